@@ -0,0 +1,85 @@
+"""Admin endpoints for inspecting the running process: sampling profiles, tracemalloc snapshots, task stacks
+and event loop stalls."""
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.loop_monitor import loop_monitor
+from app.core.profiling import allocation_tracker, dump_tasks, sampling_profiler
+from app.core.security import require_admin
+from app.core.timing import TimedRoute
+
+admin_router = APIRouter(route_class=TimedRoute, dependencies=[Depends(require_admin)])
+
+
+@admin_router.get("/profile")
+async def get_profile(seconds: float = 5.0, interval_ms: float = 10.0, format: str = "speedscope",
+                      main_thread_only: bool = False):
+    """Sample all thread stacks for a few seconds; open the result at https://www.speedscope.app.
+
+    format=collapsed returns collapsed stacks for flamegraph.pl instead.
+    """
+    if format not in ("speedscope", "collapsed"):
+        raise HTTPException(status_code=422, detail="format must be speedscope or collapsed")
+    try:
+        result = await sampling_profiler.profile(seconds, max(interval_ms, 1.0) / 1000, main_thread_only)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(sampling_profiler.to_collapsed(result))
+    return sampling_profiler.to_speedscope(result)
+
+
+@admin_router.get("/tracemalloc")
+async def get_tracemalloc_status():
+    """Get whether allocations are traced, the traced memory and the kept snapshots."""
+    return allocation_tracker.status()
+
+
+@admin_router.post("/tracemalloc/start")
+async def start_tracemalloc(frames: int = 10):
+    """Start tracing allocations (adds memory and CPU overhead until stopped)."""
+    return allocation_tracker.start(min(max(frames, 1), 50))
+
+
+@admin_router.post("/tracemalloc/stop")
+async def stop_tracemalloc():
+    """Stop tracing allocations and drop the snapshots."""
+    return allocation_tracker.stop()
+
+
+@admin_router.post("/tracemalloc/snapshot")
+async def take_tracemalloc_snapshot(group_by: str = "lineno", limit: int = 25):
+    """Take a snapshot and return its id with the largest allocation sites."""
+    try:
+        snapshot_id = await anyio.to_thread.run_sync(allocation_tracker.snapshot)
+        top = await anyio.to_thread.run_sync(allocation_tracker.top, snapshot_id, group_by, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"id": snapshot_id, "top": top, **allocation_tracker.status()}
+
+
+@admin_router.get("/tracemalloc/diff")
+async def diff_tracemalloc_snapshots(base: int, target: int, group_by: str = "lineno", limit: int = 25):
+    """Compare two snapshots by allocation site, largest growth first."""
+    try:
+        return await anyio.to_thread.run_sync(allocation_tracker.diff, base, target, group_by, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@admin_router.get("/loop")
+async def get_loop():
+    """Get the event loop lag and the stacks of recent stalls."""
+    return loop_monitor.snapshot()
+
+
+@admin_router.get("/tasks")
+async def get_tasks(stack_limit: int = 10):
+    """Get the stacks of all asyncio tasks and threads."""
+    return dump_tasks(stack_limit)
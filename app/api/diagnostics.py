@@ -0,0 +1,49 @@
+"""Diagnostics endpoints exposing runtime metrics, client statistics and startup phases.
+
+The router is included behind the admin token check (see app.core.security).
+"""
+
+import os
+
+from fastapi import APIRouter
+
+from app.core.lazy_imports import loaded_lazy_modules
+from app.core.metrics import metrics
+from app.core.snapshot import snapshot_summary
+from app.core.startup import startup_summary
+from app.core.timing import TimedRoute
+from app.core.workers import current_worker
+from app.services.ai import ai_gateway
+from app.ui.sessions import client_monitor
+
+diagnostics_router = APIRouter(route_class=TimedRoute)
+
+
+@diagnostics_router.get("/metrics")
+async def get_metrics(prefix: str = ""):
+    """Get a snapshot of all in-process metrics."""
+    return metrics.snapshot(prefix)
+
+
+@diagnostics_router.get("/clients")
+async def get_clients(top: int = 20):
+    """Get element counts and estimated memory per NiceGUI client."""
+    return client_monitor.snapshot(top)
+
+
+@diagnostics_router.get("/ai")
+async def get_ai_providers():
+    """Get the AI providers' circuit breakers and the hedging delay."""
+    return ai_gateway.describe()
+
+
+@diagnostics_router.get("/startup")
+async def get_startup():
+    """Get startup phases, lazily imported modules, the restored snapshot and the serving worker."""
+    return {
+        **startup_summary(),
+        "lazy_modules": loaded_lazy_modules(),
+        "snapshot": snapshot_summary(),
+        "worker": current_worker(),
+        "pid": os.getpid(),
+    }
@@ -1,13 +1,26 @@
 """API router for the portfolio application."""
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, EmailStr, TypeAdapter
+from typing import Dict, List, Optional
 import time
+from app.core.deadlines import run_within_deadline
+from app.core.exceptions import AppException, DeadlineExceededError, PayloadTooLargeError
 from app.core.logging import app_logger
+from app.core.security import require_admin
+from app.core.timing import TimedRoute
+from app.core.warmup import warmer
+from app.services.ai import CHAT, TEXT_GENERATION, ai_gateway
+from app.services.ingestion import ingestion_pool
+from app.services.uploads import upload_store
+from app.api.admin import admin_router
+from app.api.diagnostics import diagnostics_router
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=TimedRoute)
+api_router.include_router(diagnostics_router, prefix="/diagnostics", tags=["diagnostics"],
+                          dependencies=[Depends(require_admin)])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
 
 # Pydantic models for API
 class ContactMessage(BaseModel):
@@ -44,9 +57,9 @@ async def submit_contact_form(contact: ContactMessage):
         # 3. Store in database
         # 4. Send confirmation email
         
-        # Simulate processing time
+        # Simulate processing time (the mail delivery is skipped once the client is gone)
         import asyncio
-        await asyncio.sleep(1)
+        await run_within_deadline(asyncio.sleep(1), work="email")
         
         return JSONResponse(
             content={
@@ -55,38 +68,75 @@ async def submit_contact_form(contact: ContactMessage):
                 "timestamp": time.time()
             }
         )
+    except DeadlineExceededError as e:
+        raise e.to_http_exception()
     except Exception as e:
         app_logger.error(f"Error processing contact form: {e}")
         raise HTTPException(status_code=500, detail="Failed to send message")
 
+# Catalog data served by the API
+PROJECTS = [
+    {
+        "id": "intelligent-chatbot",
+        "title": "Intelligent Customer Service Chatbot",
+        "description": "Enterprise-grade chatbot powered by GPT-4 with RAG capabilities",
+        "tech_stack": ["GPT-4", "LangChain", "Pinecone", "FastAPI", "React"],
+        "category": "NLP",
+        "github_url": "https://github.com/genai-engineer/intelligent-chatbot",
+        "demo_url": "https://demo.chatbot.com"
+    },
+    {
+        "id": "content-generator",
+        "title": "AI Content Generation Platform",
+        "description": "Multi-modal content creation platform for marketing teams",
+        "tech_stack": ["GPT-4", "DALL-E 3", "Stable Diffusion", "Python", "Vue.js"],
+        "category": "Multimodal",
+        "github_url": "https://github.com/genai-engineer/content-generator",
+        "demo_url": "https://demo.contentgen.com"
+    }
+]
+
+SKILLS = [
+    {"name": "Large Language Models", "category": "Generative AI", "proficiency": 95},
+    {"name": "Prompt Engineering", "category": "Generative AI", "proficiency": 90},
+    {"name": "LangChain", "category": "AI Frameworks", "proficiency": 92},
+    {"name": "Python", "category": "Programming", "proficiency": 95},
+    {"name": "FastAPI", "category": "Web Development", "proficiency": 88}
+]
+
+CATALOGS = {
+    "projects": (PROJECTS, ProjectResponse),
+    "skills": (SKILLS, SkillResponse),
+}
+
+# Validated and serialized catalogs, filled by the warm-up or on first request
+_catalog_bodies: Dict[str, bytes] = {}
+
+
+def catalog_body(name: str) -> bytes:
+    """Return the JSON body of a catalog, validating and serializing it once."""
+    body = _catalog_bodies.get(name)
+    if body is None:
+        items, model = CATALOGS[name]
+        adapter = TypeAdapter(List[model])
+        body = adapter.dump_json(adapter.validate_python(items))
+        _catalog_bodies[name] = body
+    return body
+
+
+@warmer("catalogs")
+def warm_catalogs() -> None:
+    """Pre-serialize every catalog."""
+    for name in CATALOGS:
+        catalog_body(name)
+
+
 # Projects endpoint
 @api_router.get("/projects", response_model=List[ProjectResponse])
 async def get_projects():
     """Get all projects."""
     try:
-        # Mock project data
-        projects = [
-            {
-                "id": "intelligent-chatbot",
-                "title": "Intelligent Customer Service Chatbot",
-                "description": "Enterprise-grade chatbot powered by GPT-4 with RAG capabilities",
-                "tech_stack": ["GPT-4", "LangChain", "Pinecone", "FastAPI", "React"],
-                "category": "NLP",
-                "github_url": "https://github.com/genai-engineer/intelligent-chatbot",
-                "demo_url": "https://demo.chatbot.com"
-            },
-            {
-                "id": "content-generator",
-                "title": "AI Content Generation Platform",
-                "description": "Multi-modal content creation platform for marketing teams",
-                "tech_stack": ["GPT-4", "DALL-E 3", "Stable Diffusion", "Python", "Vue.js"],
-                "category": "Multimodal",
-                "github_url": "https://github.com/genai-engineer/content-generator",
-                "demo_url": "https://demo.contentgen.com"
-            }
-        ]
-        
-        return projects
+        return Response(content=catalog_body("projects"), media_type="application/json")
     except Exception as e:
         app_logger.error(f"Error fetching projects: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
@@ -96,19 +146,37 @@ async def get_projects():
 async def get_skills():
     """Get all skills."""
     try:
-        skills = [
-            {"name": "Large Language Models", "category": "Generative AI", "proficiency": 95},
-            {"name": "Prompt Engineering", "category": "Generative AI", "proficiency": 90},
-            {"name": "LangChain", "category": "AI Frameworks", "proficiency": 92},
-            {"name": "Python", "category": "Programming", "proficiency": 95},
-            {"name": "FastAPI", "category": "Web Development", "proficiency": 88}
-        ]
-        
-        return skills
+        return Response(content=catalog_body("skills"), media_type="application/json")
     except Exception as e:
         app_logger.error(f"Error fetching skills: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch skills")
 
+# Document upload endpoint
+@api_router.post("/uploads")
+async def upload_document(request: Request, filename: str):
+    """Upload a document as the raw request body; it is streamed to disk in chunks."""
+    try:
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > upload_store.max_size:
+            raise PayloadTooLargeError(f"Files are limited to {upload_store.max_size // (1024 * 1024)} MB")
+        stored = await upload_store.save_stream(filename, request.stream())
+        job = await ingestion_pool.submit(stored["id"], stored["filename"])
+        return JSONResponse(content={**stored, "ingestion": job.to_dict()},
+                            status_code=200 if stored["deduplicated"] else 201)
+    except AppException as e:
+        raise e.to_http_exception()
+    except Exception as e:
+        app_logger.error(f"Error storing upload {filename}: {e}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+@api_router.get("/uploads/{document_id}")
+async def get_upload_status(document_id: str):
+    """Get the ingestion progress of an uploaded document."""
+    status = await ingestion_pool.status(document_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return JSONResponse(content=status)
+
 # Health check endpoint
 @api_router.get("/health")
 async def health_check():
@@ -126,24 +194,11 @@ async def health_check():
 async def generate_text(prompt: str, style: str = "creative", length: str = "medium"):
     """Generate text using AI (demo endpoint)."""
     try:
-        # Simulate AI text generation
-        import asyncio
-        await asyncio.sleep(2)
-        
-        mock_response = f"""Generated text based on prompt: "{prompt[:50]}..."
-
-Style: {style.title()}
-Length: {length.title()}
-
-This is a demonstration of AI text generation capabilities. In a real implementation, this would connect to actual language models like GPT-4, Claude, or local models.
-
-Key features demonstrated:
-✓ Context-aware generation
-✓ Style customization  
-✓ Length control
-✓ Real-time processing"""
-        
-        return JSONResponse(content={"generated_text": mock_response})
+        result = await run_within_deadline(
+            ai_gateway.complete(TEXT_GENERATION, prompt, style=style, length=length), work="llm")
+        return JSONResponse(content={"generated_text": result.text, "provider": result.provider})
+    except DeadlineExceededError as e:
+        raise e.to_http_exception()
     except Exception as e:
         app_logger.error(f"Error in text generation: {e}")
         raise HTTPException(status_code=500, detail="Text generation failed")
@@ -152,21 +207,10 @@ Key features demonstrated:
 async def chat_with_ai(message: str):
     """Chat with AI assistant (demo endpoint)."""
     try:
-        # Simulate AI chat response
-        import asyncio
-        await asyncio.sleep(1.5)
-        
-        responses = [
-            "That's an interesting question! In a real implementation, I would use advanced language models to provide helpful responses.",
-            "I understand what you're asking. This demo showcases how AI chat systems can maintain context and provide relevant responses.",
-            "Great point! AI assistants can help with various tasks including answering questions and providing explanations.",
-            "Thanks for trying this demo! Real AI systems use sophisticated NLP models for natural conversations."
-        ]
-        
-        import random
-        response = random.choice(responses)
-        
-        return JSONResponse(content={"response": response})
+        result = await run_within_deadline(ai_gateway.complete(CHAT, message), work="llm")
+        return JSONResponse(content={"response": result.text, "provider": result.provider})
+    except DeadlineExceededError as e:
+        raise e.to_http_exception()
     except Exception as e:
         app_logger.error(f"Error in chat: {e}")
         raise HTTPException(status_code=500, detail="Chat failed")
\ No newline at end of file
@@ -5,6 +5,12 @@ import asyncio
 import json
 from typing import Optional
 
+from app.core import app_logger, settings
+from app.core.exceptions import DeadlineExceededError
+from app.services.ai import CHAT, TEXT_GENERATION, ai_gateway
+from app.ui.lazy import create_lazy_tab_panels
+from app.ui.sessions import run_for_client
+
 def create_ai_demos_section():
     """Create the AI demos section with interactive examples."""
     
@@ -21,22 +27,13 @@ def create_ai_demos_section():
                 analysis_tab = ui.tab('Text Analysis', icon='analytics')
                 image_tab = ui.tab('Image Generation', icon='image')
             
-            with ui.tab_panels(tabs, value=text_tab).classes('w-full mt-8'):
-                # Text Generation Demo
-                with ui.tab_panel(text_tab):
-                    create_text_generation_demo()
-                
-                # AI Chat Demo
-                with ui.tab_panel(chat_tab):
-                    create_chat_demo()
-                
-                # Text Analysis Demo
-                with ui.tab_panel(analysis_tab):
-                    create_text_analysis_demo()
-                
-                # Image Generation Demo
-                with ui.tab_panel(image_tab):
-                    create_image_generation_demo()
+            # Demo panels (each demo is built the first time its tab is opened)
+            create_lazy_tab_panels(tabs, {
+                text_tab: create_text_generation_demo,
+                chat_tab: create_chat_demo,
+                analysis_tab: create_text_analysis_demo,
+                image_tab: create_image_generation_demo,
+            }, value=text_tab, name='ai-demos', classes='w-full mt-8')
 
 def create_text_generation_demo():
     """Create text generation demo."""
@@ -72,30 +69,22 @@ def create_text_generation_demo():
             generate_btn.props('loading')
             output_area.value = 'Generating...'
             
-            # Simulate AI text generation
-            await asyncio.sleep(2)
-            
-            # Mock response based on prompt and settings
-            mock_response = f"""Based on your prompt "{prompt_input.value[:50]}..." in {style_select.value.lower()} style:
-
-This is a demonstration of AI text generation capabilities. In a real implementation, this would connect to:
-- OpenAI GPT-4 API
-- Anthropic Claude API  
-- Local language models
-- Custom fine-tuned models
-
-The generated content would be contextually relevant, creative, and tailored to your specified style and length preferences.
-
-Key features:
-✓ Context-aware generation
-✓ Style customization
-✓ Length control
-✓ Real-time processing
-✓ Multiple model support"""
-            
-            output_area.value = mock_response
-            generate_btn.props(remove='loading')
-            ui.notify('Text generated successfully!', type='positive')
+            try:
+                result = await run_for_client(
+                    ai_gateway.complete(TEXT_GENERATION, prompt_input.value,
+                                        style=style_select.value, length=length_select.value),
+                    work="llm", timeout=settings.AI_REQUEST_TIMEOUT)
+                output_area.value = result.text
+                ui.notify('Text generated successfully!', type='positive')
+            except DeadlineExceededError:
+                output_area.value = ''
+                ui.notify('Text generation took too long, please try again', type='warning')
+            except Exception as e:
+                output_area.value = ''
+                ui.notify('Text generation failed', type='negative')
+                app_logger.error(f"Text generation demo error: {e}")
+            finally:
+                generate_btn.props(remove='loading')
         
         generate_btn.on('click', generate_text)
 
@@ -133,21 +122,18 @@ def create_chat_demo():
             with chat_container:
                 typing_msg = create_chat_message("AI is typing...", is_user=False, is_typing=True)
             
-            await asyncio.sleep(1.5)
-            
-            # Remove typing indicator and add response
-            typing_msg.delete()
-            
-            # Mock AI response
-            responses = [
-                "That's an interesting question! In a real implementation, I would use advanced language models to provide helpful, accurate responses.",
-                "I understand what you're asking. This demo showcases how AI chat systems can maintain context and provide relevant responses.",
-                "Great point! AI assistants like this can help with various tasks including answering questions, providing explanations, and offering suggestions.",
-                "Thanks for trying out this demo! Real AI chat systems use sophisticated NLP models to understand and respond to user queries effectively."
-            ]
-            
-            import random
-            ai_response = random.choice(responses)
+            try:
+                result = await run_for_client(ai_gateway.complete(CHAT, user_message), work="llm",
+                                              timeout=settings.AI_REQUEST_TIMEOUT)
+                ai_response = result.text
+            except DeadlineExceededError:
+                ai_response = "Sorry, that took too long. Please try again."
+            except Exception as e:
+                ai_response = "Sorry, something went wrong. Please try again."
+                app_logger.error(f"Chat demo error: {e}")
+            finally:
+                # Remove typing indicator
+                typing_msg.delete()
             
             with chat_container:
                 create_chat_message(ai_response, is_user=False)
@@ -207,7 +193,14 @@ def create_text_analysis_demo():
             analyze_btn.props('loading')
             results_container.clear()
             
-            await asyncio.sleep(1.5)
+            # Simulated analysis, abandoned when the visitor leaves
+            try:
+                await run_for_client(asyncio.sleep(1.5), work="analysis", timeout=settings.AI_REQUEST_TIMEOUT)
+            except DeadlineExceededError:
+                ui.notify('The analysis took too long, please try again', type='warning')
+                return
+            finally:
+                analyze_btn.props(remove='loading')
             
             # Mock analysis results
             with results_container:
@@ -245,7 +238,6 @@ def create_text_analysis_demo():
                                 ui.icon('star').classes('text-yellow-500 mr-2')
                                 ui.label(phrase).classes('text-gray-700')
             
-            analyze_btn.props(remove='loading')
             ui.notify('Analysis completed!', type='positive')
         
         analyze_btn.on('click', analyze_text)
@@ -295,9 +287,15 @@ def create_image_generation_demo():
                 ui.label('Generating image...').classes('text-gray-600 mb-4')
                 ui.spinner(size='lg').classes('text-blue-600')
             
-            await asyncio.sleep(3)
-            
-            image_container.clear()
+            # Simulated generation, abandoned when the visitor leaves
+            try:
+                await run_for_client(asyncio.sleep(3), work="image", timeout=settings.AI_REQUEST_TIMEOUT)
+            except DeadlineExceededError:
+                ui.notify('Image generation took too long, please try again', type='warning')
+                return
+            finally:
+                generate_img_btn.props(remove='loading')
+                image_container.clear()
             
             # Mock image generation result
             with image_container:
@@ -316,7 +314,6 @@ def create_image_generation_demo():
                     ui.button('Download', icon='download').classes('bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700')
                     ui.button('Regenerate', icon='refresh').classes('border border-gray-300 text-gray-700 px-4 py-2 rounded-lg hover:bg-gray-50')
             
-            generate_img_btn.props(remove='loading')
             ui.notify('Image generated successfully!', type='positive')
         
         generate_img_btn.on('click', generate_image)
\ No newline at end of file
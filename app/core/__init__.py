@@ -149,26 +149,41 @@ class FallbackSettings:
         fallback_logger.warning(f"Accessing undefined setting: {name}")
         return None
 
-# Import logging components with fallbacks
-logging_imports = safe_import("app.core.logging", ["app_logger", "get_logger", "log_structured"], {
-    "app_logger": fallback_logger,
-    "get_logger": fallback_get_logger,
-    "log_structured": fallback_log_structured
-})
-
-# Extract imported or fallback components
-app_logger = logging_imports["app_logger"]
-get_logger = logging_imports["get_logger"]
-log_structured = logging_imports["log_structured"]
-
-# Import settings with fallbacks
-settings_import = safe_import("app.core.config", ["settings"], {
-    "settings": FallbackSettings()
-})
-settings = settings_import["settings"]
-
-# Log successful initialization
-if app_logger != fallback_logger:
-    app_logger.info(f"Core module initialized successfully for {settings.APP_NAME}")
-else:
-    fallback_logger.warning("Using fallback logging implementation")
\ No newline at end of file
+# Logging and settings are resolved on first access (PEP 562), so importing a
+# lightweight submodule such as app.core.metrics does not parse the environment.
+_LOGGING_ATTRIBUTES = ("app_logger", "get_logger", "log_structured")
+
+
+def _load_logging() -> None:
+    logging_imports = safe_import("app.core.logging", list(_LOGGING_ATTRIBUTES), {
+        "app_logger": fallback_logger,
+        "get_logger": fallback_get_logger,
+        "log_structured": fallback_log_structured
+    })
+    globals().update(logging_imports)
+
+
+def _load_settings() -> None:
+    # Import settings with fallbacks
+    settings_import = safe_import("app.core.config", ["settings"], {
+        "settings": FallbackSettings()
+    })
+    settings = settings_import["settings"]
+    globals()["settings"] = settings
+
+    # Log successful initialization
+    app_logger = __getattr__("app_logger")
+    if app_logger != fallback_logger:
+        app_logger.info(f"Core module initialized successfully for {settings.APP_NAME}")
+    else:
+        fallback_logger.warning("Using fallback logging implementation")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LOGGING_ATTRIBUTES:
+        _load_logging()
+    elif name == "settings":
+        _load_settings()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
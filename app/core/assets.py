@@ -0,0 +1,151 @@
+"""
+Fingerprinted static assets for the GenAI Portfolio application.
+Inline head HTML (theme CSS, small scripts) is written once to content-hashed
+files under /static with precompressed siblings, so browsers can cache it forever.
+
+Assets can be prebuilt at image build time with:
+    python -m app.core.assets
+"""
+
+import gzip
+import hashlib
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.core.lazy_imports import lazy_import
+from app.core.logging import app_logger
+
+# brotli is optional, only .gz variants are written without it
+brotli = lazy_import("brotli")
+
+# Define what this module exports
+__all__ = [
+    "STATIC_DIRECTORY",
+    "STATIC_URL",
+    "FINGERPRINT_PATTERN",
+    "register_asset",
+    "publish_asset",
+    "build_assets",
+    "precompress",
+]
+
+STATIC_DIRECTORY = Path("./static")
+STATIC_URL = "/static"
+
+# Number of hex digits of the SHA-256 digest used in file names
+FINGERPRINT_LENGTH = 12
+
+# Matches fingerprinted file names such as "theme.3f2a9c1b7d4e.css"
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{%d}\.[A-Za-z0-9]+$" % FINGERPRINT_LENGTH)
+
+# Subdirectory per asset type
+ASSET_SUBDIRECTORIES = {"css": "css", "js": "js"}
+
+_registry: Dict[str, Tuple[str, str]] = {}
+_published: Dict[Tuple[str, str], str] = {}
+
+
+def precompress(path: Path) -> None:
+    """Write .gz (and .br when brotli is installed) siblings of a file.
+
+    Args:
+        path: The file to compress
+    """
+    data = path.read_bytes()
+    # mtime=0 keeps the gzip output byte-identical across builds
+    Path(f"{path}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli:
+        Path(f"{path}.br").write_bytes(brotli.compress(data, quality=11))
+
+
+def register_asset(name: str, content: str, extension: str) -> None:
+    """Register inline content so that build_assets() can prebuild it.
+
+    Args:
+        name: Base file name (e.g. "theme")
+        content: Text content of the asset
+        extension: File extension, "css" or "js"
+    """
+    _registry[name] = (content, extension)
+
+
+def publish_asset(name: str, content: str, extension: str, directory: Optional[Path] = None) -> str:
+    """Write content to a fingerprinted file and return its URL.
+
+    Files are only written when missing, so repeated calls and restarts are
+    cheap. Older fingerprints of the same asset are removed.
+
+    Args:
+        name: Base file name (e.g. "theme")
+        content: Text content of the asset
+        extension: File extension, "css" or "js"
+        directory: Static root directory (defaults to STATIC_DIRECTORY)
+
+    Returns:
+        URL of the fingerprinted asset under /static
+    """
+    register_asset(name, content, extension)
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+    cache_key = (name, digest)
+    if cache_key in _published and directory is None:
+        return _published[cache_key]
+
+    subdirectory = ASSET_SUBDIRECTORIES.get(extension, extension)
+    target_dir = (directory or STATIC_DIRECTORY) / subdirectory
+    filename = f"{name}.{digest}.{extension}"
+    target = target_dir / filename
+
+    if not target.exists():
+        target_dir.mkdir(parents=True, exist_ok=True)
+        stale_pattern = re.compile(
+            r"^%s\.[0-9a-f]{%d}\.%s(\.gz|\.br)?$" % (re.escape(name), FINGERPRINT_LENGTH, extension)
+        )
+        for stale in target_dir.iterdir():
+            if stale_pattern.match(stale.name):
+                stale.unlink()
+        tmp = target.with_suffix(f".{extension}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(target)
+        precompress(target)
+        app_logger.info(f"Published static asset {subdirectory}/{filename}")
+
+    url = f"{STATIC_URL}/{subdirectory}/{filename}"
+    if directory is None:
+        _published[cache_key] = url
+    return url
+
+
+def build_assets(directory: Optional[Path] = None) -> Dict[str, str]:
+    """Publish all registered assets.
+
+    Args:
+        directory: Static root directory (defaults to STATIC_DIRECTORY)
+
+    Returns:
+        Mapping of asset name to URL
+    """
+    return {
+        name: publish_asset(name, content, extension, directory)
+        for name, (content, extension) in list(_registry.items())
+    }
+
+
+def main() -> bool:
+    """Prebuild all head assets of the UI."""
+    # Importing the UI registers its inline assets in the package module,
+    # which is a different module object than __main__ when run with -m
+    import app.ui.components  # noqa: F401
+    import app.ui.lazy  # noqa: F401
+    from app.core import assets
+
+    for name, url in assets.build_assets().items():
+        print(f"✓ {name}: {url}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
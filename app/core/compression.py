@@ -0,0 +1,386 @@
+"""
+Response compression for the GenAI Portfolio application.
+Negotiates zstd, brotli or gzip per request, picks the compression level by
+content type and memoizes the compressed output of cacheable responses, so a
+hot JSON or HTML body is compressed once instead of on every request.
+"""
+
+import gzip
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.lazy_imports import lazy_import
+from app.core.metrics import metrics
+from app.core.snapshot import register_snapshot
+
+# brotli and zstandard are optional, a coding is simply not offered without its module
+brotli = lazy_import("brotli")
+zstandard = lazy_import("zstandard")
+
+# Define what this module exports
+__all__ = [
+    "CompressionMiddleware",
+    "available_encodings",
+    "compress",
+    "negotiate_encoding",
+]
+
+# Server preference when the client accepts several codings with equal q
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+# Levels for dynamic responses, by content type prefix. Bodies that are built per
+# request use fast levels; CSS and JavaScript are usually static and worth more effort.
+COMPRESSION_LEVELS: Dict[str, Dict[str, int]] = {
+    "text/html": {"zstd": 6, "br": 5, "gzip": 6},
+    "application/json": {"zstd": 3, "br": 4, "gzip": 5},
+    "text/css": {"zstd": 9, "br": 7, "gzip": 9},
+    "application/javascript": {"zstd": 9, "br": 7, "gzip": 9},
+    "text/javascript": {"zstd": 9, "br": 7, "gzip": 9},
+}
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Cacheable responses are compressed once, so they get a higher level
+CACHED_LEVELS = {"zstd": 12, "br": 9, "gzip": 9}
+
+# Streaming responses are flushed per chunk and favour latency
+STREAMING_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+# Bodies larger than this are compressed in a worker thread
+THREAD_OFFLOAD_BYTES = 128 * 1024
+
+DEFAULT_MINIMUM_SIZE = 500
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def available_encodings() -> List[str]:
+    """Return the content codings this process can produce, in preference order."""
+    installed = {"zstd": bool(zstandard), "br": bool(brotli), "gzip": True}
+    return [encoding for encoding in ENCODING_PREFERENCE if installed[encoding]]
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pick the content coding for a response.
+
+    Args:
+        accept_encoding: Value of the request's Accept-Encoding header
+        available: Codings the server can produce, in preference order
+
+    Returns:
+        The chosen coding, or None to send the identity representation
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compress a complete body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "zstd", "br" or "gzip"
+        level: Encoder level (brotli quality for "br")
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressedResponseCache:
+    """Byte-bounded LRU of compressed bodies keyed by (body hash, coding, level)."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[bytes, str, int], bytes]" = OrderedDict()
+        self._size = 0
+        self._gauge = metrics.gauge("compression_cache_bytes", "Bytes of compressed responses held in memory")
+
+    def get(self, key: Tuple[bytes, str, int]) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[bytes, str, int], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+        self._gauge.set(self._size)
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting the least recently used entries that no longer fit."""
+        self.max_bytes = max_bytes
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+        self._gauge.set(self._size)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+        self._gauge.set(0)
+
+    def dump(self) -> Tuple[List[Tuple[str, str, int]], List[bytes]]:
+        """Describe the cache for a warm-state snapshot, least recently used first."""
+        entries = list(self._entries.items())
+        return [(digest.hex(), coding, level) for (digest, coding, level), _ in entries], [body for _, body in entries]
+
+    def load(self, keys: List[Tuple[str, str, int]], bodies: List[bytes]) -> int:
+        """Restore entries from a warm-state snapshot; keys are content hashes, so they never go stale."""
+        for (digest, coding, level), body in zip(keys, bodies):
+            self.put((bytes.fromhex(digest), coding, int(level)), body)
+        return len(keys)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with zstd, brotli or gzip.
+
+    Args:
+        app: The ASGI application
+        minimum_size: Bodies smaller than this are sent uncompressed
+        cache_max_bytes: Size of the compressed-response cache (0 disables it)
+        cacheable_paths: Path prefixes whose GET responses are always memoized
+            (responses carrying an ETag are memoized regardless of path)
+        snapshot_name: Include the cache in the warm-state snapshot under this name
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        cacheable_paths: Optional[List[str]] = None,
+        snapshot_name: Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cacheable_paths = tuple(cacheable_paths or ())
+        self.cache = CompressedResponseCache(cache_max_bytes) if cache_max_bytes else None
+        if self.cache is not None and snapshot_name:
+            register_snapshot(snapshot_name, self.cache.dump, self.cache.load)
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-request send wrapper used by CompressionMiddleware."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start_message: Optional[Message] = None
+        self.stream: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._eligible(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self._send(message)
+            return
+        if self.passthrough or message_type != "http.response.body":
+            if self.start_message is not None and not self.passthrough:
+                # File responses sent via pathsend/zerocopy are forwarded as they are
+                await self._send(self.start_message)
+                self.start_message = None
+                self.passthrough = True
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            if not more_body:
+                await self._send_complete(start_message, body)
+                return
+            await self._start_stream(start_message)
+
+        if self.stream is None:
+            await self._send(message)
+            return
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _eligible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or content_type == "text/event-stream":
+            return False
+        content_length = headers.get("content-length")
+        return content_length is None or int(content_length) >= self.middleware.minimum_size
+
+    def _levels(self, headers: Headers) -> Dict[str, int]:
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return COMPRESSION_LEVELS.get(content_type, DEFAULT_LEVELS)
+
+    def _cacheable(self, headers: Headers) -> bool:
+        if self.middleware.cache is None:
+            return False
+        cache_control = headers.get("cache-control", "")
+        if "no-store" in cache_control or "set-cookie" in headers:
+            return False
+        if "etag" in headers:
+            return True
+        return self.scope["method"] == "GET" and self.scope["path"].startswith(self.middleware.cacheable_paths)
+
+    def _encoded_headers(self, start_message: Message) -> MutableHeaders:
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from the identity body, so the validator is weak
+            headers["etag"] = f"W/{etag}"
+        return headers
+
+    async def _send_complete(self, start_message: Message, body: bytes) -> None:
+        if len(body) < self.middleware.minimum_size:
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        headers = Headers(raw=start_message["headers"])
+        cache = self.middleware.cache if self._cacheable(headers) else None
+        level = (CACHED_LEVELS if cache is not None else self._levels(headers))[self.encoding]
+        key = (hashlib.sha256(body).digest(), self.encoding, level) if cache is not None else None
+        compressed = cache.get(key) if cache is not None else None
+
+        if compressed is not None:
+            metrics.counter("compression_cache_hits_total", "Compressed responses served from cache").inc()
+        else:
+            started = time.perf_counter()
+            if len(body) >= THREAD_OFFLOAD_BYTES:
+                compressed = await anyio.to_thread.run_sync(compress, body, self.encoding, level)
+            else:
+                compressed = compress(body, self.encoding, level)
+            metrics.histogram(
+                "compression_duration_ms", "Time spent compressing a response body", encoding=self.encoding
+            ).observe((time.perf_counter() - started) * 1000)
+            if cache is not None:
+                cache.put(key, compressed)
+
+        if len(compressed) >= len(body):
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        self._record(len(body), len(compressed))
+        encoded_headers = self._encoded_headers(start_message)
+        encoded_headers["content-length"] = str(len(compressed))
+        start_message["headers"] = encoded_headers.raw
+        await self._send(start_message)
+        await self._send({
+            "type": "http.response.body",
+            "body": b"" if self.scope["method"] == "HEAD" else compressed,
+            "more_body": False,
+        })
+
+    async def _start_stream(self, start_message: Message) -> None:
+        headers = self._encoded_headers(start_message)
+        del headers["content-length"]
+        start_message["headers"] = headers.raw
+        self.stream = StreamCompressor(self.encoding, STREAMING_LEVELS[self.encoding])
+        metrics.counter("compression_streams_total", "Streaming responses compressed", encoding=self.encoding).inc()
+        await self._send(start_message)
+
+    def _record(self, bytes_in: int, bytes_out: int) -> None:
+        labels: Dict[str, Any] = {"encoding": self.encoding}
+        metrics.counter("compression_responses_total", "Responses compressed", **labels).inc()
+        metrics.counter("compression_bytes_in_total", "Uncompressed bytes of compressed responses", **labels) \
+            .inc(bytes_in)
+        metrics.counter("compression_bytes_out_total", "Bytes sent for compressed responses", **labels) \
+            .inc(bytes_out)
+
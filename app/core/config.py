@@ -1,12 +1,21 @@
 """
 Configuration settings for the GenAI Portfolio application.
 Uses pydantic-settings for environment variable management.
+
+Settings are loaded once, without side effects; ``bootstrap_settings`` creates
+the application's directories and validates the configuration when the app is
+built. Fields in ``RELOADABLE_FIELDS`` are re-read from ``.env`` while running
+(when the file changes, or on SIGUSR1) and pushed to the subsystems that
+registered for them with ``on_settings_change``; other changes need a restart.
 """
 
 from pydantic_settings import BaseSettings
-from pydantic import Field, ConfigDict
-from typing import Optional, List
+from pydantic import Field, ConfigDict, ValidationError
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, List, Tuple
+import asyncio
+import logging
 import os
+import signal
 from pathlib import Path
 
 class Settings(BaseSettings):
@@ -28,18 +37,38 @@ class Settings(BaseSettings):
     # Server
     HOST: str = Field(default="0.0.0.0")
     PORT: int = Field(default=8080)
+    WORKERS: int = Field(default=1)  # Pre-forked worker processes, 0 for one per core
+    WORKER_STICKY_HEADER: Optional[str] = Field(default="fly-client-ip")  # Route clients by this proxy header, empty for the address
+    WORKER_GRACEFUL_TIMEOUT: int = Field(default=30)  # seconds
     
     # Security
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production")
     ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
+    ENABLE_AUTH: bool = Field(default=False)
+    ADMIN_DIAGNOSTICS_ENABLED: bool = Field(default=True)  # Profiler endpoints, need a SECRET_KEY-signed token
     
     # Database
     DATABASE_URL: str = Field(default="sqlite:///./data/portfolio.db")
+    ENABLE_DATABASE: bool = Field(default=False)
     
     # AI Services
     OPENAI_API_KEY: Optional[str] = Field(default=None)
     ANTHROPIC_API_KEY: Optional[str] = Field(default=None)
+    OPENAI_MODEL: str = Field(default="gpt-4o-mini")
+    ANTHROPIC_MODEL: str = Field(default="claude-3-5-haiku-latest")
+    AI_PROVIDERS: str = Field(default="openai,anthropic")  # Order of preference; "fake" adds the latency injector
+    AI_PROVIDER_TIMEOUT: float = Field(default=10.0)  # seconds for one provider call
+    AI_PROVIDER_MAX_CONCURRENCY: int = Field(default=16)  # Calls in flight per provider, 0 for no limit
+    AI_HEDGE_DELAY_MS: int = Field(default=0)  # Ask the next provider too when the first is this slow, 0 disables
+    AI_BREAKER_FAILURE_RATE: float = Field(default=0.5)  # Failed fraction of recent calls that opens a breaker
+    AI_BREAKER_SLOW_CALL_SECONDS: float = Field(default=5.0)
+    AI_BREAKER_SLOW_CALL_RATE: float = Field(default=0.5)  # Slow fraction of recent calls that opens a breaker
+    AI_BREAKER_WINDOW: int = Field(default=20)  # Recent calls considered
+    AI_BREAKER_MIN_CALLS: int = Field(default=5)
+    AI_BREAKER_OPEN_SECONDS: int = Field(default=30)  # Cool-down before probing a provider again
+    AI_FAKE_LATENCY_MS: int = Field(default=800)  # Latency of the "fake" provider
+    AI_FAKE_FAILURE_RATE: float = Field(default=0.0)  # Fraction of "fake" calls that fail
     
     # Email Configuration
     SMTP_HOST: Optional[str] = Field(default=None)
@@ -57,6 +86,14 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = Field(default=10 * 1024 * 1024)  # 10MB
     UPLOAD_DIRECTORY: str = Field(default="./uploads")
     ALLOWED_EXTENSIONS: List[str] = Field(default=["pdf", "doc", "docx", "txt"])
+    UPLOAD_MAX_CONCURRENCY: int = Field(default=8)  # Uploads streamed at the same time
+    UPLOAD_TIMEOUT: int = Field(default=120)  # seconds for a whole upload
+    
+    # Document Ingestion
+    INGESTION_WORKERS: int = Field(default=2)  # Extraction processes, 0 for one per core
+    INGESTION_DATABASE: str = Field(default="./data/ingestion.db")  # SQLite file for extracted chunks
+    INGESTION_CHUNK_SIZE: int = Field(default=1000)  # characters
+    INGESTION_CHUNK_OVERLAP: int = Field(default=200)  # characters shared by consecutive chunks
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO")
@@ -69,28 +106,50 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = Field(default=100)
     RATE_LIMIT_WINDOW: int = Field(default=3600)  # 1 hour
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        
-        # Create necessary directories
-        self._create_directories()
-    
-    def _create_directories(self):
-        """Create necessary directories if they don't exist."""
-        directories = [
-            Path(self.UPLOAD_DIRECTORY),
-            Path("./data"),
-            Path("./logs"),
-            Path("./static"),
-            Path("./static/images"),
-            Path("./static/css"),
-            Path("./static/js")
-        ]
-        
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
-    
+
+    # NiceGUI Client Sessions
+    CLIENT_IDLE_TIMEOUT_MINUTES: int = Field(default=15)  # 0 disables idle eviction
+    CLIENT_MEMORY_BUDGET_MB: int = Field(default=128)  # Estimated bytes across all clients, 0 disables
+    CLIENT_SWEEP_INTERVAL: int = Field(default=30)  # seconds
+
+    # Static Files
+    STATIC_CACHE_MAX_MB: int = Field(default=16)  # In-memory hot set across all files
+    STATIC_CACHE_MAX_FILE_KB: int = Field(default=256)  # Larger files are streamed from disk
+
+    # Response Compression
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=500)  # bytes
+    COMPRESSION_CACHE_MAX_MB: int = Field(default=32)  # Memoized compressed responses, 0 disables
+
+    # Warm State Snapshot
+    WARM_SNAPSHOT_FILE: Optional[str] = Field(default="./data/warm_state.snapshot")  # Empty disables
+
+    # Module Discovery
+    DISCOVERY_MANIFEST_FILE: Optional[str] = Field(default="./app/_generated/discovery_manifest.json")  # Build output, empty disables
+
+    # Health Checks
+    READINESS_CHECK_INTERVAL: int = Field(default=10)  # seconds between readiness checks
+
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED: bool = Field(default=True)
+    ADMISSION_QUEUE_TIMEOUT_MS: int = Field(default=500)  # Longest a request may wait for a slot
+    ADMISSION_MAX_CONCURRENCY: int = Field(default=64)  # Upper bound of the adaptive limit for pages and API
+    ADMISSION_EXPENSIVE_MAX_CONCURRENCY: int = Field(default=8)  # Upper bound for AI demos and the contact form
+
+    # Request Deadlines
+    REQUEST_TIMEOUT: int = Field(default=30)  # seconds, checked by upstream calls; X-Request-Timeout can shorten it
+    AI_REQUEST_TIMEOUT: int = Field(default=15)  # seconds, for AI demos and the contact form
+
+    # Request Instrumentation
+    SERVER_TIMING_ENABLED: bool = Field(default=True)  # Expose phase timings in a Server-Timing header
+
+    # Event Loop Monitor
+    LOOP_MONITOR_ENABLED: bool = Field(default=True)
+    LOOP_MONITOR_INTERVAL_MS: int = Field(default=100)  # Heartbeat period; lag is measured against it
+    LOOP_STALL_THRESHOLD_MS: int = Field(default=250)  # Capture the blocking stack after this long
+
+    # Runtime Reload
+    SETTINGS_RELOAD_INTERVAL: int = Field(default=5)  # seconds between .env checks, 0 disables (SIGUSR1 still works)
+
     @property
     def database_path(self) -> Path:
         """Get the database file path."""
@@ -102,6 +161,54 @@ class Settings(BaseSettings):
 # Create global settings instance
 settings = Settings()
 
+# Settings the running application picks up without a restart
+RELOADABLE_FIELDS = frozenset({
+    "LOG_LEVEL",
+    "RATE_LIMIT_REQUESTS",
+    "RATE_LIMIT_WINDOW",
+    "CLIENT_IDLE_TIMEOUT_MINUTES",
+    "CLIENT_MEMORY_BUDGET_MB",
+    "CLIENT_SWEEP_INTERVAL",
+    "STATIC_CACHE_MAX_MB",
+    "STATIC_CACHE_MAX_FILE_KB",
+    "COMPRESSION_CACHE_MAX_MB",
+    "ADMISSION_QUEUE_TIMEOUT_MS",
+    "ADMISSION_MAX_CONCURRENCY",
+    "ADMISSION_EXPENSIVE_MAX_CONCURRENCY",
+    "UPLOAD_MAX_CONCURRENCY",
+    "REQUEST_TIMEOUT",
+    "AI_REQUEST_TIMEOUT",
+    "UPLOAD_TIMEOUT",
+    "AI_PROVIDER_TIMEOUT",
+    "AI_HEDGE_DELAY_MS",
+    "LOOP_MONITOR_INTERVAL_MS",
+    "LOOP_STALL_THRESHOLD_MS",
+    "ADMIN_DIAGNOSTICS_ENABLED",
+    "SETTINGS_RELOAD_INTERVAL",
+})
+
+# Same logger as app.core.logging.app_logger, which imports this module
+logger = logging.getLogger("portfolio")
+
+# (fields, listener) pairs registered with on_settings_change
+_listeners: List[Tuple[FrozenSet[str], Callable[[Dict[str, Any]], None]]] = []
+_bootstrapped = False
+
+def create_directories() -> None:
+    """Create necessary directories if they don't exist."""
+    directories = [
+        Path(settings.UPLOAD_DIRECTORY),
+        Path("./data"),
+        Path("./logs"),
+        Path("./static"),
+        Path("./static/images"),
+        Path("./static/css"),
+        Path("./static/js")
+    ]
+
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
 # Validate critical settings
 def validate_settings():
     """Validate critical application settings."""
@@ -125,17 +232,110 @@ def validate_settings():
     
     # Validate AI API keys if AI features are enabled
     if not settings.OPENAI_API_KEY and not settings.ANTHROPIC_API_KEY:
-        print("WARNING: No AI API keys configured. AI features will use mock responses.")
+        logger.warning("No AI API keys configured. AI features will use mock responses.")
     
     # Validate email configuration if contact form is enabled
     if settings.SMTP_HOST and not all([settings.SMTP_USERNAME, settings.SMTP_PASSWORD]):
-        print("WARNING: SMTP host configured but missing username/password. Contact form emails may fail.")
+        logger.warning("SMTP host configured but missing username/password. Contact form emails may fail.")
     
     if errors:
         raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
 
-# Validate settings on import
-try:
-    validate_settings()
-except Exception as e:
-    print(f"Configuration warning: {e}")
\ No newline at end of file
+def bootstrap_settings() -> None:
+    """Create the application's directories and validate the settings, once per process."""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    _bootstrapped = True
+    try:
+        create_directories()
+        validate_settings()
+    except Exception as e:
+        logger.warning(f"Configuration warning: {e}")
+
+def on_settings_change(fields: Iterable[str], listener: Callable[[Dict[str, Any]], None]) -> None:
+    """Call ``listener`` whenever a reload changes one of ``fields``.
+
+    The listener runs on the event loop with the changed fields and their new
+    values; by then the global settings already hold the new values.
+
+    Args:
+        fields: Names of reloadable settings
+        listener: Applies the new values to a subsystem
+    """
+    fields = frozenset(fields)
+    unknown = fields - RELOADABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Settings are not reloadable: {', '.join(sorted(unknown))}")
+    _listeners.append((fields, listener))
+
+def reload_settings() -> Dict[str, Any]:
+    """Re-read the environment and .env and apply changed reloadable settings.
+
+    Returns:
+        The reloadable fields that changed, with their new values
+    """
+    try:
+        fresh = Settings()
+    except ValidationError as e:
+        logger.error(f"Settings not reloaded, keeping the current values: {e}")
+        return {}
+
+    changed: Dict[str, Any] = {}
+    for name in Settings.model_fields:
+        value = getattr(fresh, name)
+        if value == getattr(settings, name):
+            continue
+        if name in RELOADABLE_FIELDS:
+            changed[name] = value
+        else:
+            logger.warning(f"Setting {name} changed; restart the application to apply it")
+    if not changed:
+        return changed
+
+    for name, value in changed.items():
+        setattr(settings, name, value)
+    logger.info(f"Reloaded settings: {', '.join(f'{name}={value}' for name, value in changed.items())}")
+    for fields, listener in _listeners:
+        if fields & changed.keys():
+            try:
+                listener({name: changed[name] for name in fields & changed.keys()})
+            except Exception as e:
+                logger.error(f"Failed to apply reloaded settings in {getattr(listener, '__qualname__', listener)}: {e}")
+    return changed
+
+def _env_file_version() -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(Settings.model_config["env_file"])
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+async def watch_settings() -> None:
+    """Reload settings when .env changes or the process receives SIGUSR1.
+
+    The file is checked every ``SETTINGS_RELOAD_INTERVAL`` seconds, so requests
+    never pay for it. Runs until cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    reload_signal = getattr(signal, "SIGUSR1", None)
+    try:
+        if reload_signal is not None:
+            loop.add_signal_handler(reload_signal, reload_settings)
+    except (NotImplementedError, RuntimeError):
+        # No signals on Windows event loops or outside the main thread
+        reload_signal = None
+
+    version = _env_file_version()
+    try:
+        while True:
+            await asyncio.sleep(settings.SETTINGS_RELOAD_INTERVAL or 5)
+            if not settings.SETTINGS_RELOAD_INTERVAL:
+                continue
+            current = _env_file_version()
+            if current != version:
+                version = current
+                reload_settings()
+    finally:
+        if reload_signal is not None:
+            loop.remove_signal_handler(reload_signal)
@@ -1,10 +1,11 @@
-from typing import Generator, Optional
+from typing import Generator, Optional, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
 from app.core.config import settings
+from app.core.deadlines import check_deadline, current_deadline
 from app.core.logging import app_logger
 
 class Base(DeclarativeBase):
@@ -14,6 +15,9 @@ class Base(DeclarativeBase):
 engine = None
 SessionLocal = None
 
+# SQLite virtual machine instructions between deadline checks of a running statement
+SQLITE_PROGRESS_INSTRUCTIONS = 10000
+
 def setup_database() -> None:
     """Initialize database connection and create tables if enabled."""
     global engine, SessionLocal
@@ -33,6 +37,9 @@ def setup_database() -> None:
             pool_recycle=3600,
             echo=settings.DEBUG,
         )
+        event.listen(engine, "before_cursor_execute", _check_statement_deadline)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _install_deadline_interrupt)
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         app_logger.info(f"Database connection established: {settings.DATABASE_URL.split('@')[-1].split('/')[-1]}")
         create_tables()
@@ -40,10 +47,23 @@ def setup_database() -> None:
         app_logger.error(f"Failed to connect to database: {e}")
         raise
 
+def _check_statement_deadline(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Do not send statements for a request that has been abandoned."""
+    check_deadline("database")
+
+def _deadline_expired() -> int:
+    deadline = current_deadline.get()
+    return int(deadline is not None and deadline.expired)
+
+def _install_deadline_interrupt(dbapi_connection, connection_record) -> None:
+    """Let SQLite interrupt a running statement once its request's deadline has passed."""
+    dbapi_connection.set_progress_handler(_deadline_expired, SQLITE_PROGRESS_INSTRUCTIONS)
+
 def get_db() -> Generator[Session, None, None]:
     """Dependency for FastAPI to get a database session."""
     if not SessionLocal:
         raise RuntimeError("Database not initialized or enabled.")
+    check_deadline("database")
     db = SessionLocal()
     try:
         yield db
@@ -55,12 +75,26 @@ def get_db_context() -> Generator[Session, None, None]:
     """Context manager for database sessions."""
     if not SessionLocal:
         raise RuntimeError("Database not initialized or enabled.")
+    check_deadline("database")
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+def ping_database() -> Tuple[bool, str]:
+    """Check that the connection pool can reach the database.
+
+    Returns:
+        (ready, detail) for the readiness registry
+    """
+    if not engine:
+        return False, "not initialized"
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    pool = engine.pool
+    return True, pool.status() if hasattr(pool, "status") else "connected"
+
 def create_tables() -> None:
     """Create all tables defined in SQLAlchemy models."""
     if not engine:
@@ -0,0 +1,325 @@
+"""
+Request deadlines for the GenAI Portfolio application.
+Every request gets a deadline, from an X-Request-Timeout header (seconds, which
+can only shorten it) or the default of its route, exposed through a contextvar.
+Upstream work (language models, database statements, job submission) checks the
+deadline before it starts and is bounded by the time left. For routes with
+their own timeout and requests with the header, the handler is also cancelled
+when the client disconnects or the deadline passes; every upstream call that
+was skipped or cut short is counted in ``upstream_work_saved_total``.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exceptions import DeadlineExceededError
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = [
+    "Deadline",
+    "DeadlineMiddleware",
+    "check_deadline",
+    "current_deadline",
+    "deadline_scope",
+    "remaining_time",
+    "run_within_deadline",
+]
+
+
+class Deadline:
+    """Point in time by which the current unit of work must be finished.
+
+    Args:
+        timeout: Seconds from now
+    """
+
+    __slots__ = ("expires_at", "reason")
+
+    def __init__(self, timeout: float) -> None:
+        self.expires_at = time.monotonic() + timeout
+        self.reason: Optional[str] = None  # why the work was abandoned, if it was
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.reason is not None or time.monotonic() >= self.expires_at
+
+    def abandon(self, reason: str) -> None:
+        """Mark the work as abandoned (e.g. "disconnect") so nothing new is started."""
+        self.reason = self.reason or reason
+
+
+# Deadline of the request or UI event being handled
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left for the current work, capped at ``default``.
+
+    Use it as the timeout of blocking client calls that cannot be cancelled.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
+
+
+def _count_saved(work: str, reason: str) -> None:
+    metrics.counter("upstream_work_saved_total", "Upstream calls skipped or cancelled because nobody waits for them",
+                    work=work, reason=reason).inc()
+
+
+def check_deadline(work: str) -> None:
+    """Refuse to start upstream work that can no longer be delivered.
+
+    Args:
+        work: Kind of upstream work, used as a metrics label
+
+    Raises:
+        DeadlineExceededError: The deadline has passed or the client is gone
+    """
+    deadline = current_deadline.get()
+    if deadline is not None and deadline.expired:
+        reason = deadline.reason or "deadline"
+        _count_saved(work, reason)
+        raise DeadlineExceededError(f"Request abandoned before {work} ({reason})")
+
+
+async def run_within_deadline(awaitable: Awaitable[Any], work: str) -> Any:
+    """Await upstream work, bounded by the time left on the current deadline.
+
+    Args:
+        awaitable: The upstream call
+        work: Kind of upstream work, used as a metrics label
+
+    Raises:
+        DeadlineExceededError: The deadline passed before or during the call
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return await awaitable
+    try:
+        check_deadline(work)
+    except DeadlineExceededError:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+
+    try:
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except asyncio.TimeoutError:
+        _count_saved(work, "deadline")
+        raise DeadlineExceededError(f"Deadline exceeded during {work}") from None
+    except asyncio.CancelledError:
+        _count_saved(work, deadline.reason or "cancelled")
+        raise
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[Deadline]:
+    """Run a block outside of an HTTP request (e.g. a UI event) under a deadline.
+
+    A scope nested in another deadline never extends it.
+    """
+    outer = current_deadline.get()
+    if outer is not None:
+        timeout = min(timeout, outer.remaining())
+    deadline = Deadline(timeout)
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each HTTP request a deadline and cancelling abandoned work.
+
+    Requests to a route in ``route_timeouts`` or with the timeout header run
+    their handler in its own task. It is cancelled when the client
+    disconnects, and when the deadline passes before the response has
+    started, in which case a 504 is sent. A response that is already being
+    streamed is allowed to finish. Other requests only get the deadline in
+    the contextvar, so upstream calls check it, without extra tasks.
+
+    Args:
+        app: The ASGI application
+        default_timeout: Deadline of requests without a route default, in seconds
+        route_timeouts: Deadlines by path prefix, matched in order
+        bypass_paths: Path prefixes that get no deadline (static files, probes)
+        header: Request header carrying a shorter timeout in seconds
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_timeout: float = 30.0,
+        route_timeouts: Optional[Dict[str, float]] = None,
+        bypass_paths: Optional[List[str]] = None,
+        header: str = "x-request-timeout",
+    ) -> None:
+        self.app = app
+        self.default_timeout = default_timeout
+        self.route_timeouts = list((route_timeouts or {}).items())
+        self.bypass_paths = tuple(bypass_paths or [])
+        self.header = header.lower().encode("latin-1")
+
+    def _timeout(self, scope: Scope) -> Tuple[float, bool]:
+        """Timeout of the request and whether its handler must be cancelled on expiry."""
+        path = scope["path"]
+        timeout = next((seconds for prefix, seconds in self.route_timeouts if path.startswith(prefix)), None)
+        enforced = timeout is not None
+        if timeout is None:
+            timeout = self.default_timeout
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    timeout = min(timeout, requested)
+                    enforced = True
+                break
+        return timeout, enforced
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.bypass_paths):
+            await self.app(scope, receive, send)
+            return
+
+        timeout, enforced = self._timeout(scope)
+        deadline = Deadline(timeout)
+        token = current_deadline.set(deadline)
+        try:
+            if enforced:
+                await self._run(scope, receive, send, deadline)
+            else:
+                await self._run_inline(scope, receive, send)
+        finally:
+            current_deadline.reset(token)
+
+    async def _run_inline(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the handler in the current task; only upstream calls see the deadline."""
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except DeadlineExceededError:
+            if response_started:
+                raise
+            await self._timeout_response(send)
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, deadline: Deadline) -> None:
+        loop = asyncio.get_running_loop()
+        disconnected = loop.create_future()
+        watcher: Optional[asyncio.Task] = None
+        response_started = response_complete = False
+
+        async def watch_disconnect() -> None:
+            # Only a disconnect can follow the request body
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            # Servers also report a disconnect once the response is complete;
+            # background tasks that run after it must not be cancelled
+            if not disconnected.done() and not response_complete:
+                disconnected.set_result(None)
+
+        def body_complete() -> None:
+            nonlocal watcher
+            watcher = loop.create_task(watch_disconnect())
+
+        headers = dict(scope["headers"])
+        bodiless = b"transfer-encoding" not in headers and headers.get(b"content-length", b"0") == b"0"
+
+        async def receive_wrapper() -> Message:
+            if watcher is not None:
+                # The watcher owns receive() once the body has been read
+                await asyncio.shield(disconnected)
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                body_complete()
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        if bodiless:
+            # The app may never call receive(), so hand it the empty body up front
+            body_complete()
+            first: List[Message] = [{"type": "http.request", "body": b"", "more_body": False}]
+
+            async def bodiless_receive() -> Message:
+                if first:
+                    return first.pop()
+                return await receive_wrapper()
+
+            handler = loop.create_task(self.app(scope, bodiless_receive, send_wrapper))
+        else:
+            handler = loop.create_task(self.app(scope, receive_wrapper, send_wrapper))
+
+        try:
+            done, _ = await asyncio.wait({handler, disconnected}, timeout=deadline.remaining(),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done and response_started:
+                # Streaming already: let the response finish unless the client leaves
+                await asyncio.wait({handler, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+
+            if not handler.done():
+                reason = "disconnect" if disconnected.done() else "deadline"
+                deadline.abandon(reason)
+                handler.cancel()
+                metrics.counter("requests_cancelled_total", "Requests whose handler was cancelled",
+                                reason=reason).inc()
+            try:
+                await handler
+            except asyncio.CancelledError:
+                if not handler.cancelled():
+                    raise
+            except DeadlineExceededError:
+                if response_started:
+                    raise
+                deadline.abandon("deadline")
+
+            if deadline.reason == "deadline" and not response_started:
+                await self._timeout_response(send)
+        except asyncio.CancelledError:
+            handler.cancel()
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+    async def _timeout_response(self, send: Send) -> None:
+        """Send 504 for a request whose deadline passed before it was answered."""
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [[b"content-type", b"application/json"]],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": b'{"detail":"The request could not be completed in time."}',
+        })
@@ -154,4 +154,42 @@ def app_exception_handler(app):
     async def handle_app_exception(request, exc):
         return await app.exception_handler(HTTPException, exc.to_http_exception())(request, exc.to_http_exception())
     
-    # Add more exception handlers as needed
\ No newline at end of file
+    # Add more exception handlers as needed
+class DeadlineExceededError(AppException):
+    """Exception raised when a request's deadline passes or its client goes away."""
+    def __init__(
+        self, 
+        detail: str = "Request deadline exceeded",
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=detail,
+            headers=headers
+        )
+
+class PayloadTooLargeError(AppException):
+    """Exception raised when an uploaded payload exceeds the size limit."""
+    def __init__(
+        self, 
+        detail: str = "Payload too large",
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail,
+            headers=headers
+        )
+
+class UnsupportedMediaTypeError(AppException):
+    """Exception raised when an uploaded file is not of an accepted type."""
+    def __init__(
+        self, 
+        detail: str = "Unsupported media type",
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=detail,
+            headers=headers
+        )
@@ -1,11 +1,18 @@
+import asyncio
+import json
 import os
+import threading
 import time
 import platform
-import psutil
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import anyio
+
+from app.core.lazy_imports import lazy_import
 from app.core.logging import app_logger
 
+psutil = lazy_import("psutil")
+
 class HealthCheck:
     """Health check utility for the application.
     
@@ -65,6 +72,7 @@ class HealthCheck:
                 "timestamp": time.time(),
                 "response_time_ms": response_time_ms,
                 "system": system_health,
+                "readiness": readiness.snapshot(),
             }
             app_logger.info("All health checks completed successfully")
             return result
@@ -93,4 +101,148 @@ def is_healthy(component: str = "all") -> bool:
             return False
     except Exception as e:
         app_logger.error(f"Error checking health for {component}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+class Readiness:
+    """Cached readiness of the components an instance needs to serve traffic.
+
+    Components report transitions through set(); registered checks refresh
+    dynamic components (such as the database) from a background loop. Probes
+    only read the cached state, so they never do I/O.
+    """
+
+    def __init__(self) -> None:
+        self._components: Dict[str, Tuple[bool, str]] = {}
+        self._checks: Dict[str, Callable[[], Tuple[bool, str]]] = {}
+        self._messages: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        # True once startup completed; requests before that are turned away
+        self.serving = False
+
+    def set(self, component: str, ready: bool, detail: str = "") -> None:
+        """Record the state of a component."""
+        with self._lock:
+            previous = self._components.get(component)
+            if previous == (ready, detail):
+                return
+            self._components[component] = (ready, detail)
+            self._messages = None
+        if previous is None or previous[0] != ready:
+            log = app_logger.info if ready else app_logger.warning
+            log(f"Readiness: {component} is {'ready' if ready else 'not ready'}{f' ({detail})' if detail else ''}")
+
+    def register_check(self, component: str, check: Callable[[], Tuple[bool, str]]) -> None:
+        """Refresh a component periodically with check(), which returns (ready, detail)."""
+        self._checks[component] = check
+        self.set(component, False, "not checked yet")
+
+    def mark_started(self) -> None:
+        """Startup completed: caches are warm and traffic may be accepted."""
+        self.serving = True
+        self.set("lifecycle", True, "serving")
+
+    def mark_stopping(self) -> None:
+        """Shutdown started: report not ready so the platform drains the instance."""
+        self.set("lifecycle", False, "shutting down")
+
+    @property
+    def ready(self) -> bool:
+        return self.serving and all(ready for ready, _ in self._components.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Readiness of every component."""
+        with self._lock:
+            components = dict(self._components)
+        return {
+            "status": "ready" if self.ready else "not ready",
+            "components": {name: {"ready": ready, "detail": detail} for name, (ready, detail) in components.items()},
+        }
+
+    def response_messages(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """ASGI messages answering a readiness probe, rebuilt only when the state changes."""
+        messages = self._messages
+        if messages is None:
+            body = json.dumps(self.snapshot()).encode()
+            messages = (
+                {
+                    "type": "http.response.start",
+                    "status": 200 if self.ready else 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"cache-control", b"no-store"),
+                    ],
+                },
+                {"type": "http.response.body", "body": body},
+            )
+            self._messages = messages
+        return messages
+
+    async def refresh(self) -> None:
+        """Run every registered check once, off the event loop."""
+        for component, check in list(self._checks.items()):
+            try:
+                ready, detail = await anyio.to_thread.run_sync(check)
+            except Exception as e:
+                ready, detail = False, str(e)
+            self.set(component, ready, detail)
+
+    async def run_checks(self, interval: float) -> None:
+        """Refresh the registered checks every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh()
+
+
+readiness = Readiness()
+
+# Constant probe responses, sent without allocating per request
+_LIVE_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [(b"content-type", b"text/plain"), (b"content-length", b"2"), (b"cache-control", b"no-store")],
+}
+_LIVE_BODY = {"type": "http.response.body", "body": b"ok"}
+_WARMING_START = {
+    "type": "http.response.start",
+    "status": 503,
+    "headers": [(b"content-type", b"text/plain"), (b"content-length", b"8"), (b"retry-after", b"1")],
+}
+_WARMING_BODY = {"type": "http.response.body", "body": b"starting"}
+
+
+class HealthProbeMiddleware:
+    """Answers liveness and readiness probes before any other middleware runs.
+
+    Liveness is a constant response; readiness is served from the cached
+    readiness state. Other HTTP requests get 503 + Retry-After until startup
+    has completed.
+
+    Args:
+        app: The ASGI application
+        live_path: Path of the liveness probe
+        ready_path: Path of the readiness probe
+    """
+
+    def __init__(self, app, live_path: str = "/livez", ready_path: str = "/readyz") -> None:
+        self.app = app
+        self.live_path = live_path
+        self.ready_path = ready_path
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path == self.live_path:
+                await send(_LIVE_START)
+                await send(_LIVE_BODY)
+                return
+            if path == self.ready_path:
+                start, body = readiness.response_messages()
+                await send(start)
+                await send(body)
+                return
+            if not readiness.serving:
+                await send(_WARMING_START)
+                await send(_WARMING_BODY)
+                return
+        await self.app(scope, receive, send)
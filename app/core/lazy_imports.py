@@ -0,0 +1,90 @@
+"""
+Deferred imports for heavy optional modules.
+``lazy_import("psutil")`` returns a placeholder module that is truthy when the
+module is installed and only imports it on first attribute access, so optional
+dependencies stay off the cold-start path until a request actually needs them.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+import types
+from typing import Any, Dict, List
+
+# Define what this module exports
+__all__ = ["LazyModule", "lazy_import", "loaded_lazy_modules"]
+
+_lock = threading.RLock()
+_load_times: Dict[str, float] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first use.
+
+    ``bool(module)`` reports whether the module is installed without importing
+    it, which keeps the ``if psutil:`` style checks of optional dependencies.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_available"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    _load_times[self.__name__] = (time.perf_counter() - started) * 1000
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def available(self) -> bool:
+        """Whether the module can be imported (checked without importing it)."""
+        available = self.__dict__["_lazy_available"]
+        if available is None:
+            if self.__dict__["_lazy_module"] is not None:
+                available = True
+            else:
+                try:
+                    available = importlib.util.find_spec(self.__name__) is not None
+                except (ImportError, ValueError):
+                    available = False
+            self.__dict__["_lazy_available"] = available
+        return available
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __bool__(self) -> bool:
+        return self.available
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a placeholder for a module that is imported on first attribute access.
+
+    Args:
+        name: Absolute module name (e.g. "psutil" or "sqlalchemy.orm")
+
+    Returns:
+        The lazy module placeholder
+    """
+    return LazyModule(name)
+
+
+def loaded_lazy_modules() -> Dict[str, float]:
+    """Return the lazily imported modules and their import time in milliseconds."""
+    with _lock:
+        return dict(_load_times)
@@ -12,7 +12,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 # Define what this module exports
-__all__ = ["app_logger", "get_logger", "log_structured", "setup_logging"]
+__all__ = ["app_logger", "get_logger", "log_structured", "set_log_level", "setup_logging"]
 
 # Configure basic logging format
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -81,6 +81,26 @@ def setup_logging(
     
     app_logger.info(f"Logging initialized with level: {log_level}")
 
+def set_log_level(log_level: str) -> None:
+    """Change the level of the application logger at runtime.
+
+    Module loggers from get_logger() copied the previous level, so those still
+    on it follow; loggers created with an explicit level keep theirs.
+
+    Args:
+        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    """
+    level = getattr(logging, log_level.upper(), None)
+    if not isinstance(level, int):
+        app_logger.warning(f"Invalid log level '{log_level}', keeping {logging.getLevelName(app_logger.level)}")
+        return
+    previous = app_logger.level
+    app_logger.setLevel(level)
+    for name, logger in list(logging.Logger.manager.loggerDict.items()):
+        if name.startswith("portfolio.") and isinstance(logger, logging.Logger) and logger.level == previous:
+            logger.setLevel(level)
+    app_logger.info(f"Log level changed to {log_level.upper()}")
+
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """Create a logger for a specific module.
     
@@ -157,11 +177,12 @@ def log_structured(
 def _initialize_default_logging():
     """Initialize logging with default settings."""
     try:
-        from app.core.config import settings
+        from app.core.config import on_settings_change, settings
         setup_logging(
             log_level=settings.LOG_LEVEL,
             log_file=settings.LOG_FILE
         )
+        on_settings_change(["LOG_LEVEL"], lambda changes: set_log_level(changes["LOG_LEVEL"]))
     except ImportError:
         # Fallback if settings are not available
         setup_logging(
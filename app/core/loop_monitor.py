@@ -0,0 +1,161 @@
+"""
+Event loop lag monitor for the GenAI Portfolio application.
+A task on the event loop wakes every ``LOOP_MONITOR_INTERVAL_MS`` and records
+how late it woke (the loop lag) in the ``event_loop_lag_ms`` histogram. A
+watchdog thread checks that heartbeat; when the loop has not come round for
+``LOOP_STALL_THRESHOLD_MS`` it samples the loop thread's current stack, which
+shows the callback that is blocking every connected client, and logs it. The
+stall is counted in ``event_loop_stalls_total`` by blocking function and kept
+for /api/v1/admin/loop with its final duration.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import on_settings_change, settings
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = ["LoopMonitor", "loop_monitor"]
+
+# Frames kept from a sampled stack, innermost last
+MAX_STACK_FRAMES = 30
+
+# Stall reports kept for diagnostics
+MAX_STALLS = 20
+
+
+def _describe_frame(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class LoopMonitor:
+    """Measures event loop lag and captures the stack of stalled callbacks.
+
+    Args:
+        interval: Seconds between heartbeats of the loop task
+        stall_threshold: Seconds without a heartbeat (beyond the interval) that count as a stall
+    """
+
+    def __init__(self, interval: float = 0.1, stall_threshold: float = 0.25) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=MAX_STALLS)
+        self._heartbeat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stall: Optional[Dict[str, Any]] = None  # reported by the watchdog, not yet over
+        self._reported_heartbeat = 0.0
+        self._lag = metrics.histogram("event_loop_lag_ms", "How late the event loop ran a timer")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the heartbeat task on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        app_logger.info(f"Event loop monitor started (stall threshold {self.stall_threshold * 1000:.0f} ms)")
+
+    def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self._lag.observe(lag * 1000)
+            if self._stall is not None:
+                self._end_stall(lag)
+
+    def _end_stall(self, lag: float) -> None:
+        with self._lock:
+            stall, self._stall = self._stall, None
+        if stall is None:
+            return
+        stall["duration_ms"] = round(lag * 1000, 1)
+        app_logger.warning(f"Event loop was blocked for {stall['duration_ms']:.0f} ms by {stall['function']} "
+                           f"({stall['location']})")
+
+    def _watch(self) -> None:
+        """Watchdog thread: sample the loop thread's stack when the heartbeat is overdue."""
+        while not self._stopping.wait(min(self.interval, self.stall_threshold / 2)):
+            heartbeat = self._heartbeat
+            overdue = time.monotonic() - heartbeat - self.interval
+            if overdue > self.stall_threshold and heartbeat != self._reported_heartbeat:
+                self._reported_heartbeat = heartbeat
+                self._capture(overdue)
+
+    def _capture(self, overdue: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame, limit=MAX_STACK_FRAMES)
+        innermost = stack[-1]
+        stall = {
+            "detected_at": time.time(),
+            "function": _describe_frame(frame),
+            "location": f"{innermost.filename}:{innermost.lineno}",
+            "stack": [line.rstrip("\n") for line in traceback.format_list(stack)],
+            "duration_ms": None,  # set once the loop runs again
+        }
+        del frame
+        with self._lock:
+            self._stall = stall
+        self.stalls.append(stall)
+        metrics.counter("event_loop_stalls_total", "Event loop stalls by the function running when detected",
+                        function=stall["function"]).inc()
+        app_logger.warning(
+            f"Event loop blocked for over {overdue * 1000:.0f} ms in {stall['function']} ({stall['location']}):\n"
+            + "".join(traceback.format_list(stack)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag percentiles and the most recent stalls, newest first."""
+        stalls: List[Dict[str, Any]] = list(self.stalls)
+        stalls.reverse()
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "lag_ms": self._lag.snapshot(),
+            "stalls": stalls,
+        }
+
+
+# Create global loop monitor
+loop_monitor = LoopMonitor(
+    interval=(settings.LOOP_MONITOR_INTERVAL_MS or 100) / 1000,
+    stall_threshold=(settings.LOOP_STALL_THRESHOLD_MS or 250) / 1000,
+)
+
+
+def _apply_loop_settings(changes: Dict[str, Any]) -> None:
+    # Both are read by the heartbeat task and the watchdog on every pass
+    loop_monitor.interval = (settings.LOOP_MONITOR_INTERVAL_MS or 100) / 1000
+    loop_monitor.stall_threshold = (settings.LOOP_STALL_THRESHOLD_MS or 250) / 1000
+
+
+on_settings_change(["LOOP_MONITOR_INTERVAL_MS", "LOOP_STALL_THRESHOLD_MS"], _apply_loop_settings)
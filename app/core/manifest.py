@@ -0,0 +1,136 @@
+"""
+Discovery manifest for the GenAI Portfolio application.
+Records which module attributes of a package are API routers (or subclasses
+of a base class), so ``setup_routers`` and ``get_subclasses`` import exactly
+those modules and read the listed attributes instead of importing every module
+of the package and reflecting over ``dir()``. Each entry is keyed by a
+fingerprint of the package's source files (names, sizes and mtimes), so
+editing a module rescans its package on the next boot.
+
+The manifest is written on first boot, or at image build time with:
+    python -m app.core.manifest
+It is a build output kept next to the code (app/_generated), not in ./data,
+which holds runtime state and may be a volume mounted over the image's copy.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core import settings
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = ["DiscoveryManifest", "discovery_manifest", "package_fingerprint"]
+
+# Bumped when the entry format changes, which discards older manifests
+MANIFEST_VERSION = 1
+
+# (module name, attribute name)
+Attribute = Tuple[str, str]
+
+
+def package_fingerprint(package: str) -> str:
+    """Hash the names, sizes and mtimes of a package's source files without importing it.
+
+    Args:
+        package: Dotted package name (e.g. "app.api")
+    """
+    spec = importlib.util.find_spec(package)
+    digest = hashlib.sha256(package.encode())
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        for entry in sorted(os.scandir(location), key=lambda entry: entry.name):
+            if entry.name.endswith(".py"):
+                stat = entry.stat()
+                digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+class DiscoveryManifest:
+    """JSON file of discovered module attributes per package and kind.
+
+    Args:
+        path: Manifest file, or None to scan on every boot
+    """
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self._entries: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    if data.get("version") == MANIFEST_VERSION:
+                        self._entries = data.get("entries", {})
+                except (OSError, ValueError) as e:
+                    app_logger.warning(f"Ignoring unreadable discovery manifest {self.path}: {e}")
+        return self._entries
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps({"version": MANIFEST_VERSION, "entries": self._entries}, indent=2),
+                                 encoding="utf-8")
+            os.replace(temporary, self.path)
+        except OSError as e:
+            # A read-only deployment still boots, it just scans every time
+            app_logger.warning(f"Could not write the discovery manifest {self.path}: {e}")
+
+    def discover(self, key: str, package: str, scan: Callable[[], List[Attribute]]) -> List[Attribute]:
+        """Return the attributes recorded for ``key``, scanning the package when they are stale.
+
+        Args:
+            key: Entry name, e.g. "routers:app.api"
+            package: Package whose source files key the entry
+            scan: Finds the attributes by importing and reflecting over the package
+
+        Returns:
+            (module name, attribute name) pairs to load
+        """
+        fingerprint = package_fingerprint(package)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and entry.get("fingerprint") == fingerprint:
+                metrics.counter("discovery_manifest_total", "Module discovery lookups", outcome="hit").inc()
+                return [tuple(attribute) for attribute in entry["attributes"]]
+
+            metrics.counter("discovery_manifest_total", "Module discovery lookups", outcome="scan").inc()
+            attributes = scan()
+            self._entries[key] = {"fingerprint": fingerprint, "attributes": [list(a) for a in attributes]}
+            self._save()
+            app_logger.info(f"Discovered {len(attributes)} attributes for {key}")
+            return attributes
+
+
+# Create global discovery manifest
+discovery_manifest = DiscoveryManifest(
+    Path(settings.DISCOVERY_MANIFEST_FILE) if settings.DISCOVERY_MANIFEST_FILE else None
+)
+
+
+def main() -> bool:
+    """Write the discovery manifest for the application's packages."""
+    # utils records into app.core.manifest's global manifest, not this __main__ module's
+    from app.core.utils import discover_routers
+
+    for module_name, attr_name in discover_routers():
+        print(f"✓ router {module_name}.{attr_name}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,194 @@
+"""
+In-process metrics registry for the GenAI Portfolio application.
+Provides counters, gauges and histograms that subsystems can update cheaply
+and that the diagnostics API exposes as a JSON snapshot.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Define what this module exports
+__all__ = ["Counter", "Gauge", "Histogram", "MetricsRegistry", "metrics"]
+
+# Default histogram buckets (in milliseconds) suitable for request and loop latency
+DEFAULT_BUCKETS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Build a hashable, order-independent key from a label dictionary."""
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonically increasing counter."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by the given amount."""
+        self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to the given value."""
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge by the given amount."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge by the given amount."""
+        self.value -= amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class Histogram:
+    """Fixed-bucket histogram with approximate percentiles."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: List[float] = sorted(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket containing the q-th percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Bucket upper bound (or the observed maximum for the overflow bucket)
+        """
+        if not self.count:
+            return 0.0
+        target = self.count * q / 100.0
+        running = 0
+        for index, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Registry of named metrics, optionally split by labels.
+
+    Metric objects are created on first use and cached, so hot paths can keep
+    a reference to the returned object and update it without any lookups.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[LabelKey, Any]] = {}
+        self._kinds: Dict[str, str] = {}
+        self._help: Dict[str, str] = {}
+
+    def _get(self, kind: str, name: str, description: str, labels: Dict[str, Any], factory) -> Any:
+        key = _label_key(labels)
+        family = self._metrics.get(name)
+        if family is not None and key in family:
+            return family[key]
+        with self._lock:
+            registered_kind = self._kinds.setdefault(name, kind)
+            if registered_kind != kind:
+                raise ValueError(f"Metric '{name}' is already registered as a {registered_kind}")
+            if description:
+                self._help.setdefault(name, description)
+            family = self._metrics.setdefault(name, {})
+            if key not in family:
+                family[key] = factory()
+            return family[key]
+
+    def counter(self, name: str, description: str = "", **labels: Any) -> Counter:
+        """Get or create a counter."""
+        return self._get("counter", name, description, labels, Counter)
+
+    def gauge(self, name: str, description: str = "", **labels: Any) -> Gauge:
+        """Get or create a gauge."""
+        return self._get("gauge", name, description, labels, Gauge)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+        **labels: Any,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get("histogram", name, description, labels,
+                         lambda: Histogram(buckets or DEFAULT_BUCKETS))
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Any]:
+        """Return a JSON-serializable view of all metrics.
+
+        Args:
+            prefix: Only include metrics whose name starts with this prefix
+
+        Returns:
+            Dictionary keyed by metric name
+        """
+        result: Dict[str, Any] = {}
+        with self._lock:
+            families = [(name, dict(family)) for name, family in self._metrics.items() if name.startswith(prefix)]
+        for name, family in sorted(families):
+            result[name] = {
+                "type": self._kinds[name],
+                "help": self._help.get(name, ""),
+                "values": [
+                    {"labels": dict(key), "value": metric.snapshot()}
+                    for key, metric in family.items()
+                ],
+            }
+        return result
+
+    def reset(self) -> None:
+        """Remove all registered metrics."""
+        with self._lock:
+            self._metrics.clear()
+            self._kinds.clear()
+            self._help.clear()
+
+
+# Create global metrics registry
+metrics = MetricsRegistry()
@@ -1,13 +1,20 @@
+import asyncio
+import math
 import time
-from typing import Dict, List, Optional, Set
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.core.config import settings
+from app.core.compression import CompressedResponseCache, CompressionMiddleware, available_encodings
+from app.core.config import on_settings_change, settings
+from app.core.deadlines import DeadlineMiddleware
+from app.core.health import HealthProbeMiddleware
 from app.core.logging import app_logger
+from app.core.metrics import metrics
+from app.core.timing import TimingMiddleware, current_timer
 
 def setup_middleware(app: FastAPI) -> None:
     """Set up global middleware for the FastAPI application."""
@@ -25,9 +32,15 @@ def setup_middleware(app: FastAPI) -> None:
     else:
         app_logger.warning("CORS_ORIGINS not set. CORS middleware is disabled.")
 
-    # GZip Middleware
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
-    app_logger.info("GZip middleware enabled.")
+    # Compression Middleware (zstd/brotli/gzip with a compressed-response cache)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        cache_max_bytes=settings.COMPRESSION_CACHE_MAX_MB * 1024 * 1024,
+        cacheable_paths=[f"{settings.API_PREFIX}/projects", f"{settings.API_PREFIX}/skills"],
+        snapshot_name="compression",
+    )
+    app_logger.info(f"Compression middleware enabled: {', '.join(available_encodings())}.")
 
     # Session Middleware (only if authentication is enabled and secret key is provided)
     if settings.ENABLE_AUTH and settings.SECRET_KEY:
@@ -38,18 +51,103 @@ def setup_middleware(app: FastAPI) -> None:
     else:
         app_logger.info("Session middleware disabled as authentication is not enabled.")
 
-    # Request Timing Middleware
-    @app.middleware("http")
-    async def add_process_time_header(request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        app_logger.debug(f"Request processed in {process_time:.4f} seconds.",
-                         extra={"path": request.url.path, "method": request.method, "process_time": process_time})
-        return response
+    # Static files, NiceGUI assets and the websocket (with its long-polling fallback), and health probes
+    # are never limited
+    unlimited_paths = ["/static", "/_nicegui", "/livez", "/readyz", "/health", f"{settings.API_PREFIX}/health",
+                       "/favicon.ico"]
+
+    # Admission Control (sheds load per route class before any other work is done)
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            route_classes=_route_classes_from_settings(),
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+            # Admin requests are authenticated and run long on purpose (profiles), which must
+            # not be read as congestion of the API class
+            bypass_paths=unlimited_paths + [f"{settings.API_PREFIX}/admin"],
+        )
+        app_logger.info(f"Admission control enabled (queue timeout {settings.ADMISSION_QUEUE_TIMEOUT_MS} ms).")
+
+    # Request Deadlines (cover the admission queue; disconnects cancel the handler)
+    app.add_middleware(
+        DeadlineMiddleware,
+        default_timeout=settings.REQUEST_TIMEOUT,
+        route_timeouts=_route_timeouts_from_settings(),
+        bypass_paths=unlimited_paths,
+    )
+    app_logger.info(f"Request deadlines enabled ({settings.REQUEST_TIMEOUT}s by default).")
+
+    # Request Timing Middleware (covers all other middleware)
+    app.add_middleware(TimingMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
     app_logger.info("Request timing middleware enabled.")
 
+    # Health Probes (outermost: /livez and /readyz skip all other middleware)
+    app.add_middleware(HealthProbeMiddleware)
+    app_logger.info("Health probes enabled at /livez and /readyz.")
+
+    # Reloaded settings are written to the built middleware, never read per request
+    on_settings_change(["COMPRESSION_CACHE_MAX_MB"], lambda changes: _apply_compression_settings(app))
+    on_settings_change(["ADMISSION_QUEUE_TIMEOUT_MS", "ADMISSION_MAX_CONCURRENCY",
+                        "ADMISSION_EXPENSIVE_MAX_CONCURRENCY", "UPLOAD_MAX_CONCURRENCY"],
+                       lambda changes: _apply_admission_settings(app))
+    on_settings_change(["REQUEST_TIMEOUT", "AI_REQUEST_TIMEOUT", "UPLOAD_TIMEOUT"],
+                       lambda changes: _apply_deadline_settings(app))
+
+def _route_classes_from_settings() -> List["RouteClass"]:
+    return default_route_classes(
+        settings.API_PREFIX,
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        expensive_max_concurrency=settings.ADMISSION_EXPENSIVE_MAX_CONCURRENCY,
+        upload_concurrency=settings.UPLOAD_MAX_CONCURRENCY,
+    )
+
+def _route_timeouts_from_settings() -> Dict[str, float]:
+    return {
+        f"{settings.API_PREFIX}/ai/": settings.AI_REQUEST_TIMEOUT,
+        f"{settings.API_PREFIX}/contact": settings.AI_REQUEST_TIMEOUT,
+        f"{settings.API_PREFIX}/uploads": settings.UPLOAD_TIMEOUT,
+    }
+
+def _middleware_instances(app: FastAPI, middleware_class: type) -> List[Any]:
+    """Instances of a middleware class in the application's built middleware stack.
+
+    Empty until the stack is built (at warm-up or on the first request); the
+    stack is built from the current settings then.
+    """
+    instances = []
+    node = app.middleware_stack
+    while node is not None:
+        if isinstance(node, middleware_class):
+            instances.append(node)
+        node = getattr(node, "app", None)
+    return instances
+
+def _apply_compression_settings(app: FastAPI) -> None:
+    max_bytes = settings.COMPRESSION_CACHE_MAX_MB * 1024 * 1024
+    for middleware in _middleware_instances(app, CompressionMiddleware):
+        if not max_bytes:
+            middleware.cache = None
+        elif middleware.cache is None:
+            middleware.cache = CompressedResponseCache(max_bytes)
+        else:
+            middleware.cache.resize(max_bytes)
+
+def _apply_admission_settings(app: FastAPI) -> None:
+    bounds = {route_class.name: route_class.limit for route_class in _route_classes_from_settings()}
+    for middleware in _middleware_instances(app, AdmissionControlMiddleware):
+        middleware.queue_timeout = settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+        for route_class in middleware.route_classes:
+            limit = bounds.get(route_class.name)
+            if limit is not None:
+                route_class.limit.resize(limit.min_limit, limit.max_limit)
+                # A raised limit admits queued requests right away
+                route_class._wake()
+
+def _apply_deadline_settings(app: FastAPI) -> None:
+    for middleware in _middleware_instances(app, DeadlineMiddleware):
+        middleware.default_timeout = settings.REQUEST_TIMEOUT
+        middleware.route_timeouts = list(_route_timeouts_from_settings().items())
+
 # Custom middleware classes
 
 class RateLimitMiddleware:
@@ -124,20 +222,293 @@ class RateLimitMiddleware:
             "body": b'{"detail":"Rate limit exceeded. Please try again later."}',
         })
 
+class AdaptiveLimit:
+    """Concurrency limit of one route class, adapted with AIMD.
+
+    Every completed request is a sample. While latency stays under the target
+    and the limit is actually being used, the limit grows by one per limit's
+    worth of requests (additive increase). A request slower than the target, or
+    one that timed out in the queue, cuts it by ``backoff`` (multiplicative
+    decrease), so the limit settles just below the point where queuing starts.
+    The limit is cut at most once per latency window (the average handler
+    latency): the requests that were already in flight when it was cut report
+    the same congestion and must not cut it again.
+
+    Args:
+        initial: Starting limit
+        min_limit: Lowest limit, so the class is never starved
+        max_limit: Highest limit
+        latency_target: Seconds a request of this class should take at most
+        backoff: Factor applied to the limit on a slow or dropped request
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff: float = 0.9,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency = latency_target / 2  # EWMA of handler latency, seeds the wait estimate
+        self._hold_until = 0.0  # monotonic time before which the limit is not cut again
+
+    def on_sample(self, latency: float, inflight: int) -> None:
+        """Adapt the limit to the latency of a completed request."""
+        self.latency += 0.2 * (latency - self.latency)
+        if latency > self.latency_target:
+            self.on_drop()
+        elif inflight * 2 >= self.limit:
+            # Only grow while the limit is what holds requests back
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_drop(self) -> None:
+        """Back off after a request timed out waiting or exceeded the target."""
+        now = time.monotonic()
+        if now < self._hold_until:
+            return
+        self._hold_until = now + self.latency
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def resize(self, min_limit: int, max_limit: int) -> None:
+        """Change the bounds, keeping the adapted limit within them."""
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(self.limit, self.min_limit), self.max_limit))
+
+    @property
+    def slots(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+
+class RouteClass:
+    """A group of routes sharing one adaptive concurrency limit.
+
+    Args:
+        name: Label used in metrics
+        prefixes: Path prefixes of the class, matched in order of definition
+        limit: The class's adaptive limit
+        methods: Only requests with these methods belong to the class (all if empty)
+    """
+
+    def __init__(self, name: str, prefixes: Iterable[str], limit: AdaptiveLimit, methods: Iterable[str] = ()):
+        self.name = name
+        self.prefixes = tuple(prefixes)
+        self.methods = frozenset(methods)
+        self.limit = limit
+        self.inflight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.prefixes) and (not self.methods or method in self.methods)
+
+    def expected_wait(self, position: int) -> float:
+        """Estimated seconds until the request at the given queue position is admitted."""
+        return (position + 1) * self.limit.latency / self.limit.slots
+
+    def _wake(self) -> None:
+        """Hand free slots to the oldest waiters."""
+        while self.waiters and self.inflight < self.limit.slots:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    async def acquire(self, timeout: float) -> Tuple[bool, str]:
+        """Wait for a slot for at most ``timeout`` seconds.
+
+        Returns:
+            Whether the request was admitted, and why not otherwise
+        """
+        if self.inflight < self.limit.slots and not self.waiters:
+            self.inflight += 1
+            return True, ""
+        # Reject right away when the queue ahead would not drain in time
+        if self.expected_wait(len(self.waiters)) > timeout:
+            return False, "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away; hand back a slot granted in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self.inflight -= 1
+                self._wake()
+            waiter.cancel()
+            raise
+        finally:
+            try:
+                self.waiters.remove(waiter)
+            except ValueError:
+                pass
+
+        # A slot may have been granted in the same loop iteration the timeout fired
+        if waiter.done() and not waiter.cancelled():
+            return True, ""
+        waiter.cancel()
+        self.limit.on_drop()
+        return False, "queue_timeout"
+
+    def release(self, latency: float) -> None:
+        """Free the slot of a completed request and feed its latency to the limit."""
+        self.limit.on_sample(latency, self.inflight)
+        self.inflight -= 1
+        self._wake()
+
+
+def default_route_classes(
+    api_prefix: str,
+    max_concurrency: int = 64,
+    expensive_max_concurrency: int = 8,
+    upload_concurrency: int = 8,
+) -> List[RouteClass]:
+    """Route classes of the portfolio: uploads, AI demos and contact, the other API routes, and pages.
+
+    Args:
+        api_prefix: Prefix of the API router
+        max_concurrency: Highest limit of the API and page classes
+        expensive_max_concurrency: Highest limit of the expensive class
+        upload_concurrency: Fixed limit of concurrent uploads
+    """
+    return [
+        # Upload latency follows the client's bandwidth, so this limit does not adapt
+        RouteClass("uploads", [f"{api_prefix}/uploads"],
+                   AdaptiveLimit(initial=upload_concurrency, min_limit=upload_concurrency,
+                                 max_limit=upload_concurrency, latency_target=float("inf")),
+                   methods=["POST"]),
+        # The demos call out to language models and the contact form sends mail
+        RouteClass("expensive", [f"{api_prefix}/ai/", f"{api_prefix}/contact"],
+                   AdaptiveLimit(initial=expensive_max_concurrency // 2 or 1, min_limit=1,
+                                 max_limit=expensive_max_concurrency, latency_target=5.0),
+                   methods=["POST"]),
+        RouteClass("api", [api_prefix],
+                   AdaptiveLimit(initial=max_concurrency // 2 or 1, min_limit=2,
+                                 max_limit=max_concurrency, latency_target=0.25)),
+        RouteClass("pages", ["/"],
+                   AdaptiveLimit(initial=max_concurrency // 2 or 1, min_limit=2,
+                                 max_limit=max_concurrency, latency_target=1.0)),
+    ]
+
+
+class AdmissionControlMiddleware:
+    """Admission control with per-route-class adaptive concurrency limits.
+
+    Each HTTP request is assigned to the first matching route class. If the
+    class has a free slot the request proceeds; otherwise it queues for at most
+    ``queue_timeout`` seconds and is rejected with 503 and Retry-After when it
+    would wait longer, so cheap requests are not stuck behind expensive ones
+    during a spike. Requests under ``bypass_paths`` (static files, health
+    probes) and websockets are never limited.
+
+    Args:
+        app: The ASGI application
+        route_classes: Route classes in order of precedence
+        queue_timeout: Longest a request may wait for a slot, in seconds
+        bypass_paths: Path prefixes that are never limited
+    """
+
+    def __init__(
+        self,
+        app,
+        route_classes: List[RouteClass],
+        queue_timeout: float = 0.5,
+        bypass_paths: List[str] = None,
+    ):
+        self.app = app
+        self.route_classes = route_classes
+        self.queue_timeout = queue_timeout
+        self.bypass_paths = tuple(bypass_paths or [])
+
+    def _classify(self, scope) -> Optional[RouteClass]:
+        path = scope["path"]
+        if path.startswith(self.bypass_paths):
+            return None
+        for route_class in self.route_classes:
+            if route_class.matches(scope["method"], path):
+                return route_class
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        route_class = self._classify(scope)
+        if route_class is None:
+            return await self.app(scope, receive, send)
+
+        queued = time.perf_counter()
+        admitted, reason = await route_class.acquire(self.queue_timeout)
+        if not admitted:
+            metrics.counter("admission_rejected_total", "Requests shed by admission control",
+                            route_class=route_class.name, reason=reason).inc()
+            return await self._overloaded_response(route_class, send)
+
+        started = time.perf_counter()
+        timer = current_timer.get()
+        if timer is not None:
+            timer.mark("queue")
+        metrics.histogram("admission_queue_ms", "Time spent waiting for admission",
+                          route_class=route_class.name).observe((started - queued) * 1000)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release(time.perf_counter() - started)
+            metrics.gauge("admission_limit", "Adaptive concurrency limit",
+                          route_class=route_class.name).set(route_class.limit.limit)
+
+    async def _overloaded_response(self, route_class: RouteClass, send):
+        """Send 503 with a Retry-After estimated from the queue ahead."""
+        retry_after = max(1, math.ceil(route_class.expected_wait(len(route_class.waiters))))
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                [b"content-type", b"application/json"],
+                [b"retry-after", str(retry_after).encode()],
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": b'{"detail":"Server is busy. Please try again later."}',
+        })
+
 # Helper function to add rate limiting
-def add_rate_limiting(app: FastAPI, limit: int = 100, window: int = 60, exempt_paths: List[str] = None) -> None:
+def add_rate_limiting(
+    app: FastAPI,
+    limit: Optional[int] = None,
+    window: Optional[int] = None,
+    exempt_paths: List[str] = None,
+) -> None:
     """Add rate limiting middleware to the application.
     
     Args:
         app: The FastAPI application
-        limit: Maximum number of requests per window
-        window: Time window in seconds
+        limit: Maximum number of requests per window, RATE_LIMIT_REQUESTS (reloadable) if omitted
+        window: Time window in seconds, RATE_LIMIT_WINDOW (reloadable) if omitted
         exempt_paths: List of path prefixes to exempt from rate limiting
     """
+    if limit is None and window is None:
+        on_settings_change(["RATE_LIMIT_REQUESTS", "RATE_LIMIT_WINDOW"],
+                           lambda changes: _apply_rate_limit_settings(app))
+    limit = settings.RATE_LIMIT_REQUESTS if limit is None else limit
+    window = settings.RATE_LIMIT_WINDOW if window is None else window
     app.add_middleware(
         RateLimitMiddleware,
         limit=limit,
         window=window,
         exempt_paths=exempt_paths or ["/static", "/docs", "/redoc", "/openapi.json"],
     )
-    app_logger.info(f"Rate limiting configured: {limit} requests per {window} seconds")
\ No newline at end of file
+    app_logger.info(f"Rate limiting configured: {limit} requests per {window} seconds")
+
+def _apply_rate_limit_settings(app: FastAPI) -> None:
+    for middleware in _middleware_instances(app, RateLimitMiddleware):
+        middleware.limit = settings.RATE_LIMIT_REQUESTS
+        middleware.window = settings.RATE_LIMIT_WINDOW
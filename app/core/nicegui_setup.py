@@ -3,14 +3,23 @@ from fastapi import FastAPI
 
 from app.core.config import settings
 from app.core.logging import app_logger
+from app.core.warmup import register_warmer
 
-def setup_nicegui(fastapi_app: FastAPI, ui_instance=None, settings_instance=None):
+
+def _warm_templates():
+    """Compile the NiceGUI page template ahead of the first page request."""
+    from nicegui.client import templates
+    templates.get_template("index.html")
+
+
+def setup_nicegui(fastapi_app: FastAPI, ui_instance=None, settings_instance=None, **run_options):
     """Sets up NiceGUI integration with FastAPI.
     
     Args:
         fastapi_app: The FastAPI application instance
         ui_instance: Optional NiceGUI UI instance (if not provided, uses imported ui)
         settings_instance: Optional settings instance (if not provided, uses imported settings)
+        **run_options: Further options for ui.run_with (e.g. title, favicon, dark)
     """
     try:
         app_logger.info("Setting up NiceGUI integration...")
@@ -25,8 +34,11 @@ def setup_nicegui(fastapi_app: FastAPI, ui_instance=None, settings_instance=None
         # Mount NiceGUI to FastAPI
         ui_obj.run_with(fastapi_app, 
                     mount_path=mount_path, 
-                    storage_secret=config.SECRET_KEY)
+                    storage_secret=config.SECRET_KEY,
+                    **run_options)
         
+        register_warmer("templates", _warm_templates)
+
         app_logger.info(f"NiceGUI mounted at {mount_path}")
         app_logger.info("NiceGUI setup complete.")
         
@@ -0,0 +1,296 @@
+"""
+On-demand production profiling for the GenAI Portfolio application.
+Nothing here runs until an admin endpoint asks for it:
+
+- ``SamplingProfiler`` samples the stacks of all threads from a background
+  thread (``sys._current_frames``) for a few seconds and returns a speedscope
+  profile or collapsed stacks for flame graphs. The profiled code is not
+  instrumented, so the overhead is one stack walk per thread per interval.
+- ``AllocationTracker`` starts tracemalloc, keeps a few snapshots and diffs
+  them by allocation site. Tracing costs memory and CPU while it is on, so it
+  is started and stopped explicitly.
+- ``dump_tasks`` lists the asyncio tasks and thread stacks of the process.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = ["AllocationTracker", "SamplingProfiler", "allocation_tracker", "dump_tasks", "sampling_profiler"]
+
+# Longest profile, so a forgotten request cannot keep the sampler running
+MAX_PROFILE_SECONDS = 20
+
+# Snapshots kept by the allocation tracker; each holds every traced block
+MAX_SNAPSHOTS = 4
+
+# (name, file, first line) of a function
+FrameKey = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling every thread's stack from a background thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, interval: float, stop: threading.Event, main_only: bool,
+                stacks: Dict[str, List[Tuple[FrameKey, ...]]]) -> None:
+        sampler = threading.get_ident()
+        main = threading.main_thread().ident
+        frame_keys: Dict[Any, FrameKey] = {}
+        while not stop.wait(interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == sampler or (main_only and ident != main):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    key = frame_keys.get(code)
+                    if key is None:
+                        key = frame_keys[code] = (code.co_name, code.co_filename, code.co_firstlineno)
+                    stack.append(key)
+                    frame = frame.f_back
+                stack.reverse()
+                stacks.setdefault(names.get(ident, str(ident)), []).append(tuple(stack))
+
+    async def profile(self, seconds: float, interval: float = 0.01, main_only: bool = False) -> Dict[str, Any]:
+        """Sample for ``seconds`` while the event loop keeps serving.
+
+        Args:
+            seconds: Duration, capped at MAX_PROFILE_SECONDS
+            interval: Seconds between samples
+            main_only: Only sample the main (event loop) thread
+
+        Returns:
+            Samples per thread: {"threads": {name: [stack, ...]}, "interval", "seconds"}
+
+        Raises:
+            RuntimeError: Another profile is running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        seconds = min(max(seconds, interval), MAX_PROFILE_SECONDS)
+        stacks: Dict[str, List[Tuple[FrameKey, ...]]] = {}
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(interval, stop, main_only, stacks),
+                                   name="profiler", daemon=True)
+        started = time.monotonic()
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            # Also when the request is cancelled
+            stop.set()
+            sampler.join()
+            self._lock.release()
+        elapsed = time.monotonic() - started
+        metrics.counter("admin_profiles_total", "Sampling profiles taken").inc()
+        app_logger.info(f"Profiled {len(stacks)} threads for {elapsed:.1f}s")
+        return {"threads": stacks, "interval": interval, "seconds": elapsed}
+
+    @staticmethod
+    def to_speedscope(result: Dict[str, Any], name: str = "portfolio") -> Dict[str, Any]:
+        """Convert samples to the speedscope file format (one sampled profile per thread)."""
+        frames: List[Dict[str, Any]] = []
+        index: Dict[FrameKey, int] = {}
+        profiles = []
+        weight = result["interval"] * 1000
+        for thread, samples in sorted(result["threads"].items()):
+            encoded = []
+            for stack in samples:
+                row = []
+                for key in stack:
+                    position = index.get(key)
+                    if position is None:
+                        position = index[key] = len(frames)
+                        frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                    row.append(position)
+                encoded.append(row)
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": len(encoded) * weight,
+                "samples": encoded,
+                "weights": [weight] * len(encoded),
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "genai-portfolio",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    @staticmethod
+    def to_collapsed(result: Dict[str, Any]) -> str:
+        """Convert samples to collapsed stacks ("thread;outer;inner count"), the input of flamegraph.pl."""
+        counts: Dict[str, int] = {}
+        for thread, samples in result["threads"].items():
+            for stack in samples:
+                line = ";".join([thread] + [f"{name} ({file.rsplit('/', 1)[-1]}:{line})" for name, file, line in stack])
+                counts[line] = counts.get(line, 0) + 1
+        return "".join(f"{line} {count}\n" for line, count in sorted(counts.items()))
+
+
+class AllocationTracker:
+    """tracemalloc control with a small set of numbered snapshots."""
+
+    def __init__(self) -> None:
+        self.snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> Dict[str, Any]:
+        """Start tracing allocations, keeping ``frames`` frames per allocation."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            app_logger.warning(f"tracemalloc started ({frames} frames); stop it when done")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing and drop the snapshots."""
+        with self._lock:
+            self.snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            app_logger.info("tracemalloc stopped")
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "overhead_kb": round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            "snapshots": list(self.snapshots),
+        }
+
+    def snapshot(self) -> int:
+        """Take a snapshot (slow on large heaps, run it off the event loop); returns its id.
+
+        Raises:
+            RuntimeError: Tracing is not started
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self.snapshots[snapshot_id] = snapshot
+            while len(self.snapshots) > MAX_SNAPSHOTS:
+                self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise KeyError(f"No snapshot {snapshot_id}; kept: {list(self.snapshots)}")
+        return snapshot
+
+    @staticmethod
+    def _site(stat, group_by: str) -> Dict[str, Any]:
+        frame = stat.traceback[0]
+        site = {"site": f"{frame.filename}:{frame.lineno}"}
+        if group_by == "traceback":
+            site["traceback"] = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        return site
+
+    def top(self, snapshot_id: int, group_by: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+        """Largest allocation sites of a snapshot."""
+        return [
+            {**self._site(stat, group_by), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in self._get(snapshot_id).statistics(group_by)[:limit]
+        ]
+
+    def diff(self, base_id: int, target_id: int, group_by: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+        """Allocation sites that grew most from one snapshot to another.
+
+        Args:
+            base_id: Earlier snapshot
+            target_id: Later snapshot
+            group_by: "lineno", "filename" or "traceback"
+            limit: Sites returned
+        """
+        stats = self._get(target_id).compare_to(self._get(base_id), group_by)
+        return [
+            {**self._site(stat, group_by), "size_kb": round(stat.size / 1024, 1),
+             "size_diff_kb": round(stat.size_diff / 1024, 1), "count": stat.count, "count_diff": stat.count_diff}
+            for stat in stats[:limit]
+        ]
+
+
+def _coroutine_frames(coro, limit: int) -> List[Any]:
+    """Frames of a suspended coroutine and those it awaits, outermost first.
+
+    Task.get_stack() only returns the outermost frame of a suspended coroutine.
+    """
+    frames = []
+    while coro is not None and len(frames) < limit:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frames
+
+
+def _format_frames(frames) -> List[str]:
+    return [f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}" for frame in frames]
+
+
+def dump_tasks(stack_limit: int = 10) -> Dict[str, Any]:
+    """Stacks of the running loop's asyncio tasks and of every thread, innermost frame last."""
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        tasks.append({
+            "name": task.get_name(),
+            "coro": getattr(coro, "__qualname__", repr(coro)),
+            "done": task.done(),
+            "stack": _format_frames(_coroutine_frames(coro, stack_limit)),
+        })
+    tasks.sort(key=lambda task: task["name"])
+
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    threads = {}
+    for ident, frame in sys._current_frames().items():
+        frames = []
+        while frame is not None and len(frames) < stack_limit:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        threads[names.get(ident, str(ident))] = _format_frames(frames)
+    return {"task_count": len(tasks), "tasks": tasks, "threads": threads}
+
+
+# Create global profiling tools
+sampling_profiler = SamplingProfiler()
+allocation_tracker = AllocationTracker()
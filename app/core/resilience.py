@@ -0,0 +1,190 @@
+"""
+Circuit breakers for the GenAI Portfolio application.
+A breaker guards one upstream dependency (e.g. a language model provider). It
+keeps the outcomes of the most recent calls; when too many of them failed or
+were slower than the latency threshold it opens and rejects calls outright, so
+handlers fall back instead of piling up on a struggling upstream. After a
+cool-down it lets a few probe calls through (half-open) and closes again when
+they succeed. A bulkhead bounds the calls in flight in every state. Outcomes
+are only counted in the state their call started in, so a slow call from
+before a transition cannot reopen or close the breaker.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = ["CLOSED", "HALF_OPEN", "OPEN", "CircuitBreaker", "Permit"]
+
+# Breaker states, also the value of the circuit_breaker_state gauge
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class Permit:
+    """Admission of one call by a breaker, handed back with the call's outcome.
+
+    Args:
+        epoch: The breaker's state epoch when the call started
+        probe: Whether the call is a half-open probe
+    """
+
+    __slots__ = ("epoch", "probe")
+
+    def __init__(self, epoch: int, probe: bool) -> None:
+        self.epoch = epoch
+        self.probe = probe
+
+
+class CircuitBreaker:
+    """Failure-rate and slow-call-rate circuit breaker with half-open probing.
+
+    Callers ask ``acquire()`` for a permit before a call and report its
+    outcome with the permit: ``on_success(permit, latency)``,
+    ``on_failure(permit)`` or, for a call abandoned by the caller (e.g. the
+    losing leg of a hedged request), ``on_cancel(permit)``.
+
+    Args:
+        name: Upstream name, used in logs and as the metrics label
+        failure_rate: Fraction of failed calls in the window that opens the breaker
+        slow_call_seconds: Calls slower than this count as slow
+        slow_call_rate: Fraction of slow calls in the window that opens the breaker
+        window: Number of recent calls considered
+        minimum_calls: Calls needed in the window before the rates are evaluated
+        open_seconds: Time the breaker stays open before probing
+        half_open_probes: Calls let through while half-open; all must succeed to close
+        max_concurrency: Calls in flight at once, 0 for no limit
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate: float = 0.5,
+        window: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        max_concurrency: int = 0,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.minimum_calls = max(1, minimum_calls)
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.max_concurrency = max_concurrency
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.inflight = 0
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=max(1, window))  # (failed, slow)
+        self._probes = 0
+        self._probe_successes = 0
+        self._epoch = 0  # bumped on every transition; permits of older epochs are stale
+        self._state_gauge = metrics.gauge("circuit_breaker_state", "Breaker state (0 closed, 1 half-open, 2 open)",
+                                          upstream=name)
+        self._state_gauge.set(STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        app_logger.warning(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+        self._epoch += 1
+        self._state_gauge.set(STATE_VALUES[state])
+        metrics.counter("circuit_breaker_transitions_total", "Breaker state changes",
+                        upstream=self.name, state=state).inc()
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._probes = 0
+            self._probe_successes = 0
+        else:
+            self._outcomes.clear()
+
+    def _reject(self, reason: str) -> None:
+        metrics.counter("circuit_breaker_rejected_total", "Calls refused by a breaker",
+                        upstream=self.name, reason=reason).inc()
+
+    def acquire(self) -> Optional[Permit]:
+        """A permit if a call may start now, else None; a permit must be handed back with an outcome."""
+        if self.max_concurrency and self.inflight >= self.max_concurrency:
+            return self._reject("concurrency")
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return self._reject("open")
+            self._transition(HALF_OPEN)
+        probe = self.state == HALF_OPEN
+        if probe:
+            if self._probes >= self.half_open_probes:
+                return self._reject("half_open")
+            self._probes += 1
+        self.inflight += 1
+        return Permit(self._epoch, probe)
+
+    def _record(self, permit: Permit, failed: bool, slow: bool) -> None:
+        if permit.epoch != self._epoch:
+            # The call started before the last transition (e.g. in the closed
+            # state before a half-open probe); its outcome is stale
+            return
+        if permit.probe:
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._transition(CLOSED)
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.minimum_calls:
+            return
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+            self._transition(OPEN)
+
+    def on_success(self, permit: Permit, latency: float) -> None:
+        """Report a completed call and its latency in seconds."""
+        self.inflight -= 1
+        slow = latency > self.slow_call_seconds
+        metrics.counter("circuit_breaker_calls_total", "Calls through a breaker by outcome",
+                        upstream=self.name, outcome="slow" if slow else "success").inc()
+        self._record(permit, False, slow)
+
+    def on_failure(self, permit: Permit) -> None:
+        """Report a failed or timed-out call."""
+        self.inflight -= 1
+        metrics.counter("circuit_breaker_calls_total", "Calls through a breaker by outcome",
+                        upstream=self.name, outcome="failure").inc()
+        self._record(permit, True, False)
+
+    def on_cancel(self, permit: Permit) -> None:
+        """Report a call the caller abandoned; it says nothing about the upstream."""
+        self.inflight -= 1
+        metrics.counter("circuit_breaker_calls_total", "Calls through a breaker by outcome",
+                        upstream=self.name, outcome="cancelled").inc()
+        if permit.probe and permit.epoch == self._epoch:
+            # Free the probe slot for the next caller
+            self._probes = max(0, self._probes - 1)
+
+    def describe(self) -> Dict[str, Any]:
+        """State of the breaker for diagnostics."""
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "inflight": self.inflight,
+            "window_calls": calls,
+            "failure_rate": round(sum(1 for failed, _ in self._outcomes if failed) / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, slow in self._outcomes if slow) / calls, 3) if calls else 0.0,
+        }
@@ -0,0 +1,123 @@
+"""
+Admin authentication for the GenAI Portfolio application.
+Admin endpoints take a short-lived bearer token: a JWT signed with SECRET_KEY
+(using ALGORITHM) that carries the admin scope. Mint one where the settings
+are available, e.g. on the server:
+    python -m app.core.security --minutes 15
+
+Admin endpoints stay off (404) unless SECRET_KEY has been set to a long random
+value: the built-in default and the placeholders of .env.example and the
+project templates are rejected, as are short or prose-like keys. They also
+answer 404 when ADMIN_DIAGNOSTICS_ENABLED is off.
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.core import settings
+from app.core.exceptions import AuthenticationError, AuthorizationError
+from app.core.lazy_imports import lazy_import
+
+jwt = lazy_import("jose.jwt")
+
+# Define what this module exports
+__all__ = ["ADMIN_SCOPE", "admin_key_usable", "create_admin_token", "require_admin", "verify_admin_token"]
+
+# Scope claim of admin tokens
+ADMIN_SCOPE = "admin:diagnostics"
+
+# Shortest SECRET_KEY admin tokens are signed with
+MIN_SECRET_KEY_LENGTH = 32
+
+# Fewest distinct characters of a random key (a 32-character hex key has about 14)
+MIN_SECRET_KEY_SYMBOLS = 10
+
+# Published SECRET_KEY values: the settings default and the .env templates
+PLACEHOLDER_SECRET_KEYS = frozenset({
+    "your-secret-key-change-in-production",
+    "your-secret-key-change-in-production-make-it-long-and-random",
+    "replace_this_with_a_secure_random_key_at_least_32_characters_long",
+})
+
+# Template wording that never appears in a generated key
+PLACEHOLDER_PREFIXES = ("your-", "your_", "replace_", "replace-")
+PLACEHOLDER_WORDS = ("secret", "change", "random", "example", "replace")
+
+
+def admin_key_usable() -> bool:
+    """Whether SECRET_KEY was explicitly set to a long random value fit to sign admin tokens."""
+    key = settings.SECRET_KEY or ""
+    lowered = key.lower()
+    if key in PLACEHOLDER_SECRET_KEYS or lowered.startswith(PLACEHOLDER_PREFIXES):
+        return False
+    if any(word in lowered for word in PLACEHOLDER_WORDS):
+        return False
+    return len(key) >= MIN_SECRET_KEY_LENGTH and len(set(key)) >= MIN_SECRET_KEY_SYMBOLS
+
+
+def create_admin_token(minutes: Optional[int] = None) -> str:
+    """Sign an admin token.
+
+    Args:
+        minutes: Lifetime, ACCESS_TOKEN_EXPIRE_MINUTES by default
+    """
+    now = int(time.time())
+    lifetime = (minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES) * 60
+    claims = {"sub": "admin", "scope": ADMIN_SCOPE, "iat": now, "exp": now + lifetime}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_admin_token(token: str) -> Dict[str, Any]:
+    """Check an admin token's signature, expiry and scope.
+
+    Returns:
+        The token's claims
+
+    Raises:
+        AuthenticationError: The token is invalid or expired
+        AuthorizationError: The token lacks the admin scope
+    """
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except Exception as e:
+        raise AuthenticationError(f"Invalid admin token: {type(e).__name__}",
+                                  headers={"WWW-Authenticate": "Bearer"}) from None
+    if claims.get("scope") != ADMIN_SCOPE:
+        raise AuthorizationError("Token does not grant admin access")
+    return claims
+
+
+async def require_admin(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    """FastAPI dependency guarding admin endpoints."""
+    # Without a usable key the endpoints do not exist, rather than answering to a guessable signature
+    if not settings.ADMIN_DIAGNOSTICS_ENABLED or not admin_key_usable():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise AuthenticationError("Admin token required", headers={"WWW-Authenticate": "Bearer"}).to_http_exception()
+    try:
+        return verify_admin_token(token.strip())
+    except (AuthenticationError, AuthorizationError) as e:
+        raise e.to_http_exception()
+
+
+def main() -> bool:
+    """Print an admin token signed with the configured SECRET_KEY."""
+    parser = argparse.ArgumentParser(description="Mint an admin diagnostics token")
+    parser.add_argument("--minutes", type=int, default=None, help="Token lifetime (ACCESS_TOKEN_EXPIRE_MINUTES)")
+    args = parser.parse_args()
+    if not admin_key_usable():
+        print("✗ SECRET_KEY is a placeholder or not random enough; set one first, e.g. "
+              "python -c 'import secrets; print(secrets.token_hex(32))'", file=sys.stderr)
+        return False
+    print(create_admin_token(args.minutes))
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
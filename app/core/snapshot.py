@@ -0,0 +1,199 @@
+"""
+Warm-state snapshots for the GenAI Portfolio application.
+Caches that are expensive to rebuild (the static file hot set with its content
+hashes, memoized compressed responses) register a dump and a load function.
+On shutdown their state is written to one file under ./data; on boot the file
+is memory-mapped before traffic is accepted and every cache is restored from
+it, so the first requests after a scale-to-zero start hit warm caches.
+
+The snapshot covers the caches this application has. Pages are built per
+NiceGUI client and never pre-rendered, and there is no search index,
+embedding matrix or prompt cache in memory (extracted chunks live in SQLite
+under ./data already), so those have nothing to save. A cache added later
+joins by registering a dump/load pair. At the default cache sizes a snapshot
+is at most about 48 MB and is written in well under a second.
+
+File layout: a magic line, the length of a JSON index, the index (per cache:
+its metadata and the offset and length of each blob) and the raw blobs. No
+code is deserialized, and each cache validates its own entries on load (for
+example against file modification times), so a stale snapshot is harmless.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import app_logger
+
+# Define what this module exports
+__all__ = [
+    "register_snapshot",
+    "restore_snapshot",
+    "save_snapshot",
+    "snapshot_summary",
+]
+
+MAGIC = b"PORTFOLIO-WARM-STATE 1\n"
+INDEX_LENGTH = struct.Struct(">Q")
+
+# A dump returns JSON-serializable metadata and the blobs it refers to by
+# position; a load receives both back and returns the number of restored entries
+SnapshotDump = Callable[[], Tuple[Any, List[bytes]]]
+SnapshotLoad = Callable[[Any, List[bytes]], int]
+
+_providers: Dict[str, Tuple[SnapshotDump, SnapshotLoad]] = {}
+_sections: Dict[str, Dict[str, Any]] = {}  # read from the snapshot, not yet applied
+_mapping: Optional[mmap.mmap] = None
+_blob_base = 0
+_summary: Dict[str, Any] = {"path": None, "created": None, "restored": {}, "saved": None}
+_lock = threading.RLock()
+
+
+def register_snapshot(name: str, dump: SnapshotDump, load: SnapshotLoad) -> None:
+    """Include a cache in the warm-state snapshot.
+
+    When a snapshot is already open, the cache is restored immediately, so
+    caches created after restore_snapshot() (e.g. in a middleware constructor)
+    still start warm.
+
+    Args:
+        name: Section name in the snapshot file
+        dump: Returns (metadata, blobs) describing the cache
+        load: Restores the cache from (metadata, blobs)
+    """
+    with _lock:
+        _providers[name] = (dump, load)
+        if name in _sections:
+            _apply(name)
+
+
+def _apply(name: str) -> None:
+    """Restore one cache from the open snapshot."""
+    section = _sections.pop(name)
+    _, load = _providers[name]
+    started = time.perf_counter()
+    try:
+        blobs = [_mapping[_blob_base + offset:_blob_base + offset + length] for offset, length in section["blobs"]]
+        restored = load(section["meta"], blobs)
+    except Exception as e:
+        app_logger.warning(f"Could not restore '{name}' from the warm-state snapshot: {e}")
+    else:
+        _summary["restored"][name] = {
+            "entries": restored,
+            "bytes": sum(length for _, length in section["blobs"]),
+            "ms": (time.perf_counter() - started) * 1000,
+        }
+    _release_mapping()
+
+
+def _release_mapping() -> None:
+    """Unmap the snapshot once every section has been restored."""
+    global _mapping
+    if not _sections and _mapping is not None:
+        _mapping.close()
+        _mapping = None
+
+
+def restore_snapshot(path: Path) -> bool:
+    """Open a snapshot and restore every registered cache from it.
+
+    Sections of caches that register later stay mapped until they do.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Whether a valid snapshot was found
+    """
+    global _mapping, _blob_base
+    with _lock:
+        try:
+            with open(path, "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing or empty: a regular cold start
+            return False
+
+        try:
+            if mapping[:len(MAGIC)] != MAGIC:
+                raise ValueError("unknown format")
+            index_start = len(MAGIC) + INDEX_LENGTH.size
+            (index_length,) = INDEX_LENGTH.unpack(mapping[len(MAGIC):index_start])
+            index = json.loads(mapping[index_start:index_start + index_length])
+        except (ValueError, struct.error) as e:
+            mapping.close()
+            app_logger.warning(f"Ignoring unreadable warm-state snapshot {path}: {e}")
+            return False
+
+        _mapping = mapping
+        _blob_base = index_start + index_length
+        _sections.clear()
+        _sections.update(index["sections"])
+        _summary["path"] = str(path)
+        _summary["created"] = index.get("created")
+        for name in [name for name in _sections if name in _providers]:
+            _apply(name)
+        _release_mapping()
+
+    age = time.time() - (index.get("created") or time.time())
+    app_logger.info(f"Restored warm-state snapshot {path} ({age:.0f}s old)")
+    return True
+
+
+def save_snapshot(path: Path) -> int:
+    """Write the state of every registered cache to a snapshot file.
+
+    The file is written next to the target and renamed, so a reader never
+    sees a partial snapshot.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Size of the written snapshot in bytes
+    """
+    with _lock:
+        started = time.perf_counter()
+        sections = {}
+        blobs: List[bytes] = []
+        offset = 0
+        for name, (dump, _) in _providers.items():
+            try:
+                meta, section_blobs = dump()
+            except Exception as e:
+                app_logger.warning(f"Could not snapshot '{name}': {e}")
+                continue
+            spans = []
+            for blob in section_blobs:
+                spans.append((offset, len(blob)))
+                offset += len(blob)
+            sections[name] = {"meta": meta, "blobs": spans}
+            blobs.extend(section_blobs)
+
+        index = json.dumps({"created": time.time(), "sections": sections}).encode()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary, "wb") as file:
+            file.write(MAGIC)
+            file.write(INDEX_LENGTH.pack(len(index)))
+            file.write(index)
+            for blob in blobs:
+                file.write(blob)
+        os.replace(temporary, path)
+
+        size = len(MAGIC) + INDEX_LENGTH.size + len(index) + offset
+        _summary["saved"] = {"bytes": size, "ms": (time.perf_counter() - started) * 1000, "at": time.time()}
+    app_logger.info(f"Saved warm-state snapshot {path} ({size / 1024:.0f} KB)")
+    return size
+
+
+def snapshot_summary() -> Dict[str, Any]:
+    """Describe the snapshot restored and saved by this process."""
+    with _lock:
+        return {**_summary, "restored": dict(_summary["restored"]), "pending": sorted(_sections)}
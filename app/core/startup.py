@@ -0,0 +1,276 @@
+"""
+Startup profiling for the GenAI Portfolio application.
+Keeps a registry of startup phases and their wall time, which the diagnostics
+API exposes, and implements ``python main.py --profile-startup``: it boots the
+application in a child interpreter under ``-X importtime`` and prints the
+slowest imports as a tree, the time per phase and whether the total stays
+within the startup budget.
+
+Example (fails with exit code 1 when startup takes longer than 2.5 seconds):
+    python main.py --profile-startup --startup-budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = [
+    "PROFILE_FLAG",
+    "CHILD_FLAG",
+    "ImportNode",
+    "StartupPhase",
+    "mark_ready",
+    "startup_phase",
+    "startup_phases",
+    "startup_summary",
+    "emit_startup_report",
+    "parse_importtime",
+    "profile_startup",
+]
+
+PROFILE_FLAG = "--profile-startup"
+CHILD_FLAG = "--profile-startup-child"
+REPORT_MARKER = "STARTUP_REPORT "
+
+# Process-wide reference point, as close to interpreter start as this module gets
+PROCESS_START = time.perf_counter()
+
+
+@dataclass
+class StartupPhase:
+    """A recorded startup phase; times are milliseconds."""
+
+    name: str
+    started_ms: float  # offset from PROCESS_START
+    duration_ms: float
+    status: str = "ok"
+
+
+_phases: Dict[str, StartupPhase] = {}
+_ready_ms: Optional[float] = None
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Record the wall time of a startup phase in milliseconds.
+
+    Repeated phases accumulate; a phase that raises is marked as failed.
+
+    Args:
+        name: Phase name (e.g. "settings", "routers" or "pages")
+    """
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        phase = _phases.get(name)
+        if phase is None:
+            phase = _phases[name] = StartupPhase(name, (started - PROCESS_START) * 1000, duration_ms, status)
+        else:
+            phase.duration_ms += duration_ms
+            if status != "ok":
+                phase.status = status
+        metrics.gauge("startup_phase_ms", "Wall time of a startup phase", phase=name).set(phase.duration_ms)
+
+
+def startup_phases() -> Dict[str, float]:
+    """Return the recorded startup phases in milliseconds, in execution order."""
+    return {name: phase.duration_ms for name, phase in _phases.items()}
+
+
+def mark_ready() -> None:
+    """Record that startup finished and the application serves requests."""
+    global _ready_ms
+    if _ready_ms is None:
+        _ready_ms = (time.perf_counter() - PROCESS_START) * 1000
+        metrics.gauge("startup_ready_ms", "Time from process start until the app was ready").set(_ready_ms)
+
+
+def startup_summary() -> Dict[str, Any]:
+    """Describe the startup of this process for the diagnostics API."""
+    return {
+        "phases": [asdict(phase) for phase in _phases.values()],
+        "total_phase_ms": sum(phase.duration_ms for phase in _phases.values()),
+        "ready_ms": _ready_ms,
+        "uptime_seconds": time.perf_counter() - PROCESS_START,
+    }
+
+
+def emit_startup_report() -> None:
+    """Print the recorded phases for the profiling parent process."""
+    report = {
+        "phases": startup_phases(),
+        "since_module_import_ms": (time.perf_counter() - PROCESS_START) * 1000,
+    }
+    print(REPORT_MARKER + json.dumps(report), flush=True)
+
+
+@dataclass
+class ImportNode:
+    """One module from ``-X importtime`` output."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List["ImportNode"] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """Build the import tree from ``-X importtime`` output.
+
+    CPython prints a module after all of its children, indented two spaces per
+    nesting level, so children are collected per depth until their parent appears.
+
+    Args:
+        output: stderr of a process run with ``-X importtime``
+
+    Returns:
+        Top-level imports in the order they completed
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|", 2)
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+            raw_name = fields[2]
+        except (IndexError, ValueError):
+            continue
+        # One space after the separator, then two per nesting level
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        node = ImportNode(raw_name.strip(), self_us, cumulative_us)
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def format_import_tree(
+    roots: Sequence[ImportNode],
+    threshold_ms: float = 5.0,
+    max_depth: int = 4,
+) -> List[str]:
+    """Render the slowest branches of an import tree.
+
+    Args:
+        roots: Top-level import nodes
+        threshold_ms: Hide modules whose cumulative time is below this
+        max_depth: Maximum nesting depth to show
+
+    Returns:
+        Lines in ``-X importtime`` style, slowest first at every level
+    """
+    lines = []
+
+    def visit(nodes: Sequence[ImportNode], depth: int) -> None:
+        for node in sorted(nodes, key=lambda n: n.cumulative_us, reverse=True):
+            if node.cumulative_us / 1000 < threshold_ms:
+                break
+            lines.append(f"{node.self_us / 1000:>9.1f} | {node.cumulative_us / 1000:>9.1f} | "
+                         f"{'  ' * depth}{node.name}")
+            if depth + 1 < max_depth:
+                visit(node.children, depth + 1)
+
+    visit(roots, 0)
+    return lines
+
+
+def _run_child(entrypoint: Path, env: Dict[str, str]) -> Dict:
+    """Boot the application once in a child interpreter and collect its report."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(entrypoint), CHILD_FLAG],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.getcwd(),
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    report = None
+    for line in result.stdout.splitlines():
+        if line.startswith(REPORT_MARKER):
+            report = json.loads(line[len(REPORT_MARKER):])
+    if result.returncode != 0 or report is None:
+        output = [line for line in (result.stdout + result.stderr).splitlines()
+                  if not line.startswith("import time:")]
+        tail = "\n".join(output[-20:])
+        raise RuntimeError(f"Startup child failed with exit code {result.returncode}:\n{tail}")
+    report["wall_ms"] = wall_ms
+    report["imports"] = parse_importtime(result.stderr)
+    return report
+
+
+def profile_startup(argv: Optional[Sequence[str]] = None, entrypoint: Optional[Path] = None) -> int:
+    """Profile application startup and enforce the startup budget.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+        entrypoint: Script that boots the application (defaults to main.py)
+
+    Returns:
+        Process exit code: 0 within budget, 1 over budget or on failure
+    """
+    parser = argparse.ArgumentParser(prog="main.py --profile-startup", description="Profile application startup")
+    parser.add_argument(PROFILE_FLAG, action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--startup-budget-ms", type=float,
+                        default=float(os.getenv("STARTUP_BUDGET_MS", "0") or 0),
+                        help="Fail when the median startup time exceeds this (0 disables, env STARTUP_BUDGET_MS)")
+    parser.add_argument("--startup-runs", type=int, default=1, help="Number of cold starts to measure")
+    parser.add_argument("--import-threshold-ms", type=float, default=5.0, help="Hide faster imports")
+    parser.add_argument("--import-depth", type=int, default=4, help="Maximum import tree depth to show")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args, _ = parser.parse_known_args(argv if argv is not None else sys.argv[1:])
+
+    entrypoint = entrypoint or Path(__file__).resolve().parents[2] / "main.py"
+    try:
+        reports = [_run_child(entrypoint, dict(os.environ)) for _ in range(max(args.startup_runs, 1))]
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    wall_ms = statistics.median(report["wall_ms"] for report in reports)
+    phases = {
+        name: statistics.median(report["phases"].get(name, 0.0) for report in reports)
+        for name in reports[0]["phases"]
+    }
+    # Interpreter start-up, anything before the first phase and interpreter exit
+    phases = {"interpreter": max(wall_ms - sum(phases.values()), 0.0), **phases}
+    within_budget = not args.startup_budget_ms or wall_ms <= args.startup_budget_ms
+
+    if args.json:
+        print(json.dumps({
+            "wall_ms": wall_ms,
+            "phases": phases,
+            "budget_ms": args.startup_budget_ms or None,
+            "within_budget": within_budget,
+            "runs": len(reports),
+        }, indent=2))
+    else:
+        print("=== Startup Profile ===")
+        print(f"{'self ms':>9} | {'cumul ms':>9} | module (imports >= {args.import_threshold_ms:g} ms)")
+        for line in format_import_tree(reports[-1]["imports"], args.import_threshold_ms, args.import_depth):
+            print(line)
+        print("\nPhases (median of %d run%s):" % (len(reports), "s" if len(reports) > 1 else ""))
+        for name, duration in phases.items():
+            print(f"  {name:<16}{duration:>9.1f} ms")
+        print(f"  {'total':<16}{wall_ms:>9.1f} ms")
+        if args.startup_budget_ms:
+            verdict = "within" if within_budget else "OVER"
+            print(f"\nStartup {verdict} budget: {wall_ms:.1f} ms / {args.startup_budget_ms:.1f} ms")
+    return 0 if within_budget else 1
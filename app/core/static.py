@@ -0,0 +1,584 @@
+"""
+Static file serving for the GenAI Portfolio application.
+Serves precompressed .br/.gz siblings when the client accepts them, computes
+strong content-hash ETags once per file version, answers byte-range requests,
+keeps the hottest small files in a byte-bounded in-memory LRU and hands large
+files to the server's zero-copy path when the ASGI server supports it.
+
+Responses served from cached metadata and bodies are built on the event loop;
+when a file must first be hashed, read or compressed (new or changed files,
+cache misses) the response is built in a worker thread instead.
+"""
+
+import functools
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.core.assets import FINGERPRINT_PATTERN
+from app.core.lazy_imports import lazy_import
+from app.core.metrics import metrics
+
+# brotli is optional, only gzip is negotiated without it
+brotli = lazy_import("brotli")
+
+# Define what this module exports
+__all__ = [
+    "CachedStaticFiles",
+    "DeferredResponse",
+    "FileRangeResponse",
+    "IMMUTABLE_CACHE_CONTROL",
+    "REVALIDATE_CACHE_CONTROL",
+    "parse_range",
+]
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# Precompressed siblings in order of preference
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+# Defaults for the in-memory hot set
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024  # 16MB across all cached bodies
+DEFAULT_CACHE_MAX_FILE_BYTES = 256 * 1024  # files larger than this stream from disk
+
+# Media types worth compressing on the fly when no precompressed sibling exists
+COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be satisfied for the file size."""
+
+
+class NotCached(Exception):
+    """Raised when a response cannot be built without blocking file work."""
+
+
+def accepted_encodings(scope: Scope) -> List[str]:
+    """Return the content codings accepted by the client (ignoring q=0)."""
+    header = Headers(scope=scope).get("accept-encoding", "")
+    accepted = []
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range "bytes=" header.
+
+    Multi-range and malformed headers are ignored (the full file is served),
+    as RFC 9110 allows.
+
+    Args:
+        header: Value of the Range header
+        size: Size of the representation in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the full file
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the file
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if not start_text:
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class StaticVariant:
+    """One representation of a static file (identity or a content coding)."""
+
+    __slots__ = ("path", "size", "etag", "encoding")
+
+    def __init__(self, path: str, size: int, etag: str, encoding: Optional[str]) -> None:
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.encoding = encoding
+
+
+class StaticEntry:
+    """Metadata for a file, computed once per (mtime, size) version."""
+
+    __slots__ = ("version", "media_type", "last_modified", "mtime", "cache_control", "variants", "incompressible")
+
+    def __init__(self, version: Tuple[int, int], media_type: str, mtime: float, cache_control: str) -> None:
+        self.version = version
+        self.media_type = media_type
+        self.mtime = mtime
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.cache_control = cache_control
+        self.variants: Dict[Optional[str], StaticVariant] = {}
+        self.incompressible: Set[str] = set()
+
+
+class FileRangeResponse(Response):
+    """Streams a byte range of a file without loading it into memory.
+
+    Uses the ASGI "http.response.zerocopy" extension (sendfile) when the
+    server offers it, "http.response.pathsend" for whole files, and large
+    chunked reads otherwise. Uvicorn offers neither extension, so under it
+    the chunked reads (in a worker thread) are what runs.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        count: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        whole_file: bool = True,
+    ) -> None:
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.status_code = status_code
+        self.media_type = media_type
+        self.whole_file = whole_file
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        extensions = scope.get("extensions") or {}
+        if scope["method"].upper() == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopy" in extensions:
+            # The server reads the descriptor; opening and closing it stay off the event loop
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+        elif self.whole_file and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": self.path})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.offset)
+                remaining = self.count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    # File shrank underneath us; terminate the body cleanly
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class DeferredResponse:
+    """A response built in a worker thread, for files that must be hashed, read or compressed first."""
+
+    def __init__(self, build: Callable[[], Response]) -> None:
+        self.build = build
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = await anyio.to_thread.run_sync(self.build)
+        await response(scope, receive, send)
+
+
+class CachedStaticFiles(StaticFiles):
+    """High-performance StaticFiles.
+
+    Args:
+        cache_max_bytes: Total bytes of file bodies kept in memory
+        cache_max_file_bytes: Largest file (per representation) kept in memory
+        **kwargs: Passed to starlette.staticfiles.StaticFiles
+    """
+
+    def __init__(
+        self,
+        *args,
+        cache_max_bytes: Optional[int] = None,
+        cache_max_file_bytes: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_max_bytes = cache_max_bytes if cache_max_bytes is not None else DEFAULT_CACHE_MAX_BYTES
+        self.cache_max_file_bytes = (
+            cache_max_file_bytes if cache_max_file_bytes is not None else DEFAULT_CACHE_MAX_FILE_BYTES
+        )
+        self._entries: Dict[str, StaticEntry] = {}
+        self._bodies: "OrderedDict[Tuple[str, Optional[str]], bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = metrics.counter("static_cache_hits_total", "Static responses served from memory")
+        self._misses = metrics.counter("static_cache_misses_total", "Static responses read from disk")
+        self._not_modified = metrics.counter("static_not_modified_total", "Static 304 responses")
+        self._cache_gauge = metrics.gauge("static_cache_bytes", "Bytes of static files held in memory")
+
+    # Metadata ----------------------------------------------------------------
+
+    def _hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()[:24]
+
+    def _entry(self, path: str, stat_result: os.stat_result, blocking: bool = True) -> StaticEntry:
+        """Return cached metadata, recomputing it when the file changed.
+
+        Raises:
+            NotCached: The metadata must be recomputed and blocking is False
+        """
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry.version == version:
+            return entry
+        if not blocking:
+            raise NotCached(path)
+
+        media_type = guess_type(path)[0] or "text/plain"
+        cache_control = (
+            IMMUTABLE_CACHE_CONTROL if FINGERPRINT_PATTERN.search(os.path.basename(path)) else REVALIDATE_CACHE_CONTROL
+        )
+        entry = StaticEntry(version, media_type, stat_result.st_mtime, cache_control)
+        content_hash = self._hash_file(path)
+        entry.variants[None] = StaticVariant(path, stat_result.st_size, f'"{content_hash}"', None)
+        for encoding, suffix in ENCODINGS:
+            try:
+                sibling = os.stat(path + suffix)
+            except OSError:
+                continue
+            # Ignore siblings older than the source, they describe stale content
+            if sibling.st_mtime_ns >= stat_result.st_mtime_ns:
+                entry.variants[encoding] = StaticVariant(
+                    path + suffix, sibling.st_size, f'"{content_hash}-{encoding}"', encoding)
+
+        with self._lock:
+            self._entries[path] = entry
+            for key in [key for key in self._bodies if key[0] == path]:
+                self._evict(key)
+        return entry
+
+    # Hot set -----------------------------------------------------------------
+
+    def _evict(self, key: Tuple[str, Optional[str]]) -> None:
+        body = self._bodies.pop(key, None)
+        if body is not None:
+            self._cached_bytes -= len(body)
+
+    def _remember(self, key: Tuple[str, Optional[str]], body: bytes) -> None:
+        if len(body) > self.cache_max_file_bytes or len(body) > self.cache_max_bytes:
+            return
+        with self._lock:
+            self._evict(key)
+            self._bodies[key] = body
+            self._cached_bytes += len(body)
+            while self._cached_bytes > self.cache_max_bytes:
+                self._evict(next(iter(self._bodies)))
+            self._cache_gauge.set(self._cached_bytes)
+
+    def resize(self, cache_max_bytes: int, cache_max_file_bytes: int) -> None:
+        """Apply new hot-set limits, evicting what no longer fits."""
+        with self._lock:
+            self.cache_max_bytes = cache_max_bytes
+            self.cache_max_file_bytes = cache_max_file_bytes
+            for key in [key for key, body in self._bodies.items() if len(body) > cache_max_file_bytes]:
+                self._evict(key)
+            while self._cached_bytes > self.cache_max_bytes:
+                self._evict(next(iter(self._bodies)))
+            self._cache_gauge.set(self._cached_bytes)
+
+    def _cached_body(self, key: Tuple[str, Optional[str]]) -> Optional[bytes]:
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+        return body
+
+    def _load_variant(self, entry: StaticEntry, variant: StaticVariant, blocking: bool = True) -> Optional[bytes]:
+        """Return the body of a small variant from memory, reading it on a miss.
+
+        Raises:
+            NotCached: The body must be read and blocking is False
+        """
+        if variant.size > self.cache_max_file_bytes:
+            return None
+        key = (entry.variants[None].path, variant.encoding)
+        body = self._cached_body(key)
+        if body is not None:
+            self._hits.inc()
+            return body
+        if not blocking:
+            raise NotCached(variant.path)
+        self._misses.inc()
+        with open(variant.path, "rb") as file:
+            body = file.read()
+        self._remember(key, body)
+        return body
+
+    def _compressed_variant(
+        self, entry: StaticEntry, encoding: str, blocking: bool = True
+    ) -> Optional[Tuple[StaticVariant, bytes]]:
+        """Compress a small, compressible file once and keep the result in memory.
+
+        Raises:
+            NotCached: The file must be compressed and blocking is False
+        """
+        identity = entry.variants[None]
+        if (
+            encoding in entry.incompressible
+            or identity.size > self.cache_max_file_bytes
+            or not entry.media_type.startswith(COMPRESSIBLE_PREFIXES)
+            or (encoding == "br" and not brotli)
+        ):
+            return None
+        key = (identity.path, encoding)
+        compressed = self._cached_body(key)
+        if compressed is None:
+            if not blocking:
+                raise NotCached(identity.path)
+            body = self._load_variant(entry, identity)
+            if encoding == "br":
+                compressed = brotli.compress(body, quality=5)
+            else:
+                compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) >= len(body):
+                entry.incompressible.add(encoding)
+                return None
+            self._remember(key, compressed)
+        else:
+            self._hits.inc()
+        variant = StaticVariant(identity.path, len(compressed), f'{identity.etag[:-1]}-{encoding}"', encoding)
+        return variant, compressed
+
+    def _select_variant(
+        self, entry: StaticEntry, scope: Scope, blocking: bool = True
+    ) -> Tuple[StaticVariant, Optional[bytes]]:
+        """Pick the best representation, with its body when it is held in memory."""
+        accepted = accepted_encodings(scope)
+        for encoding, _ in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            variant = entry.variants.get(encoding)
+            if variant is not None:
+                return variant, self._load_variant(entry, variant, blocking)
+            generated = self._compressed_variant(entry, encoding, blocking)
+            if generated is not None:
+                return generated
+        variant = entry.variants[None]
+        return variant, self._load_variant(entry, variant, blocking)
+
+    # Warm-up -----------------------------------------------------------------
+
+    def warm(self) -> int:
+        """Hash every file and load small ones with their compressed variants.
+
+        Returns:
+            Number of files whose metadata is now cached
+        """
+        sibling_suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        count = 0
+        for directory in self.all_directories:
+            for root, _, filenames in os.walk(os.path.realpath(directory)):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    if path.endswith(sibling_suffixes) and os.path.exists(os.path.splitext(path)[0]):
+                        continue
+                    try:
+                        entry = self._entry(path, os.stat(path))
+                    except OSError:
+                        continue
+                    count += 1
+                    self._load_variant(entry, entry.variants[None])
+                    for encoding, _ in ENCODINGS:
+                        variant = entry.variants.get(encoding)
+                        if variant is not None:
+                            self._load_variant(entry, variant)
+                        else:
+                            self._compressed_variant(entry, encoding)
+        return count
+
+    # Snapshots ---------------------------------------------------------------
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], List[bytes]]:
+        """Describe file metadata and the hot set for a warm-state snapshot."""
+        with self._lock:
+            entries = dict(self._entries)
+            bodies = list(self._bodies.items())
+        meta = {
+            "entries": {
+                path: {
+                    "version": entry.version,
+                    "media_type": entry.media_type,
+                    "mtime": entry.mtime,
+                    "cache_control": entry.cache_control,
+                    "variants": {
+                        encoding or "identity": [variant.path, variant.size, variant.etag]
+                        for encoding, variant in entry.variants.items()
+                    },
+                    "incompressible": sorted(entry.incompressible),
+                }
+                for path, entry in entries.items()
+            },
+            "bodies": [[path, encoding] for (path, encoding), _ in bodies],
+        }
+        return meta, [body for _, body in bodies]
+
+    def restore_state(self, meta: Dict[str, Any], blobs: List[bytes]) -> int:
+        """Restore metadata and bodies of files that did not change since the snapshot.
+
+        Returns:
+            Number of restored files
+        """
+        restored = set()
+        for path, data in meta["entries"].items():
+            try:
+                stat_result = os.stat(path)
+                variants = {
+                    (None if encoding == "identity" else encoding): StaticVariant(
+                        variant_path, size, etag, None if encoding == "identity" else encoding)
+                    for encoding, (variant_path, size, etag) in data["variants"].items()
+                }
+                # Precompressed siblings must still be the ones that were hashed
+                if any(os.stat(variant.path).st_size != variant.size
+                       for encoding, variant in variants.items() if encoding is not None and variant.path != path):
+                    continue
+            except OSError:
+                continue
+            version = (stat_result.st_mtime_ns, stat_result.st_size)
+            if tuple(data["version"]) != version:
+                continue
+            entry = StaticEntry(version, data["media_type"], data["mtime"], data["cache_control"])
+            entry.variants.update(variants)
+            entry.incompressible.update(data["incompressible"])
+            with self._lock:
+                self._entries[path] = entry
+            restored.add(path)
+
+        for (path, encoding), body in zip(meta["bodies"], blobs):
+            if path in restored:
+                self._remember((path, encoding), body)
+        return len(restored)
+
+    # Responses ---------------------------------------------------------------
+
+    def _is_not_modified(self, request_headers: Headers, entry: StaticEntry, etag: str) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")]
+            return etag in tags or "*" in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(entry.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Union[Response, DeferredResponse]:
+        path = os.fspath(full_path)
+        try:
+            return self._response(path, stat_result, scope, status_code, blocking=False)
+        except NotCached:
+            # Hashing, reading or compressing a file would stall every client on the loop
+            return DeferredResponse(functools.partial(self._response, path, stat_result, scope, status_code))
+
+    def _response(
+        self, path: str, stat_result: os.stat_result, scope: Scope, status_code: int, blocking: bool = True
+    ) -> Response:
+        """Build the response for a file; see file_response."""
+        request_headers = Headers(scope=scope)
+        entry = self._entry(path, stat_result, blocking)
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200:
+            # Ranges always address the identity representation
+            variant = entry.variants[None]
+            body = None
+            if_range = request_headers.get("if-range")
+            if if_range and if_range not in (variant.etag, entry.last_modified):
+                range_header = None
+        else:
+            variant, body = self._select_variant(entry, scope, blocking)
+
+        headers = {
+            "etag": variant.etag,
+            "last-modified": entry.last_modified,
+            "cache-control": entry.cache_control,
+            "accept-ranges": "bytes",
+            "vary": "Accept-Encoding",
+        }
+        if variant.encoding:
+            headers["content-encoding"] = variant.encoding
+
+        if status_code == 200 and self._is_not_modified(request_headers, entry, variant.etag):
+            self._not_modified.inc()
+            return Response(status_code=304, headers=headers)
+        if body is None and range_header:
+            body = self._load_variant(entry, variant, blocking)
+
+        start, end = 0, variant.size - 1
+        if range_header and status_code == 200:
+            try:
+                requested = parse_range(range_header, variant.size)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={"content-range": f"bytes */{variant.size}"})
+            if requested is not None:
+                start, end = requested
+                status_code = 206
+                headers["content-range"] = f"bytes {start}-{end}/{variant.size}"
+                metrics.counter("static_range_requests_total", "Static byte-range responses").inc()
+
+        length = max(end - start + 1, 0)
+        headers["content-length"] = str(length)
+        if body is not None:
+            content = b"" if scope["method"].upper() == "HEAD" else body[start:end + 1]
+            return Response(content, status_code=status_code, headers=headers, media_type=entry.media_type)
+
+        return FileRangeResponse(
+            variant.path,
+            offset=start,
+            count=length,
+            status_code=status_code,
+            headers=headers,
+            media_type=entry.media_type,
+            whole_file=status_code != 206,
+        )
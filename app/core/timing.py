@@ -0,0 +1,197 @@
+"""
+Request timing and instrumentation for the GenAI Portfolio application.
+A pure-ASGI middleware measures every request with a monotonic clock, reports a
+Server-Timing header with a phase breakdown (routing, handler, serialization)
+and feeds the metrics registry, without buffering response bodies.
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = [
+    "RequestTimer",
+    "TimedRoute",
+    "TimingMiddleware",
+    "current_timer",
+    "timed_phase",
+]
+
+# Timer of the request being handled, set by TimingMiddleware
+current_timer: ContextVar[Optional["RequestTimer"]] = ContextVar("current_timer", default=None)
+
+
+class RequestTimer:
+    """Phase durations of a single request, measured with perf_counter_ns.
+
+    Sequential phases are recorded with mark(), which attributes the time since
+    the previous mark to the given phase. Nested or overlapping work (a database
+    query inside the handler, say) is recorded with add().
+    """
+
+    __slots__ = ("start", "last", "phases")
+
+    def __init__(self) -> None:
+        self.start = self.last = time.perf_counter_ns()
+        self.phases: Dict[str, int] = {}
+
+    def mark(self, phase: str) -> None:
+        """Close the current sequential phase."""
+        now = time.perf_counter_ns()
+        self.phases[phase] = self.phases.get(phase, 0) + now - self.last
+        self.last = now
+
+    def add(self, phase: str, duration_ns: int) -> None:
+        """Add time to a phase without moving the sequential cursor."""
+        self.phases[phase] = self.phases.get(phase, 0) + duration_ns
+
+    def elapsed_ns(self) -> int:
+        return time.perf_counter_ns() - self.start
+
+    def server_timing(self, total_ns: int) -> str:
+        """Format the phases as a Server-Timing header value (durations in ms)."""
+        entries = [f"{phase};dur={duration / 1e6:.3f}" for phase, duration in self.phases.items()]
+        entries.append(f"total;dur={total_ns / 1e6:.3f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Attribute the time spent in the block to a named Server-Timing phase.
+
+    Args:
+        phase: Phase name reported in Server-Timing (e.g. "db" or "llm")
+    """
+    timer = current_timer.get()
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        if timer is not None:
+            timer.add(phase, time.perf_counter_ns() - started)
+
+
+def _timed_endpoint(call: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint so the handler phase ends when it returns."""
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timer = current_timer.get()
+                if timer is not None:
+                    timer.mark("handler")
+        return async_endpoint
+
+    @functools.wraps(call)
+    def sync_endpoint(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return call(*args, **kwargs)
+        finally:
+            timer = current_timer.get()
+            if timer is not None:
+                timer.mark("handler")
+    return sync_endpoint
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that reports routing, handler and serialization phases.
+
+    Routing covers everything up to the route (middleware and path matching),
+    handler covers request parsing, dependencies and the endpoint itself, and
+    serialization covers response validation and encoding.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if self.dependant.call is not None:
+            self.dependant.call = _timed_endpoint(self.dependant.call)
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timer = current_timer.get()
+            if timer is not None:
+                timer.mark("routing")
+            response = await handler(request)
+            if timer is not None:
+                timer.mark("serialization")
+            return response
+
+        return timed_handler
+
+
+def _route_label(scope: Scope) -> str:
+    """Low-cardinality label for the matched route."""
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    return scope.get("root_path") or "unmatched"
+
+
+class TimingMiddleware:
+    """ASGI middleware timing every HTTP request.
+
+    Adds ``Server-Timing`` and ``X-Process-Time`` headers when the response
+    starts and records ``http_requests_total`` and ``http_request_duration_ms``
+    once the body has been sent. Bodies are forwarded as they arrive.
+
+    Args:
+        app: The ASGI application
+        server_timing: Whether to add the Server-Timing header
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = current_timer.set(timer)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                elapsed = timer.elapsed_ns()
+                headers["x-process-time"] = f"{elapsed / 1e9:.6f}"
+                if self.server_timing:
+                    headers.append("server-timing", timer.server_timing(elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timer.reset(token)
+            duration_ms = timer.elapsed_ns() / 1e6
+            labels = {
+                "method": scope["method"],
+                "route": _route_label(scope),
+                "status": f"{status_code // 100}xx",
+            }
+            metrics.counter("http_requests_total", "HTTP requests handled", **labels).inc()
+            metrics.histogram("http_request_duration_ms", "HTTP request duration including the body",
+                              **labels).observe(duration_ms)
+            for phase, duration in timer.phases.items():
+                metrics.histogram("http_request_phase_ms", "HTTP request phase duration",
+                                  phase=phase).observe(duration / 1e6)
+            app_logger.debug(f"Request processed in {duration_ms:.3f} ms.",
+                             extra={"path": scope["path"], "method": scope["method"], "process_time": duration_ms / 1000})
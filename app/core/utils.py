@@ -1,59 +1,75 @@
 import os
 import importlib
 import inspect
-from typing import List, Dict, Any, Optional, Type, Callable
+from typing import List, Dict, Any, Optional, Tuple, Type, Callable
 from fastapi import FastAPI, APIRouter
 import pkgutil
 from pathlib import Path
 
 from app.core.logging import app_logger
 from app.core.config import settings
+from app.core.manifest import discovery_manifest
 
-def setup_routers(app: FastAPI, api_prefix: str = "/api") -> None:
+def _scan_routers(package: str) -> List[Tuple[str, str]]:
+    """Find the APIRouter attributes of a package's modules by importing and reflecting over them."""
+    package_dir = Path(importlib.import_module(package).__file__).parent
+    found = []
+    seen = set()
+    for _, module_name, is_pkg in pkgutil.iter_modules([str(package_dir)]):
+        if is_pkg:
+            continue  # Skip packages for now
+        module = importlib.import_module(f"{package}.{module_name}")
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, APIRouter) and id(attr) not in seen:
+                seen.add(id(attr))
+                found.append((module.__name__, attr_name, attr))
+
+    # A router included into another one (e.g. diagnostics_router into api_router) is served through it
+    endpoints = {id(router): {getattr(route, "endpoint", None) for route in router.routes} for _, _, router in found}
+    return [
+        (module_name, attr_name)
+        for module_name, attr_name, router in found
+        if not any(other is not router and endpoints[id(router)] <= endpoints[id(other)] for _, _, other in found)
+    ]
+
+def discover_routers(package: str = "app.api") -> List[Tuple[str, str]]:
+    """Find the routers to include, from the discovery manifest when it is current.
+    
+    Args:
+        package: The package holding the API modules
+        
+    Returns:
+        (module name, attribute name) of every top-level APIRouter
+    """
+    return discovery_manifest.discover(f"routers:{package}", package, lambda: _scan_routers(package))
+
+def setup_routers(app: FastAPI, api_prefix: str = "/api", routers: Optional[List[Tuple[str, str]]] = None) -> None:
     """Automatically set up all routers in the app/api directory.
     
-    This function scans the app/api directory for modules containing APIRouter instances
-    and includes them in the FastAPI application with the specified prefix.
+    The modules and attributes holding APIRouter instances come from the discovery
+    manifest, so only those modules are imported; the package is scanned when the
+    manifest is missing or its sources changed.
     
     Args:
         app: The FastAPI application instance
         api_prefix: The prefix for all API routes (default: "/api")
+        routers: Routers found by discover_routers(), discovered here when omitted
     """
     try:
-        # Get the path to the api directory
-        api_dir = Path(os.path.dirname(os.path.dirname(__file__))) / "api"
-        
-        # Check if the api directory exists
-        if not api_dir.exists() or not api_dir.is_dir():
-            app_logger.warning(f"API directory not found: {api_dir}")
-            return
-        
-        # Import all modules in the api directory
-        package_name = "app.api"
-        
         # Track the number of routers added
         router_count = 0
         
-        # Scan the package for modules
-        for _, module_name, is_pkg in pkgutil.iter_modules([str(api_dir)]):
-            if is_pkg:
-                continue  # Skip packages for now
-            
-            # Import the module
-            module = importlib.import_module(f"{package_name}.{module_name}")
-            
-            # Look for APIRouter instances in the module
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if isinstance(attr, APIRouter):
-                    # Include the router in the app
-                    app.include_router(attr, prefix=api_prefix)
-                    router_count += 1
-                    app_logger.info(f"Added router from {module_name}.{attr_name}")
+        for module_name, attr_name in routers if routers is not None else discover_routers():
+            # Include the router in the app
+            app.include_router(import_string(f"{module_name}.{attr_name}"), prefix=api_prefix)
+            router_count += 1
+            app_logger.info(f"Added router from {module_name}.{attr_name}")
         
         app_logger.info(f"Set up {router_count} routers with prefix '{api_prefix}'")
     except Exception as e:
         app_logger.error(f"Error setting up routers: {e}")
+        raise
 
 def validate_environment() -> List[str]:
     """Validate required environment variables.
@@ -103,17 +119,9 @@ def import_string(dotted_path: str) -> Any:
     except AttributeError as e:
         raise ImportError(f"Module '{module_path}' does not define a '{class_name}' attribute") from e
 
-def get_subclasses(base_class: Type, package: str) -> List[Type]:
-    """Get all subclasses of a base class in a package.
-    
-    Args:
-        base_class: The base class to find subclasses of
-        package: The package to search in (e.g., "app.models")
-        
-    Returns:
-        List of subclasses
-    """
-    subclasses = []
+def _scan_subclasses(base_class: Type, package: str) -> List[Tuple[str, str]]:
+    """Find subclasses of base_class in a package's modules by importing and reflecting over them."""
+    found = []
     package_dir = Path(importlib.import_module(package).__file__).parent
     
     for _, module_name, is_pkg in pkgutil.iter_modules([str(package_dir)]):
@@ -127,9 +135,26 @@ def get_subclasses(base_class: Type, package: str) -> List[Type]:
         for attr_name in dir(module):
             attr = getattr(module, attr_name)
             if inspect.isclass(attr) and issubclass(attr, base_class) and attr != base_class:
-                subclasses.append(attr)
+                found.append((module.__name__, attr_name))
+    
+    return found
+
+def get_subclasses(base_class: Type, package: str) -> List[Type]:
+    """Get all subclasses of a base class in a package.
+    
+    Only the modules listed in the discovery manifest are imported; the package
+    is scanned when the manifest is missing or its sources changed.
     
-    return subclasses
+    Args:
+        base_class: The base class to find subclasses of
+        package: The package to search in (e.g., "app.models")
+        
+    Returns:
+        List of subclasses
+    """
+    key = f"subclasses:{package}:{base_class.__module__}.{base_class.__qualname__}"
+    attributes = discovery_manifest.discover(key, package, lambda: _scan_subclasses(base_class, package))
+    return [import_string(f"{module_name}.{attr_name}") for module_name, attr_name in attributes]
 
 def create_dir_if_not_exists(directory: str) -> None:
     """Create a directory if it doesn't exist.
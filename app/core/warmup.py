@@ -0,0 +1,74 @@
+"""
+Cache warm-up registry for the GenAI Portfolio application.
+Subsystems register warmers that fill their caches (pre-serialized catalogs,
+the static file hot set, compiled templates). ``warm_up()`` runs them once per
+process: before forking workers, so the warm state is shared copy-on-write, or
+in the application lifespan when serving from a single process.
+"""
+
+import threading
+from typing import Callable, Dict
+
+from app.core.health import readiness
+from app.core.logging import app_logger
+from app.core.startup import startup_phase, startup_phases
+
+# Define what this module exports
+__all__ = ["register_warmer", "warmer", "warm_up", "is_warm"]
+
+Warmer = Callable[[], None]
+
+_warmers: Dict[str, Warmer] = {}
+_warm = False
+_lock = threading.Lock()
+
+
+def register_warmer(name: str, func: Warmer) -> None:
+    """Register a function that fills a cache.
+
+    Args:
+        name: Warmer name, recorded as the startup phase "warmup.<name>"
+        func: Callable without arguments; registering a name again replaces it
+    """
+    _warmers[name] = func
+
+
+def warmer(name: str) -> Callable[[Warmer], Warmer]:
+    """Decorator form of register_warmer()."""
+    def decorator(func: Warmer) -> Warmer:
+        register_warmer(name, func)
+        return func
+    return decorator
+
+
+def warm_up() -> Dict[str, float]:
+    """Run every registered warmer once per process.
+
+    A failing warmer is logged and skipped; the cache it fills is then built
+    lazily by the first request that needs it.
+
+    Returns:
+        Duration of each warmer in milliseconds (empty when already warm)
+    """
+    global _warm
+    with _lock:
+        if _warm:
+            return {}
+        durations = {}
+        for name, func in list(_warmers.items()):
+            phase = f"warmup.{name}"
+            try:
+                with startup_phase(phase):
+                    func()
+            except Exception as e:
+                app_logger.warning(f"Cache warmer '{name}' failed: {e}")
+            durations[name] = startup_phases().get(phase, 0.0)
+        _warm = True
+    readiness.set("caches", True, f"{len(durations)} warmers run")
+    app_logger.info(f"Warmed {len(durations)} caches in {sum(durations.values()):.1f} ms")
+    return durations
+
+
+def is_warm() -> bool:
+    """Whether warm_up() has completed in this process."""
+    return _warm
@@ -0,0 +1,562 @@
+"""
+Pre-fork multi-worker serving for the GenAI Portfolio application.
+The master process builds the application and warms its caches once, then
+forks the workers so that the warm state is shared copy-on-write. The master
+owns the listening socket: it accepts each connection and hands it to a worker
+chosen by a hash of a header set by a proxy (WORKER_STICKY_HEADER, by default
+Fly's fly-client-ip), or of the client address when the header is missing, so
+the page request and the NiceGUI websocket of a browser reach the worker that
+holds the client's state. A proxy reuses its upstream connections for different
+visitors, so a worker that receives a request whose key maps to another worker
+ends the connection after the response: the proxy's next request arrives on a
+new connection and is routed by its own key. Requests of the visitor the
+connection was routed for keep it alive.
+
+Signals to the master:
+    SIGHUP          rolling restart, one worker at a time
+    SIGUSR1         forwarded to the workers, which reload runtime-tunable settings
+    SIGINT/SIGTERM  graceful shutdown (a second signal kills the workers)
+
+Workers are re-forked from the warm master, so a rolling restart starts fresh
+processes but does not load new code; restart the master to deploy.
+"""
+
+import asyncio
+import gc
+import os
+import selectors
+import signal
+import socket
+import time
+import traceback
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import uvicorn
+
+from app.core.logging import app_logger
+from app.core.warmup import warm_up
+
+# Define what this module exports
+__all__ = [
+    "PreforkServer",
+    "WorkerProcess",
+    "current_worker",
+    "prefork_supported",
+    "resolve_worker_count",
+    "sticky_key",
+    "worker_for_key",
+]
+
+# Messages on the datagram channel between master and worker
+READY = b"R"
+CONNECTION = b"C"
+
+PEEK_BYTES = 8192  # request head inspected when routing by header
+PEEK_TIMEOUT = 1.0  # seconds a new connection may take to send its request head
+READY_TIMEOUT = 60.0  # seconds a worker may take to start
+RESPAWN_DELAY = 1.0  # seconds before replacing a worker that died during startup
+
+# Slot of this process when it is a worker, None in the master or a single process
+_worker_slot: Optional[int] = None
+
+
+def current_worker() -> Optional[int]:
+    """Return the worker slot of this process, or None outside pre-fork mode."""
+    return _worker_slot
+
+
+def prefork_supported() -> bool:
+    """Whether this platform can fork and pass sockets between processes."""
+    return hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+
+def resolve_worker_count(workers: int) -> int:
+    """Resolve the configured worker count, where 0 means one per available core."""
+    if workers > 0:
+        return workers
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+def sticky_key(head: bytes, header: bytes) -> Optional[bytes]:
+    """Extract the value of a header from a raw HTTP request head.
+
+    Args:
+        head: Request line and headers as received
+        header: Lower-case header name
+
+    Returns:
+        The header value, or None when the header is missing
+    """
+    for line in head.split(b"\r\n\r\n", 1)[0].split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == header:
+            return value.strip()
+    return None
+
+
+def worker_for_key(key: bytes, worker_count: int) -> int:
+    """Slot of the worker a routing key maps to while all workers are ready."""
+    return zlib.crc32(key) % worker_count
+
+
+class _CloseMisroutedConnections:
+    """ASGI wrapper ending keep-alive after a request whose sticky key belongs to another worker.
+
+    Args:
+        app: The ASGI application
+        header: Lower-case sticky header name
+        worker_count: Number of worker slots
+    """
+
+    def __init__(self, app, header: bytes, worker_count: int) -> None:
+        self.app = app
+        self.header = header
+        self.worker_count = worker_count
+
+    def _misrouted(self, scope) -> bool:
+        slot = current_worker()
+        if slot is None:
+            return False
+        key = next((value for name, value in scope["headers"] if name == self.header), None)
+        return key is not None and worker_for_key(key.strip(), self.worker_count) != slot
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self._misrouted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_closing(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"connection", b"close")]}
+            await send(message)
+
+        await self.app(scope, receive, send_closing)
+
+
+@dataclass
+class WorkerProcess:
+    """A forked worker as seen by the master."""
+
+    slot: int
+    pid: int
+    channel: socket.socket  # master end of the datagram socket pair
+    started: float = field(default_factory=time.monotonic)
+    ready: bool = False
+
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that serves connections accepted by the master."""
+
+    def __init__(self, config: uvicorn.Config, channel: socket.socket) -> None:
+        super().__init__(config)
+        self.channel = channel
+        self.master_pid = os.getppid()
+        self._connecting = set()
+
+    async def startup(self, sockets=None) -> None:
+        # Run the lifespan without listening; connections arrive on the channel
+        await super().startup(sockets=[])
+        if self.should_exit:
+            return
+        loop = asyncio.get_running_loop()
+        self.channel.setblocking(False)
+        loop.add_reader(self.channel.fileno(), self._receive_connections, loop)
+        self.channel.send(READY)
+
+    def _create_protocol(self) -> asyncio.Protocol:
+        return self.config.http_protocol_class(
+            config=self.config,
+            server_state=self.server_state,
+            app_state=self.lifespan.state,
+        )
+
+    def _receive_connections(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            try:
+                _, fds, _, _ = socket.recv_fds(self.channel, 16, 1)
+            except (BlockingIOError, InterruptedError):
+                return
+            for fd in fds:
+                task = loop.create_task(self._connect(loop, socket.socket(fileno=fd)))
+                self._connecting.add(task)
+                task.add_done_callback(self._connecting.discard)
+
+    async def _connect(self, loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+        try:
+            await loop.connect_accepted_socket(self._create_protocol, sock)
+        except OSError:
+            sock.close()
+
+    async def on_tick(self, counter: int) -> bool:
+        # Exit when the master is gone instead of serving without supervision
+        if counter % 10 == 0 and os.getppid() != self.master_pid:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+    async def shutdown(self, sockets=None) -> None:
+        asyncio.get_running_loop().remove_reader(self.channel.fileno())
+        await super().shutdown(sockets=sockets)
+
+
+class PreforkServer:
+    """Master process of the pre-fork serving mode.
+
+    Args:
+        app: ASGI application, fully constructed
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Number of worker processes
+        sticky_header: Route by this request header (e.g. "fly-client-ip"),
+            falling back to the peer address; None routes by address only
+        graceful_timeout: Seconds a stopping worker may take to finish requests
+        log_level: Uvicorn log level of the workers
+        backlog: Listen backlog of the shared socket
+    """
+
+    def __init__(
+        self,
+        app,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers: int = 2,
+        sticky_header: Optional[str] = None,
+        graceful_timeout: int = 30,
+        log_level: str = "warning",
+        backlog: int = 2048,
+    ) -> None:
+        self.worker_count = max(workers, 1)
+        self.sticky_header = sticky_header.lower().encode() if sticky_header else None
+        if self.sticky_header is not None and self.worker_count > 1:
+            # Routing happens per connection; a pooled connection reused for another visitor is re-routed
+            app = _CloseMisroutedConnections(app, self.sticky_header, self.worker_count)
+        self.config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level=log_level,
+            lifespan="on",
+            timeout_graceful_shutdown=graceful_timeout,
+            backlog=backlog,
+        )
+        self.graceful_timeout = graceful_timeout
+
+        self.slots: List[Optional[WorkerProcess]] = [None] * self.worker_count
+        self.workers: Dict[int, WorkerProcess] = {}
+        self.listener: Optional[socket.socket] = None
+        self.selector: Optional[selectors.BaseSelector] = None
+        self._pending: Dict[socket.socket, Tuple[float, bytes]] = {}
+        self._respawn_at: Dict[int, float] = {}
+        self._restart_queue: List[int] = []
+        self._replacement: Optional[WorkerProcess] = None
+        self._signals: List[int] = []
+        self._wakeup: Tuple[socket.socket, ...] = ()
+        self._stop_deadline: Optional[float] = None
+        self._listening = False
+
+    # Lifecycle ---------------------------------------------------------------
+
+    def run(self) -> int:
+        """Warm the caches, fork the workers and supervise them until stopped.
+
+        Returns:
+            Process exit code
+        """
+        self.config.load()
+        warm_up()
+        self.listener = self._bind()
+        self.selector = selectors.DefaultSelector()
+        self._wakeup = socket.socketpair()
+        for sock in self._wakeup:
+            sock.setblocking(False)
+        self.selector.register(self._wakeup[0], selectors.EVENT_READ, self._drain_wakeup)
+        signal.set_wakeup_fd(self._wakeup[1].fileno(), warn_on_full_buffer=False)
+        for signum in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM, signal.SIGCHLD, signal.SIGUSR1):
+            signal.signal(signum, self._on_signal)
+
+        # Objects created so far are shared with the workers; keep the cyclic
+        # garbage collector from touching (and thereby copying) their pages
+        gc.collect()
+        if hasattr(gc, "freeze"):
+            gc.freeze()
+
+        app_logger.info(
+            f"Pre-fork master {os.getpid()} listening on {self.config.host}:{self.config.port} "
+            f"with {self.worker_count} workers")
+        for slot in range(self.worker_count):
+            self._spawn(slot)
+
+        try:
+            while self.workers or self._stop_deadline is None:
+                for key, _ in self.selector.select(0.25 if self._pending else 1.0):
+                    key.data(key.fileobj)
+                self._handle_signals()
+                self._reap()
+                self._tick()
+        finally:
+            signal.set_wakeup_fd(-1)
+            self.selector.close()
+            for sock in self._wakeup:
+                sock.close()
+            if self.listener is not None:
+                self.listener.close()
+        app_logger.info("Pre-fork master stopped")
+        return 0
+
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.config.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.config.host, self.config.port))
+        sock.listen(self.config.backlog)
+        sock.setblocking(False)
+        return sock
+
+    def _spawn(self, slot: int) -> WorkerProcess:
+        master_end, worker_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                master_end.close()
+                code = self._run_worker(slot, worker_end)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+
+        worker_end.close()
+        master_end.setblocking(False)
+        worker = WorkerProcess(slot, pid, master_end)
+        self.workers[pid] = worker
+        self.selector.register(master_end, selectors.EVENT_READ, self._on_worker_message)
+        return worker
+
+    def _run_worker(self, slot: int, channel: socket.socket) -> int:
+        """Body of a forked worker process."""
+        global _worker_slot
+        _worker_slot = slot
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        # Until the application's settings watcher takes it over
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        # Drop the master's descriptors: listener, selector and other channels
+        self.selector.close()
+        self.listener.close()
+        for sock in self._wakeup:
+            sock.close()
+        for sock in list(self._pending):
+            sock.close()
+        for worker in self.workers.values():
+            worker.channel.close()
+
+        self.config.setup_event_loop()
+        asyncio.run(_WorkerServer(self.config, channel).serve())
+        return 0
+
+    # Connection dispatch -----------------------------------------------------
+
+    def _accept(self, listener: socket.socket) -> None:
+        while True:
+            try:
+                conn, address = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # Out of descriptors or similar; keep serving existing workers
+                app_logger.error(f"Accept failed: {e}")
+                return
+            client = str(address[0]).encode()
+            if self.sticky_header is None:
+                self._dispatch(conn, client)
+            else:
+                conn.setblocking(False)
+                self._pending[conn] = (time.monotonic() + PEEK_TIMEOUT, client)
+                self.selector.register(conn, selectors.EVENT_READ, self._peek)
+
+    def _peek(self, conn: socket.socket) -> None:
+        """Route a connection by header once its request head has arrived."""
+        _, client = self._pending.pop(conn)
+        self.selector.unregister(conn)
+        try:
+            head = conn.recv(PEEK_BYTES, socket.MSG_PEEK)
+        except OSError:
+            head = b""
+        if not head:
+            conn.close()
+            return
+        # A head split across segments is rare; route it by address rather than wait
+        self._dispatch(conn, sticky_key(head, self.sticky_header) or client)
+
+    def _dispatch(self, conn: socket.socket, key: bytes) -> None:
+        """Hand a connection to the worker its key maps to, or the next ready one."""
+        try:
+            start = worker_for_key(key, self.worker_count)
+            for offset in range(self.worker_count):
+                worker = self.slots[(start + offset) % self.worker_count]
+                if worker is None or not worker.ready:
+                    continue
+                try:
+                    socket.send_fds(worker.channel, [CONNECTION], [conn.fileno()])
+                    return
+                except OSError:
+                    # Channel full or worker exiting; try the next one
+                    continue
+            app_logger.warning("No worker available, dropping connection")
+        finally:
+            conn.close()
+
+    def _on_worker_message(self, channel: socket.socket) -> None:
+        try:
+            message = channel.recv(16)
+        except OSError:
+            return
+        if message != READY:
+            return
+        worker = next((w for w in self.workers.values() if w.channel is channel), None)
+        if worker is None:
+            return
+        worker.ready = True
+        app_logger.info(f"Worker {worker.slot} ready (pid {worker.pid}, "
+                        f"{time.monotonic() - worker.started:.2f}s)")
+        if self.slots[worker.slot] is None:
+            self.slots[worker.slot] = worker
+        if not self._listening and self._stop_deadline is None:
+            # Connections wait in the backlog until the first worker can serve
+            self.selector.register(self.listener, selectors.EVENT_READ, self._accept)
+            self._listening = True
+
+    # Supervision -------------------------------------------------------------
+
+    def _on_signal(self, signum: int, frame) -> None:
+        self._signals.append(signum)
+
+    def _drain_wakeup(self, sock: socket.socket) -> None:
+        try:
+            while sock.recv(512):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _handle_signals(self) -> None:
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum == signal.SIGHUP:
+                self._begin_rolling_restart()
+            elif signum == signal.SIGUSR1:
+                app_logger.info("Reloading settings in all workers")
+                self._kill_all(signal.SIGUSR1)
+            elif signum in (signal.SIGINT, signal.SIGTERM):
+                self._stop()
+
+    def _begin_rolling_restart(self) -> None:
+        if self._stop_deadline is not None:
+            return
+        if self._restart_queue or self._replacement is not None:
+            app_logger.warning("Rolling restart already in progress")
+            return
+        app_logger.info("Rolling restart of all workers")
+        self._restart_queue = list(range(self.worker_count))
+
+    def _stop(self) -> None:
+        if self._stop_deadline is not None:
+            app_logger.warning("Second stop signal, killing workers")
+            self._kill_all(signal.SIGKILL)
+            return
+        app_logger.info("Stopping workers")
+        self._stop_deadline = time.monotonic() + self.graceful_timeout + 5
+        self._restart_queue.clear()
+        if self._listening:
+            self.selector.unregister(self.listener)
+            self._listening = False
+        self.listener.close()
+        for conn in list(self._pending):
+            self.selector.unregister(conn)
+            conn.close()
+        self._pending.clear()
+        self._kill_all(signal.SIGTERM)
+
+    def _kill_all(self, signum: int) -> None:
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            self.selector.unregister(worker.channel)
+            worker.channel.close()
+            code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+
+            if worker is self._replacement:
+                app_logger.error(f"Replacement worker {worker.slot} exited with {code}, aborting rolling restart")
+                self._replacement = None
+                self._restart_queue.clear()
+            elif self.slots[worker.slot] is worker or (self.slots[worker.slot] is None and not worker.ready):
+                self.slots[worker.slot] = None
+                if self._stop_deadline is None:
+                    app_logger.warning(f"Worker {worker.slot} (pid {pid}) exited with {code}, respawning")
+                    delay = 0.0 if worker.ready else RESPAWN_DELAY
+                    self._respawn_at[worker.slot] = time.monotonic() + delay
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+
+        for slot, due in list(self._respawn_at.items()):
+            if now >= due:
+                del self._respawn_at[slot]
+                self._spawn(slot)
+
+        for conn, (deadline, client) in list(self._pending.items()):
+            if now >= deadline:
+                # No request head in time (e.g. a slow client); route by address
+                del self._pending[conn]
+                self.selector.unregister(conn)
+                self._dispatch(conn, client)
+
+        self._advance_rolling_restart(now)
+
+        if self._stop_deadline is not None and now >= self._stop_deadline and self.workers:
+            app_logger.warning("Workers did not stop in time, killing them")
+            self._kill_all(signal.SIGKILL)
+            self._stop_deadline = now + 5
+
+    def _advance_rolling_restart(self, now: float) -> None:
+        """Replace one slot at a time: start the new worker, then retire the old."""
+        replacement = self._replacement
+        if replacement is not None:
+            if replacement.ready:
+                old = self.slots[replacement.slot]
+                self.slots[replacement.slot] = replacement
+                self._replacement = None
+                if old is not None and old is not replacement:
+                    old.ready = False
+                    os.kill(old.pid, signal.SIGTERM)
+                if not self._restart_queue:
+                    app_logger.info("Rolling restart complete")
+            elif now - replacement.started > READY_TIMEOUT:
+                app_logger.error(f"Replacement worker {replacement.slot} did not start, aborting rolling restart")
+                os.kill(replacement.pid, signal.SIGKILL)
+                self._replacement = None
+                self._restart_queue.clear()
+            return
+
+        if self._restart_queue and self._stop_deadline is None:
+            slot = self._restart_queue.pop(0)
+            if slot in self._respawn_at:
+                return
+            self._replacement = self._spawn(slot)
@@ -1,24 +1,100 @@
 """
 Main application module for the GenAI Portfolio.
-Creates and configures the NiceGUI application with FastAPI integration.
+Provides the application factory that builds the FastAPI app, mounts NiceGUI and
+registers the portfolio pages exactly once per process. Importing this module has
+no side effects; runtime resources are initialized in the application lifespan.
+
+Every construction step is recorded as a startup phase (settings, logging,
+discovery, routers, theme, pages, database) and reported at /api/v1/diagnostics/startup.
 """
 
-from nicegui import ui, app as nicegui_app
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from pathlib import Path
 import asyncio
-from typing import Optional
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import FastAPI
+
+from app.core.snapshot import register_snapshot, restore_snapshot, save_snapshot
+from app.core.startup import mark_ready, startup_phase
+from app.core.warmup import register_warmer, warm_up
+
+# The application built by create_portfolio_app(), once per process
+_application: Optional[FastAPI] = None
+_application_lock = threading.Lock()
+
+
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI) -> AsyncIterator[None]:
+    """Initialize runtime resources on startup and release them on shutdown."""
+    from app.core import app_logger, settings
+
+    from app.core.health import readiness
+
+    if settings.ENABLE_DATABASE:
+        with startup_phase("database"):
+            from app.core.database import ping_database, setup_database
+            setup_database()
+        readiness.register_check("database", ping_database)
 
-from app.core import app_logger, settings
-from app.api.router import api_router
-from app.ui.pages import create_portfolio_pages
-from app.ui.components import setup_theme
+    # Uploads are stored and extracted by the ingestion pool
+    from app.services.ingestion import ingestion_pool
+    readiness.register_check("ingestion", ingestion_pool.check)
+
+    # No-op when the caches were warmed before forking workers
+    warm_up()
+    await readiness.refresh()
+    checks = asyncio.create_task(readiness.run_checks(settings.READINESS_CHECK_INTERVAL or 10))
+    if settings.LOOP_MONITOR_ENABLED:
+        from app.core.loop_monitor import loop_monitor
+        loop_monitor.start()
+    # Runtime-tunable settings follow .env and SIGUSR1 without a restart
+    from app.core.config import watch_settings
+    reloader = asyncio.create_task(watch_settings())
+
+    # Uploads stored while the previous process was stopping still need ingesting
+    from app.core.workers import current_worker
+    backfill = asyncio.create_task(ingestion_pool.backfill()) if current_worker() in (None, 0) else None
+
+    readiness.mark_started()
+    mark_ready()
+    app_logger.info("Portfolio application ready")
+    yield
+    readiness.mark_stopping()
+    checks.cancel()
+    reloader.cancel()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.stop()
+    if backfill is not None:
+        backfill.cancel()
+    app_logger.info("Portfolio application shutting down")
+    ingestion_pool.shutdown()
+    from app.services.ai import ai_gateway
+    await ai_gateway.aclose()
+
+    # One process writes the snapshot; pre-forked workers hold similar caches
+    if settings.WARM_SNAPSHOT_FILE and current_worker() in (None, 0):
+        try:
+            save_snapshot(Path(settings.WARM_SNAPSHOT_FILE))
+        except OSError as e:
+            app_logger.warning(f"Could not save the warm-state snapshot: {e}")
+
+
+def create_fastapi_app(routers: Optional[List[Tuple[str, str]]] = None) -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    Args:
+        routers: Routers found by discover_routers(), discovered here when omitted
+    """
+    from app.core import app_logger, settings
+    from app.core.assets import STATIC_DIRECTORY
+    from app.core.config import on_settings_change
+    from app.core.middleware import setup_middleware
+    from app.core.static import CachedStaticFiles
+    from app.core.timing import TimedRoute
+    from app.core.utils import setup_routers
 
-def create_fastapi_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
-    
     # Create FastAPI app
     fastapi_app = FastAPI(
         title=settings.APP_NAME,
@@ -26,25 +102,34 @@ def create_fastapi_app() -> FastAPI:
         version=settings.APP_VERSION,
         docs_url="/docs" if settings.DEBUG else None,
         redoc_url="/redoc" if settings.DEBUG else None,
+        lifespan=lifespan,
     )
-    
-    # Add CORS middleware
-    fastapi_app.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.CORS_ORIGINS,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-    
-    # Include API router
-    fastapi_app.include_router(api_router, prefix=settings.API_PREFIX)
-    
+    fastapi_app.router.route_class = TimedRoute
+
+    # Add CORS, compression, session and timing middleware
+    setup_middleware(fastapi_app)
+
+    # Include the API routers listed in the discovery manifest
+    setup_routers(fastapi_app, settings.API_PREFIX, routers)
+
     # Mount static files
-    static_path = Path("./static")
-    if static_path.exists():
-        fastapi_app.mount("/static", StaticFiles(directory=static_path), name="static")
-    
+    if STATIC_DIRECTORY.exists():
+        static_files = CachedStaticFiles(
+            directory=STATIC_DIRECTORY,
+            cache_max_bytes=(settings.STATIC_CACHE_MAX_MB or 16) * 1024 * 1024,
+            cache_max_file_bytes=(settings.STATIC_CACHE_MAX_FILE_KB or 256) * 1024,
+        )
+        fastapi_app.mount("/static", static_files, name="static")
+        register_warmer("static", static_files.warm)
+        register_snapshot("static", static_files.snapshot_state, static_files.restore_state)
+        on_settings_change(
+            ["STATIC_CACHE_MAX_MB", "STATIC_CACHE_MAX_FILE_KB"],
+            lambda changes: static_files.resize(
+                cache_max_bytes=(settings.STATIC_CACHE_MAX_MB or 16) * 1024 * 1024,
+                cache_max_file_bytes=(settings.STATIC_CACHE_MAX_FILE_KB or 256) * 1024,
+            ),
+        )
+
     # Health check endpoint
     @fastapi_app.get("/health")
     async def health_check():
@@ -53,52 +138,107 @@ def create_fastapi_app() -> FastAPI:
             "app": settings.APP_NAME,
             "version": settings.APP_VERSION
         }
-    
+
     app_logger.info("FastAPI application configured successfully")
     return fastapi_app
 
+
+def _build_middleware_stack(fastapi_app: FastAPI) -> None:
+    """Build the middleware stack now instead of on the first request."""
+    if fastapi_app.middleware_stack is None:
+        fastapi_app.middleware_stack = fastapi_app.build_middleware_stack()
+
+
 def create_portfolio_app() -> FastAPI:
-    """Create the complete portfolio application with NiceGUI integration."""
-    
-    try:
-        # Create FastAPI app
-        fastapi_app = create_fastapi_app()
-        
-        # Configure NiceGUI to use our FastAPI app
-        nicegui_app.mount_to(fastapi_app)
-        
-        # Setup theme and styling
-        setup_theme()
-        
-        # Create portfolio pages
-        create_portfolio_pages()
-        
-        app_logger.info("Portfolio application created successfully")
-        return fastapi_app
-        
-    except Exception as e:
-        app_logger.error(f"Failed to create portfolio application: {e}")
-        raise
-
-# Global app instance
-app: Optional[FastAPI] = None
+    """Create the complete portfolio application with NiceGUI integration.
+
+    The factory is idempotent: routes, theme and pages are registered on the
+    first call and later calls return the same application.
+
+    Returns:
+        The FastAPI application with NiceGUI mounted at /
+    """
+    global _application
+    if _application is not None:
+        return _application
+
+    with _application_lock:
+        if _application is not None:
+            return _application
+
+        with startup_phase("settings"):
+            from app.core import settings
+            from app.core.config import bootstrap_settings
+            bootstrap_settings()
+        with startup_phase("logging"):
+            from app.core import app_logger
+
+        if settings.WARM_SNAPSHOT_FILE:
+            # Registered before the other warmers, which then find their caches restored
+            snapshot_file = Path(settings.WARM_SNAPSHOT_FILE)
+            register_warmer("snapshot", lambda: restore_snapshot(snapshot_file))
+
+        try:
+            with startup_phase("discovery"):
+                from app.core.utils import discover_routers
+                routers = discover_routers()
+
+            with startup_phase("routers"):
+                fastapi_app = create_fastapi_app(routers)
+
+            with startup_phase("theme"):
+                from app.ui.components import setup_theme
+                setup_theme()
+
+            with startup_phase("pages"):
+                from app.core.nicegui_setup import setup_nicegui
+                from app.ui.pages import create_portfolio_pages
+                from app.ui.sessions import client_monitor
+
+                create_portfolio_pages()
+                # Track per-client memory and evict idle clients
+                client_monitor.install()
+                # NiceGUI's catch-all mount must come after all other routes
+                setup_nicegui(
+                    fastapi_app,
+                    title="GenAI Engineer Portfolio",
+                    favicon="🤖",
+                    dark=False,
+                )
+                register_warmer("middleware", lambda: _build_middleware_stack(fastapi_app))
+
+            app_logger.info("Portfolio application created successfully")
+            _application = fastapi_app
+            return fastapi_app
+
+        except Exception as e:
+            app_logger.error(f"Failed to create portfolio application: {e}")
+            raise
+
 
 def get_app() -> FastAPI:
     """Get or create the application instance."""
-    global app
-    if app is None:
-        app = create_portfolio_app()
-    return app
-
-# Create the app when this module is imported
-if __name__ != "__main__":
-    try:
-        app = create_portfolio_app()
-    except Exception as e:
-        app_logger.error(f"Failed to initialize application: {e}")
-        # Create a minimal FastAPI app as fallback
-        app = FastAPI(title="Portfolio (Fallback Mode)")
-        
-        @app.get("/")
-        async def fallback_root():
-            return {"message": "Portfolio application is in fallback mode", "error": str(e)}
\ No newline at end of file
+    return create_portfolio_app()
+
+
+def _create_fallback_app(error: Exception) -> FastAPI:
+    """Minimal app served when the portfolio cannot be built."""
+    fallback_app = FastAPI(title="Portfolio (Fallback Mode)")
+
+    @fallback_app.get("/")
+    async def fallback_root():
+        return {"message": "Portfolio application is in fallback mode", "error": str(error)}
+
+    return fallback_app
+
+
+def __getattr__(name: str) -> FastAPI:
+    # Support "uvicorn app.main:app" without building the app at import time
+    if name == "app":
+        try:
+            return get_app()
+        except Exception as e:
+            from app.core import app_logger
+            app_logger.error(f"Failed to initialize application: {e}")
+            return _create_fallback_app(e)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,388 @@
+"""
+Language model access for the GenAI Portfolio application.
+The AI demos call ``ai_gateway``, which tries the configured providers
+(OpenAI, Anthropic) in order of preference. Each provider sits behind a
+circuit breaker, so a provider that fails or slows down is skipped for a while
+instead of holding handlers; when no provider answers, the demos fall back to
+the mock responses. With ``AI_HEDGE_DELAY_MS`` set, a request still waiting on
+its first provider after that long is also sent to the next one and the first
+answer wins, which cuts tail latency at the cost of some duplicate calls.
+
+The "fake" provider answers locally with configurable latency and failures,
+for exercising the breakers and hedging without API keys.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.core import settings
+from app.core.config import on_settings_change
+from app.core.exceptions import ExternalServiceError
+from app.core.lazy_imports import lazy_import
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+from app.core.resilience import CircuitBreaker
+
+httpx = lazy_import("httpx")
+
+# Define what this module exports
+__all__ = [
+    "AIGateway",
+    "AIProvider",
+    "AIResult",
+    "AnthropicProvider",
+    "FakeProvider",
+    "MockProvider",
+    "OpenAIProvider",
+    "ai_gateway",
+    "build_ai_gateway",
+]
+
+# Kinds of completion the demos request
+TEXT_GENERATION = "text-generation"
+CHAT = "chat"
+
+# Output budget by requested length
+MAX_TOKENS = {"short": 150, "medium": 400, "long": 800}
+
+CHAT_RESPONSES = [
+    "That's an interesting question! In a real implementation, I would use advanced language models to provide helpful responses.",
+    "I understand what you're asking. This demo showcases how AI chat systems can maintain context and provide relevant responses.",
+    "Great point! AI assistants can help with various tasks including answering questions and providing explanations.",
+    "Thanks for trying this demo! Real AI systems use sophisticated NLP models for natural conversations."
+]
+
+
+@dataclass
+class AIResult:
+    """Answer of the gateway."""
+
+    text: str
+    provider: str
+    fallback: bool = False  # True when no provider answered and the mock did
+    hedged: bool = False  # True when a second provider was asked
+
+
+def _instructions(kind: str, options: Dict[str, str]) -> str:
+    if kind == CHAT:
+        return "You are the assistant on a Generative AI engineer's portfolio site. Answer briefly."
+    return f"Write {options.get('length', 'medium')} text in a {options.get('style', 'creative')} style."
+
+
+class AIProvider:
+    """A language model behind the gateway.
+
+    Args:
+        name: Provider name, used for its breaker and in metrics
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> str:
+        """Answer a prompt.
+
+        Args:
+            kind: TEXT_GENERATION or CHAT
+            prompt: The user's prompt or message
+            **options: style and length for text generation
+
+        Raises:
+            ExternalServiceError: The provider did not answer
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release connections."""
+
+
+class _HTTPProvider(AIProvider):
+    """Provider reached over HTTPS with a pooled client."""
+
+    def __init__(self, name: str, api_key: str, model: str) -> None:
+        super().__init__(name)
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Calls are bounded by the gateway's timeout
+            self._client = httpx.AsyncClient(timeout=None, limits=httpx.Limits(max_keepalive_connections=8))
+        return self._client
+
+    async def _post(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            response = await self.client.post(url, headers=headers, json=payload)
+        except httpx.HTTPError as e:
+            raise ExternalServiceError(f"{self.name} request failed: {type(e).__name__}") from e
+        if response.status_code != 200:
+            raise ExternalServiceError(f"{self.name} returned HTTP {response.status_code}")
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class OpenAIProvider(_HTTPProvider):
+    """OpenAI chat completions."""
+
+    def __init__(self, api_key: str, model: str) -> None:
+        super().__init__("openai", api_key, model)
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> str:
+        data = await self._post(
+            "https://api.openai.com/v1/chat/completions",
+            {"Authorization": f"Bearer {self.api_key}"},
+            {
+                "model": self.model,
+                "max_tokens": MAX_TOKENS.get(options.get("length", "medium"), 400),
+                "messages": [{"role": "system", "content": _instructions(kind, options)},
+                             {"role": "user", "content": prompt}],
+            },
+        )
+        return data["choices"][0]["message"]["content"]
+
+
+class AnthropicProvider(_HTTPProvider):
+    """Anthropic messages API."""
+
+    def __init__(self, api_key: str, model: str) -> None:
+        super().__init__("anthropic", api_key, model)
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> str:
+        data = await self._post(
+            "https://api.anthropic.com/v1/messages",
+            {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"},
+            {
+                "model": self.model,
+                "max_tokens": MAX_TOKENS.get(options.get("length", "medium"), 400),
+                "system": _instructions(kind, options),
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        )
+        return "".join(block.get("text", "") for block in data["content"])
+
+
+class FakeProvider(AIProvider):
+    """Local provider with injected latency and failures.
+
+    Args:
+        name: Provider name
+        latency: Seconds every call takes
+        jitter: Extra seconds, uniformly distributed, added to each call
+        failure_rate: Fraction of calls that raise ExternalServiceError
+        slow_rate: Fraction of calls that take ``slow_latency`` instead (the tail)
+        slow_latency: Seconds a tail call takes
+        seed: Seed of the random generator, for reproducible runs
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        latency: float = 0.8,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(name)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> str:
+        self.calls += 1
+        slow = self._random.random() < self.slow_rate
+        failed = self._random.random() < self.failure_rate
+        await asyncio.sleep((self.slow_latency if slow else self.latency) + self._random.random() * self.jitter)
+        if failed:
+            raise ExternalServiceError(f"{self.name} injected failure")
+        return f"[{self.name}] {kind} answer to: {prompt[:50]}"
+
+
+class MockProvider(AIProvider):
+    """The demo's canned responses; never fails.
+
+    Args:
+        simulate_latency: Pause like a model would, used when no provider is configured
+    """
+
+    def __init__(self, simulate_latency: bool = True) -> None:
+        super().__init__("mock")
+        self.simulate_latency = simulate_latency
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> str:
+        if kind == CHAT:
+            if self.simulate_latency:
+                await asyncio.sleep(1.5)
+            return random.choice(CHAT_RESPONSES)
+
+        if self.simulate_latency:
+            await asyncio.sleep(2)
+        return f"""Generated text based on prompt: "{prompt[:50]}..."
+
+Style: {options.get('style', 'creative').title()}
+Length: {options.get('length', 'medium').title()}
+
+This is a demonstration of AI text generation capabilities. In a real implementation, this would connect to actual language models like GPT-4, Claude, or local models.
+
+Key features demonstrated:
+✓ Context-aware generation
+✓ Style customization
+✓ Length control
+✓ Real-time processing"""
+
+
+class AIGateway:
+    """Providers in order of preference, each behind a circuit breaker, with a fallback.
+
+    Args:
+        providers: Providers to try, best first
+        fallback: Answers when no provider does
+        timeout: Seconds a single provider call may take
+        hedge_delay: Seconds after which the next provider is asked as well, 0 disables hedging
+        **breaker_options: Passed to every provider's CircuitBreaker
+    """
+
+    def __init__(
+        self,
+        providers: List[AIProvider],
+        fallback: AIProvider,
+        timeout: float = 10.0,
+        hedge_delay: float = 0.0,
+        **breaker_options: Any,
+    ) -> None:
+        self.providers = providers
+        self.fallback = fallback
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.breakers = {provider.name: CircuitBreaker(provider.name, **breaker_options) for provider in providers}
+
+    def _start(self, candidates: List[AIProvider], pending: Dict[asyncio.Task, Any],
+               kind: str, prompt: str, options: Dict[str, str]) -> bool:
+        """Start a call on the next provider whose breaker admits it."""
+        while candidates:
+            provider = candidates.pop(0)
+            permit = self.breakers[provider.name].acquire()
+            if permit is not None:
+                call = asyncio.wait_for(provider.complete(kind, prompt, **options), self.timeout)
+                pending[asyncio.ensure_future(call)] = (provider, permit, time.monotonic())
+                return True
+        return False
+
+    async def complete(self, kind: str, prompt: str, **options: str) -> AIResult:
+        """Answer a prompt with the first provider that can, or with the fallback.
+
+        Bound the call with run_within_deadline(); cancelling it cancels the
+        provider calls in flight without counting them against the providers.
+        """
+        candidates = list(self.providers)
+        pending: Dict[asyncio.Task, Any] = {}
+        hedged = False
+        self._start(candidates, pending, kind, prompt, options)
+        try:
+            while pending:
+                hedge_after = self.hedge_delay if self.hedge_delay and not hedged and candidates else None
+                done, _ = await asyncio.wait(pending, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The first provider is slow; ask the next one too
+                    hedged = self._start(candidates, pending, kind, prompt, options)
+                    if hedged:
+                        metrics.counter("ai_hedged_requests_total", "AI requests sent to a second provider").inc()
+                    continue
+
+                for task in done:
+                    provider, permit, started = pending.pop(task)
+                    breaker = self.breakers[provider.name]
+                    error = task.exception()
+                    if error is None:
+                        latency = time.monotonic() - started
+                        breaker.on_success(permit, latency)
+                        metrics.histogram("ai_provider_latency_ms", "Latency of answered AI provider calls",
+                                          provider=provider.name).observe(latency * 1000)
+                        metrics.counter("ai_requests_total", "AI requests by the provider that answered",
+                                        provider=provider.name).inc()
+                        return AIResult(task.result(), provider.name, hedged=hedged)
+                    breaker.on_failure(permit)
+                    reason = "timed out" if isinstance(error, asyncio.TimeoutError) else str(error)
+                    app_logger.warning(f"AI provider {provider.name} failed: {reason}")
+                if not pending:
+                    # Fail over to the next provider
+                    self._start(candidates, pending, kind, prompt, options)
+        finally:
+            # Losing hedged calls, or all calls when the caller gave up
+            for task, (provider, permit, _) in pending.items():
+                task.cancel()
+                self.breakers[provider.name].on_cancel(permit)
+
+        metrics.counter("ai_requests_total", "AI requests by the provider that answered",
+                        provider=self.fallback.name).inc()
+        return AIResult(await self.fallback.complete(kind, prompt, **options), self.fallback.name,
+                        fallback=True, hedged=hedged)
+
+    def describe(self) -> Dict[str, Any]:
+        """Providers and their breakers, for diagnostics."""
+        return {
+            "providers": {name: breaker.describe() for name, breaker in self.breakers.items()},
+            "fallback": self.fallback.name,
+            "timeout": self.timeout,
+            "hedge_delay": self.hedge_delay,
+        }
+
+    async def aclose(self) -> None:
+        """Close the providers' connections."""
+        for provider in self.providers:
+            await provider.aclose()
+
+
+def build_ai_gateway() -> AIGateway:
+    """Build the gateway from the AI settings; providers without an API key are left out."""
+    providers: List[AIProvider] = []
+    for name in (name.strip().lower() for name in settings.AI_PROVIDERS.split(",")):
+        if name == "openai" and settings.OPENAI_API_KEY:
+            providers.append(OpenAIProvider(settings.OPENAI_API_KEY, settings.OPENAI_MODEL))
+        elif name == "anthropic" and settings.ANTHROPIC_API_KEY:
+            providers.append(AnthropicProvider(settings.ANTHROPIC_API_KEY, settings.ANTHROPIC_MODEL))
+        elif name == "fake":
+            providers.append(FakeProvider(latency=settings.AI_FAKE_LATENCY_MS / 1000,
+                                          failure_rate=settings.AI_FAKE_FAILURE_RATE))
+    if providers:
+        app_logger.info(f"AI providers: {', '.join(provider.name for provider in providers)}")
+
+    return AIGateway(
+        providers,
+        MockProvider(simulate_latency=not providers),
+        timeout=settings.AI_PROVIDER_TIMEOUT,
+        hedge_delay=settings.AI_HEDGE_DELAY_MS / 1000,
+        failure_rate=settings.AI_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.AI_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate=settings.AI_BREAKER_SLOW_CALL_RATE,
+        window=settings.AI_BREAKER_WINDOW,
+        minimum_calls=settings.AI_BREAKER_MIN_CALLS,
+        open_seconds=settings.AI_BREAKER_OPEN_SECONDS,
+        max_concurrency=settings.AI_PROVIDER_MAX_CONCURRENCY,
+    )
+
+
+# Create global AI gateway
+ai_gateway = build_ai_gateway()
+
+
+def _apply_ai_settings(changes: Dict[str, Any]) -> None:
+    ai_gateway.timeout = settings.AI_PROVIDER_TIMEOUT
+    ai_gateway.hedge_delay = settings.AI_HEDGE_DELAY_MS / 1000
+
+
+on_settings_change(["AI_PROVIDER_TIMEOUT", "AI_HEDGE_DELAY_MS"], _apply_ai_settings)
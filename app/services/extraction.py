@@ -0,0 +1,267 @@
+"""
+Text extraction and chunking for document ingestion.
+Runs inside the ingestion worker processes: documents are read page by page,
+split into overlapping chunks and written to SQLite as they go, so memory stays
+bounded by a page and progress can be reported after every page. Nothing here
+touches the event loop, the settings or NiceGUI, which keeps worker start-up
+cheap.
+"""
+
+import os
+import sqlite3
+import time
+import zipfile
+from typing import Callable, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from app.core.lazy_imports import lazy_import
+
+# pypdf is optional, PDF documents are marked unsupported without it
+pypdf = lazy_import("pypdf")
+
+# Define what this module exports
+__all__ = [
+    "UnsupportedDocumentError",
+    "chunk_pages",
+    "connect",
+    "extract_pages",
+    "ingest_document",
+    "init_worker",
+    "run_job",
+]
+
+# Lines per page of plain text documents without form feeds
+TEXT_PAGE_LINES = 60
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    hash TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages INTEGER NOT NULL DEFAULT 0,
+    chunks INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (hash, seq)
+);
+"""
+
+# (pages done, total pages or None, chunks written) after every page
+ProgressCallback = Callable[[int, Optional[int], int], None]
+
+
+class UnsupportedDocumentError(Exception):
+    """Raised for documents whose text cannot be extracted."""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the ingestion database, creating its schema when needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _pdf_pages(reader) -> Iterator[str]:
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _docx_pages(path: str) -> Iterator[str]:
+    """Stream document.xml, splitting pages at explicit and rendered page breaks."""
+    parts: List[str] = []
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+        for _, element in ElementTree.iterparse(document, events=("end",)):
+            tag = element.tag
+            if tag == f"{WORD_NAMESPACE}t":
+                parts.append(element.text or "")
+            elif tag == f"{WORD_NAMESPACE}tab":
+                parts.append("\t")
+            elif tag == f"{WORD_NAMESPACE}br" and element.get(f"{WORD_NAMESPACE}type") != "page":
+                parts.append("\n")
+            elif tag == f"{WORD_NAMESPACE}lastRenderedPageBreak" or (
+                    tag == f"{WORD_NAMESPACE}br" and element.get(f"{WORD_NAMESPACE}type") == "page"):
+                if parts:
+                    yield "".join(parts)
+                    parts = []
+            elif tag == f"{WORD_NAMESPACE}p":
+                parts.append("\n")
+                element.clear()
+    if parts:
+        yield "".join(parts)
+
+
+def _text_pages(path: str) -> Iterator[str]:
+    lines: List[str] = []
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            while "\f" in line:
+                before, line = line.split("\f", 1)
+                lines.append(before)
+                yield "".join(lines)
+                lines = []
+            lines.append(line)
+            if len(lines) >= TEXT_PAGE_LINES:
+                yield "".join(lines)
+                lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def extract_pages(path: str, extension: str) -> Tuple[Optional[int], Iterator[str]]:
+    """Open a document for extraction one page at a time.
+
+    Returns:
+        The number of pages when it is known up front, and an iterator over
+        the text of each page
+
+    Raises:
+        UnsupportedDocumentError: No extractor for this document type
+    """
+    if extension == "pdf":
+        if not pypdf:
+            raise UnsupportedDocumentError("PDF extraction requires pypdf")
+        reader = pypdf.PdfReader(path)
+        return len(reader.pages), _pdf_pages(reader)
+    if extension == "docx":
+        return None, _docx_pages(path)
+    if extension == "txt":
+        return None, _text_pages(path)
+    raise UnsupportedDocumentError(f"Text extraction from .{extension} documents is not supported")
+
+
+def chunk_pages(pages: Iterator[str], size: int, overlap: int) -> Iterator[Tuple[int, Optional[str]]]:
+    """Split page texts into chunks of about ``size`` characters overlapping by ``overlap``.
+
+    Chunks end at whitespace where possible and may span pages.
+
+    Yields:
+        (page number, chunk) for every chunk, tagged with the page it starts
+        on, and (page number, None) after each page so callers can report
+        progress
+    """
+    overlap = min(overlap, size // 2)
+    buffer = ""
+    seen = 0  # leading characters of the buffer already in the last chunk
+    marks: List[Tuple[int, int]] = []  # (offset in buffer, page number) of each page start
+
+    def page_at(offset: int) -> int:
+        page = marks[0][1]
+        for start, number in marks:
+            if start > offset:
+                break
+            page = number
+        return page
+
+    for page_number, text in enumerate(pages, start=1):
+        marks.append((len(buffer), page_number))
+        buffer += text
+        while len(buffer) >= size:
+            cut = buffer.rfind(" ", size // 2, size)
+            cut = size if cut <= 0 else cut
+            chunk = buffer[:cut].strip()
+            if chunk:
+                yield page_at(0), chunk
+            start = max(cut - overlap, 1)
+            first_page = page_at(start)
+            buffer = buffer[start:]
+            seen = cut - start
+            marks = [(0, first_page)] + [(offset - start, number) for offset, number in marks if offset > start]
+        yield page_number, None
+    # A tail of only overlap would repeat the end of the last chunk
+    if buffer[seen:].strip():
+        yield page_at(0), buffer.strip()
+
+
+def ingest_document(
+    database: str,
+    content_hash: str,
+    path: str,
+    filename: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[str, int, int]:
+    """Extract, chunk and store one document, committing after every page.
+
+    Returns:
+        (status, pages, chunks), status being "done" or "unsupported"
+    """
+    extension = path.rsplit(".", 1)[-1].lower()
+    started = time.perf_counter()
+    connection = connect(database)
+    try:
+        with connection:
+            connection.execute("DELETE FROM chunks WHERE hash = ?", (content_hash,))
+            connection.execute(
+                "INSERT OR REPLACE INTO documents (hash, filename, status, updated) VALUES (?, ?, 'running', ?)",
+                (content_hash, filename, time.time()))
+        try:
+            total, pages = extract_pages(path, extension)
+        except UnsupportedDocumentError as e:
+            with connection:
+                connection.execute("UPDATE documents SET status = 'unsupported', error = ?, updated = ? WHERE hash = ?",
+                                   (str(e), time.time(), content_hash))
+            return "unsupported", 0, 0
+
+        pages_done = chunks = 0
+        batch: List[Tuple[str, int, int, str]] = []
+        for page, chunk in chunk_pages(pages, chunk_size, chunk_overlap):
+            if chunk is not None:
+                batch.append((content_hash, chunks, page, chunk))
+                chunks += 1
+                continue
+            pages_done = page
+            with connection:
+                connection.executemany("INSERT INTO chunks (hash, seq, page, text) VALUES (?, ?, ?, ?)", batch)
+                connection.execute("UPDATE documents SET pages = ?, chunks = ?, updated = ? WHERE hash = ?",
+                                   (pages_done, chunks, time.time(), content_hash))
+            batch.clear()
+            if progress is not None:
+                progress(pages_done, total, chunks)
+        with connection:
+            connection.executemany("INSERT INTO chunks (hash, seq, page, text) VALUES (?, ?, ?, ?)", batch)
+            connection.execute(
+                "UPDATE documents SET status = 'done', pages = ?, chunks = ?, seconds = ?, updated = ? WHERE hash = ?",
+                (pages_done, chunks, time.perf_counter() - started, time.time(), content_hash))
+        return "done", pages_done, chunks
+    except Exception as e:
+        with connection:
+            connection.execute("UPDATE documents SET status = 'failed', error = ?, updated = ? WHERE hash = ?",
+                               (str(e), time.time(), content_hash))
+        raise
+    finally:
+        connection.close()
+
+
+# Queue for progress messages to the parent, set in each worker process
+_progress_queue = None
+
+
+def init_worker(progress_queue) -> None:
+    """Process pool initializer: remember where to send progress."""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def run_job(database: str, content_hash: str, path: str, filename: str, chunk_size: int,
+            chunk_overlap: int) -> Tuple[str, int, int]:
+    """Worker entry point: ingest one document, reporting progress after every page."""
+    def progress(pages: int, total: Optional[int], chunks: int) -> None:
+        if _progress_queue is not None:
+            _progress_queue.put((content_hash, pages, total, chunks))
+
+    return ingest_document(database, content_hash, path, filename, chunk_size, chunk_overlap, progress)
@@ -0,0 +1,306 @@
+"""
+Document ingestion for the GenAI Portfolio application.
+Documents stored by the upload pipeline are handed to a pool of worker
+processes that extract their text page by page, chunk it with overlap and
+write the chunks to SQLite (see extraction.py), so the CPU-heavy work never
+runs in the event loop. Results are cached by content hash: a document that
+has been ingested before is not extracted again. Workers report progress after
+every page and subscribers, such as the upload widget, receive it on the
+event loop.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import anyio
+
+from app.core import settings
+from app.core.deadlines import check_deadline
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+from app.services import extraction
+
+# Define what this module exports
+__all__ = ["IngestionJob", "IngestionPool", "ingestion_pool"]
+
+# Finished jobs kept in memory for status queries; older ones are read from SQLite
+MAX_FINISHED_JOBS = 256
+
+FINISHED_STATUSES = ("done", "cached", "unsupported", "failed")
+
+
+class IngestionJob:
+    """Progress of one document through the ingestion pool.
+
+    Args:
+        content_hash: SHA-256 of the document, also its name in the upload directory
+        filename: Original file name
+    """
+
+    def __init__(self, content_hash: str, filename: str) -> None:
+        self.content_hash = content_hash
+        self.filename = filename
+        self.status = "queued"
+        self.pages = 0
+        self.total_pages: Optional[int] = None
+        self.chunks = 0
+        self.error: Optional[str] = None
+        self.started = time.monotonic()
+        self.seconds: Optional[float] = None
+        self._listeners: List[Callable[["IngestionJob"], None]] = []
+        self._finished = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def subscribe(self, listener: Callable[["IngestionJob"], None]) -> Callable[[], None]:
+        """Call ``listener`` now, then on the event loop after every page and once finished.
+
+        Returns:
+            A function that removes the listener again
+        """
+        listener(self)
+        if not self.finished:
+            self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener) if listener in self._listeners else None
+
+    async def wait(self) -> "IngestionJob":
+        """Wait until the job has finished."""
+        await self._finished.wait()
+        return self
+
+    def _update(self, **changes: Any) -> None:
+        for name, value in changes.items():
+            setattr(self, name, value)
+        if self.finished:
+            self.seconds = time.monotonic() - self.started
+            self._finished.set()
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                app_logger.warning(f"Ingestion progress listener failed: {e}")
+        if self.finished:
+            self._listeners.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.content_hash,
+            "filename": self.filename,
+            "status": self.status,
+            "pages": self.pages,
+            "total_pages": self.total_pages,
+            "chunks": self.chunks,
+            "error": self.error,
+        }
+
+
+class IngestionPool:
+    """Process pool that turns stored uploads into chunks in SQLite.
+
+    Worker processes are spawned on the first submission, so documents only
+    cost start-up time once someone uploads one.
+
+    Args:
+        database: SQLite file holding documents and chunks
+        upload_directory: Directory of the content-addressed upload store
+        workers: Number of worker processes
+        chunk_size: Characters per chunk
+        chunk_overlap: Characters shared by consecutive chunks
+    """
+
+    def __init__(self, database: str, upload_directory: str, workers: int, chunk_size: int, chunk_overlap: int):
+        self.database = database
+        self.upload_directory = Path(upload_directory)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.jobs: Dict[str, IngestionJob] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._progress_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the server process runs threads and an event loop
+                context = multiprocessing.get_context("spawn")
+                self._queue = context.SimpleQueue()
+                self._loop = asyncio.get_running_loop()
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context,
+                                                     initializer=extraction.init_worker, initargs=(self._queue,))
+                self._progress_thread = threading.Thread(target=self._read_progress, args=(self._queue, self._loop),
+                                                         name="ingestion-progress", daemon=True)
+                self._progress_thread.start()
+                app_logger.info(f"Ingestion pool started with {self.workers} worker processes")
+            return self._executor
+
+    def _read_progress(self, queue, loop: asyncio.AbstractEventLoop) -> None:
+        """Forward progress messages from the workers to the event loop."""
+        while True:
+            message = queue.get()
+            if message is None:
+                return
+            try:
+                loop.call_soon_threadsafe(self._on_progress, *message)
+            except RuntimeError:
+                # The loop is closed
+                return
+
+    def _on_progress(self, content_hash: str, pages: int, total: Optional[int], chunks: int) -> None:
+        job = self.jobs.get(content_hash)
+        if job is not None and not job.finished:
+            metrics.counter("ingestion_pages_total", "Pages extracted by the ingestion pool").inc(pages - job.pages)
+            job._update(status="running", pages=pages, total_pages=total, chunks=chunks)
+
+    def _on_done(self, job: IngestionJob, future: "asyncio.Future") -> None:
+        if future.cancelled():
+            job._update(status="failed", error="cancelled")
+        elif future.exception() is not None:
+            app_logger.error(f"Ingestion of {job.filename} failed: {future.exception()}")
+            job._update(status="failed", error=str(future.exception()))
+        else:
+            status, pages, chunks = future.result()
+            if pages > job.pages:
+                metrics.counter("ingestion_pages_total", "Pages extracted by the ingestion pool").inc(pages - job.pages)
+            job._update(status=status, pages=pages, total_pages=pages, chunks=chunks)
+            app_logger.info(f"Ingested {job.filename}: {status}, {pages} pages, {chunks} chunks "
+                            f"in {job.seconds:.2f}s")
+        metrics.counter("ingestion_documents_total", "Documents through the ingestion pool", status=job.status).inc()
+        self._prune()
+
+    def _prune(self) -> None:
+        finished = [content_hash for content_hash, job in self.jobs.items() if job.finished]
+        for content_hash in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[content_hash]
+
+    def _stored_document(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Read the ingestion record of a document from SQLite (blocking)."""
+        if not os.path.exists(self.database):
+            return None
+        connection = extraction.connect(self.database)
+        try:
+            row = connection.execute(
+                "SELECT filename, status, pages, chunks, error FROM documents WHERE hash = ?", (content_hash,)
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        filename, status, pages, chunks, error = row
+        return {"id": content_hash, "filename": filename, "status": status, "pages": pages,
+                "total_pages": pages if status == "done" else None, "chunks": chunks, "error": error}
+
+    async def submit(self, content_hash: str, filename: str) -> IngestionJob:
+        """Queue a stored upload for ingestion, or return its cached result.
+
+        Args:
+            content_hash: Content hash returned by the upload store
+            filename: Original file name, whose extension selects the extractor
+
+        Returns:
+            The document's job; already finished when the result was cached
+        """
+        job = self.jobs.get(content_hash)
+        if job is not None and job.status != "failed":
+            return job
+        check_deadline("ingestion")
+
+        record = await anyio.to_thread.run_sync(self._stored_document, content_hash)
+        if record is not None and record["status"] in ("done", "unsupported"):
+            metrics.counter("ingestion_cache_hits_total", "Documents whose chunks were already stored").inc()
+            job = IngestionJob(content_hash, filename)
+            job._update(status="cached" if record["status"] == "done" else "unsupported",
+                        pages=record["pages"], total_pages=record["pages"], chunks=record["chunks"],
+                        error=record["error"])
+            self.jobs[content_hash] = job
+            return job
+
+        extension = filename.rsplit(".", 1)[-1].lower()
+        path = self.upload_directory / f"{content_hash}.{extension}"
+        job = IngestionJob(content_hash, filename)
+        self.jobs[content_hash] = job
+        executor = self._ensure_started()
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, extraction.run_job, self.database, content_hash, str(path), filename,
+            self.chunk_size, self.chunk_overlap)
+        future.add_done_callback(lambda done: self._on_done(job, done))
+        return job
+
+    async def status(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Ingestion state of a document, from memory or SQLite."""
+        job = self.jobs.get(content_hash)
+        if job is not None:
+            return job.to_dict()
+        return await anyio.to_thread.run_sync(self._stored_document, content_hash)
+
+    async def backfill(self) -> int:
+        """Submit stored uploads that have not been ingested yet (e.g. after a restart).
+
+        Returns:
+            Number of submitted documents
+        """
+        if not self.upload_directory.is_dir():
+            return 0
+        submitted = 0
+        for path in sorted(self.upload_directory.iterdir()):
+            content_hash, _, extension = path.name.partition(".")
+            if not path.is_file() or len(content_hash) != 64 or not extension:
+                continue
+            job = await self.submit(content_hash, path.name)
+            submitted += not job.finished
+        if submitted:
+            app_logger.info(f"Backfilling ingestion of {submitted} stored uploads")
+        return submitted
+
+    def check(self) -> Tuple[bool, str]:
+        """Readiness of the pool (blocking): running workers, or directories it can start with.
+
+        Returns:
+            (ready, detail) for the readiness registry
+        """
+        with self._lock:
+            executor, thread = self._executor, self._progress_thread
+        if executor is None:
+            # Not started yet: the first upload must be able to store, spawn and write
+            for directory in (self.upload_directory, Path(self.database).parent):
+                if not directory.is_dir() or not os.access(directory, os.W_OK):
+                    return False, f"{directory} is not a writable directory"
+            return True, "idle"
+        if getattr(executor, "_broken", False):
+            return False, "worker processes died"
+        if thread is None or not thread.is_alive():
+            return False, "progress reader stopped"
+        return True, f"{sum(not job.finished for job in list(self.jobs.values()))} documents in progress"
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker processes, abandoning queued documents.
+
+        Args:
+            wait: Wait for documents being extracted to finish
+        """
+        with self._lock:
+            if self._executor is None:
+                return
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._queue.put(None)
+            self._executor = None
+
+
+# Create global ingestion pool
+ingestion_pool = IngestionPool(
+    database=settings.INGESTION_DATABASE or "./data/ingestion.db",
+    upload_directory=settings.UPLOAD_DIRECTORY or "./uploads",
+    workers=settings.INGESTION_WORKERS or os.cpu_count() or 1,
+    chunk_size=settings.INGESTION_CHUNK_SIZE or 1000,
+    chunk_overlap=settings.INGESTION_CHUNK_OVERLAP if settings.INGESTION_CHUNK_OVERLAP is not None else 200,
+)
@@ -0,0 +1,227 @@
+"""
+Document upload storage for the GenAI Portfolio application.
+Uploads are streamed to a temporary file in chunks while their SHA-256 is
+computed, their leading bytes are checked against the magic numbers of the
+allowed document types and the size limit is enforced, so a file is never
+held in memory as a whole. Stored files are named by content hash, which
+deduplicates identical uploads.
+"""
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterable, BinaryIO, Dict, Iterable, List, Optional
+
+import anyio
+
+from app.core import settings
+from app.core.exceptions import PayloadTooLargeError, UnsupportedMediaTypeError
+from app.core.logging import app_logger
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = ["UploadStore", "sniff_document_type", "upload_store"]
+
+# Chunks are hashed and written in a worker thread once this much is buffered
+WRITE_BUFFER_BYTES = 128 * 1024
+
+# Leading bytes needed to identify a document
+SNIFF_BYTES = 512
+
+# Magic numbers by extension; text has none and is checked for being UTF-8
+DOCUMENT_MAGIC = {
+    "pdf": (b"%PDF-",),
+    "doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),  # OLE2 compound file
+    "docx": (b"PK\x03\x04",),  # Office Open XML is a ZIP archive
+}
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+}
+
+
+def sniff_document_type(head: bytes, complete: bool = False) -> Optional[str]:
+    """Identify a document from its leading bytes.
+
+    Args:
+        head: The first bytes of the document (up to SNIFF_BYTES)
+        complete: Whether head is the whole document
+
+    Returns:
+        The matching extension, or None for an unknown type
+    """
+    for extension, signatures in DOCUMENT_MAGIC.items():
+        if head.startswith(signatures):
+            return extension
+    if b"\x00" in head:
+        return None
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sniffed bytes is fine
+        if complete or e.start < len(head) - 3:
+            return None
+    return "txt"
+
+
+class _Upload:
+    """A single upload being streamed to a temporary file."""
+
+    def __init__(self, store: "UploadStore", filename: str) -> None:
+        self.store = store
+        self.filename = Path(filename).name
+        self.extension = self.filename.rsplit(".", 1)[-1].lower() if "." in self.filename else ""
+        if self.extension not in store.allowed_extensions:
+            raise UnsupportedMediaTypeError(
+                f"Only {', '.join(sorted(store.allowed_extensions))} files can be uploaded")
+        self.temporary = store.incoming / f"{uuid.uuid4().hex}.part"
+        self.file: BinaryIO = open(self.temporary, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.sniffed = False
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Account for a chunk; returns whether enough is buffered to be written."""
+        self.size += len(chunk)
+        if self.size > self.store.max_size:
+            raise PayloadTooLargeError(f"Files are limited to {self.store.max_size // (1024 * 1024)} MB")
+        if not self.sniffed:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.sniff(complete=False)
+        self.pending.append(chunk)
+        self.pending_size += len(chunk)
+        return self.pending_size >= WRITE_BUFFER_BYTES
+
+    def sniff(self, complete: bool) -> None:
+        self.sniffed = True
+        detected = sniff_document_type(self.head, complete)
+        if detected != self.extension:
+            raise UnsupportedMediaTypeError(f"The content of {self.filename} is not a {self.extension} document")
+
+    def flush(self) -> None:
+        """Hash and write the buffered chunks (blocking)."""
+        for chunk in self.pending:
+            self.digest.update(chunk)
+            self.file.write(chunk)
+        self.pending.clear()
+        self.pending_size = 0
+
+    def finish(self) -> Dict[str, Any]:
+        """Move the completed upload into the store (blocking)."""
+        if not self.sniffed:
+            self.sniff(complete=True)
+        self.flush()
+        self.file.close()
+        content_hash = self.digest.hexdigest()
+        target = self.store.directory / f"{content_hash}.{self.extension}"
+        deduplicated = target.exists()
+        if deduplicated:
+            self.temporary.unlink()
+        else:
+            os.replace(self.temporary, target)
+        return {
+            "id": content_hash,
+            "filename": self.filename,
+            "size": self.size,
+            "content_type": CONTENT_TYPES.get(self.extension, "application/octet-stream"),
+            "deduplicated": deduplicated,
+        }
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            self.temporary.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class UploadStore:
+    """Content-addressed store for uploaded documents.
+
+    Args:
+        directory: Directory holding the stored files
+        max_size: Largest accepted upload in bytes
+        allowed_extensions: Accepted file extensions
+    """
+
+    def __init__(self, directory: Path, max_size: int, allowed_extensions: Iterable[str]) -> None:
+        self.directory = Path(directory)
+        self.incoming = self.directory / ".incoming"
+        self.max_size = max_size
+        self.allowed_extensions = {extension.lower().lstrip(".") for extension in allowed_extensions}
+
+    async def save_stream(self, filename: str, chunks: AsyncIterable[bytes]) -> Dict[str, Any]:
+        """Store an upload arriving as a stream of chunks, e.g. a request body.
+
+        Args:
+            filename: Original file name, whose extension must be allowed
+            chunks: The upload's content
+
+        Returns:
+            Description of the stored file
+
+        Raises:
+            UnsupportedMediaTypeError: The extension is not allowed or does not match the content
+            PayloadTooLargeError: The upload exceeds max_size
+        """
+        upload = await anyio.to_thread.run_sync(self._open, filename)
+        try:
+            async for chunk in chunks:
+                if chunk and upload.feed(chunk):
+                    await anyio.to_thread.run_sync(upload.flush)
+            result = await anyio.to_thread.run_sync(upload.finish)
+        except BaseException as e:
+            upload.discard()
+            self._count(upload, "rejected" if isinstance(e, Exception) else "abandoned")
+            raise
+        self._count(upload, "deduplicated" if result["deduplicated"] else "stored")
+        return result
+
+    def save_file(self, filename: str, file: BinaryIO, chunk_size: int = 64 * 1024) -> Dict[str, Any]:
+        """Store an upload from a file object, e.g. a spooled form upload (blocking).
+
+        Args:
+            filename: Original file name, whose extension must be allowed
+            file: Readable binary file positioned at the start of the upload
+            chunk_size: Bytes read at a time
+
+        Returns:
+            Description of the stored file
+        """
+        upload = self._open(filename)
+        try:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                if upload.feed(chunk):
+                    upload.flush()
+            result = upload.finish()
+        except BaseException:
+            upload.discard()
+            self._count(upload, "rejected")
+            raise
+        self._count(upload, "deduplicated" if result["deduplicated"] else "stored")
+        return result
+
+    def _open(self, filename: str) -> _Upload:
+        self.incoming.mkdir(parents=True, exist_ok=True)
+        return _Upload(self, filename)
+
+    def _count(self, upload: _Upload, outcome: str) -> None:
+        metrics.counter("uploads_total", "Document uploads", outcome=outcome).inc()
+        metrics.counter("upload_bytes_total", "Bytes received in document uploads", outcome=outcome).inc(upload.size)
+        app_logger.info(f"Upload of {upload.filename} ({upload.size} bytes): {outcome}")
+
+
+# Create global upload store
+upload_store = UploadStore(
+    directory=Path(settings.UPLOAD_DIRECTORY or "./uploads"),
+    max_size=settings.MAX_FILE_SIZE or 10 * 1024 * 1024,
+    allowed_extensions=settings.ALLOWED_EXTENSIONS or ["pdf", "doc", "docx", "txt"],
+)
@@ -3,116 +3,129 @@ UI components and theme setup for the GenAI Portfolio.
 Provides reusable components and consistent styling.
 """
 
-from nicegui import ui
+from nicegui import context, run, ui
 from typing import Optional, List, Dict, Any, Callable
 from app.core import app_logger, settings
+from app.core.assets import publish_asset, register_asset
+from app.core.exceptions import AppException, DeadlineExceededError
+from app.ui.lazy import create_lazy_expansion
+from app.ui.sessions import run_for_client
+from app.services.ai import CHAT, TEXT_GENERATION, ai_gateway
+from app.services.ingestion import ingestion_pool
+from app.services.uploads import upload_store
+
+# Global theme stylesheet, served as a fingerprinted static asset
+THEME_CSS = """
+:root {
+    --primary-color: #2563eb;
+    --secondary-color: #1e40af;
+    --accent-color: #3b82f6;
+    --background-color: #f8fafc;
+    --surface-color: #ffffff;
+    --text-primary: #1e293b;
+    --text-secondary: #64748b;
+    --border-color: #e2e8f0;
+    --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+}
+
+body {
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+    background-color: var(--background-color);
+    color: var(--text-primary);
+}
+
+.portfolio-header {
+    background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
+    color: white;
+    padding: 2rem;
+    border-radius: 0.5rem;
+    margin-bottom: 2rem;
+}
+
+.portfolio-card {
+    background: var(--surface-color);
+    border: 1px solid var(--border-color);
+    border-radius: 0.75rem;
+    padding: 1.5rem;
+    box-shadow: var(--shadow);
+    transition: transform 0.2s, box-shadow 0.2s;
+}
+
+.portfolio-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 25px -5px rgba(0, 0, 0, 0.1);
+}
+
+.skill-badge {
+    background: var(--accent-color);
+    color: white;
+    padding: 0.25rem 0.75rem;
+    border-radius: 9999px;
+    font-size: 0.875rem;
+    font-weight: 500;
+}
+
+.project-tech {
+    background: var(--background-color);
+    color: var(--text-secondary);
+    padding: 0.25rem 0.5rem;
+    border-radius: 0.375rem;
+    font-size: 0.75rem;
+    border: 1px solid var(--border-color);
+}
+
+.contact-form {
+    background: var(--surface-color);
+    border: 1px solid var(--border-color);
+    border-radius: 0.75rem;
+    padding: 2rem;
+    box-shadow: var(--shadow);
+}
+
+.demo-section {
+    background: linear-gradient(to right, #f8fafc, #e2e8f0);
+    border: 1px solid var(--border-color);
+    border-radius: 0.75rem;
+    padding: 1.5rem;
+    margin: 1rem 0;
+}
+
+.loading-spinner {
+    border: 3px solid var(--border-color);
+    border-top: 3px solid var(--primary-color);
+    border-radius: 50%;
+    width: 24px;
+    height: 24px;
+    animation: spin 1s linear infinite;
+}
+
+@keyframes spin {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+
+.fade-in {
+    animation: fadeIn 0.5s ease-in;
+}
+
+@keyframes fadeIn {
+    from { opacity: 0; transform: translateY(20px); }
+    to { opacity: 1; transform: translateY(0); }
+}
+"""
+
+register_asset("theme", THEME_CSS, "css")
 
 def setup_theme():
-    """Setup the application theme and global styles."""
+    """Setup the application theme and global styles.
     
-    # Custom CSS for professional styling
-    ui.add_head_html('''
-    <style>
-        :root {
-            --primary-color: #2563eb;
-            --secondary-color: #1e40af;
-            --accent-color: #3b82f6;
-            --background-color: #f8fafc;
-            --surface-color: #ffffff;
-            --text-primary: #1e293b;
-            --text-secondary: #64748b;
-            --border-color: #e2e8f0;
-            --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }
-        
-        body {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-            background-color: var(--background-color);
-            color: var(--text-primary);
-        }
-        
-        .portfolio-header {
-            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-            color: white;
-            padding: 2rem;
-            border-radius: 0.5rem;
-            margin-bottom: 2rem;
-        }
-        
-        .portfolio-card {
-            background: var(--surface-color);
-            border: 1px solid var(--border-color);
-            border-radius: 0.75rem;
-            padding: 1.5rem;
-            box-shadow: var(--shadow);
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
-        
-        .portfolio-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 25px -5px rgba(0, 0, 0, 0.1);
-        }
-        
-        .skill-badge {
-            background: var(--accent-color);
-            color: white;
-            padding: 0.25rem 0.75rem;
-            border-radius: 9999px;
-            font-size: 0.875rem;
-            font-weight: 500;
-        }
-        
-        .project-tech {
-            background: var(--background-color);
-            color: var(--text-secondary);
-            padding: 0.25rem 0.5rem;
-            border-radius: 0.375rem;
-            font-size: 0.75rem;
-            border: 1px solid var(--border-color);
-        }
-        
-        .contact-form {
-            background: var(--surface-color);
-            border: 1px solid var(--border-color);
-            border-radius: 0.75rem;
-            padding: 2rem;
-            box-shadow: var(--shadow);
-        }
-        
-        .demo-section {
-            background: linear-gradient(to right, #f8fafc, #e2e8f0);
-            border: 1px solid var(--border-color);
-            border-radius: 0.75rem;
-            padding: 1.5rem;
-            margin: 1rem 0;
-        }
-        
-        .loading-spinner {
-            border: 3px solid var(--border-color);
-            border-top: 3px solid var(--primary-color);
-            border-radius: 50%;
-            width: 24px;
-            height: 24px;
-            animation: spin 1s linear infinite;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .fade-in {
-            animation: fadeIn 0.5s ease-in;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-    </style>
-    ''')
+    The stylesheet is written to a content-hashed file under /static and
+    linked from every page, so browsers cache it instead of receiving it inline.
+    """
+    theme_url = publish_asset("theme", THEME_CSS, "css")
+    ui.add_head_html(f'<link rel="stylesheet" href="{theme_url}">', shared=True)
     
-    app_logger.info("Theme and styles configured")
+    app_logger.info(f"Theme and styles configured: {theme_url}")
 
 def create_header(title: str, subtitle: str) -> None:
     """Create a professional header section."""
@@ -200,43 +213,116 @@ async def handle_contact_submit(name: str, email: str, company: str, subject: st
         # Show loading state
         ui.notify('Sending message...', type='info')
         
-        # Simulate API call (replace with actual API call)
+        # Simulate API call (replace with actual API call); dropped if the visitor leaves
         import asyncio
-        await asyncio.sleep(1)
+        await run_for_client(asyncio.sleep(1), work="email", timeout=settings.AI_REQUEST_TIMEOUT)
         
         # Success message
         ui.notify('Thank you! Your message has been sent successfully.', type='positive')
         app_logger.info(f"Contact form submitted by {email}")
         
+    except DeadlineExceededError:
+        ui.notify('Sending took too long, please try again', type='warning')
     except Exception as e:
         ui.notify('Failed to send message. Please try again.', type='negative')
         app_logger.error(f"Contact form error: {e}")
 
 def create_ai_demo_section() -> None:
-    """Create an interactive AI demo section."""
+    """Create an interactive AI demo section.
+    
+    Each demo is only built the first time its expansion is opened.
+    """
     with ui.element('div').classes('demo-section'):
         ui.label('AI Capabilities Demo').classes('text-2xl font-semibold mb-4')
         
         # Text generation demo
-        with ui.expansion('Text Generation Demo', icon='edit').classes('w-full mb-4'):
-            prompt_input = ui.input('Enter a prompt', placeholder='Write a story about...').classes('w-full mb-2')
-            style_select = ui.select(['Creative', 'Professional', 'Technical', 'Casual'], value='Creative').classes('mb-2')
-            length_select = ui.select(['Short', 'Medium', 'Long'], value='Medium').classes('mb-2')
-            
-            generate_button = ui.button('Generate Text', on_click=lambda: handle_text_generation(
-                prompt_input.value, style_select.value, length_select.value
-            )).classes('bg-green-600 text-white px-4 py-2 rounded')
-            
-            result_area = ui.element('div').classes('mt-4 p-4 bg-gray-50 rounded border min-h-[100px]')
+        create_lazy_expansion('Text Generation Demo', create_text_generation_panel, icon='edit',
+                              name='demos:text-generation', classes='w-full mb-4')
         
         # Chat demo
-        with ui.expansion('AI Chat Demo', icon='chat').classes('w-full'):
-            chat_input = ui.input('Ask me anything...', placeholder='What can you help me with?').classes('w-full mb-2')
-            chat_button = ui.button('Send', on_click=lambda: handle_chat_message(chat_input.value)).classes('bg-blue-600 text-white px-4 py-2 rounded')
-            
-            chat_area = ui.element('div').classes('mt-4 p-4 bg-gray-50 rounded border min-h-[200px] max-h-[400px] overflow-y-auto')
+        create_lazy_expansion('AI Chat Demo', create_chat_panel, icon='chat',
+                              name='demos:chat', classes='w-full mb-4')
+        
+        # Document upload demo
+        create_lazy_expansion('Document Analysis Demo', create_document_upload_panel, icon='description',
+                              name='demos:documents', classes='w-full')
+
+def create_text_generation_panel() -> None:
+    """Create the text generation demo controls."""
+    prompt_input = ui.input('Enter a prompt', placeholder='Write a story about...').classes('w-full mb-2')
+    style_select = ui.select(['Creative', 'Professional', 'Technical', 'Casual'], value='Creative').classes('mb-2')
+    length_select = ui.select(['Short', 'Medium', 'Long'], value='Medium').classes('mb-2')
+    
+    generate_button = ui.button('Generate Text', on_click=lambda: handle_text_generation(
+        prompt_input.value, style_select.value, length_select.value, result_area
+    )).classes('bg-green-600 text-white px-4 py-2 rounded')
+    
+    result_area = ui.element('div').classes('mt-4 p-4 bg-gray-50 rounded border min-h-[100px]')
+
+def create_chat_panel() -> None:
+    """Create the chat demo controls."""
+    chat_input = ui.input('Ask me anything...', placeholder='What can you help me with?').classes('w-full mb-2')
+    chat_button = ui.button('Send', on_click=lambda: handle_chat_message(chat_input.value, chat_area)).classes('bg-blue-600 text-white px-4 py-2 rounded')
+    
+    chat_area = ui.element('div').classes('mt-4 p-4 bg-gray-50 rounded border min-h-[200px] max-h-[400px] overflow-y-auto')
+
+def create_document_upload_panel() -> None:
+    """Create the document upload demo controls."""
+    extensions = sorted(upload_store.allowed_extensions)
+    ui.markdown(f"Upload a document ({', '.join(extensions)}, up to "
+                f"{upload_store.max_size // (1024 * 1024)} MB) to run it through the analysis pipeline.")
+    result_label = ui.label().classes('mt-2 text-gray-700')
+    progress = ui.linear_progress(value=0, show_value=False).classes('mt-2')
+    progress.set_visibility(False)
+    
+    async def on_upload(event) -> None:
+        await handle_document_upload(event, result_label, progress)
+    
+    ui.upload(on_upload=on_upload, max_file_size=upload_store.max_size, auto_upload=True) \
+        .props(f'accept="{",".join("." + extension for extension in extensions)}"').classes('w-full')
 
-async def handle_text_generation(prompt: str, style: str, length: str) -> None:
+async def handle_document_upload(event, result_label: ui.label, progress: ui.linear_progress) -> None:
+    """Store an uploaded document, reading the spooled upload in chunks, and follow its ingestion."""
+    try:
+        stored = await run.io_bound(upload_store.save_file, event.name, event.content)
+        job = await ingestion_pool.submit(stored["id"], stored["filename"])
+        ui.notify('Document uploaded!', type='positive')
+    except AppException as e:
+        ui.notify(e.detail, type='warning')
+        return
+    except Exception as e:
+        ui.notify('Upload failed', type='negative')
+        app_logger.error(f"Document upload demo error: {e}")
+        return
+    
+    def show_progress(job) -> None:
+        # Called on the event loop after every extracted page
+        progress.set_visibility(not job.finished)
+        if job.total_pages:
+            progress.props(remove='indeterminate')
+            progress.set_value(job.pages / job.total_pages)
+        else:
+            progress.props('indeterminate')
+        if job.status == "cached":
+            result_label.set_text(f"{job.filename} was analyzed before: {job.pages} pages, {job.chunks} chunks.")
+        elif job.status == "done":
+            result_label.set_text(f"Analyzed {job.filename}: {job.pages} pages, {job.chunks} chunks.")
+        elif job.finished:
+            result_label.set_text(f"{job.filename} could not be analyzed: {job.error or job.status}.")
+        else:
+            pages = f"{job.pages}/{job.total_pages}" if job.total_pages else str(job.pages)
+            result_label.set_text(f"Extracting {job.filename}: page {pages}, {job.chunks} chunks so far...")
+    
+    context.get_client().on_disconnect(job.subscribe(show_progress))
+
+def show_ai_answer(area: ui.element, text: str, fallback: bool) -> None:
+    """Render an AI answer into a demo's result area, flagging canned answers."""
+    with area:
+        ui.label(text).classes('whitespace-pre-wrap text-gray-800')
+        if fallback:
+            ui.label('Sample answer: no AI provider is available right now.').classes('text-xs text-gray-500 mt-1')
+
+async def handle_text_generation(prompt: str, style: str, length: str, result_area: ui.element) -> None:
     """Handle AI text generation demo."""
     try:
         if not prompt.strip():
@@ -245,32 +331,20 @@ async def handle_text_generation(prompt: str, style: str, length: str) -> None:
         
         ui.notify('Generating text...', type='info')
         
-        # Simulate AI generation (replace with actual AI call)
-        import asyncio
-        await asyncio.sleep(2)
-        
-        mock_response = f"""Generated text for prompt: "{prompt[:50]}..."
-
-Style: {style}
-Length: {length}
-
-This is a demonstration of AI text generation capabilities. In a real implementation, this would connect to language models like GPT-4, Claude, or other AI services to generate contextually relevant content based on the user's prompt and preferences.
-
-Key features demonstrated:
-✓ Prompt-based generation
-✓ Style customization
-✓ Length control
-✓ Real-time processing"""
-        
-        # Display result (in a real app, you'd update the result_area)
+        result = await run_for_client(ai_gateway.complete(TEXT_GENERATION, prompt, style=style, length=length),
+                                      work="llm", timeout=settings.AI_REQUEST_TIMEOUT)
+        result_area.clear()
+        show_ai_answer(result_area, result.text, result.fallback)
         ui.notify('Text generated successfully!', type='positive')
         app_logger.info(f"Text generation demo used with prompt: {prompt[:50]}...")
         
+    except DeadlineExceededError:
+        ui.notify('Text generation took too long, please try again', type='warning')
     except Exception as e:
         ui.notify('Text generation failed', type='negative')
         app_logger.error(f"Text generation demo error: {e}")
 
-async def handle_chat_message(message: str) -> None:
+async def handle_chat_message(message: str, chat_area: ui.element) -> None:
     """Handle AI chat demo message."""
     try:
         if not message.strip():
@@ -279,24 +353,16 @@ async def handle_chat_message(message: str) -> None:
         
         ui.notify('AI is thinking...', type='info')
         
-        # Simulate AI response (replace with actual AI call)
-        import asyncio
-        await asyncio.sleep(1.5)
-        
-        responses = [
-            "That's an interesting question! In a real implementation, I would use advanced language models to provide helpful responses.",
-            "I understand what you're asking. This demo showcases how AI chat systems can maintain context and provide relevant responses.",
-            "Great point! AI assistants can help with various tasks including answering questions and providing explanations.",
-            "Thanks for trying this demo! Real AI systems use sophisticated NLP models for natural conversations."
-        ]
-        
-        import random
-        response = random.choice(responses)
-        
-        # Display response (in a real app, you'd update the chat_area)
+        result = await run_for_client(ai_gateway.complete(CHAT, message), work="llm",
+                                      timeout=settings.AI_REQUEST_TIMEOUT)
+        with chat_area:
+            ui.label(message).classes('text-right text-blue-700 font-medium mt-2')
+        show_ai_answer(chat_area, result.text, result.fallback)
         ui.notify('AI responded!', type='positive')
         app_logger.info(f"Chat demo used with message: {message[:50]}...")
         
+    except DeadlineExceededError:
+        ui.notify('The AI took too long to answer, please try again', type='warning')
     except Exception as e:
         ui.notify('Chat failed', type='negative')
         app_logger.error(f"Chat demo error: {e}")
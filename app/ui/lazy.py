@@ -0,0 +1,214 @@
+"""
+Lazy, viewport-triggered construction of heavy page sections.
+A lazy section renders a single placeholder element and only builds its real
+subtree once it scrolls into view, or when its tab or expansion is opened.
+"""
+
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+from nicegui import Client, context, ui
+
+from app.core.assets import publish_asset, register_asset
+from app.core.metrics import metrics
+
+# Define what this module exports
+__all__ = [
+    "LazySection",
+    "create_lazy_section",
+    "create_lazy_expansion",
+    "create_lazy_tab_panels",
+    "get_section_stats",
+]
+
+# Shared observer: dispatches a "lazyvisible" DOM event on a placeholder once it
+# approaches the viewport. Placeholders are registered via run_javascript, which
+# NiceGUI only delivers after the socket handshake, so the event is never lost.
+LAZY_SECTION_SCRIPT = """
+window.observeLazySection = (() => {
+  const observer = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (!entry.isIntersecting) continue;
+      observer.unobserve(entry.target);
+      entry.target.dispatchEvent(new CustomEvent("lazyvisible"));
+    }
+  }, { rootMargin: "200px" });
+  return (id) => {
+    const element = document.getElementById(id);
+    if (element) observer.observe(element);
+  };
+})();
+"""
+
+register_asset("lazy-sections", LAZY_SECTION_SCRIPT, "js")
+
+# Buckets for the number of sections materialized per visit
+SECTIONS_PER_VISIT_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30)
+
+_script_installed = False
+_client_stats: "weakref.WeakKeyDictionary[Client, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+
+def _install_script() -> None:
+    global _script_installed
+    if not _script_installed:
+        script_url = publish_asset("lazy-sections", LAZY_SECTION_SCRIPT, "js")
+        ui.add_head_html(f'<script src="{script_url}"></script>', shared=True)
+        _script_installed = True
+
+
+def _stats_for(client: Client) -> Dict[str, int]:
+    """Get the per-visit section counters, reporting them when the visit ends."""
+    stats = _client_stats.get(client)
+    if stats is None:
+        stats = _client_stats[client] = {"rendered": 0, "materialized": 0}
+
+        def report() -> None:
+            metrics.histogram(
+                "lazy_sections_materialized_per_visit",
+                "Lazy sections built during a single visit",
+                buckets=SECTIONS_PER_VISIT_BUCKETS,
+            ).observe(stats["materialized"])
+
+        client.on_disconnect(report)
+    return stats
+
+
+def get_section_stats(client: Client) -> Dict[str, int]:
+    """Return how many lazy sections a client rendered and actually materialized.
+
+    Args:
+        client: The NiceGUI client
+
+    Returns:
+        Dictionary with "rendered" and "materialized" counts
+    """
+    return dict(_client_stats.get(client, {"rendered": 0, "materialized": 0}))
+
+
+class LazySection:
+    """Placeholder that builds its content on first demand.
+
+    Args:
+        name: Section name used in metrics
+        content_func: Function that builds the real subtree
+        min_height: Placeholder height, so the page does not jump while scrolling
+        classes: Classes applied to the section container
+        observe: Materialize when the placeholder scrolls into view
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content_func: Callable[[], Any],
+        min_height: str = "16rem",
+        classes: str = "",
+        observe: bool = True,
+    ) -> None:
+        _install_script()
+        self.name = name
+        self.content_func = content_func
+        self.materialized = False
+        self.client = context.client
+        with ui.element("div").classes(f"w-full {classes}") as self.container:
+            self.placeholder = ui.element("div").classes("w-full bg-gray-50 rounded-lg animate-pulse") \
+                .style(f"min-height: {min_height}")
+
+        _stats_for(self.client)["rendered"] += 1
+        metrics.counter("lazy_sections_rendered_total", "Lazy section placeholders rendered", section=name).inc()
+
+        if observe:
+            self.placeholder.on("lazyvisible", self.materialize, [])
+            self.client.run_javascript(f'window.observeLazySection("c{self.placeholder.id}")')
+
+    def materialize(self) -> None:
+        """Build the real content in place of the placeholder (idempotent)."""
+        if self.materialized:
+            return
+        self.materialized = True
+        self.placeholder.delete()
+        with self.container:
+            self.content_func()
+
+        _stats_for(self.client)["materialized"] += 1
+        metrics.counter("lazy_sections_materialized_total", "Lazy sections actually built", section=self.name).inc()
+
+
+def create_lazy_section(
+    name: str,
+    content_func: Callable[[], Any],
+    min_height: str = "16rem",
+    classes: str = "",
+) -> LazySection:
+    """Create a section that is built when it scrolls into view."""
+    return LazySection(name, content_func, min_height=min_height, classes=classes)
+
+
+def create_lazy_expansion(
+    text: str,
+    content_func: Callable[[], Any],
+    icon: Optional[str] = None,
+    name: Optional[str] = None,
+    classes: str = "",
+) -> ui.expansion:
+    """Create an expansion whose content is built the first time it is opened.
+
+    Args:
+        text: Expansion header text
+        content_func: Function that builds the expansion content
+        icon: Optional header icon
+        name: Section name used in metrics (defaults to the header text)
+        classes: Classes applied to the expansion
+
+    Returns:
+        The expansion element
+    """
+    def open_expansion(event: Any) -> None:
+        if event.value:
+            section.materialize()
+
+    with ui.expansion(text, icon=icon, on_value_change=open_expansion).classes(classes) as expansion:
+        section = LazySection(name or f"expansion:{text}", content_func, min_height="6rem", observe=False)
+    return expansion
+
+
+def _tab_name(tab: Any) -> str:
+    """Return the panel name for a tab element or a tab name."""
+    return tab._props["name"] if isinstance(tab, ui.tab) else str(tab)
+
+
+def create_lazy_tab_panels(
+    tabs: ui.tabs,
+    panels: Dict[Any, Callable[[], Any]],
+    value: Optional[Any] = None,
+    name: str = "tab",
+    classes: str = "",
+) -> ui.tab_panels:
+    """Create tab panels whose content is built the first time each tab is opened.
+
+    Args:
+        tabs: The tabs element the panels belong to
+        panels: Mapping of tab to the function building its panel content
+        value: Initially selected tab (defaults to the first one)
+        name: Prefix for the section names used in metrics
+        classes: Classes applied to the tab panels element
+
+    Returns:
+        The tab panels element
+    """
+    value = value if value is not None else next(iter(panels))
+    sections: Dict[str, LazySection] = {}
+
+    def open_tab(event: Any) -> None:
+        section = sections.get(_tab_name(event.value))
+        if section is not None:
+            section.materialize()
+
+    with ui.tab_panels(tabs, value=value, on_change=open_tab).classes(classes) as tab_panels:
+        for tab, content_func in panels.items():
+            tab_name = _tab_name(tab)
+            with ui.tab_panel(tab):
+                sections[tab_name] = LazySection(f"{name}:{tab_name}", content_func, observe=False)
+
+    sections[_tab_name(value)].materialize()
+    return tab_panels
@@ -11,6 +11,7 @@ from app.ui.components import (
     create_project_card, create_contact_form, 
     create_ai_demo_section, create_stats_grid
 )
+from app.ui.lazy import create_lazy_section
 
 def create_portfolio_pages():
     """Create all portfolio pages and navigation."""
@@ -80,48 +81,56 @@ def create_home_page():
         create_stats_grid(stats)
         
         # Introduction section
-        with ui.element('div').classes('grid md:grid-cols-2 gap-8 mb-8'):
-            create_card("About Me", lambda: ui.markdown("""
-            I'm a passionate **Generative AI Engineer** specializing in building intelligent systems that solve real-world problems. With expertise in Large Language Models, prompt engineering, and AI application development, I help businesses harness the power of AI to drive innovation and growth.
-
-            **Key Specializations:**
-            - Large Language Model integration and fine-tuning
-            - Intelligent chatbots and virtual assistants  
-            - AI-powered content generation platforms
-            - Retrieval-Augmented Generation (RAG) systems
-            - Multi-modal AI applications
-            """))
-            
-            create_card("Latest Work", lambda: ui.markdown("""
-            **🚀 Recent Achievements:**
-            
-            - Built an enterprise chatbot serving 10K+ users daily
-            - Developed AI content platform reducing creation time by 80%
-            - Implemented RAG system improving answer accuracy by 40%
-            - Created multi-modal AI app for creative professionals
-            
-            **🔧 Currently Working On:**
-            - Advanced prompt engineering techniques
-            - AI agent orchestration systems
-            - Custom model fine-tuning pipelines
-            """))
+        create_lazy_section("home:introduction", create_home_introduction, min_height='24rem')
         
         # Quick links
-        with ui.element('div').classes('grid md:grid-cols-3 gap-6'):
-            create_card("Explore Projects", lambda: [
-                ui.markdown("Discover my latest AI projects and case studies"),
-                ui.button("View Projects", on_click=lambda: ui.navigate.to('/projects')).classes('mt-4 bg-blue-600 text-white px-4 py-2 rounded')
-            ])
-            
-            create_card("Try AI Demos", lambda: [
-                ui.markdown("Experience live demonstrations of AI capabilities"),
-                ui.button("Try Demos", on_click=lambda: ui.navigate.to('/demos')).classes('mt-4 bg-green-600 text-white px-4 py-2 rounded')
-            ])
-            
-            create_card("Get In Touch", lambda: [
-                ui.markdown("Let's discuss your AI project requirements"),
-                ui.button("Contact Me", on_click=lambda: ui.navigate.to('/contact')).classes('mt-4 bg-purple-600 text-white px-4 py-2 rounded')
-            ])
+        create_lazy_section("home:quick-links", create_home_quick_links, min_height='10rem')
+
+def create_home_introduction():
+    """Create the home page introduction cards."""
+    with ui.element('div').classes('grid md:grid-cols-2 gap-8 mb-8'):
+        create_card("About Me", lambda: ui.markdown("""
+        I'm a passionate **Generative AI Engineer** specializing in building intelligent systems that solve real-world problems. With expertise in Large Language Models, prompt engineering, and AI application development, I help businesses harness the power of AI to drive innovation and growth.
+
+        **Key Specializations:**
+        - Large Language Model integration and fine-tuning
+        - Intelligent chatbots and virtual assistants  
+        - AI-powered content generation platforms
+        - Retrieval-Augmented Generation (RAG) systems
+        - Multi-modal AI applications
+        """))
+        
+        create_card("Latest Work", lambda: ui.markdown("""
+        **🚀 Recent Achievements:**
+        
+        - Built an enterprise chatbot serving 10K+ users daily
+        - Developed AI content platform reducing creation time by 80%
+        - Implemented RAG system improving answer accuracy by 40%
+        - Created multi-modal AI app for creative professionals
+        
+        **🔧 Currently Working On:**
+        - Advanced prompt engineering techniques
+        - AI agent orchestration systems
+        - Custom model fine-tuning pipelines
+        """))
+
+def create_home_quick_links():
+    """Create the home page quick link cards."""
+    with ui.element('div').classes('grid md:grid-cols-3 gap-6'):
+        create_card("Explore Projects", lambda: [
+            ui.markdown("Discover my latest AI projects and case studies"),
+            ui.button("View Projects", on_click=lambda: ui.navigate.to('/projects')).classes('mt-4 bg-blue-600 text-white px-4 py-2 rounded')
+        ])
+        
+        create_card("Try AI Demos", lambda: [
+            ui.markdown("Experience live demonstrations of AI capabilities"),
+            ui.button("Try Demos", on_click=lambda: ui.navigate.to('/demos')).classes('mt-4 bg-green-600 text-white px-4 py-2 rounded')
+        ])
+        
+        create_card("Get In Touch", lambda: [
+            ui.markdown("Let's discuss your AI project requirements"),
+            ui.button("Contact Me", on_click=lambda: ui.navigate.to('/contact')).classes('mt-4 bg-purple-600 text-white px-4 py-2 rounded')
+        ])
 
 def create_about_page():
     """Create the about page content."""
@@ -247,7 +256,11 @@ def create_projects_page():
         # Project grid
         with ui.element('div').classes('grid md:grid-cols-2 lg:grid-cols-3 gap-6'):
             for project in projects:
-                create_project_card(project)
+                create_lazy_section(
+                    f"projects:{project['title']}",
+                    lambda p=project: create_project_card(p),
+                    min_height='18rem',
+                )
 
 def create_skills_page():
     """Create the skills page content."""
@@ -323,7 +336,7 @@ def create_demos_page():
         create_ai_demo_section()
         
         # Additional demo info
-        create_card("Demo Information", lambda: ui.markdown("""
+        create_lazy_section("demos:information", lambda: create_card("Demo Information", lambda: ui.markdown("""
         **About These Demos:**
         
         These interactive demonstrations showcase core AI capabilities that I implement in real-world projects:
@@ -337,7 +350,7 @@ def create_demos_page():
         🎨 **Creative AI**: Multi-modal content generation including text, images, and multimedia
         
         **Ready to implement these capabilities in your business?** [Contact me](/contact) to discuss your specific requirements.
-        """))
+        """)), min_height='20rem')
 
 def create_contact_page():
     """Create the contact page content."""
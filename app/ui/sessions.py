@@ -0,0 +1,316 @@
+"""
+Per-client memory accounting and idle-client eviction for NiceGUI sessions.
+Every visitor keeps a server-side element tree alive; this module reports its
+size and tears down clients that are idle or push the process past its budget.
+"""
+
+import asyncio
+import hashlib
+import sys
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+from nicegui import Client, app as nicegui_app, context
+
+from app.core import app_logger, settings
+from app.core.config import on_settings_change
+from app.core.deadlines import deadline_scope, run_within_deadline
+from app.core.health import readiness
+from app.core.metrics import metrics
+from app.core.lazy_imports import lazy_import
+from app.ui.lazy import get_section_stats
+
+# psutil is optional, RSS is simply not reported without it
+psutil = lazy_import("psutil")
+
+# Define what this module exports
+__all__ = ["ClientMonitor", "client_monitor", "estimate_element_bytes", "run_for_client"]
+
+# Seconds an evicted client may keep its socket before it is deleted forcibly
+EVICTION_GRACE_SECONDS = 10.0
+
+# Sent to an evicted browser tab: drop the socket without showing the
+# "connection lost" popup and rebuild the page as soon as the visitor returns.
+EVICTION_JAVASCRIPT = """
+window.socket.io.reconnection(false);
+window.socket.disconnect();
+document.getElementById("popup").ariaHidden = true;
+const rebuild = () => window.location.reload();
+["pointerdown", "keydown", "scroll", "focus"].forEach(name => window.addEventListener(name, rebuild, {once: true}));
+document.addEventListener("visibilitychange", () => { if (!document.hidden) rebuild(); });
+"""
+
+
+def estimate_element_bytes(element: Any) -> int:
+    """Estimate the server-side memory held by a single NiceGUI element.
+
+    The estimate is shallow (containers plus their direct values), which keeps
+    it cheap enough to run over every element of every client on each sweep.
+
+    Args:
+        element: The NiceGUI element
+
+    Returns:
+        Estimated size in bytes
+    """
+    size = sys.getsizeof(element) + sys.getsizeof(element.__dict__)
+    props = getattr(element, "_props", {})
+    size += sys.getsizeof(props) + sum(sys.getsizeof(value) for value in props.values())
+    for attr in ("_classes", "_style", "_event_listeners", "slots"):
+        size += sys.getsizeof(getattr(element, attr, None))
+    text = getattr(element, "_text", None)
+    if text:
+        size += sys.getsizeof(text)
+    return size
+
+
+async def run_for_client(awaitable: Awaitable[Any], work: str, timeout: float) -> Any:
+    """Run upstream work for the current client's UI event under a deadline.
+
+    When the visitor leaves (the client disconnects for good) or the timeout
+    passes, the work is abandoned instead of finishing for nobody.
+
+    Args:
+        awaitable: The upstream call
+        work: Kind of upstream work, used as a metrics label
+        timeout: Seconds the event may take
+
+    Raises:
+        DeadlineExceededError: The timeout passed
+    """
+    client = context.get_client()
+    task = asyncio.current_task()
+    with deadline_scope(timeout) as deadline:
+        def abandon() -> None:
+            deadline.abandon("disconnect")
+            task.cancel()
+
+        client.on_disconnect(abandon)
+        try:
+            return await run_within_deadline(awaitable, work)
+        finally:
+            client.disconnect_handlers.remove(abandon)
+
+
+class ClientMonitor:
+    """Tracks NiceGUI clients and evicts idle or over-budget ones.
+
+    Activity is recorded on every handshake and UI event. A background sweep
+    runs every ``CLIENT_SWEEP_INTERVAL`` seconds and evicts clients idle longer
+    than ``CLIENT_IDLE_TIMEOUT_MINUTES``, then the least recently active ones
+    while the estimated total exceeds ``CLIENT_MEMORY_BUDGET_MB``.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 0,
+        memory_budget: int = 0,
+        sweep_interval: float = 30,
+    ) -> None:
+        self.idle_timeout = idle_timeout  # seconds, 0 disables
+        self.memory_budget = memory_budget  # bytes, 0 disables
+        self.sweep_interval = sweep_interval
+        self.last_activity: Dict[str, float] = {}
+        self.evicted: Dict[str, float] = {}
+        self._installed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self) -> None:
+        """Hook into NiceGUI to track activity and start the sweep loop on startup."""
+        if self._installed:
+            return
+        self._installed = True
+
+        monitor = self
+        original_handle_event = Client.handle_event
+
+        def handle_event(client: Client, msg: Dict) -> None:
+            monitor.touch(client)
+            original_handle_event(client, msg)
+
+        Client.handle_event = handle_event
+        nicegui_app.on_connect(self.touch)
+        nicegui_app.on_startup(self.start)
+        nicegui_app.on_shutdown(self.stop)
+        readiness.register_check("client_monitor", lambda: (self.running, "sweeping" if self.running else "stopped"))
+        app_logger.info(
+            f"Client monitor installed: idle timeout {self.idle_timeout}s, "
+            f"budget {self.memory_budget // (1024 * 1024)}MB"
+        )
+
+    def touch(self, client: Client) -> None:
+        """Record activity for a client."""
+        self.last_activity[client.id] = time.monotonic()
+
+    def start(self) -> None:
+        """Start the background sweep loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        """Whether the background sweep loop is running."""
+        return self._task is not None and not self._task.done()
+
+    def stop(self) -> None:
+        """Stop the background sweep loop."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                # Make sure the loop survives unexpected client states
+                app_logger.error(f"Client sweep failed: {e}")
+
+    def _clients(self) -> List[Client]:
+        return [client for client in list(Client.instances.values()) if not client.shared]
+
+    def client_stats(self, client: Client, now: Optional[float] = None) -> Dict[str, Any]:
+        """Collect size and activity information for one client.
+
+        Args:
+            client: The NiceGUI client
+            now: Monotonic timestamp to measure idle time against
+
+        Returns:
+            Dictionary with element count, estimated bytes and idle time
+        """
+        now = now if now is not None else time.monotonic()
+        elements = list(client.elements.values())
+        last_activity = self.last_activity.setdefault(client.id, now)
+        return {
+            # The client id is a session credential for the socket, never expose it
+            "id_hash": hashlib.sha256(client.id.encode()).hexdigest()[:12],
+            "path": getattr(client.page, "path", ""),
+            "connected": client.has_socket_connection,
+            "elements": len(elements),
+            "estimated_bytes": sum(estimate_element_bytes(element) for element in elements),
+            "idle_seconds": round(now - last_activity, 1),
+            "age_seconds": round(time.time() - client.created, 1),
+            "evicted": client.id in self.evicted,
+            "lazy_sections": get_section_stats(client),
+        }
+
+    def snapshot(self, top: int = 20) -> Dict[str, Any]:
+        """Summarize all clients, largest first.
+
+        Args:
+            top: Number of individual clients to include
+
+        Returns:
+            Dictionary with totals, configured limits and per-client details
+        """
+        now = time.monotonic()
+        stats = [self.client_stats(client, now) for client in self._clients()]
+        stats.sort(key=lambda s: s["estimated_bytes"], reverse=True)
+        return {
+            "clients": len(stats),
+            "connected": sum(1 for s in stats if s["connected"]),
+            "elements": sum(s["elements"] for s in stats),
+            "estimated_bytes": sum(s["estimated_bytes"] for s in stats),
+            "rss_bytes": psutil.Process().memory_info().rss if psutil else None,
+            "idle_timeout_seconds": self.idle_timeout,
+            "memory_budget_bytes": self.memory_budget,
+            "top_clients": stats[:top],
+        }
+
+    def sweep(self) -> int:
+        """Evict idle clients, then the least recently active ones while over budget.
+
+        Returns:
+            Number of clients evicted in this sweep
+        """
+        now = time.monotonic()
+        live_ids = set(Client.instances)
+        for client_id in list(self.last_activity):
+            if client_id not in live_ids:
+                self.last_activity.pop(client_id, None)
+                self.evicted.pop(client_id, None)
+
+        stats = [(client, self.client_stats(client, now)) for client in self._clients()]
+        total_bytes = sum(s["estimated_bytes"] for _, s in stats)
+        metrics.gauge("nicegui_clients", "Active NiceGUI clients").set(len(stats))
+        metrics.gauge("nicegui_client_elements", "Elements held by all clients").set(
+            sum(s["elements"] for _, s in stats))
+        metrics.gauge("nicegui_client_estimated_bytes", "Estimated bytes held by all clients").set(total_bytes)
+        if psutil:
+            metrics.gauge("process_rss_bytes", "Resident set size of the process").set(
+                psutil.Process().memory_info().rss)
+
+        evicted = 0
+        remaining: List[Any] = []
+        for client, client_stats in stats:
+            if client.id in self.evicted:
+                # Already told to leave; force deletion once the grace period has passed
+                if now - self.evicted[client.id] > EVICTION_GRACE_SECONDS:
+                    self._delete(client)
+                total_bytes -= client_stats["estimated_bytes"]
+            elif self.idle_timeout and client_stats["idle_seconds"] > self.idle_timeout:
+                self.evict(client, "idle")
+                total_bytes -= client_stats["estimated_bytes"]
+                evicted += 1
+            else:
+                remaining.append((client, client_stats))
+
+        if self.memory_budget and total_bytes > self.memory_budget:
+            remaining.sort(key=lambda item: item[1]["idle_seconds"], reverse=True)
+            for client, client_stats in remaining:
+                if total_bytes <= self.memory_budget:
+                    break
+                self.evict(client, "budget")
+                total_bytes -= client_stats["estimated_bytes"]
+                evicted += 1
+
+        if evicted:
+            app_logger.info(f"Evicted {evicted} NiceGUI clients, {len(stats) - evicted} remaining")
+        return evicted
+
+    def evict(self, client: Client, reason: str) -> None:
+        """Tear down a client; a connected browser rebuilds the page when the visitor returns.
+
+        Args:
+            client: The NiceGUI client to evict
+            reason: Why the client is evicted ("idle" or "budget")
+        """
+        metrics.counter("nicegui_client_evictions_total", "Evicted NiceGUI clients", reason=reason).inc()
+        if client.has_socket_connection:
+            # The browser drops its socket; NiceGUI then deletes the client after its reconnect timeout
+            self.evicted[client.id] = time.monotonic()
+            client.run_javascript(EVICTION_JAVASCRIPT)
+        else:
+            self._delete(client)
+
+    def _delete(self, client: Client) -> None:
+        self.last_activity.pop(client.id, None)
+        self.evicted.pop(client.id, None)
+        try:
+            client.delete()
+        except KeyError:
+            # Already removed by NiceGUI's own disconnect handling
+            pass
+
+
+# Create global client monitor
+client_monitor = ClientMonitor(
+    idle_timeout=(settings.CLIENT_IDLE_TIMEOUT_MINUTES or 0) * 60,
+    memory_budget=(settings.CLIENT_MEMORY_BUDGET_MB or 0) * 1024 * 1024,
+    sweep_interval=settings.CLIENT_SWEEP_INTERVAL or 30,
+)
+
+
+def _apply_client_settings(changes: Dict[str, Any]) -> None:
+    # The sweep loop reads these on every pass
+    client_monitor.idle_timeout = (settings.CLIENT_IDLE_TIMEOUT_MINUTES or 0) * 60
+    client_monitor.memory_budget = (settings.CLIENT_MEMORY_BUDGET_MB or 0) * 1024 * 1024
+    client_monitor.sweep_interval = settings.CLIENT_SWEEP_INTERVAL or 30
+
+
+on_settings_change(
+    ["CLIENT_IDLE_TIMEOUT_MINUTES", "CLIENT_MEMORY_BUDGET_MB", "CLIENT_SWEEP_INTERVAL"],
+    _apply_client_settings,
+)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+AI Provider Resilience Benchmark
+
+This script drives the AI gateway with local fake providers (no API keys or
+network needed) and reports request latency percentiles.
+
+Scenarios:
+- tail latency: two healthy providers, a few percent of whose calls are very
+  slow, with and without hedged requests (and the extra calls hedging costs)
+- outage: the preferred provider hangs until the provider timeout, with the
+  circuit breaker disabled and enabled (and the calls still sent to it)
+
+Usage:
+    python benchmarks/ai_resilience.py --requests 400 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.ai import AIGateway, FakeProvider, MockProvider  # noqa: E402
+
+# Never opens: rates above 1 cannot be reached
+BREAKER_DISABLED = {"failure_rate": 2.0, "slow_call_rate": 2.0}
+
+
+async def drive(gateway, requests, concurrency):
+    """Send requests through the gateway; returns per-request latencies and fallbacks."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    fallbacks = 0
+
+    async def one(index):
+        nonlocal fallbacks
+        async with semaphore:
+            started = time.perf_counter()
+            result = await gateway.complete("chat", f"question {index}")
+            latencies.append(time.perf_counter() - started)
+            fallbacks += result.fallback
+
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return latencies, fallbacks
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def report(name, latencies, calls, requests, fallbacks):
+    print(f"{name:<26}{statistics.median(latencies) * 1000:>9.0f}{percentile(latencies, 0.95) * 1000:>9.0f}"
+          f"{percentile(latencies, 0.99) * 1000:>9.0f}{calls / requests:>12.2f}{fallbacks:>11}")
+
+
+def tail_scenario(requests, concurrency, hedge_delay):
+    def providers():
+        return [FakeProvider(name, latency=0.05, jitter=0.02, slow_rate=0.05, slow_latency=1.0, seed=seed)
+                for name, seed in (("primary", 1), ("secondary", 2))]
+
+    for label, delay in (("tail, no hedging", 0.0), (f"tail, hedge at {hedge_delay * 1000:.0f} ms", hedge_delay)):
+        fakes = providers()
+        gateway = AIGateway(fakes, MockProvider(simulate_latency=False), timeout=5.0, hedge_delay=delay)
+        latencies, fallbacks = asyncio.run(drive(gateway, requests, concurrency))
+        report(label, latencies, sum(fake.calls for fake in fakes), requests, fallbacks)
+
+
+def outage_scenario(requests, concurrency, timeout):
+    for label, breaker in (("outage, no breaker", BREAKER_DISABLED), ("outage, breaker", {})):
+        dead = FakeProvider("primary", latency=60.0)
+        healthy = FakeProvider("secondary", latency=0.05, jitter=0.02, seed=3)
+        gateway = AIGateway([dead, healthy], MockProvider(simulate_latency=False), timeout=timeout,
+                            open_seconds=60.0, **breaker)
+        latencies, fallbacks = asyncio.run(drive(gateway, requests, concurrency))
+        report(label, latencies, dead.calls + healthy.calls, requests, fallbacks)
+        print(f"{'':<26}calls to the hanging provider: {dead.calls}")
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    parser.add_argument("--hedge-delay", type=float, default=0.1, help="Hedging delay in seconds")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Provider timeout in seconds for the outage")
+    args = parser.parse_args()
+
+    print("=== AI Provider Resilience ===")
+    print(f"{args.requests} requests, {args.concurrency} concurrent\n")
+    print(f"{'Scenario':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'calls/req':>12}{'fallbacks':>11}")
+    tail_scenario(args.requests, args.concurrency, args.hedge_delay)
+    outage_scenario(args.requests, args.concurrency, args.timeout)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+NiceGUI Client Memory Load Test
+
+This script opens N headless NiceGUI clients against the portfolio: each one
+loads a page over HTTP and then completes the socket.io handshake over a raw
+websocket, so the server keeps a live element tree exactly as for a browser tab.
+It reports the server's RSS growth per client and the server-side client
+statistics from the diagnostics API.
+
+By default a fresh server is started from main.py in a temporary working
+directory; use --url and --pid to measure an already running server instead,
+with --token (or ADMIN_TOKEN) holding an admin token for the diagnostics API.
+
+Usage:
+    python benchmarks/client_memory.py --clients 200 --path /projects
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import psutil
+import websockets
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CLIENT_ID_PATTERN = re.compile(r"""["']client_id["']:\s*["']([0-9a-f-]{36})""")
+
+# Signs the admin tokens of spawned servers
+BENCH_SECRET_KEY = secrets.token_hex(32)
+
+
+def start_server(port, workdir=None, extra_env=None):
+    """Start main.py on the given port in a scratch directory and return the process.
+
+    Args:
+        port: Port to listen on
+        workdir: Working directory (a new temporary one by default)
+        extra_env: Settings passed to the server as environment variables
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="portfolio-bench-")
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "DEBUG": "false",
+        "PYTHONPATH": str(PROJECT_ROOT),
+        "SECRET_KEY": BENCH_SECRET_KEY,
+        "ALGORITHM": "HS256",
+        **(extra_env or {}),
+    }
+    return subprocess.Popen(
+        [sys.executable, str(PROJECT_ROOT / "main.py")],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def admin_token(secret_key=BENCH_SECRET_KEY):
+    """Mint an admin token for a server using secret_key, with the app's own CLI.
+
+    It runs outside the project so a local .env does not change the settings.
+    """
+    result = subprocess.run(
+        [sys.executable, "-m", "app.core.security", "--minutes", "60"],
+        cwd=tempfile.gettempdir(),
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT), "SECRET_KEY": secret_key, "ALGORITHM": "HS256"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+async def wait_until_ready(url, timeout=60.0):
+    """Poll the health endpoint until the server answers."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise TimeoutError(f"Server at {url} did not become ready within {timeout}s")
+
+
+async def open_client(http, url, path, stop):
+    """Load a page and keep its socket.io connection alive until stop is set."""
+    response = await http.get(f"{url}{path}")
+    match = CLIENT_ID_PATTERN.search(response.text)
+    if not match:
+        raise RuntimeError(f"No client id found in response for {path}")
+    client_id = match.group(1)
+
+    ws_url = url.replace("http", "ws", 1)
+    socket_url = f"{ws_url}/_nicegui_ws/socket.io/?client_id={client_id}&EIO=4&transport=websocket"
+    async with websockets.connect(socket_url, max_size=None) as ws:
+        await ws.recv()  # Engine.IO open packet
+        await ws.send("40")  # connect to the default namespace
+        await ws.recv()
+        handshake = ["handshake", {"client_id": client_id, "tab_id": str(uuid.uuid4())}]
+        await ws.send("420" + json.dumps(handshake))
+        while not stop.is_set():
+            try:
+                message = await asyncio.wait_for(ws.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            if message == "2":  # Engine.IO ping
+                await ws.send("3")
+
+
+def rss_mb(process):
+    return process.memory_info().rss / (1024 * 1024)
+
+
+async def run(args):
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port)
+        pid = server.pid
+    else:
+        pid = args.pid
+    process = psutil.Process(pid) if pid else None
+
+    try:
+        await wait_until_ready(url)
+        token = admin_token() if server is not None else args.token
+        baseline = rss_mb(process) if process else None
+        stop = asyncio.Event()
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=30) as http:
+            started = time.perf_counter()
+            tasks = []
+            for index in range(args.clients):
+                tasks.append(asyncio.create_task(open_client(http, url, args.path, stop)))
+                if (index + 1) % args.concurrency == 0:
+                    await asyncio.sleep(0.05)
+            await asyncio.sleep(args.settle)
+            elapsed = time.perf_counter() - started
+            failed = [task for task in tasks if task.done() and task.exception()]
+
+            loaded = rss_mb(process) if process else None
+            stats = (await http.get(f"{url}/api/v1/diagnostics/clients", params={"top": 0},
+                                    headers={"Authorization": f"Bearer {token}"})).json()
+
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        print("=== NiceGUI Client Memory Load Test ===")
+        print(f"Path:               {args.path}")
+        print(f"Clients opened:     {args.clients - len(failed)}/{args.clients} in {elapsed:.1f}s")
+        print(f"Server clients:     {stats.get('clients')} ({stats.get('connected')} connected)")
+        print(f"Server elements:    {stats.get('elements')}")
+        print(f"Estimated bytes:    {stats.get('estimated_bytes', 0) / (1024 * 1024):.1f} MB")
+        if baseline is not None:
+            growth = loaded - baseline
+            print(f"RSS before/after:   {baseline:.1f} MB / {loaded:.1f} MB")
+            print(f"RSS growth:         {growth:.1f} MB ({growth * 1024 / max(args.clients, 1):.1f} KB per client)")
+        return not failed
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="Number of headless clients to open")
+    parser.add_argument("--path", default="/", help="Page route every client loads")
+    parser.add_argument("--concurrency", type=int, default=20, help="Clients opened per batch")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait after opening clients")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned server")
+    parser.add_argument("--url", help="Measure an already running server instead of spawning one")
+    parser.add_argument("--pid", type=int, help="PID of the running server, for RSS measurement")
+    parser.add_argument("--token", default=os.getenv("ADMIN_TOKEN"), help="Admin token of the running server")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
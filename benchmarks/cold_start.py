@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Cold Start vs Snapshot-Restored Start Benchmark
+
+This script boots ``main.py`` repeatedly, alternating between a cold start
+(no warm-state snapshot) and a start that restores the snapshot written by the
+previous run's shutdown (SIGINT, the platform's kill signal). For each kind of
+start it reports the median of:
+
+- time from process spawn to the first byte of the first response
+- time spent warming caches before traffic is accepted
+- latency of the first request to each hot URL (served from restored caches
+  on a snapshot start, built on demand on a cold start)
+
+Usage:
+    python benchmarks/cold_start.py --runs 3
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import re
+import secrets
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+HEADERS = {"Accept-Encoding": "br, gzip" if brotli else "gzip"}
+
+# Signs the admin token for the diagnostics API of the booted apps
+SECRET_KEY = secrets.token_hex(32)
+THEME_PATTERN = re.compile(r'/static/css/theme\.[0-9a-f]+\.css')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def admin_token():
+    """Mint an admin token for SECRET_KEY with the app's own CLI, outside the project so a local .env is not read."""
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), SECRET_KEY=SECRET_KEY, ALGORITHM="HS256")
+    result = subprocess.run([sys.executable, "-m", "app.core.security", "--minutes", "60"],
+                            cwd=tempfile.gettempdir(), env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def get(port, path, headers=None):
+    """Return (seconds to the response headers, decoded body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    started = time.perf_counter()
+    connection.request("GET", path, headers={**HEADERS, **(headers or {})})
+    response = connection.getresponse()
+    ttfb = time.perf_counter() - started
+    body = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"GET {path} returned {response.status}")
+    encoding = response.getheader("content-encoding")
+    if encoding == "br":
+        body = brotli.decompress(body)
+    elif encoding == "gzip":
+        body = gzip.decompress(body)
+    return ttfb, body
+
+
+def boot(snapshot, api_prefix, token):
+    """Start the app, time the first requests and stop it with SIGINT."""
+    port = free_port()
+    env = dict(os.environ, DEBUG="false", PORT=str(port), HOST="127.0.0.1", WORKERS="1",
+               WARM_SNAPSHOT_FILE=str(snapshot), SECRET_KEY=SECRET_KEY, ALGORITHM="HS256")
+    spawned = time.perf_counter()
+    process = subprocess.Popen([sys.executable, str(PROJECT_ROOT / "main.py")], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("application exited during startup")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.05):
+                    break
+            except OSError:
+                time.sleep(0.005)
+        requested = time.perf_counter()
+        ttfb, _ = get(port, f"{api_prefix}/projects")
+        first_byte = requested - spawned + ttfb
+
+        latencies = {"api": ttfb}
+        latencies["skills"], _ = get(port, f"{api_prefix}/skills")
+        latencies["page"], page = get(port, "/")
+        theme = THEME_PATTERN.search(page.decode("utf-8", "replace"))
+        if theme:
+            latencies["theme css"], _ = get(port, theme.group(0))
+
+        # Time spent filling caches before the first request was accepted
+        _, startup = get(port, f"{api_prefix}/diagnostics/startup", {"Authorization": f"Bearer {token}"})
+        warmup = sum(phase["duration_ms"] for phase in json.loads(startup)["phases"]
+                     if phase["name"].startswith("warmup."))
+        return first_byte, warmup, latencies
+    finally:
+        process.send_signal(signal.SIGINT)
+        process.wait(30)
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Boots of each kind")
+    parser.add_argument("--api-prefix", default=os.getenv("API_PREFIX", "/api/v1"), help="API prefix of the app")
+    args = parser.parse_args()
+
+    token = admin_token()
+    results = {"cold": [], "snapshot": []}
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = Path(directory) / "warm_state.snapshot"
+        for _ in range(args.runs):
+            snapshot.unlink(missing_ok=True)
+            results["cold"].append(boot(snapshot, args.api_prefix, token))
+            if not snapshot.exists():
+                print("No snapshot was written on shutdown")
+                return False
+            results["snapshot"].append(boot(snapshot, args.api_prefix, token))
+        snapshot_kb = snapshot.stat().st_size / 1024
+
+    print("=== Cold Start vs Snapshot-Restored Start ===")
+    print(f"Median of {args.runs} boots each, snapshot size {snapshot_kb:.0f} KB\n")
+    names = list(results["cold"][0][2])
+    print(f"{'':<24}{'cold ms':>10}{'snapshot ms':>13}")
+    spawn = [statistics.median(run[0] for run in results[kind]) * 1000 for kind in ("cold", "snapshot")]
+    print(f"{'spawn to first byte':<24}{spawn[0]:>10.1f}{spawn[1]:>13.1f}")
+    warmup = [statistics.median(run[1] for run in results[kind]) for kind in ("cold", "snapshot")]
+    print(f"{'cache warm-up':<24}{warmup[0]:>10.2f}{warmup[1]:>13.2f}")
+    for name in names:
+        values = [statistics.median(run[2].get(name, 0.0) for run in results[kind]) * 1000
+                  for kind in ("cold", "snapshot")]
+        print(f"{'first ' + name:<24}{values[0]:>10.2f}{values[1]:>13.2f}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
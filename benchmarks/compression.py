@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Response Compression Benchmark
+
+This script compares Starlette's ``GZipMiddleware(minimum_size=1000)`` with
+``CompressionMiddleware`` (zstd/brotli/gzip, levels by content type and a
+compressed-response cache) on representative responses:
+
+- a catalog JSON response served from a cacheable path (identical every time)
+- an HTML page carrying an ETag (identical every time)
+- a dynamic JSON response that differs on every request (never cached)
+
+Both apps are driven directly through the ASGI interface. For every scenario and
+Accept-Encoding the script reports process CPU time per request and the share of
+bytes saved compared to the uncompressed body.
+
+Usage:
+    python benchmarks/compression.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.gzip import GZipMiddleware  # noqa: E402
+from starlette.responses import HTMLResponse, JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from app.core.compression import CompressionMiddleware, available_encodings  # noqa: E402
+
+
+def build_payloads(seed=7):
+    """Create the catalog JSON and the HTML page."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(300)]
+    sentence = lambda n: " ".join(rng.choice(words) for _ in range(n))  # noqa: E731
+    catalog = [
+        {
+            "id": f"project-{i}",
+            "title": sentence(4).title(),
+            "description": sentence(30),
+            "tech_stack": [rng.choice(words) for _ in range(5)],
+            "category": rng.choice(["NLP", "Vision", "Multimodal", "MLOps"]),
+            "github_url": f"https://github.com/genai-engineer/{rng.choice(words)}",
+            "demo_url": f"https://demo.{rng.choice(words)}.com",
+        }
+        for i in range(150)
+    ]
+    cards = "".join(
+        f'<div class="card p-6 shadow-lg"><h3 class="text-xl font-bold">{sentence(4)}</h3>'
+        f'<p class="text-gray-600">{sentence(40)}</p></div>\n'
+        for _ in range(60)
+    )
+    html = f"<!DOCTYPE html><html><head><title>Portfolio</title></head><body>{cards}</body></html>"
+    return catalog, html
+
+
+def build_app(middleware):
+    catalog, html = build_payloads()
+    counter = itertools.count()
+
+    async def projects(request):
+        return JSONResponse(catalog)
+
+    async def page(request):
+        return HTMLResponse(html, headers={"etag": '"page-v1"'})
+
+    async def dynamic(request):
+        n = next(counter)
+        return JSONResponse({"request": n, "items": [{"id": i, "score": (i * n) % 97} for i in range(400)]})
+
+    routes = [
+        Route("/api/v1/projects", projects),
+        Route("/page", page),
+        Route("/dynamic", dynamic),
+    ]
+    return Starlette(routes=routes, middleware=[middleware])
+
+
+async def request(app, path, accept_encoding):
+    """Send one GET through the ASGI app and return (body bytes, content-encoding)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    size = 0
+    encoding = "identity"
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size, encoding
+        if message["type"] == "http.response.start":
+            for name, value in message["headers"]:
+                if name == b"content-encoding":
+                    encoding = value.decode()
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size, encoding
+
+
+async def measure(app, path, accept_encoding, count):
+    """Return (CPU microseconds per request, response bytes, content-encoding)."""
+    await request(app, path, accept_encoding)  # warm caches
+    started = time.process_time()
+    for _ in range(count):
+        size, encoding = await request(app, path, accept_encoding)
+    cpu = (time.process_time() - started) / count
+    return cpu * 1_000_000, size, encoding
+
+
+async def run(args):
+    apps = {
+        "GZipMiddleware": build_app(Middleware(GZipMiddleware, minimum_size=1000)),
+        "CompressionMiddleware": build_app(Middleware(
+            CompressionMiddleware, minimum_size=500, cacheable_paths=["/api/v1/projects"])),
+    }
+    browser = "gzip, deflate, br, zstd"
+    scenarios = [
+        ("catalog JSON", "/api/v1/projects", browser),
+        ("catalog JSON", "/api/v1/projects", "gzip"),
+        ("HTML with ETag", "/page", browser),
+        ("dynamic JSON", "/dynamic", browser),
+        ("dynamic JSON", "/dynamic", "gzip"),
+    ]
+
+    print("=== Response Compression Benchmark ===")
+    print(f"Available encodings: {', '.join(available_encodings())}")
+    print(f"{'Scenario':<16}{'Accept':<10}{'Middleware':<24}{'Coding':<9}{'CPU us/req':>11}{'Bytes':>9}{'Saved':>8}")
+    ok = True
+    for label, path, accept_encoding in scenarios:
+        identity_size, _ = await request(apps["GZipMiddleware"], path, "identity")
+        results = []
+        for name, app in apps.items():
+            cpu, size, encoding = await measure(app, path, accept_encoding, args.requests)
+            results.append(cpu)
+            saved = 1 - size / identity_size
+            accept = "browser" if accept_encoding == browser else accept_encoding
+            print(f"{label:<16}{accept:<10}{name:<24}{encoding:<9}{cpu:>11.1f}{size:>9}{saved:>8.1%}")
+            ok = ok and size <= identity_size
+        print(f"{'':<50}{'CPU ratio':<9}{results[1] / results[0]:>10.2f}x")
+    return ok
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario and middleware")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+Document Ingestion Throughput Benchmark
+
+This script generates a corpus of multi-page PDF (when pypdf is installed),
+DOCX and text documents in a content-addressed upload directory, then ingests
+it with ``IngestionPool`` using 1, 2, 4, ... worker processes: text is
+extracted page by page, chunked with overlap and written to SQLite.
+
+For each worker count it reports pages per second, the speedup over one
+worker and the time to resubmit the whole corpus, which is answered from the
+cache by content hash without extracting anything. Worker start-up is
+excluded: the pool is warmed with one small document per worker first.
+
+Worker processes only help up to the number of available cores.
+
+Usage:
+    python benchmarks/ingestion_throughput.py --workers 1 2 4 --documents 12 --pages 40
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.extraction import pypdf  # noqa: E402
+from app.services.ingestion import IngestionPool  # noqa: E402
+
+WORDS = ("model retrieval embedding context prompt latency vector token dataset inference pipeline "
+         "evaluation agent chunk document analysis transformer attention gradient benchmark").split()
+
+LINES_PER_PAGE = 45
+
+
+def page_lines(rng, page):
+    return [f"Page {page}: " + " ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(LINES_PER_PAGE)]
+
+
+def make_pdf(rng, pages):
+    """Build an uncompressed PDF with one text content stream per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(1, pages + 1):
+        text = "\n".join(f"({line}) '" for line in page_lines(rng, page))
+        stream = f"BT /F1 9 Tf 12 TL 40 800 Td\n{text}\nET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def make_docx(rng, pages):
+    """Build a minimal DOCX with an explicit page break after every page."""
+    body = []
+    for page in range(1, pages + 1):
+        body.extend(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in page_lines(rng, page))
+        body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{"".join(body)}</w:body></w:document>')
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document)
+    return output.getvalue()
+
+
+def make_text(rng, pages):
+    return "\f".join("\n".join(page_lines(rng, page)) + "\n" for page in range(1, pages + 1)).encode()
+
+
+def build_corpus(directory, documents, pages, seed=7):
+    """Write the corpus into a content-addressed directory; returns [(hash, filename, pages)]."""
+    rng = random.Random(seed)
+    makers = [("docx", make_docx), ("txt", make_text)]
+    if pypdf:
+        makers.insert(0, ("pdf", make_pdf))
+    corpus = []
+    for index in range(documents):
+        extension, make = makers[index % len(makers)]
+        content = make(rng, pages)
+        content_hash = hashlib.sha256(content).hexdigest()
+        (directory / f"{content_hash}.{extension}").write_bytes(content)
+        corpus.append((content_hash, f"document-{index}.{extension}", pages))
+    return corpus
+
+
+async def ingest(corpus, upload_directory, database, workers):
+    """Returns (pages per second, seconds to resubmit the corpus from the cache)."""
+    pool = IngestionPool(database, str(upload_directory), workers, chunk_size=1000, chunk_overlap=200)
+    try:
+        # One small document per worker, so every worker process is up before timing
+        warm_up = build_corpus(upload_directory, workers, 1, seed=workers + 1000)
+        await asyncio.gather(*[(await pool.submit(content_hash, filename)).wait()
+                               for content_hash, filename, _ in warm_up])
+
+        started = time.perf_counter()
+        jobs = [await pool.submit(content_hash, filename) for content_hash, filename, _ in corpus]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        elapsed = time.perf_counter() - started
+        failed = [job for job in jobs if job.status != "done"]
+        if failed:
+            raise RuntimeError(f"{failed[0].filename}: {failed[0].status} {failed[0].error}")
+        pages = sum(job.pages for job in jobs)
+
+        pool.jobs.clear()
+        started = time.perf_counter()
+        cached = [await pool.submit(content_hash, filename) for content_hash, filename, _ in corpus]
+        cached_elapsed = time.perf_counter() - started
+        if any(job.status != "cached" for job in cached):
+            raise RuntimeError("resubmitted documents were not served from the cache")
+        return pages / elapsed, cached_elapsed
+    finally:
+        pool.shutdown(wait=True)
+
+
+def main():
+    """Main function to run the script."""
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, max(cores, 1)}),
+                        help="Worker process counts to measure")
+    parser.add_argument("--documents", type=int, default=12, help="Documents in the corpus")
+    parser.add_argument("--pages", type=int, default=40, help="Pages per document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        upload_directory = Path(directory) / "uploads"
+        upload_directory.mkdir()
+        corpus = build_corpus(upload_directory, args.documents, args.pages)
+        kinds = sorted({filename.rsplit(".", 1)[-1] for _, filename, _ in corpus})
+
+        print("=== Document Ingestion Throughput ===")
+        print(f"{args.documents} documents ({', '.join(kinds)}) x {args.pages} pages, {cores} cores available")
+        if not pypdf:
+            print("pypdf is not installed, PDF documents are left out")
+        print(f"{'Workers':>8}{'pages/s':>10}{'speedup':>10}{'cached resubmit ms':>20}")
+        baseline = None
+        for workers in args.workers:
+            database = str(Path(directory) / f"ingestion-{workers}.db")
+            throughput, cached = asyncio.run(ingest(corpus, upload_directory, database, workers))
+            baseline = baseline or throughput
+            print(f"{workers:>8}{throughput:>10.0f}{throughput / baseline:>9.2f}x{cached * 1000:>20.1f}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
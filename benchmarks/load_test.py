@@ -0,0 +1,503 @@
+#!/usr/bin/env python
+"""
+Mixed Traffic Load Test
+
+This script drives the portfolio with a reproducible mix of traffic for a fixed
+duration and compares the results with a stored baseline:
+
+- HTTP users: closed-loop clients picking weighted requests with a seeded
+  random generator: GET /api/v1/projects and /skills, POST /api/v1/contact,
+  static assets (app files under /static and NiceGUI's own bundles) and page
+  loads of every NiceGUI page
+- websocket users: headless NiceGUI clients that load /demos, complete the
+  socket.io handshake, open the text generation and chat demos and then
+  keep typing prompts and clicking their buttons; the latency is measured
+  from the click to the notification with the result
+
+It reports requests per second, p50/p95/p99 latency and errors per scenario and
+the server's RSS (start, peak, end). Requests made during the warm-up are not
+counted.
+
+By default a fresh server is started from main.py in a temporary working
+directory, with fixture files in its static directory and the local "fake" AI
+provider (fixed latency, no API keys), so runs are comparable. Use --url and
+--pid to load an already running server instead.
+
+The run fails (exit code 1) when a scenario's p95 latency (by more than the
+tolerance and --slack-ms, for scenarios with enough requests) or throughput, the peak RSS or the error rate is
+worse than the baseline by more than the tolerance. Requests shed by admission
+control (503) count as errors. Baselines depend on the machine: record one per
+host with --save-baseline and compare later runs on the same host.
+
+Usage:
+    python benchmarks/load_test.py --duration 30 --users 10 --ws-clients 10
+    python benchmarks/load_test.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import psutil
+import websockets
+
+from client_memory import CLIENT_ID_PATTERN, start_server, wait_until_ready
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Scenario weights of the HTTP users; the contact form is rare and takes a second
+HTTP_MIX = {
+    "api projects": 25,
+    "api skills": 25,
+    "api contact": 1,
+    "static": 34,
+    "page": 15,
+}
+
+PAGES = ["/", "/about", "/projects", "/skills", "/demos", "/contact"]
+
+CONTACT = {
+    "name": "Load Test",
+    "email": "load-test@example.com",
+    "company": "Benchmarks",
+    "subject": "Load test",
+    "message": "A message sent by the load test.",
+}
+
+# (expansion label, input label, button label) of the demos the websocket users drive
+DEMOS = {
+    "demo text generation": ("Text Generation Demo", "Enter a prompt", "Generate Text"),
+    "demo chat": ("AI Chat Demo", "Ask me anything...", "Send"),
+}
+
+PROMPTS = ["Write a haiku about caching", "Explain retrieval augmented generation",
+           "What is a vector database?", "Summarize this portfolio"]
+
+ELEMENTS_PATTERN = re.compile(r"parseElements\(String\.raw`(.*?)`\)", re.S)
+NICEGUI_ASSET_PATTERN = re.compile(r'"(/_nicegui/[^"/]+/static/[^"]+\.(?:css|js))"')
+
+# Fixture files served from /static of a spawned server: (path, size in KB)
+STATIC_FIXTURES = [("css/site.css", 24), ("js/app.js", 96), ("img/hero.svg", 160)]
+
+# Latency percentile compared with the baseline, per scenario
+COMPARED_LATENCY = "p95_ms"
+
+# Fewer requests give a p95 close to the maximum, too noisy to compare
+MIN_COMPARED_REQUESTS = 50
+
+# Load parameters that must match the baseline's for a comparison to mean anything
+LOAD_PARAMETERS = ("duration", "users", "ws_clients", "think", "seed", "fake_ai_latency_ms")
+
+
+def create_static_fixtures(workdir):
+    """Write compressible text assets to the static directory of a spawned server."""
+    rng = random.Random(0)
+    words = ["portfolio", "model", "vector", "prompt", "token", "layout", "button", "gradient"]
+    for path, size_kb in STATIC_FIXTURES:
+        target = Path(workdir) / "static" / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        text = []
+        while sum(map(len, text)) < size_kb * 1024:
+            text.append(f".{rng.choice(words)}-{rng.randrange(1000)} {{ margin: {rng.randrange(64)}px; }}\n")
+        target.write_text("".join(text))
+    return [f"/static/{path}" for path, _ in STATIC_FIXTURES]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Recorder:
+    """Collects latencies and errors per scenario once the warm-up is over."""
+
+    def __init__(self, warmup):
+        self.started = time.monotonic()
+        self.measuring_from = self.started + warmup
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, scenario, started, ok, warmup=False):
+        """Record a request; ones started during the warm-up are dropped unless warmup is set."""
+        now = time.monotonic()
+        if started < self.measuring_from and not warmup:
+            return
+        self.latencies.setdefault(scenario, []).append(now - started)
+        if not ok:
+            self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+    def summary(self, elapsed):
+        scenarios = {}
+        for scenario in sorted(self.latencies):
+            latencies = self.latencies[scenario]
+            scenarios[scenario] = {
+                "requests": len(latencies),
+                "errors": self.errors.get(scenario, 0),
+                "rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+            }
+        requests = sum(result["requests"] for result in scenarios.values())
+        errors = sum(result["errors"] for result in scenarios.values())
+        return scenarios, {"requests": requests, "errors": errors, "rps": round(requests / elapsed, 2),
+                           "error_rate": round(errors / max(requests, 1), 4)}
+
+
+async def http_user(http, url, api, rng, stop, recorder, static_paths):
+    """Send weighted requests back to back until stop is set."""
+    names = list(HTTP_MIX)
+    weights = [HTTP_MIX[name] for name in names]
+    while not stop.is_set():
+        scenario = rng.choices(names, weights)[0]
+        started = time.monotonic()
+        try:
+            if scenario == "api projects":
+                response = await http.get(f"{api}/projects")
+            elif scenario == "api skills":
+                response = await http.get(f"{api}/skills")
+            elif scenario == "api contact":
+                response = await http.post(f"{api}/contact", json=CONTACT)
+            elif scenario == "static":
+                response = await http.get(f"{url}{rng.choice(static_paths)}")
+            else:
+                response = await http.get(f"{url}{rng.choice(PAGES)}")
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(scenario, started, ok)
+
+
+def _listener(element, prefix):
+    """Listener id of the element's first event whose type starts with prefix."""
+    for event in element.get("events", []):
+        if event["type"].startswith(prefix):
+            return event["listener_id"]
+    raise LookupError(f"No {prefix} listener on {element.get('tag')}")
+
+
+def _find(elements, label):
+    for element_id, element in elements.items():
+        if element and element.get("props", {}).get("label") == label:
+            return element_id
+    raise LookupError(f"No element labelled {label!r}")
+
+
+class DemoSession:
+    """A headless NiceGUI client on /demos, talking socket.io over a raw websocket."""
+
+    def __init__(self, ws, client_id, elements):
+        self.ws = ws
+        self.client_id = client_id
+        self.elements = elements
+        self.updated = asyncio.Event()
+        self.notifications = asyncio.Queue()
+
+    async def receive(self):
+        """Answer pings, apply element updates and queue notifications until the socket closes."""
+        try:
+            async for message in self.ws:
+                if message == "2":  # Engine.IO ping
+                    await self.ws.send("3")
+                elif message.startswith("42"):
+                    name, *payload = json.loads(message[2:])
+                    if name == "update":
+                        self.elements.update(payload[0])
+                        self.updated.set()
+                    elif name == "notify":
+                        self.notifications.put_nowait(payload[0])
+        except websockets.ConnectionClosed:
+            pass
+
+    async def emit(self, element_id, listener_id, *args):
+        event = {"id": int(element_id), "client_id": self.client_id, "listener_id": listener_id,
+                 "args": [json.dumps(arg) for arg in args]}
+        await self.ws.send("42" + json.dumps(["event", event]))
+
+    async def open_demo(self, expansion_label, button_label, timeout):
+        """Open a lazily built demo expansion and wait for its controls to arrive."""
+        expansion = _find(self.elements, expansion_label)
+        await self.emit(expansion, _listener(self.elements[expansion], "update:"), True)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return _find(self.elements, button_label)
+            except LookupError:
+                self.updated.clear()
+                await asyncio.wait_for(self.updated.wait(), max(deadline - time.monotonic(), 0.001))
+
+    async def submit(self, input_label, button_label, text, timeout):
+        """Type into the demo's input, click its button and wait for the result; returns success."""
+        field = _find(self.elements, input_label)
+        button = _find(self.elements, button_label)
+        await self.emit(field, _listener(self.elements[field], "update:"), text)
+        await self.emit(button, _listener(self.elements[button], "click"), None)
+        deadline = time.monotonic() + timeout
+        while True:
+            notification = await asyncio.wait_for(self.notifications.get(), max(deadline - time.monotonic(), 0.001))
+            if notification.get("type") != "info":  # "Generating text..." and the like
+                return notification.get("type") == "positive"
+
+
+async def ws_user(http, url, rng, stop, recorder, think, timeout):
+    """Open /demos like a browser tab and use the AI demos until stop is set.
+
+    Connecting (page load, handshake and opening both demos) is recorded as
+    "ws connect" even during the warm-up, since every user connects only once.
+    """
+    connecting = time.monotonic()
+    try:
+        response = await http.get(f"{url}/demos")
+        client_id = CLIENT_ID_PATTERN.search(response.text).group(1)
+        elements = json.loads(ELEMENTS_PATTERN.search(response.text).group(1))
+    except (httpx.HTTPError, AttributeError):
+        recorder.record("ws connect", connecting, False, warmup=True)
+        return
+    ws_url = url.replace("http", "ws", 1)
+    socket_url = f"{ws_url}/_nicegui_ws/socket.io/?client_id={client_id}&EIO=4&transport=websocket"
+    async with websockets.connect(socket_url, max_size=None) as ws:
+        await ws.recv()  # Engine.IO open packet
+        await ws.send("40")  # connect to the default namespace
+        await ws.recv()
+        handshake = ["handshake", {"client_id": client_id, "tab_id": str(uuid.uuid4())}]
+        await ws.send("420" + json.dumps(handshake))
+        session = DemoSession(ws, client_id, elements)
+        receiver = asyncio.create_task(session.receive())
+        try:
+            for expansion_label, _, button_label in DEMOS.values():
+                await session.open_demo(expansion_label, button_label, timeout)
+            recorder.record("ws connect", connecting, True, warmup=True)
+            while not stop.is_set():
+                scenario = rng.choice(list(DEMOS))
+                _, input_label, button_label = DEMOS[scenario]
+                started = time.monotonic()
+                try:
+                    ok = await session.submit(input_label, button_label, rng.choice(PROMPTS), timeout)
+                except asyncio.TimeoutError:
+                    ok = False
+                recorder.record(scenario, started, ok)
+                try:
+                    await asyncio.wait_for(stop.wait(), think * rng.uniform(0.5, 1.5))
+                except asyncio.TimeoutError:
+                    pass
+        except (asyncio.TimeoutError, LookupError, websockets.ConnectionClosed):
+            recorder.record("ws connect", connecting, False, warmup=True)
+        finally:
+            receiver.cancel()
+
+
+def server_rss_mb(process):
+    """RSS of the server and its worker processes."""
+    try:
+        processes = [process] + process.children(recursive=True)
+        return sum(child.memory_info().rss for child in processes) / (1024 * 1024)
+    except psutil.Error:
+        return 0.0
+
+
+async def sample_rss(process, stop, samples):
+    while not stop.is_set():
+        samples.append(server_rss_mb(process))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(args, url, process, static_paths):
+    rng = random.Random(args.seed)
+    recorder = Recorder(args.warmup)
+    stop = asyncio.Event()
+    rss = []
+    limits = httpx.Limits(max_connections=args.users + args.ws_clients + 1)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as http:
+        page = await http.get(f"{url}/")
+        static_paths = static_paths + sorted(set(NICEGUI_ASSET_PATTERN.findall(page.text)))[:4]
+        rss_start = server_rss_mb(process) if process else None
+        tasks = [asyncio.create_task(sample_rss(process, stop, rss))] if process else []
+        tasks += [asyncio.create_task(http_user(http, url, f"{url}{args.api_prefix}", random.Random(rng.random()),
+                                                stop, recorder, static_paths))
+                  for _ in range(args.users)]
+        tasks += [asyncio.create_task(ws_user(http, url, random.Random(rng.random()), stop, recorder,
+                                              args.think, args.timeout))
+                  for _ in range(args.ws_clients)]
+        await asyncio.sleep(args.warmup + args.duration)
+        stop.set()
+        elapsed = time.monotonic() - recorder.measuring_from
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            print(f"! load task failed: {type(outcome).__name__}: {outcome}")
+    scenarios, total = recorder.summary(elapsed)
+    memory = None
+    if process:
+        memory = {"start": round(rss_start, 1), "peak": round(max(rss + [rss_start]), 1),
+                  "end": round(server_rss_mb(process), 1)}
+    return {
+        "meta": {
+            "duration": args.duration, "warmup": args.warmup, "users": args.users, "ws_clients": args.ws_clients,
+            "think": args.think, "seed": args.seed, "fake_ai_latency_ms": args.fake_ai_latency_ms,
+            "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": scenarios,
+        "total": total,
+        "rss_mb": memory,
+    }
+
+
+def print_report(results):
+    print(f"{'Scenario':<24}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, result in results["scenarios"].items():
+        print(f"{name:<24}{result['requests']:>9}{result['errors']:>8}{result['rps']:>9.1f}"
+              f"{result['p50_ms']:>9.0f}{result['p95_ms']:>9.0f}{result['p99_ms']:>9.0f}")
+    total = results["total"]
+    print(f"{'total':<24}{total['requests']:>9}{total['errors']:>8}{total['rps']:>9.1f}")
+    if results["rss_mb"]:
+        memory = results["rss_mb"]
+        print(f"\nServer RSS: {memory['start']:.1f} MB at start, {memory['peak']:.1f} MB peak, {memory['end']:.1f} MB at end")
+
+
+def parameter_mismatches(meta, baseline):
+    """Load parameters that differ from the baseline's, as printable lines."""
+    return [f"{name}: {meta.get(name)}, baseline {baseline['meta'].get(name)}"
+            for name in LOAD_PARAMETERS if meta.get(name) != baseline["meta"].get(name)]
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    """Regressions of results against a baseline, as printable lines.
+
+    Raises:
+        ValueError: The results were produced with other load parameters
+    """
+    mismatches = parameter_mismatches(results["meta"], baseline)
+    if mismatches:
+        raise ValueError("load parameters differ from the baseline: " + "; ".join(mismatches))
+    regressions = []
+    if baseline["meta"].get("cpus") != results["meta"]["cpus"]:
+        print(f"Note: the baseline was recorded with {baseline['meta'].get('cpus')} CPUs, this host has "
+              f"{results['meta']['cpus']}")
+    for name, expected in baseline["scenarios"].items():
+        actual = results["scenarios"].get(name)
+        if actual is None:
+            regressions.append(f"{name}: no requests completed")
+            continue
+        limit = max(expected[COMPARED_LATENCY] * (1 + tolerance), expected[COMPARED_LATENCY] + slack_ms)
+        if expected["requests"] >= MIN_COMPARED_REQUESTS and actual[COMPARED_LATENCY] > limit:
+            regressions.append(f"{name}: {COMPARED_LATENCY} {actual[COMPARED_LATENCY]:.0f} ms, "
+                               f"baseline {expected[COMPARED_LATENCY]:.0f} ms")
+        if actual["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {actual['rps']:.1f} requests/s, baseline {expected['rps']:.1f}")
+    if results["total"]["error_rate"] > baseline["total"]["error_rate"] + 0.01:
+        regressions.append(f"error rate {results['total']['error_rate']:.2%}, "
+                           f"baseline {baseline['total']['error_rate']:.2%}")
+    if results["rss_mb"] and baseline.get("rss_mb"):
+        if results["rss_mb"]["peak"] > baseline["rss_mb"]["peak"] * (1 + tolerance):
+            regressions.append(f"peak RSS {results['rss_mb']['peak']:.1f} MB, "
+                               f"baseline {baseline['rss_mb']['peak']:.1f} MB")
+    return regressions
+
+
+async def run(args):
+    server = None
+    url = args.url
+    static_paths = list(args.static)
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        workdir = tempfile.mkdtemp(prefix="portfolio-load-")
+        static_paths += create_static_fixtures(workdir)
+        server = start_server(args.port, workdir, {
+            "AI_PROVIDERS": "fake",
+            "AI_FAKE_LATENCY_MS": str(args.fake_ai_latency_ms),
+            "AI_FAKE_FAILURE_RATE": "0",
+            "API_PREFIX": args.api_prefix,
+            "LOG_LEVEL": "WARNING",
+            "CORS_ORIGINS": '["*"]',
+        })
+        pid = server.pid
+    else:
+        pid = args.pid
+    process = psutil.Process(pid) if pid else None
+
+    try:
+        await wait_until_ready(url)
+        return await run_load(args, url, process, static_paths)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds of load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent HTTP users")
+    parser.add_argument("--ws-clients", type=int, default=10, help="Concurrent NiceGUI websocket users")
+    parser.add_argument("--think", type=float, default=1.0, help="Average seconds between demo interactions")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request counts as failed")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the traffic mix")
+    parser.add_argument("--fake-ai-latency-ms", type=int, default=200, help="AI latency of the spawned server")
+    parser.add_argument("--port", type=int, default=8766, help="Port for the spawned server")
+    parser.add_argument("--url", help="Load an already running server instead of spawning one")
+    parser.add_argument("--pid", type=int, help="PID of the running server, for RSS measurement")
+    parser.add_argument("--api-prefix", default="/api/v1", help="API prefix of the server")
+    parser.add_argument("--static", nargs="*", default=[], help="Extra static asset paths to request")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--slack-ms", type=float, default=20.0,
+                        help="Latency increase always allowed, for fast requests on noisy hosts")
+    parser.add_argument("--output", type=Path, help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        mismatches = parameter_mismatches({name: getattr(args, name) for name in LOAD_PARAMETERS}, baseline)
+        if mismatches:
+            print(f"✗ Not comparable with {args.baseline.name}, its load parameters differ:")
+            for mismatch in mismatches:
+                print(f"  - {mismatch}")
+            print("Run with the baseline's parameters, or record a new baseline with --save-baseline")
+            return False
+
+    results = asyncio.run(run(args))
+    print("=== Mixed Traffic Load Test ===")
+    print(f"{args.duration:.0f}s after {args.warmup:.0f}s warm-up, {args.users} HTTP users, "
+          f"{args.ws_clients} websocket users\n")
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n✓ Baseline saved to {args.baseline}")
+        return True
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return True
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print(f"\n✗ Regressions against {args.baseline.name} (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return False
+    print(f"\n✓ Within {args.tolerance:.0%} of {args.baseline.name}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
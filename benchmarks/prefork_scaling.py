@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Pre-fork Worker Scaling Benchmark
+
+This script serves a CPU-bound JSON endpoint through ``PreforkServer`` with
+1, 2, 4, ... workers and measures throughput with keep-alive HTTP/1.1 load
+from several client processes. Every connection sends its own sticky header,
+so clients are spread over the workers the way proxied browsers would be.
+
+For each worker count it reports requests per second, the speedup over one
+worker and, on Linux, the average resident (RSS) and proportional (PSS) memory
+per worker: a warm cache built before forking is counted in RSS but shared,
+so PSS stays well below RSS.
+
+The load generator runs on the same host, so use a machine with more cores
+than workers for meaningful numbers.
+
+Usage:
+    python benchmarks/prefork_scaling.py --workers 1 2 4 --duration 5
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import FastAPI  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from app.core.warmup import register_warmer  # noqa: E402
+from app.core.workers import PreforkServer, resolve_worker_count  # noqa: E402
+
+STICKY_HEADER = "x-bench-client"
+WARM_CACHE_MB = 64
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    tags: list
+    score: float
+
+
+ITEMS = [{"id": i, "name": f"item {i}", "tags": ["a", "b", "c"], "score": i / 3} for i in range(100)]
+warm_cache = {}
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        # Validation and serialization of a catalog, as an uncached endpoint would do
+        return [Item(**item) for item in ITEMS]
+
+    def warm():
+        warm_cache["blob"] = os.urandom(WARM_CACHE_MB * 1024 * 1024)
+
+    register_warmer("bench", warm)
+    return app
+
+
+def serve(workers, port):
+    PreforkServer(build_app(), host="127.0.0.1", port=port, workers=workers, sticky_header=STICKY_HEADER).run()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_serving(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /work HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+                if sock.recv(12).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def connection_loop(port, client_id, deadline):
+    """Send requests as one client over a keep-alive connection until the deadline.
+
+    The server closes a connection that reached a worker other than the
+    client's (e.g. while a worker restarts); the client then reconnects.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (f"GET /work HTTP/1.1\r\nHost: bench\r\n{STICKY_HEADER}: {client_id}\r\n\r\n").encode()
+    count = 0
+    try:
+        while time.monotonic() < deadline:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            count += 1
+            if b"\r\nconnection: close" in head.lower():
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    finally:
+        writer.close()
+    return count
+
+
+def run_client(port, first_id, connections, duration):
+    async def run():
+        deadline = time.monotonic() + duration
+        counts = await asyncio.gather(*(
+            connection_loop(port, f"client-{first_id + i}", deadline) for i in range(connections)))
+        return sum(counts)
+    return asyncio.run(run())
+
+
+def worker_memory(master_pid):
+    """Average RSS and PSS in MB of the master's children (Linux only)."""
+    try:
+        children = Path(f"/proc/{master_pid}/task/{master_pid}/children").read_text().split()
+    except OSError:
+        return None
+    rss, pss = [], []
+    for pid in children:
+        try:
+            fields = dict(
+                line.split(":", 1) for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:])
+        except OSError:
+            continue
+        rss.append(int(fields["Rss"].split()[0]) / 1024)
+        pss.append(int(fields["Pss"].split()[0]) / 1024)
+    if not rss:
+        return None
+    return sum(rss) / len(rss), sum(pss) / len(pss)
+
+
+def measure(workers, args):
+    port = free_port()
+    server = multiprocessing.get_context("fork").Process(target=serve, args=(workers, port))
+    server.start()
+    try:
+        wait_until_serving(port)
+        with ProcessPoolExecutor(args.clients) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(run_client, port, i * args.connections, args.connections, args.duration)
+                       for i in range(args.clients)]
+            total = sum(future.result() for future in futures)
+            elapsed = time.perf_counter() - started
+        return total / elapsed, worker_memory(server.pid)
+    finally:
+        os.kill(server.pid, signal.SIGTERM)
+        server.join(30)
+
+
+def main():
+    """Main function to run the script."""
+    cores = resolve_worker_count(0)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, max(cores // 2, 1), cores}), help="Worker counts to measure")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per worker count")
+    parser.add_argument("--clients", type=int, default=max(cores // 2, 1), help="Load generator processes")
+    parser.add_argument("--connections", type=int, default=16, help="Connections per load generator")
+    args = parser.parse_args()
+
+    print("=== Pre-fork Worker Scaling ===")
+    print(f"Available cores: {cores}, load: {args.clients} processes x {args.connections} connections")
+    print(f"{'Workers':>8}{'req/s':>12}{'speedup':>10}{'RSS MB':>10}{'PSS MB':>10}")
+    baseline = None
+    for workers in args.workers:
+        throughput, memory = measure(workers, args)
+        baseline = baseline or throughput
+        rss, pss = memory if memory else (float("nan"), float("nan"))
+        print(f"{workers:>8}{throughput:>12.0f}{throughput / baseline:>9.2f}x{rss:>10.1f}{pss:>10.1f}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
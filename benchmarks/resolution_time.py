@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Dependency Resolution Time Benchmark
+
+This script measures how long pip takes to resolve the repository's
+requirements.in (``pip install --dry-run --ignore-installed``, with an empty
+cache every time) before and after the constraints derived by
+compatibility_checker.py are passed with ``-c``.
+
+A second scenario requests a FastAPI release outside the range NiceGUI 1.4.x
+accepts, which is the conflict from messages.txt: without constraints pip
+backtracks through every NiceGUI release before failing, while the derived
+constraints report the conflict before pip starts.
+
+Needs network access to the package index.
+
+Usage:
+    python benchmarks/resolution_time.py --timeout 600
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from compatibility_checker import derive_constraints, find_issues, get_installed_packages, write_constraints  # noqa: E402
+
+
+def resolve(requirements, constraints, timeout):
+    """Resolve with pip and an empty cache; returns (seconds, outcome)."""
+    with tempfile.TemporaryDirectory() as cache:
+        command = [sys.executable, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet",
+                   "--disable-pip-version-check", "--cache-dir", cache, "-r", str(requirements)]
+        if constraints:
+            command += ["-c", str(constraints)]
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return timeout, "timed out"
+        elapsed = time.perf_counter() - started
+    return elapsed, "resolved" if result.returncode == 0 else "conflict"
+
+
+def run_scenario(name, requirements, directory, timeout):
+    before, before_outcome = resolve(requirements, None, timeout)
+
+    started = time.perf_counter()
+    constraints = Path(directory) / f"{name}-constraints.txt"
+    conflicts = write_constraints(requirements, constraints)
+    derived = time.perf_counter() - started
+    if conflicts:
+        after, after_outcome = derived, "conflict"
+    else:
+        after, after_outcome = resolve(requirements, constraints, timeout)
+        after += derived
+    print(f"{name:<20}{before:>10.1f}{before_outcome:>12}{after:>10.1f}{after_outcome:>12}")
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", default=str(PROJECT_ROOT / "requirements.in"), help="requirements.in to resolve")
+    parser.add_argument("--timeout", type=float, default=600, help="Give up on a resolution after this many seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        requirements = Path(args.requirements)
+        conflicting = Path(directory) / "conflicting.in"
+        conflicting.write_text(re.sub(r"(?m)^fastapi[^#\n]*", "fastapi>=0.115.0,<0.116.0",
+                                      requirements.read_text(encoding="utf-8")), encoding="utf-8")
+
+        constraints, _ = derive_constraints(requirements)
+        print("=== Dependency Resolution Time ===")
+        print(f"Derived constraints: {', '.join(f'{name}{spec}' for name, spec in sorted(constraints.items()))}")
+        packages = get_installed_packages()
+        started = time.perf_counter()
+        find_issues(packages)
+        print(f"Rule check over {len(packages)} installed packages: {(time.perf_counter() - started) * 1000:.2f} ms\n")
+
+        print(f"{'Scenario':<20}{'before s':>10}{'outcome':>12}{'after s':>10}{'outcome':>12}")
+        run_scenario("requirements.in", requirements, directory, args.timeout)
+        run_scenario("fastapi 0.115", conflicting, directory, args.timeout)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Static File Serving Benchmark
+
+This script compares the stock Starlette ``StaticFiles`` behind
+``GZipMiddleware`` (compressing on every request) with ``CachedStaticFiles``
+(precompressed siblings, strong ETags, in-memory hot set, range support).
+
+Both apps are driven directly through the ASGI interface, so the numbers
+measure server-side work per request without socket or client overhead.
+Fixtures (a small CSS file, a ~100KB JavaScript bundle and a multi-MB binary)
+are generated in a temporary directory and precompressed like build_assets().
+
+Usage:
+    python benchmarks/static_files.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.gzip import GZipMiddleware  # noqa: E402
+from starlette.routing import Mount  # noqa: E402
+from starlette.staticfiles import StaticFiles  # noqa: E402
+
+from app.core.assets import precompress  # noqa: E402
+from app.core.static import CachedStaticFiles  # noqa: E402
+
+
+def create_fixtures(directory, large_mb):
+    """Write the benchmark files and their precompressed siblings."""
+    rng = random.Random(42)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(400)]
+
+    css = "".join(
+        f".{rng.choice(words)}-{i} {{ color: #{rng.randint(0, 0xFFFFFF):06x}; margin: {i % 16}px; }}\n"
+        for i in range(150)
+    )
+    js = "".join(
+        f"function {rng.choice(words)}_{i}(a, b) {{ return a.{rng.choice(words)}(b) + '{rng.choice(words)}'; }}\n"
+        for i in range(1400)
+    )
+    (directory / "css").mkdir()
+    (directory / "js").mkdir()
+    files = {
+        "small.css": directory / "css" / "theme.css",
+        "bundle.js": directory / "js" / "bundle.js",
+        "large.bin": directory / "large.bin",
+    }
+    files["small.css"].write_text(css)
+    files["bundle.js"].write_text(js)
+    files["large.bin"].write_bytes(os.urandom(large_mb * 1024 * 1024))
+    precompress(files["small.css"])
+    precompress(files["bundle.js"])
+    return {name: "/static/" + path.relative_to(directory).as_posix() for name, path in files.items()}
+
+
+def build_apps(directory):
+    stock = Starlette(
+        routes=[Mount("/static", StaticFiles(directory=directory))],
+        middleware=[Middleware(GZipMiddleware, minimum_size=1000)],
+    )
+    cached = Starlette(
+        routes=[Mount("/static", CachedStaticFiles(directory=directory))],
+        middleware=[Middleware(GZipMiddleware, minimum_size=1000)],
+    )
+    return {"StaticFiles + gzip": stock, "CachedStaticFiles": cached}
+
+
+async def request(app, path, headers, pathsend):
+    """Send one GET through the ASGI app and return (status, body bytes, response headers)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+        "extensions": {"http.response.pathsend": {}} if pathsend else {},
+    }
+    status = 0
+    size = 0
+    response_headers = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update((k.decode(), v.decode()) for k, v in message["headers"])
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+        elif message["type"] == "http.response.pathsend":
+            size += os.path.getsize(message["path"])
+
+    await app(scope, receive, send)
+    return status, size, response_headers
+
+
+async def measure(app, path, headers, count, pathsend):
+    """Run count sequential requests and return (requests per second, bytes per response)."""
+    await request(app, path, headers, pathsend)  # warm caches
+    size = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        _, size, _ = await request(app, path, headers, pathsend)
+    elapsed = time.perf_counter() - started
+    return count / elapsed, size
+
+
+async def run(args):
+    directory = Path(tempfile.mkdtemp(prefix="static-bench-"))
+    try:
+        paths = create_fixtures(directory, args.large_mb)
+        apps = build_apps(directory)
+        scenarios = [
+            ("small.css, br/gzip", paths["small.css"], {"accept-encoding": "gzip, deflate, br"}, args.requests),
+            ("bundle.js, br/gzip", paths["bundle.js"], {"accept-encoding": "gzip, deflate, br"}, args.requests),
+            ("bundle.js, gzip only", paths["bundle.js"], {"accept-encoding": "gzip"}, args.requests),
+            ("large.bin, full", paths["large.bin"], {}, max(args.requests // 50, 5)),
+            ("large.bin, 64KB range", paths["large.bin"], {"range": "bytes=1048576-1114111"}, args.requests),
+        ]
+
+        print("=== Static File Serving Benchmark ===")
+        print(f"{'Scenario':<24}{'App':<22}{'Req/s':>10}{'Bytes':>12}")
+        for label, path, headers, count in scenarios:
+            results = {}
+            for name, app in apps.items():
+                results[name] = await measure(app, path, headers, count, args.pathsend)
+                rate, size = results[name]
+                print(f"{label:<24}{name:<22}{rate:>10.0f}{size:>12}")
+            baseline, candidate = results.values()
+            print(f"{'':<24}{'speedup':<22}{candidate[0] / baseline[0]:>9.1f}x")
+
+        # Revalidation: stock StaticFiles only answers 304 on weak stat-based ETags
+        app = apps["CachedStaticFiles"]
+        _, _, response_headers = await request(app, paths["bundle.js"], {"accept-encoding": "br"}, args.pathsend)
+        headers = {"accept-encoding": "br", "if-none-match": response_headers["etag"]}
+        status, _, _ = await request(app, paths["bundle.js"], headers, args.pathsend)
+        rate, _ = await measure(app, paths["bundle.js"], headers, args.requests, args.pathsend)
+        print(f"{'bundle.js, revalidate':<24}{'CachedStaticFiles':<22}{rate:>10.0f}{'(' + str(status) + ')':>12}")
+        return status == 304
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--large-mb", type=int, default=8, help="Size of the large binary fixture in MB")
+    parser.add_argument("--pathsend", action="store_true",
+                        help="Advertise the http.response.pathsend extension like a zero-copy capable server")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Request Timing Middleware Overhead Benchmark
+
+This script measures the per-request overhead of the previous
+``@app.middleware("http")`` timing function (a BaseHTTPMiddleware) and of the
+pure-ASGI ``TimingMiddleware`` against an app without any timing middleware.
+
+Scenarios:
+- a small JSON endpoint (overhead per request)
+- a streaming endpoint yielding chunks with a short pause in between
+  (time to first chunk and total time, to show the body is not held back)
+
+The apps are driven directly through the ASGI interface.
+
+Usage:
+    python benchmarks/timing_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+
+from app.core.timing import TimedRoute, TimingMiddleware  # noqa: E402
+
+STREAM_CHUNKS = 5
+STREAM_PAUSE = 0.005
+
+
+def build_app(variant):
+    app = FastAPI()
+    app.router.route_class = TimedRoute
+
+    @app.get("/items")
+    async def items():
+        return {"items": [{"id": i, "name": f"item {i}"} for i in range(20)]}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(STREAM_CHUNKS):
+                yield f"chunk {i}\n".encode()
+                await asyncio.sleep(STREAM_PAUSE)
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    if variant == "legacy":
+        # The previous implementation from app/core/middleware.py
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = str(time.time() - start_time)
+            return response
+    elif variant == "asgi":
+        app.add_middleware(TimingMiddleware)
+    return app
+
+
+async def request(app, path):
+    """Send one GET and return (seconds to first body chunk, seconds to completion)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    started = time.perf_counter()
+    first_chunk = None
+
+    async def receive():
+        await asyncio.sleep(3600)  # never disconnect
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_chunk
+        if message["type"] == "http.response.body" and message.get("body") and first_chunk is None:
+            first_chunk = time.perf_counter() - started
+
+    await app(scope, receive, send)
+    return first_chunk, time.perf_counter() - started
+
+
+async def run(args):
+    variants = {"none": "no timing middleware", "legacy": "@app.middleware(\"http\")", "asgi": "TimingMiddleware"}
+    apps = {variant: build_app(variant) for variant in variants}
+    for app in apps.values():
+        await request(app, "/items")  # warm up routing and serialization
+
+    print("=== Request Timing Middleware Overhead ===")
+    print(f"{'Middleware':<26}{'us/req':>10}{'overhead':>10}{'stream TTFB ms':>16}{'stream total ms':>17}")
+    baseline = None
+    results = {}
+    for variant, label in variants.items():
+        app = apps[variant]
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            await request(app, "/items")
+        per_request = (time.perf_counter() - started) / args.requests * 1e6
+        baseline = baseline if baseline is not None else per_request
+
+        stream_runs = [await request(app, "/stream") for _ in range(args.stream_requests)]
+        ttfb = statistics.median(run[0] for run in stream_runs) * 1000
+        total = statistics.median(run[1] for run in stream_runs) * 1000
+        results[variant] = per_request
+        print(f"{label:<26}{per_request:>10.1f}{per_request - baseline:>+10.1f}{ttfb:>16.2f}{total:>17.2f}")
+
+    print(f"\nTimingMiddleware overhead is {(results['asgi'] - baseline) / max(results['legacy'] - baseline, 1e-9):.0%} "
+          f"of the previous middleware's")
+    return results["asgi"] <= results["legacy"]
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="JSON requests per middleware")
+    parser.add_argument("--stream-requests", type=int, default=50, help="Streaming requests per middleware")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Concurrent Upload Memory Benchmark
+
+This script boots ``main.py`` and uploads documents of exactly the size limit
+(MAX_FILE_SIZE) to the streaming upload endpoint with increasing concurrency,
+while sampling the server's resident memory. Because the body is streamed to
+disk in chunks, peak memory should stay flat as concurrency grows instead of
+growing by one file size per concurrent upload. A final upload repeats an
+earlier document to show deduplication by content hash.
+
+Usage:
+    python benchmarks/upload_memory.py --concurrency 1 4 8
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CHUNK = os.urandom(64 * 1024)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Resident memory of a process in MB (Linux only)."""
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def document(size, marker):
+    """Yield a PDF-looking document of the given size in chunks, unique per marker."""
+    head = f"%PDF-1.7\n% {marker}\n".encode()
+    yield head
+    remaining = size - len(head)
+    while remaining > 0:
+        chunk = CHUNK[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+
+
+def upload(port, api_prefix, size, marker):
+    """Upload one document; returns (status, response body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    connection.request("POST", f"{api_prefix}/uploads?filename={marker}.pdf", body=document(size, marker),
+                       headers={"Content-Length": str(size), "Content-Type": "application/pdf"})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, json.loads(body)
+
+
+def run_round(pid, port, api_prefix, size, concurrency):
+    """Upload `concurrency` documents at once; returns (statuses, seconds, peak RSS MB)."""
+    results = []
+    peak = rss_mb(pid)
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss_mb(pid))
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    threads = [threading.Thread(target=lambda: results.append(upload(port, api_prefix, size, uuid.uuid4().hex)))
+               for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    return [status for status, _ in results], elapsed, peak
+
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent uploads")
+    parser.add_argument("--size-mb", type=float, default=10, help="Upload size, also used as MAX_FILE_SIZE")
+    parser.add_argument("--api-prefix", default=os.getenv("API_PREFIX", "/api/v1"), help="API prefix of the app")
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DEBUG="false", PORT=str(port), HOST="127.0.0.1", WORKERS="1",
+                   MAX_FILE_SIZE=str(size), UPLOAD_DIRECTORY=directory,
+                   UPLOAD_MAX_CONCURRENCY=str(max(args.concurrency)), WARM_SNAPSHOT_FILE="")
+        process = subprocess.Popen([sys.executable, str(PROJECT_ROOT / "main.py")], env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                if process.poll() is not None:
+                    print("Application exited during startup")
+                    return False
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                        break
+                except OSError:
+                    time.sleep(0.05)
+            # One upload first, so code paths and buffers are warm for the baseline
+            upload(port, args.api_prefix, size, "warm-up")
+            baseline = rss_mb(process.pid)
+
+            print("=== Concurrent Uploads at the Size Limit ===")
+            print(f"Upload size {size / 1024 / 1024:.1f} MB, server RSS after warm-up {baseline:.1f} MB\n")
+            print(f"{'Concurrent':>10}{'uploaded MB':>13}{'MB/s':>9}{'peak RSS MB':>13}{'growth MB':>11}{'statuses':>16}")
+            success = True
+            for concurrency in args.concurrency:
+                statuses, elapsed, peak = run_round(process.pid, port, args.api_prefix, size, concurrency)
+                success = success and all(status == 201 for status in statuses)
+                total = size * concurrency / 1024 / 1024
+                print(f"{concurrency:>10}{total:>13.0f}{total / elapsed:>9.1f}{peak:>13.1f}{peak - baseline:>11.1f}"
+                      f"{','.join(sorted(set(map(str, statuses)))):>16}")
+
+            status, body = upload(port, args.api_prefix, size, "warm-up")
+            print(f"\nRepeated upload: HTTP {status}, deduplicated={body.get('deduplicated')}")
+            stored = [name for name in os.listdir(directory) if not name.startswith(".")]
+            print(f"Stored files: {len(stored)}")
+            return success and body.get("deduplicated") is True
+        finally:
+            process.send_signal(signal.SIGINT)
+            process.wait(30)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,135 +5,344 @@ Compatibility Checker Script
 This script checks for known compatibility issues between packages,
 particularly focusing on NiceGUI and FastAPI compatibility.
 
-It can be used alongside Poetry to ensure that the resolved dependencies
-will work correctly together in practice.
+Package versions are read in a single pass, either from the running
+environment via importlib.metadata or straight from a poetry.lock or pinned
+requirements file, and every known issue is evaluated against that snapshot.
+No resolver or network access is needed, so the check runs in milliseconds
+in CI and Docker builds.
+
+Known issues are declared as data and compiled into an index keyed by package
+name, so a check costs one lookup per package. Given a requirements.in, the
+same rules derive tighter constraints that spare pip from backtracking.
 
 Usage:
-    python compatibility_checker.py
+    python compatibility_checker.py [--from poetry.lock|requirements.txt]
+    python compatibility_checker.py --constraints requirements.in [--output .cache/constraints.txt]
 """
 
-import os
-import sys
-import subprocess
+import argparse
 import re
-import json
+import sys
+import time
+from importlib import metadata
 from pathlib import Path
-from packaging import version
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.version import InvalidVersion, Version
 
-# Known compatibility issues
+# Known compatibility issues: while `package` is in `specifier`, `requires` must be in `allowed`
 KNOWN_ISSUES = [
     {
-        "package1": "nicegui",
-        "package2": "fastapi",
-        "condition": "nicegui>=1.3.0 requires fastapi<0.100.0",
-        "check": lambda v1, v2: version.parse(v1) >= version.parse("1.3.0") and version.parse(v2) >= version.parse("0.100.0"),
-        "recommendation": "Use nicegui<1.3.0 or downgrade fastapi to <0.100.0"
+        "package": "nicegui",
+        "specifier": ">=1.4.21,<1.5.0",
+        "requires": "fastapi",
+        "allowed": ">=0.109.1,<0.110.0",
+        "recommendation": "Keep fastapi>=0.109.1,<0.110.0 while nicegui is on 1.4.x",
+    },
+    {
+        "package": "fastapi",
+        "specifier": ">=0.109.1,<0.110.0",
+        "requires": "starlette",
+        "allowed": ">=0.36.3,<0.37.0",
+        "recommendation": "Let fastapi choose starlette, or keep starlette>=0.36.3,<0.37.0",
     },
     # Add more known compatibility issues here as they are discovered
 ]
 
-def get_python_executable():
-    """Get the appropriate Python executable path based on the platform and environment."""
-    # If running in a virtual environment, use that Python
-    if sys.prefix != sys.base_prefix:
-        return sys.executable
-    
-    # Otherwise, use the system Python that's running this script
-    return sys.executable
-
-def get_installed_version(package_name):
-    """Get the installed version of a package using Poetry."""
-    try:
-        # Use Poetry to get the installed version
-        result = subprocess.run(
-            [get_python_executable(), "-m", "poetry", "show", package_name],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Parse the output to get the version
-        match = re.search(r"version\s+:\s+([\d\.]+)", result.stdout)
-        if match:
-            return match.group(1)
-        return None
-    except subprocess.CalledProcessError:
-        return None
-
-def get_all_installed_packages():
-    """Get all installed packages and their versions using Poetry."""
-    try:
-        # Use Poetry to get all installed packages
-        result = subprocess.run(
-            [get_python_executable(), "-m", "poetry", "show", "--no-dev", "--format", "json"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Parse the JSON output
-        packages = json.loads(result.stdout)
-        return {pkg["name"]: pkg["version"] for pkg in packages}
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return {}
-
-def check_compatibility():
-    """Check for known compatibility issues between installed packages."""
+def normalize_name(name):
+    """Normalize a distribution name as in PEP 503 (e.g. "Pydantic_Settings" -> "pydantic-settings")."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def get_installed_packages():
+    """Get all installed packages and their versions in one pass over importlib.metadata."""
+    packages = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        # The first distribution on sys.path wins, as it does for imports
+        if name:
+            packages.setdefault(normalize_name(name), dist.version)
+    return packages
+
+def parse_poetry_lock(path):
+    """Get the locked packages and their versions from a poetry.lock file."""
+    packages = {}
+    name = package_version = None
+    in_package = False
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            if in_package and name and package_version:
+                packages[normalize_name(name)] = package_version
+            in_package = line == "[[package]]"
+            name = package_version = None
+            continue
+        match = re.match(r'(name|version)\s*=\s*"([^"]+)"', line)
+        if in_package and match:
+            if match.group(1) == "name":
+                name = match.group(2)
+            else:
+                package_version = match.group(2)
+    if in_package and name and package_version:
+        packages[normalize_name(name)] = package_version
+    return packages
+
+def parse_requirements(path):
+    """Get the pinned (==) packages and their versions from a requirements file.
+
+    Ranges such as ``fastapi>=0.109.2,<0.110.0`` do not name a version and are skipped.
+    """
+    packages = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split(" #", 1)[0].strip().rstrip("\\").strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            continue
+        pins = [spec.version for spec in requirement.specifier if spec.operator in ("==", "===")]
+        if len(pins) == 1 and "*" not in pins[0]:
+            packages[normalize_name(requirement.name)] = pins[0]
+    return packages
+
+def load_packages(source=None):
+    """Get a snapshot of package versions.
+
+    Args:
+        source: None for the running environment, or the path of a poetry.lock
+            or requirements file
+
+    Returns:
+        Dict of normalized package name to version
+    """
+    if source is None:
+        return get_installed_packages()
+    if Path(source).name.endswith(".lock"):
+        return parse_poetry_lock(source)
+    return parse_requirements(source)
+
+def get_installed_version(package_name, packages=None):
+    """Get the version of a package from a snapshot (the running environment by default)."""
+    if packages is None:
+        packages = get_installed_packages()
+    return packages.get(normalize_name(package_name))
+
+def describe_rule(rule):
+    """Human-readable condition of a rule, e.g. "nicegui>=1.4.21 requires fastapi<0.110.0"."""
+    return f"{rule['package']}{rule['specifier']} requires {rule['requires']}{rule['allowed']}"
+
+def compile_rules(rules):
+    """Compile rules into an index keyed by the package that triggers them.
+
+    Returns:
+        Dict of package name to a list of (specifier, required package, allowed specifier, rule)
+    """
+    index = {}
+    for rule in rules:
+        compiled = (SpecifierSet(rule["specifier"]), normalize_name(rule["requires"]),
+                    SpecifierSet(rule["allowed"]), rule)
+        index.setdefault(normalize_name(rule["package"]), []).append(compiled)
+    return index
+
+# Compiled once, so a check only looks up the rules of the packages present
+RULE_INDEX = compile_rules(KNOWN_ISSUES)
+
+def find_issues(packages, index=RULE_INDEX):
+    """Evaluate the known issues against a package snapshot in one pass over its packages.
+
+    Returns:
+        List of (rule, version1, version2) for the issues that apply
+    """
+    found = []
+    for name, ver1 in packages.items():
+        for specifier, required, allowed, rule in index.get(name, ()):
+            ver2 = packages.get(required)
+            try:
+                if ver2 and specifier.contains(ver1, prereleases=True) and not allowed.contains(ver2, prereleases=True):
+                    found.append((rule, ver1, ver2))
+            except InvalidVersion:
+                continue
+    return found
+
+def _next_release(release):
+    """The first version after a release prefix, e.g. (1, 4) -> 1.5."""
+    return Version(".".join(map(str, release[:-1] + (release[-1] + 1,))))
+
+def _interval(specifier):
+    """Approximate a specifier set by the interval of versions it allows.
+
+    Exclusions (!=) are ignored. Bounds are (version, inclusive) or None when unbounded.
+
+    Returns:
+        (lower bound, upper bound)
+    """
+    low = high = None
+    for spec in specifier:
+        operator, text = spec.operator, spec.version
+        if operator == "!=":
+            continue
+        if text.endswith(".*"):
+            base = Version(text[:-2])
+            bounds = [("low", base, True), ("high", _next_release(base.release), False)]
+        elif operator == "~=":
+            base = Version(text)
+            bounds = [("low", base, True), ("high", _next_release(base.release[:-1]), False)]
+        elif operator in ("==", "==="):
+            bounds = [("low", Version(text), True), ("high", Version(text), True)]
+        else:
+            side = "low" if operator.startswith(">") else "high"
+            bounds = [(side, Version(text), operator.endswith("="))]
+        for side, bound, inclusive in bounds:
+            if side == "low" and (low is None or (bound, not inclusive) > (low[0], not low[1])):
+                low = (bound, inclusive)
+            elif side == "high" and (high is None or (bound, inclusive) < (high[0], high[1])):
+                high = (bound, inclusive)
+    return low, high
+
+def _is_subset(inner, outer):
+    """Whether every version allowed by `inner` is allowed by `outer` (interval approximation)."""
+    (inner_low, inner_high), (outer_low, outer_high) = _interval(inner), _interval(outer)
+    low_ok = outer_low is None or (inner_low is not None
+                                   and (inner_low[0], not inner_low[1]) >= (outer_low[0], not outer_low[1]))
+    high_ok = outer_high is None or (inner_high is not None
+                                     and (inner_high[0], inner_high[1]) <= (outer_high[0], outer_high[1]))
+    return low_ok and high_ok
+
+def _is_disjoint(first, second):
+    """Whether no version is allowed by both specifier sets (interval approximation)."""
+    (first_low, first_high), (second_low, second_high) = _interval(first), _interval(second)
+
+    def below(high, low):
+        if high is None or low is None:
+            return False
+        return high[0] < low[0] or (high[0] == low[0] and not (high[1] and low[1]))
+
+    return below(first_high, second_low) or below(second_high, first_low)
+
+def derive_constraints(requirements_path, index=RULE_INDEX):
+    """Pre-compute the constraints the known issues imply for a requirements.in file.
+
+    A rule applies when every version the file allows for its package falls in
+    the rule's specifier; its allowed range then becomes a constraint, which may
+    trigger further rules. Handing these constraints to pip up front saves it
+    from discovering them by backtracking through releases, and a requested
+    range that contradicts one is reported before pip runs at all.
+
+    Returns:
+        (dict of package name to constraint specifier, list of conflict messages)
+    """
+    requested = {}
+    for line in Path(requirements_path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            continue
+        name = normalize_name(requirement.name)
+        requested[name] = requested.get(name, SpecifierSet()) & requirement.specifier
+
+    constraints = {}
+    conflicts = []
+    applied = set()
+    changed = True
+    while changed:
+        changed = False
+        for name, rules in index.items():
+            if name not in requested and name not in constraints:
+                continue
+            effective = requested.get(name, SpecifierSet()) & constraints.get(name, SpecifierSet())
+            for specifier, required, allowed, rule in rules:
+                if id(rule) in applied or not _is_subset(effective, specifier):
+                    continue
+                applied.add(id(rule))
+                changed = True
+                wanted = requested.get(required)
+                if wanted is not None and _is_disjoint(wanted, allowed):
+                    conflicts.append(f"{name}{effective} implies {required}{allowed} ({describe_rule(rule)}), "
+                                     f"but {required}{wanted} is requested. {rule['recommendation']}")
+                else:
+                    constraints[required] = constraints.get(required, SpecifierSet()) & allowed
+    return constraints, conflicts
+
+def write_constraints(requirements_path, output_path):
+    """Write the constraints derived from a requirements.in file for pip -c / pip-compile --constraint.
+
+    Returns:
+        List of conflict messages; the file is only written when there are none
+    """
+    constraints, conflicts = derive_constraints(requirements_path)
+    if not conflicts:
+        lines = [f"# Generated by compatibility_checker.py from {Path(requirements_path).name}"]
+        lines += [f"{name}{specifier}" for name, specifier in sorted(constraints.items())]
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(output_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return conflicts
+
+def check_compatibility(source=None):
+    """Check for known compatibility issues between packages."""
     print("Checking for known compatibility issues...")
-    
-    # Get all installed packages
-    packages = get_all_installed_packages()
+    started = time.perf_counter()
+
+    try:
+        packages = load_packages(source)
+    except OSError as e:
+        print(f"✗ Failed to read {source}: {e}")
+        return False
     if not packages:
-        print("✗ Failed to get installed packages")
+        print(f"✗ No package versions found in {source or 'the environment'}"
+              f"{' (only == pins name a version)' if source and not source.endswith('.lock') else ''}")
         return False
-    
-    issues_found = False
-    
-    # Check for known issues
-    for issue in KNOWN_ISSUES:
-        pkg1 = issue["package1"]
-        pkg2 = issue["package2"]
-        
-        if pkg1 in packages and pkg2 in packages:
-            ver1 = packages[pkg1]
-            ver2 = packages[pkg2]
-            
-            if issue["check"](ver1, ver2):
-                print(f"\n⚠️ Compatibility issue detected: {issue['condition']}")
-                print(f"  - {pkg1} version: {ver1}")
-                print(f"  - {pkg2} version: {ver2}")
-                print(f"  - Recommendation: {issue['recommendation']}")
-                issues_found = True
-    
-    if not issues_found:
-        print("✓ No known compatibility issues found")
+
+    issues = find_issues(packages)
+    elapsed = (time.perf_counter() - started) * 1000
+    for rule, ver1, ver2 in issues:
+        print(f"\n⚠️ Compatibility issue detected: {describe_rule(rule)}")
+        print(f"  - {rule['package']} version: {ver1}")
+        print(f"  - {rule['requires']} version: {ver2}")
+        print(f"  - Recommendation: {rule['recommendation']}")
+
+    if not issues:
+        print(f"✓ No known compatibility issues found ({len(packages)} packages from "
+              f"{source or 'the environment'}, {elapsed:.1f} ms)")
         return True
-    
+
     return False
 
-def check_poetry_installed():
-    """Check if Poetry is installed."""
+def generate_constraints(requirements_path, output_path):
+    """Derive constraints for a requirements.in file and report conflicts."""
+    print(f"Deriving constraints for {requirements_path}...")
+    started = time.perf_counter()
     try:
-        subprocess.run(
-            [get_python_executable(), "-m", "poetry", "--version"],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        return True
-    except subprocess.CalledProcessError:
+        conflicts = write_constraints(requirements_path, output_path)
+    except OSError as e:
+        print(f"✗ Failed to read {requirements_path}: {e}")
+        return False
+    elapsed = (time.perf_counter() - started) * 1000
+    for conflict in conflicts:
+        print(f"\n⚠️ Conflicting requirements: {conflict}")
+    if conflicts:
         return False
+    print(f"✓ Constraints written to {output_path} ({elapsed:.1f} ms)")
+    return True
 
 def main():
     """Main function to run the script."""
+    parser = argparse.ArgumentParser(description="Compatibility Checker Script")
+    parser.add_argument("--from", dest="source", metavar="FILE",
+                        help="Read versions from a poetry.lock or pinned requirements file instead of the environment")
+    parser.add_argument("--constraints", metavar="REQUIREMENTS_IN",
+                        help="Derive pip constraints for a requirements.in file instead of checking versions")
+    parser.add_argument("--output", default=".cache/constraints.txt",
+                        help="Where --constraints writes its output (a generated file, kept out of git)")
+    args = parser.parse_args()
+
     print("=== Compatibility Checker ===")
-    
-    if not check_poetry_installed():
-        print("✗ Poetry is not installed. Please install Poetry first.")
-        return False
-    
-    return check_compatibility()
+    if args.constraints:
+        return generate_constraints(args.constraints, args.output)
+    return check_compatibility(args.source)
 
 if __name__ == "__main__":
     success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -5,16 +5,22 @@ Requirements Compiler Script
 This script installs pip-tools and uses pip-compile to generate a pinned requirements.txt
 file from requirements.in, resolving all dependencies and their compatible versions.
 
+Resolved files are cached by a hash of their inputs (see resolution_cache.py), so
+compiling unchanged requirements is instant and needs no network access.
+
 Usage:
-    python compile_requirements.py
+    python compile_requirements.py [--wheelhouse]
 """
 
 import os
 import sys
+import argparse
 import subprocess
 import platform
 from pathlib import Path
 
+from resolution_cache import WHEELHOUSE_DIR, build_wheelhouse, resolution_key, restore_resolution, store_resolution
+
 def get_python_executable():
     """Get the appropriate Python executable path based on the platform and environment."""
     # If running in a virtual environment, use that Python
@@ -45,7 +51,7 @@ def install_pip_tools():
     try:
         # Check if pip-tools is installed
         subprocess.run(
-            [*get_python_executable(), "-c", "import piptools"], 
+            [get_python_executable(), "-c", "import piptools"], 
             check=True, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE
@@ -72,23 +78,53 @@ def compile_requirements_file(input_file, output_file):
         print(f"✗ {input_path} not found")
         return False
     
+    # Constraints implied by known compatibility rules spare the resolver from backtracking,
+    # and contradicting requirements are reported before it starts
+    constraints_file = Path(".cache") / f"{input_path.stem}-constraints.txt"
+    constraint_args = []
+    try:
+        from compatibility_checker import write_constraints
+    except ImportError:
+        write_constraints = None
+    if write_constraints is not None:
+        conflicts = write_constraints(input_path, constraints_file)
+        if conflicts:
+            for conflict in conflicts:
+                print(f"✗ Conflicting requirements: {conflict}")
+            return False
+        constraint_args = [f"--constraint={constraints_file}"]
+    
+    # Resolver options that change the output are part of the cache key
+    options = [
+        "--resolver=backtracking",  # Use backtracking resolver for better conflict resolution
+        "--allow-unsafe",  # Allow unsafe packages if needed
+        "--generate-hashes",  # Add hashes for better security
+    ]
+    key = resolution_key(input_path, constraints_file if constraint_args else None, options)
+    if restore_resolution(key, output_file):
+        print(f"✓ {output_file} restored from the resolution cache ({key[:12]})")
+        return True
+    
+    if not install_pip_tools():
+        return False
+    
     print(f"Compiling {input_file} to {output_file}...")
     try:
         # Use pip-compile to generate requirements.txt
         subprocess.run(
             [
-                *get_python_executable(), 
+                get_python_executable(), 
                 "-m", 
                 "piptools", 
                 "compile", 
                 f"--output-file={output_file}", 
-                "--resolver=backtracking",  # Use backtracking resolver for better conflict resolution
-                "--allow-unsafe",  # Allow unsafe packages if needed
-                "--generate-hashes",  # Add hashes for better security
+                *options,
+                *constraint_args,
                 input_file
             ],
             check=True
         )
+        store_resolution(key, output_file)
         print(f"✓ {output_file} generated successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -112,18 +148,24 @@ def compile_requirements():
 
 def main():
     """Main function to run the script."""
+    parser = argparse.ArgumentParser(description="Requirements Compiler Script")
+    parser.add_argument("--wheelhouse", action="store_true",
+                        help=f"Also build wheels for requirements.txt into {WHEELHOUSE_DIR}")
+    args = parser.parse_args()
+
     print("=== Requirements Compiler ===")
     
-    if not install_pip_tools():
+    if not compile_requirements():
         return False
     
-    if not compile_requirements():
+    if args.wheelhouse and not build_wheelhouse("requirements.txt", get_python_executable()):
+        print(f"✗ Failed to build wheels into {WHEELHOUSE_DIR}")
         return False
     
     print("\nAll done! requirements.txt has been updated with pinned dependencies.")
     print("To install the dependencies, run:")
-    if platform.system() == "Windows":
-        print("  pip install -r requirements.txt")
+    if args.wheelhouse:
+        print(f"  pip install --no-index --find-links {WHEELHOUSE_DIR} -r requirements.txt")
     else:
         print("  pip install -r requirements.txt")
     
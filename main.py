@@ -1,15 +1,18 @@
 """
 GenAI Engineer Portfolio - Main Application Entry Point
 A professional portfolio showcasing Generative AI expertise with live demos.
+
+Profile startup (import tree, time per phase, optional budget for CI) with:
+    python main.py --profile-startup [--startup-budget-ms 2500] [--startup-runs 3]
 """
 
-import os
 import sys
-import subprocess
 import importlib.util
 from pathlib import Path
-from dotenv import load_dotenv
-from nicegui import ui
+
+from app.core.startup import CHILD_FLAG, PROFILE_FLAG, emit_startup_report, startup_phase
+
+PROJECT_ROOT = Path(__file__).resolve().parent
 
 # Verify critical dependencies
 def verify_module_installed(module_name):
@@ -20,11 +23,11 @@ def check_dependencies():
     """Check for required dependencies."""
     critical_modules = ["nicegui", "fastapi", "pydantic", "openai", "requests"]
     missing_modules = []
-    
+
     for module in critical_modules:
         if not verify_module_installed(module):
             missing_modules.append(module)
-    
+
     if missing_modules:
         print("ERROR: The following required modules are missing:")
         for module in missing_modules:
@@ -32,39 +35,75 @@ def check_dependencies():
         print("\nPlease install dependencies with: pip install -r requirements.txt")
         sys.exit(1)
 
-# Check dependencies before proceeding
-check_dependencies()
+# Profile startup in a child interpreter instead of serving
+if PROFILE_FLAG in sys.argv:
+    from app.core.startup import profile_startup
+    sys.exit(profile_startup())
 
 # Load environment variables
-load_dotenv()
-
-# Import the portfolio application
-try:
-    from app.main import create_portfolio_app
-    from app.core.config import settings
-    from app.core.logging import app_logger
-except ImportError as e:
-    print(f"Error importing portfolio application: {e}")
-    sys.exit(1)
-
-if __name__ in {"__main__", "__mp_main__"}:
+with startup_phase("environment"):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Import the portfolio application. Dependencies are only probed when the
+# import fails, so a healthy cold start does not pay for the checks.
+with startup_phase("imports"):
     try:
-        # Create and configure the portfolio
-        app = create_portfolio_app()
-        
+        import uvicorn
+        from app.main import create_portfolio_app
+    except ImportError as e:
+        check_dependencies()
+        print(f"Error importing portfolio application: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        if CHILD_FLAG in sys.argv:
+            create_portfolio_app()
+            emit_startup_report()
+            sys.exit(0)
+
+        with startup_phase("settings"):
+            from app.core import app_logger, settings
         app_logger.info(f"Starting GenAI Portfolio at {settings.HOST}:{settings.PORT}")
-        
-        # Run the application
-        ui.run(
-            host=settings.HOST,
-            port=settings.PORT,
-            title="GenAI Engineer Portfolio",
-            favicon="🤖",
-            dark=False,
-            reload=settings.DEBUG,
-            storage_secret=settings.SECRET_KEY,
-        )
-        
+
+        if settings.DEBUG:
+            # The reloader builds the app through the factory in a fresh
+            # process on every change, so it is not built here
+            uvicorn.run(
+                "app.main:create_portfolio_app",
+                factory=True,
+                host=settings.HOST,
+                port=settings.PORT,
+                reload=True,
+                reload_dirs=[str(PROJECT_ROOT / "app")],
+                app_dir=str(PROJECT_ROOT),
+                log_level="warning",
+            )
+            sys.exit(0)
+
+        # Create and configure the portfolio (the factory records its own phases)
+        app = create_portfolio_app()
+
+        from app.core.workers import PreforkServer, prefork_supported, resolve_worker_count
+        workers = resolve_worker_count(settings.WORKERS if settings.WORKERS is not None else 1)
+        if workers > 1:
+            if prefork_supported():
+                # Warm the caches once, then fork workers that share them
+                sys.exit(PreforkServer(
+                    app,
+                    host=settings.HOST,
+                    port=settings.PORT,
+                    workers=workers,
+                    sticky_header=settings.WORKER_STICKY_HEADER,
+                    graceful_timeout=settings.WORKER_GRACEFUL_TIMEOUT or 30,
+                ).run())
+            app_logger.warning("Pre-fork workers are not supported on this platform, serving from one process")
+
+        # Bounded drain, so the warm-state snapshot is written before the platform kills the process
+        uvicorn.run(app, host=settings.HOST, port=settings.PORT, log_level="warning",
+                    timeout_graceful_shutdown=settings.WORKER_GRACEFUL_TIMEOUT or 30)
+
     except Exception as e:
         print(f"Error starting portfolio: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Resolution Cache and Wheelhouse
+
+This module keeps two local caches for the setup scripts:
+
+- A content-addressed cache of resolved requirement sets. The key is a hash of
+  the requirements.in file, its derived constraints, the resolver options,
+  the Python version and the platform, so compiling unchanged inputs restores
+  the previous requirements.txt instantly without network access.
+- A persistent wheelhouse of built wheels. Dependencies are installed from it
+  with --no-index when it is complete, and it is only topped up from the
+  package index when something is missing.
+
+The Docker build keeps its own wheelhouse in a BuildKit cache mount.
+
+Usage:
+    python resolution_cache.py --wheelhouse [requirements.txt]
+    python resolution_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Cache locations, overridable e.g. to share them between checkouts
+CACHE_DIR = Path(os.getenv("RESOLUTION_CACHE_DIR", ".cache/resolutions"))
+WHEELHOUSE_DIR = Path(os.getenv("WHEELHOUSE_DIR", ".cache/wheelhouse"))
+
+def resolution_key(input_file, constraints_file=None, options=(), python_version=None):
+    """Hash everything that determines the result of resolving a requirements.in file.
+
+    Args:
+        input_file: The requirements.in file
+        constraints_file: Constraints passed to the resolver, if any
+        options: Resolver options that change its output (e.g. --generate-hashes)
+        python_version: "major.minor" of the Python the resolver runs for; the current one by default
+
+    Returns:
+        Hex digest used as the cache entry name
+    """
+    digest = hashlib.sha256()
+    for path in (input_file, constraints_file):
+        if path and Path(path).exists():
+            digest.update(Path(path).read_bytes())
+        digest.update(b"\0")
+    python_version = python_version or f"{sys.version_info[0]}.{sys.version_info[1]}"
+    for part in (python_version, sys.platform, platform.machine(), *sorted(options)):
+        digest.update(part.encode() + b"\0")
+    return digest.hexdigest()
+
+def restore_resolution(key, output_file):
+    """Copy a cached resolution to output_file; returns whether there was one."""
+    cached = CACHE_DIR / f"{key}.txt"
+    if not cached.exists():
+        return False
+    shutil.copyfile(cached, output_file)
+    return True
+
+def store_resolution(key, output_file):
+    """Add a freshly resolved output_file to the cache."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    temporary = CACHE_DIR / f"{key}.tmp"
+    shutil.copyfile(output_file, temporary)
+    os.replace(temporary, CACHE_DIR / f"{key}.txt")
+
+def _pip(python, *args, quiet=False):
+    return subprocess.run([str(python), "-m", "pip", *args, "--disable-pip-version-check"], capture_output=quiet)
+
+def build_wheelhouse(requirements_file, python=sys.executable, wheelhouse=WHEELHOUSE_DIR):
+    """Make sure the wheelhouse holds a wheel for every requirement.
+
+    Tries offline first; only when a wheel is missing are the missing ones
+    downloaded or built from the package index.
+
+    Returns:
+        True if the wheelhouse is complete
+    """
+    wheelhouse = Path(wheelhouse)
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    common = ["wheel", "--wheel-dir", str(wheelhouse), "--find-links", str(wheelhouse), "-r", str(requirements_file)]
+    if _pip(python, *common, "--no-index", quiet=True).returncode == 0:
+        return True
+    print(f"Adding missing wheels to {wheelhouse}...")
+    return _pip(python, *common).returncode == 0
+
+def install_from_wheelhouse(requirements_file, python=sys.executable, wheelhouse=WHEELHOUSE_DIR):
+    """Install requirements from the wheelhouse, topping it up first if needed.
+
+    Returns:
+        True if the requirements were installed
+    """
+    if not build_wheelhouse(requirements_file, python, wheelhouse):
+        return False
+    return _pip(python, "install", "--no-index", "--find-links", str(wheelhouse),
+                "-r", str(requirements_file)).returncode == 0
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description="Resolution Cache and Wheelhouse")
+    parser.add_argument("--wheelhouse", nargs="?", const="requirements.txt", metavar="REQUIREMENTS",
+                        help="Fill the wheelhouse for a requirements file")
+    parser.add_argument("--clear", action="store_true", help="Remove cached resolutions")
+    args = parser.parse_args()
+
+    if not (args.wheelhouse or args.clear):
+        parser.print_help()
+        return True
+
+    print("=== Resolution Cache ===")
+    if args.clear:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"✓ Cleared {CACHE_DIR}")
+    if args.wheelhouse:
+        if not build_wheelhouse(args.wheelhouse):
+            print(f"✗ Failed to build wheels for {args.wheelhouse}")
+            return False
+        print(f"✓ {WHEELHOUSE_DIR} holds every wheel for {args.wheelhouse}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
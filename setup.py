@@ -1,10 +1,13 @@
-import os
 import sys
 import subprocess
 import platform
-import importlib.util
+import json
 from pathlib import Path
 
+from verify_environment import summarize_report
+from resolution_cache import (WHEELHOUSE_DIR, install_from_wheelhouse, resolution_key, restore_resolution,
+                              store_resolution)
+
 # Minimum Python version required
 MIN_PYTHON_VERSION = (3, 8)
 
@@ -16,16 +19,6 @@ CRITICAL_DEPENDENCIES = [
     "pydantic"
 ]
 
-# Known dependency compatibility requirements
-DEPENDENCY_COMPATIBILITY = {
-    "nicegui": {
-        "version_range": "1.4.21-1.4.24",
-        "requires": {
-            "fastapi": ">=0.109.1,<0.110.0"
-        }
-    }
-}
-
 def check_python_version():
     """Check if the current Python version meets the minimum requirement."""
     current_version = sys.version_info[:2]
@@ -84,6 +77,36 @@ def compile_requirements_file(input_file, output_file):
     else:
         python_path = Path("venv") / "bin" / "python"
     
+    # Pre-computed constraints from the known compatibility rules keep pip-compile from backtracking
+    constraints_file = None
+    constraint_args = []
+    try:
+        from compatibility_checker import write_constraints
+    except ImportError:
+        write_constraints = None
+    if write_constraints is not None:
+        constraints_file = Path(input_file).with_name(f"{Path(input_file).stem}-constraints.txt")
+        conflicts = write_constraints(input_file, constraints_file)
+        if conflicts:
+            for conflict in conflicts:
+                print(f"Error: conflicting requirements: {conflict}")
+            return False
+        constraint_args = [f"--constraint={constraints_file}"]
+    
+    # Unchanged inputs are restored from the resolution cache without running pip-compile
+    options = [
+        "--resolver=backtracking",  # Better conflict resolution
+        "--allow-unsafe",  # Allow unsafe packages if needed
+    ]
+    key = resolution_key(input_file, constraints_file if constraint_args else None, options)
+    if restore_resolution(key, output_file):
+        print(f"{output_file} restored from the resolution cache.")
+        return True
+    
+    # pip-tools is only needed when something has to be resolved
+    if not install_pip_tools():
+        return False
+    
     try:
         # Use pip-compile to generate requirements.txt with pinned versions
         subprocess.run(
@@ -93,12 +116,13 @@ def compile_requirements_file(input_file, output_file):
                 "piptools", 
                 "compile", 
                 f"--output-file={output_file}", 
-                "--resolver=backtracking",  # Better conflict resolution
-                "--allow-unsafe",  # Allow unsafe packages if needed
+                *options,
+                *constraint_args,
                 input_file
             ],
             check=True
         )
+        store_resolution(key, output_file)
         print(f"{output_file} generated successfully.")
         return True
     except subprocess.CalledProcessError as e:
@@ -121,25 +145,24 @@ def compile_requirements():
     return success
 
 def install_dependencies():
-    """Install dependencies from requirements.txt."""
+    """Install dependencies from requirements.txt through the local wheelhouse."""
     print("Installing dependencies...")
     
-    # Determine the path to the pip executable in the virtual environment
+    # Determine the path to the Python executable in the virtual environment
     if platform.system() == "Windows":
-        pip_path = Path("venv") / "Scripts" / "pip"
+        python_path = Path("venv") / "Scripts" / "python"
     else:
-        pip_path = Path("venv") / "bin" / "pip"
+        python_path = Path("venv") / "bin" / "python"
     
-    try:
-        subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
+    # Wheels are kept in WHEELHOUSE_DIR, so reinstalling unchanged requirements needs no network
+    if install_from_wheelhouse("requirements.txt", python_path):
         print("Dependencies installed successfully.")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error installing dependencies: {e}")
-        return False
+    print(f"Error installing dependencies from {WHEELHOUSE_DIR}.")
+    return False
 
 def verify_critical_dependencies():
-    """Verify that critical dependencies are installed."""
+    """Verify critical dependencies and their compatibility in one pass of the venv interpreter."""
     print("Verifying critical dependencies...")
     
     # Determine the path to the Python executable in the virtual environment
@@ -148,66 +171,24 @@ def verify_critical_dependencies():
     else:
         python_path = Path("venv") / "bin" / "python"
     
-    missing_deps = []
-    installed_versions = {}
-    
-    for dep in CRITICAL_DEPENDENCIES:
-        try:
-            # Use the virtual environment's Python to check for the dependency and its version
-            result = subprocess.run(
-                [str(python_path), "-c", f"import {dep}; print('{dep}:' + getattr({dep}, '__version__', 'unknown'))"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            version_output = result.stdout.strip()
-            if ':' in version_output:
-                dep_name, version = version_output.split(':', 1)
-                installed_versions[dep_name] = version
-                print(f"✓ {dep} is installed (version {version})")
-            else:
-                print(f"✓ {dep} is installed (version unknown)")
-        except subprocess.CalledProcessError:
-            missing_deps.append(dep)
-            print(f"✗ {dep} is missing")
-    
-    if missing_deps:
-        print("\nWarning: Some critical dependencies are missing:")
-        for dep in missing_deps:
-            print(f"  - {dep}")
-        print("\nPlease install them manually or try running the setup again.")
+    # verify_environment.py imports the packages concurrently, checks the compatibility
+    # rules against the same snapshot and caches its report per environment
+    try:
+        result = subprocess.run(
+            [str(python_path), "verify_environment.py", "--json", *CRITICAL_DEPENDENCIES],
+            capture_output=True,
+            text=True
+        )
+        report = json.loads(result.stdout)
+    except (OSError, ValueError) as e:
+        print(f"Error verifying dependencies: {e}")
         return False
     
-    # Check for dependency compatibility issues
-    compatibility_issues = check_dependency_compatibility(installed_versions)
-    if compatibility_issues:
-        print("\nWarning: Dependency compatibility issues detected:")
-        for issue in compatibility_issues:
-            print(f"  - {issue}")
-        print("\nThe application may not function correctly due to these compatibility issues.")
+    if not summarize_report(report):
         print("Please refer to the README.md for more information on dependency compatibility.")
         return False
-    
-    print("All critical dependencies are installed and compatible.")
     return True
 
-def check_dependency_compatibility(installed_versions):
-    """Check for known dependency compatibility issues."""
-    issues = []
-    
-    # Check NiceGUI and FastAPI compatibility
-    if 'nicegui' in installed_versions and 'fastapi' in installed_versions:
-        nicegui_version = installed_versions['nicegui']
-        fastapi_version = installed_versions['fastapi']
-        
-        # NiceGUI 1.4.21-1.4.24 requires FastAPI <0.110.0, >=0.109.1
-        if nicegui_version.startswith('1.4.2'):
-            from packaging import version
-            if version.parse(fastapi_version) >= version.parse('0.110.0'):
-                issues.append(f"NiceGUI {nicegui_version} requires FastAPI <0.110.0, but {fastapi_version} is installed")
-    
-    return issues
-
 def print_activation_instructions():
     """Print instructions for activating the virtual environment."""
     print("\nTo activate the virtual environment:")
@@ -230,14 +211,10 @@ def main():
     if not create_venv():
         return False
     
-    # Install pip-tools for dependency management
-    if not install_pip_tools():
-        print("Warning: Failed to install pip-tools. Will use existing requirements.txt.")
-    else:
-        # Compile requirements.in to requirements.txt if requirements.in exists
-        if Path("requirements.in").exists():
-            if not compile_requirements():
-                print("Warning: Failed to compile requirements. Will use existing requirements.txt.")
+    # Compile requirements.in to requirements.txt if requirements.in exists
+    if Path("requirements.in").exists():
+        if not compile_requirements():
+            print("Warning: Failed to compile requirements. Will use existing requirements.txt.")
     
     if not install_dependencies():
         return False
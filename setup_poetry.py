@@ -11,9 +11,11 @@ import os
 import sys
 import subprocess
 import platform
-import importlib.util
+import json
 from pathlib import Path
 
+from verify_environment import summarize_report
+
 # Minimum required Python version
 MIN_PYTHON_VERSION = (3, 8)
 
@@ -25,16 +27,6 @@ CRITICAL_DEPENDENCIES = [
     "pydantic"
 ]
 
-# Known dependency compatibility requirements
-DEPENDENCY_COMPATIBILITY = {
-    "nicegui": {
-        "version_range": "1.4.21-1.4.24",
-        "requires": {
-            "fastapi": ">=0.109.1,<0.110.0"
-        }
-    }
-}
-
 def check_python_version():
     """Check if the current Python version meets the minimum requirement."""
     current_version = sys.version_info[:2]
@@ -148,89 +140,29 @@ def setup_poetry_project():
         return False
 
 def verify_critical_dependencies():
-    """Verify that critical dependencies are installed."""
+    """Verify critical dependencies and their compatibility in one pass of the venv interpreter."""
     print("Verifying critical dependencies...")
     
     python_path = get_python_executable()
     
-    missing_deps = []
-    installed_versions = {}
-    
-    for dep in CRITICAL_DEPENDENCIES:
-        try:
-            # Use the virtual environment's Python to check for the dependency and its version
-            result = subprocess.run(
-                [python_path, "-c", f"import {dep}; print('{dep}:' + getattr({dep}, '__version__', 'unknown'))"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            version_output = result.stdout.strip()
-            if ':' in version_output:
-                dep_name, version = version_output.split(':', 1)
-                installed_versions[dep_name] = version
-                print(f"✓ {dep} is installed (version {version})")
-            else:
-                print(f"✓ {dep} is installed (version unknown)")
-        except subprocess.CalledProcessError:
-            missing_deps.append(dep)
-            print(f"✗ {dep} is missing")
-    
-    if missing_deps:
-        print("\nWarning: Some critical dependencies are missing:")
-        for dep in missing_deps:
-            print(f"  - {dep}")
-        print("\nPlease try running the setup again or install them manually.")
+    # verify_environment.py imports the packages concurrently, checks the compatibility
+    # rules against the same snapshot and caches its report per environment
+    try:
+        result = subprocess.run(
+            [str(python_path), "verify_environment.py", "--json", *CRITICAL_DEPENDENCIES],
+            capture_output=True,
+            text=True
+        )
+        report = json.loads(result.stdout)
+    except (OSError, ValueError) as e:
+        print(f"Error verifying dependencies: {e}")
         return False
     
-    # Check for dependency compatibility issues
-    compatibility_issues = check_dependency_compatibility(installed_versions)
-    if compatibility_issues:
-        print("\nWarning: Dependency compatibility issues detected:")
-        for issue in compatibility_issues:
-            print(f"  - {issue}")
-        print("\nThe application may not function correctly due to these compatibility issues.")
+    if not summarize_report(report):
         print("Poetry should have resolved these issues. Please check your pyproject.toml file.")
         return False
-    
-    # Run compatibility checker if available
-    if os.path.exists("compatibility_checker.py"):
-        print("\nRunning compatibility checker...")
-        try:
-            subprocess.run(
-                [python_path, "compatibility_checker.py"],
-                check=True
-            )
-        except subprocess.CalledProcessError:
-            print("⚠️ Compatibility issues detected. Please review the output above.")
-            return False
-    
-    print("All critical dependencies are installed and compatible.")
     return True
 
-def check_dependency_compatibility(installed_versions):
-    """Check for known dependency compatibility issues."""
-    issues = []
-    
-    # Check NiceGUI and FastAPI compatibility
-    if 'nicegui' in installed_versions and 'fastapi' in installed_versions:
-        nicegui_version = installed_versions['nicegui']
-        fastapi_version = installed_versions['fastapi']
-        
-        # NiceGUI 1.4.21-1.4.24 requires FastAPI <0.110.0, >=0.109.1
-        if nicegui_version.startswith('1.4.2'):
-            try:
-                from packaging import version
-                if version.parse(fastapi_version) >= version.parse('0.110.0'):
-                    issues.append(f"NiceGUI {nicegui_version} requires FastAPI <0.110.0, but {fastapi_version} is installed")
-            except ImportError:
-                # Simple string comparison if packaging is not available
-                major, minor, patch = fastapi_version.split(".", 2)
-                if int(major) > 0 or int(minor) >= 110:
-                    issues.append(f"NiceGUI {nicegui_version} requires FastAPI <0.110.0, but {fastapi_version} is installed")
-    
-    return issues
-
 def print_activation_instructions():
     """Print instructions for activating the virtual environment."""
     print("\nTo activate the virtual environment:")
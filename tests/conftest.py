@@ -0,0 +1,15 @@
+"""
+Shared test setup for the GenAI Portfolio application.
+Settings are read from ``.env`` in the working directory and the application
+creates ./data, ./logs and ./uploads on import, so the tests run from a scratch
+directory: a developer's .env cannot change their outcome and nothing is
+written into the checkout.
+"""
+
+import os
+import tempfile
+
+
+def pytest_sessionstart(session):
+    """Move to a scratch directory before any test module imports the app."""
+    os.chdir(tempfile.mkdtemp(prefix="portfolio-tests-"))
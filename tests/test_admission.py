@@ -0,0 +1,93 @@
+"""Tests for adaptive admission control in app.core.middleware."""
+
+import asyncio
+import time
+
+import httpx
+
+from app.core.middleware import AdaptiveLimit, AdmissionControlMiddleware, RouteClass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_limit_grows_while_used_and_fast():
+    limit = AdaptiveLimit(initial=4, min_limit=1, max_limit=10, latency_target=1.0)
+    for _ in range(4):
+        limit.on_sample(0.1, inflight=4)
+    assert limit.slots == 4  # grows by one per limit's worth of requests
+    limit.on_sample(0.1, inflight=4)
+    assert limit.slots == 5
+
+
+def test_limit_does_not_grow_when_underused():
+    limit = AdaptiveLimit(initial=4, min_limit=1, max_limit=10, latency_target=1.0)
+    for _ in range(20):
+        limit.on_sample(0.1, inflight=1)
+    assert limit.limit == 4
+
+
+def test_limit_stays_within_bounds():
+    limit = AdaptiveLimit(initial=100, min_limit=2, max_limit=5, latency_target=1.0)
+    assert limit.limit == 5
+    for _ in range(50):
+        limit.on_sample(0.1, inflight=5)
+    assert limit.limit == 5
+
+    limit.resize(1, 3)
+    assert limit.limit == 3
+
+
+def test_limit_cut_once_per_latency_window(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    limit = AdaptiveLimit(initial=10, min_limit=1, max_limit=10, latency_target=1.0, backoff=0.5)
+
+    limit.on_sample(2.0, inflight=10)
+    assert limit.limit == 5
+    # Requests already in flight report the same congestion
+    limit.on_sample(2.0, inflight=10)
+    limit.on_drop()
+    assert limit.limit == 5
+
+    clock.now += limit.latency + 0.01
+    limit.on_drop()
+    assert limit.limit == 2.5
+    for _ in range(10):
+        clock.now += 60
+        limit.on_drop()
+    assert limit.slots == 1
+
+
+def test_overloaded_class_is_shed_with_503():
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    route_class = RouteClass("api", ["/"], AdaptiveLimit(initial=1, min_limit=1, max_limit=1, latency_target=10.0))
+    middleware = AdmissionControlMiddleware(app, [route_class], queue_timeout=0.05, bypass_paths=["/livez"])
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as client:
+            slow = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.01)
+            shed = await client.get("/other")
+            bypassed = await client.get("/livez")
+            release.set()
+            return await slow, shed, bypassed
+
+    slow, shed, bypassed = asyncio.run(run())
+    assert slow.status_code == 200
+    assert shed.status_code == 503
+    assert int(shed.headers["retry-after"]) >= 1
+    assert bypassed.status_code == 200
+    assert route_class.inflight == 0
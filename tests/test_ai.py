@@ -0,0 +1,91 @@
+"""Tests for failover and hedging in the AI gateway."""
+
+import asyncio
+
+from app.core.resilience import CLOSED, OPEN
+from app.services.ai import AIGateway, FakeProvider, MockProvider
+
+
+def make_gateway(*providers: FakeProvider, **options) -> AIGateway:
+    return AIGateway(list(providers), MockProvider(simulate_latency=False), **options)
+
+
+def test_first_provider_answers():
+    gateway = make_gateway(FakeProvider("primary", latency=0.01, seed=1), FakeProvider("secondary", latency=0.01, seed=2))
+    result = asyncio.run(gateway.complete("chat", "hello"))
+
+    assert result.provider == "primary"
+    assert result.text.startswith("[primary]")
+    assert not result.fallback and not result.hedged
+    assert gateway.providers[1].calls == 0
+
+
+def test_fails_over_to_next_provider():
+    primary = FakeProvider("primary", latency=0.01, failure_rate=1.0, seed=1)
+    secondary = FakeProvider("secondary", latency=0.01, seed=2)
+    gateway = make_gateway(primary, secondary)
+    result = asyncio.run(gateway.complete("chat", "hello"))
+
+    assert result.provider == "secondary"
+    assert primary.calls == 1
+    assert gateway.breakers["primary"].describe()["failure_rate"] == 1.0
+
+
+def test_timeout_counts_as_failure():
+    primary = FakeProvider("primary", latency=1.0, seed=1)
+    gateway = make_gateway(primary, FakeProvider("secondary", latency=0.01, seed=2), timeout=0.05)
+    result = asyncio.run(gateway.complete("chat", "hello"))
+
+    assert result.provider == "secondary"
+    assert gateway.breakers["primary"].inflight == 0
+
+
+def test_falls_back_when_every_provider_fails():
+    gateway = make_gateway(FakeProvider("primary", latency=0.01, failure_rate=1.0, seed=1))
+    result = asyncio.run(gateway.complete("text-generation", "a poem", style="creative", length="short"))
+
+    assert result.fallback
+    assert result.provider == "mock"
+    assert "a poem" in result.text
+
+
+def test_open_breaker_skips_provider():
+    primary = FakeProvider("primary", latency=0.01, failure_rate=1.0, seed=1)
+    gateway = make_gateway(primary, FakeProvider("secondary", latency=0.01, seed=2),
+                           minimum_calls=2, open_seconds=60)
+
+    async def run() -> None:
+        for _ in range(4):
+            assert (await gateway.complete("chat", "hello")).provider == "secondary"
+
+    asyncio.run(run())
+    assert gateway.breakers["primary"].state == OPEN
+    assert primary.calls == 2
+
+
+def test_hedges_slow_provider():
+    primary = FakeProvider("primary", latency=0.5, seed=1)
+    secondary = FakeProvider("secondary", latency=0.01, seed=2)
+    gateway = make_gateway(primary, secondary, hedge_delay=0.05)
+    result = asyncio.run(gateway.complete("chat", "hello"))
+
+    assert result.provider == "secondary"
+    assert result.hedged
+    # The losing call was cancelled and not held against the primary
+    primary_breaker = gateway.breakers["primary"]
+    assert primary_breaker.inflight == 0
+    assert primary_breaker.state == CLOSED
+    assert primary_breaker.describe()["window_calls"] == 0
+
+
+def test_hedge_with_seeded_tail_latency():
+    # Seeded so the first call lands in the slow tail and the second does not
+    primary = FakeProvider("primary", latency=0.01, slow_rate=0.5, slow_latency=0.5, seed=3)
+    gateway = make_gateway(primary, FakeProvider("secondary", latency=0.01, seed=4), hedge_delay=0.05)
+
+    async def run() -> list:
+        return [await gateway.complete("chat", "hello") for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert (first.provider, first.hedged) == ("secondary", True)
+    assert (second.provider, second.hedged) == ("primary", False)
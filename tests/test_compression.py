@@ -0,0 +1,96 @@
+"""Tests for content negotiation and the compression middleware."""
+
+import asyncio
+import json
+
+import httpx
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+AVAILABLE = ["zstd", "br", "gzip"]
+BODY = json.dumps([{"id": index, "title": f"Project {index}"} for index in range(200)]).encode()
+
+
+def test_server_preference_breaks_ties():
+    assert negotiate_encoding("gzip, deflate, br, zstd", AVAILABLE) == "zstd"
+    assert negotiate_encoding("gzip, br", AVAILABLE) == "br"
+
+
+def test_client_quality_wins():
+    assert negotiate_encoding("zstd;q=0.5, gzip;q=1.0", AVAILABLE) == "gzip"
+    assert negotiate_encoding("br; q=0.9, gzip; q=0.8", AVAILABLE) == "br"
+
+
+def test_refused_and_unknown_codings():
+    assert negotiate_encoding("", AVAILABLE) is None
+    assert negotiate_encoding("identity", AVAILABLE) is None
+    assert negotiate_encoding("gzip;q=0", AVAILABLE) is None
+    assert negotiate_encoding("gzip;q=oops", AVAILABLE) is None
+    assert negotiate_encoding("*;q=0.1, zstd;q=0", AVAILABLE) == "br"
+    assert negotiate_encoding("zstd", ["gzip"]) is None
+
+
+def make_app(body: bytes, content_type: str = "application/json", headers=(), chunks: int = 1):
+    async def app(scope, receive, send):
+        raw = [(b"content-type", content_type.encode())] + [(name.encode(), value.encode()) for name, value in headers]
+        if chunks == 1:
+            raw.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        size = len(body) // chunks + 1
+        for start in range(0, len(body), size):
+            await send({"type": "http.response.body", "body": body[start:start + size],
+                        "more_body": start + size < len(body)})
+
+    return app
+
+
+def fetch(app, path: str = "/", accept_encoding: str = "gzip") -> httpx.Response:
+    async def run() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path, headers={"accept-encoding": accept_encoding})
+
+    return asyncio.run(run())
+
+
+def test_compresses_large_json():
+    response = fetch(CompressionMiddleware(make_app(BODY)))
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_leaves_small_incompressible_and_unaccepted_bodies_alone():
+    for body, content_type, accept_encoding in [
+        (b'{"ok": true}', "application/json", "gzip"),
+        (BODY, "image/png", "gzip"),
+        (BODY, "application/json", "identity"),
+    ]:
+        response = fetch(CompressionMiddleware(make_app(body, content_type)), accept_encoding=accept_encoding)
+        assert "content-encoding" not in response.headers
+        assert response.content == body
+
+
+def test_weakens_strong_etag():
+    response = fetch(CompressionMiddleware(make_app(BODY, headers=[("etag", '"abc"')])))
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_compresses_streaming_response():
+    response = fetch(CompressionMiddleware(make_app(BODY, chunks=4)))
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY
+
+
+def test_memoizes_cacheable_paths():
+    middleware = CompressionMiddleware(make_app(BODY), cacheable_paths=["/api/projects"])
+    first = fetch(middleware, "/api/projects")
+    second = fetch(middleware, "/api/projects")
+    fetch(middleware, "/api/other")
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert first.content == second.content == BODY
+    assert len(middleware.cache.dump()[1]) == 1
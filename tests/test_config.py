@@ -0,0 +1,78 @@
+"""Tests for reloading settings while the application runs."""
+
+import pytest
+
+from app.core import config
+from app.core.config import on_settings_change, reload_settings, settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch, tmp_path):
+    """Restore the global settings after each test and start without listeners or .env."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "_listeners", [])
+    for name in ("RATE_LIMIT_REQUESTS", "RATE_LIMIT_WINDOW", "REQUEST_TIMEOUT", "API_PREFIX"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_unchanged_environment_changes_nothing():
+    calls = []
+    on_settings_change(["RATE_LIMIT_REQUESTS"], calls.append)
+    assert reload_settings() == {}
+    assert calls == []
+
+
+def test_reloadable_fields_are_applied_and_listeners_called(monkeypatch):
+    limits, timeouts = [], []
+    on_settings_change(["RATE_LIMIT_REQUESTS", "RATE_LIMIT_WINDOW"], limits.append)
+    on_settings_change(["REQUEST_TIMEOUT"], timeouts.append)
+    monkeypatch.setenv("RATE_LIMIT_REQUESTS", str(settings.RATE_LIMIT_REQUESTS + 7))
+
+    changed = reload_settings()
+    assert changed == {"RATE_LIMIT_REQUESTS": settings.RATE_LIMIT_REQUESTS}
+    assert limits == [changed]  # only the changed fields, with their new values
+    assert timeouts == []
+
+
+def test_env_file_changes_are_picked_up(tmp_path):
+    (tmp_path / ".env").write_text(f"REQUEST_TIMEOUT={settings.REQUEST_TIMEOUT + 5}\n")
+    expected = settings.REQUEST_TIMEOUT + 5
+
+    assert reload_settings() == {"REQUEST_TIMEOUT": expected}
+    assert settings.REQUEST_TIMEOUT == expected
+
+
+def test_other_fields_need_a_restart(monkeypatch):
+    original = settings.API_PREFIX
+    monkeypatch.setenv("API_PREFIX", "/v2")
+
+    assert reload_settings() == {}
+    assert settings.API_PREFIX == original
+
+
+def test_invalid_values_keep_current_settings(monkeypatch):
+    original = settings.RATE_LIMIT_REQUESTS
+    monkeypatch.setenv("RATE_LIMIT_REQUESTS", "many")
+    monkeypatch.setenv("RATE_LIMIT_WINDOW", str(settings.RATE_LIMIT_WINDOW + 1))
+
+    assert reload_settings() == {}
+    assert settings.RATE_LIMIT_REQUESTS == original
+
+
+def test_failing_listener_does_not_stop_the_others(monkeypatch):
+    def broken(changes):
+        raise RuntimeError("cannot apply")
+
+    calls = []
+    on_settings_change(["REQUEST_TIMEOUT"], broken)
+    on_settings_change(["REQUEST_TIMEOUT"], calls.append)
+    monkeypatch.setenv("REQUEST_TIMEOUT", str(settings.REQUEST_TIMEOUT + 1))
+
+    assert reload_settings()
+    assert len(calls) == 1
+
+
+def test_only_reloadable_fields_can_be_watched():
+    with pytest.raises(ValueError):
+        on_settings_change(["API_PREFIX"], lambda changes: None)
@@ -0,0 +1,120 @@
+"""Tests for request deadlines and the 504 responses of DeadlineMiddleware."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.deadlines import (
+    DeadlineMiddleware,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+    run_within_deadline,
+)
+from app.core.exceptions import DeadlineExceededError
+
+
+class SlowApp:
+    """Answers after ``delay`` seconds, optionally checking the deadline first."""
+
+    def __init__(self, delay: float, check: bool = False) -> None:
+        self.delay = delay
+        self.check = check
+        self.cancelled = False
+        self.deadline = None
+
+    async def __call__(self, scope, receive, send):
+        self.deadline = current_deadline.get()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.check:
+            check_deadline("test")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+
+
+def fetch(app, path: str = "/", headers=None) -> httpx.Response:
+    async def run() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path, headers=headers or {})
+
+    return asyncio.run(run())
+
+
+def test_route_timeout_cancels_handler_with_504():
+    handler = SlowApp(delay=5)
+    started = time.monotonic()
+    response = fetch(DeadlineMiddleware(handler, route_timeouts={"/api/ai/": 0.05}), "/api/ai/chat")
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 2
+    assert handler.cancelled
+
+
+def test_timeout_header_shortens_but_never_extends():
+    handler = SlowApp(delay=5)
+    shortened = fetch(DeadlineMiddleware(handler, default_timeout=30), headers={"x-request-timeout": "0.05"})
+    assert shortened.status_code == 504
+    assert handler.cancelled
+
+    started = time.monotonic()
+    extended = fetch(DeadlineMiddleware(SlowApp(delay=5), route_timeouts={"/": 0.05}),
+                     headers={"x-request-timeout": "60"})
+    assert extended.status_code == 504
+    assert time.monotonic() - started < 2
+
+
+def test_inline_handler_checking_deadline_gets_504():
+    handler = SlowApp(delay=0.1, check=True)
+    response = fetch(DeadlineMiddleware(handler, default_timeout=0.05))
+
+    assert response.status_code == 504
+    assert not handler.cancelled  # only upstream work sees the deadline
+
+
+def test_fast_requests_and_bypassed_paths_pass():
+    handler = SlowApp(delay=0, check=True)
+    middleware = DeadlineMiddleware(handler, default_timeout=1, route_timeouts={"/api/ai/": 1},
+                                    bypass_paths=["/static"])
+
+    assert fetch(middleware, "/api/ai/chat").status_code == 200
+    assert fetch(middleware, "/").status_code == 200
+    assert handler.deadline is not None
+    assert fetch(middleware, "/static/app.css").status_code == 200
+    assert handler.deadline is None
+
+
+def test_started_stream_is_allowed_to_finish():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"first ", "more_body": True})
+        await asyncio.sleep(0.1)
+        await send({"type": "http.response.body", "body": b"second"})
+
+    response = fetch(DeadlineMiddleware(app, route_timeouts={"/": 0.05}))
+    assert response.status_code == 200
+    assert response.content == b"first second"
+
+
+def test_run_within_deadline_bounds_upstream_calls():
+    async def run():
+        with deadline_scope(0.05):
+            await run_within_deadline(asyncio.sleep(1), "test")
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+
+
+def test_nested_scope_never_extends_deadline():
+    with deadline_scope(1) as outer:
+        with deadline_scope(60) as inner:
+            assert inner.remaining() <= 1
+        outer.abandon("disconnect")
+        with pytest.raises(DeadlineExceededError):
+            check_deadline("test")
+    assert current_deadline.get() is None
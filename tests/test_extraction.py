@@ -0,0 +1,63 @@
+"""Tests for splitting extracted pages into overlapping chunks."""
+
+from app.services.extraction import chunk_pages
+
+
+def split(pages, size, overlap):
+    results = list(chunk_pages(iter(pages), size, overlap))
+    return [(page, chunk) for page, chunk in results if chunk is not None], [page for page, chunk in results
+                                                                            if chunk is None]
+
+
+def test_short_document_is_one_chunk():
+    chunks, progress = split(["hello world"], size=100, overlap=10)
+    assert chunks == [(1, "hello world")]
+    assert progress == [1]
+
+
+def test_chunks_overlap():
+    text = "".join(chr(ord("a") + index % 26) for index in range(95))
+    chunks, _ = split([text], size=20, overlap=5)
+
+    assert [len(chunk) for _, chunk in chunks[:-1]] == [20] * (len(chunks) - 1)
+    for (_, previous), (_, current) in zip(chunks, chunks[1:]):
+        assert current[:5] == previous[-5:]
+    assert chunks[0][1] + "".join(chunk[5:] for _, chunk in chunks[1:]) == text
+    assert all(len(chunk) > 5 for _, chunk in chunks)  # no chunk is only overlap
+
+
+def test_overlap_is_capped_at_half_a_chunk():
+    chunks, _ = split(["x" * 100], size=20, overlap=50)
+    assert len(chunks) == 9  # every chunk advances by 10 characters, no tail of only overlap
+
+
+def test_chunks_end_at_whitespace():
+    words = [f"word{index}" for index in range(100)]
+    chunks, _ = split([" ".join(words)], size=60, overlap=0)
+
+    for _, chunk in chunks:
+        assert len(chunk) <= 60
+        assert all(word in words for word in chunk.split())
+    assert " ".join(chunk for _, chunk in chunks).split() == words
+
+
+def test_chunks_are_tagged_with_their_starting_page():
+    pages = [" ".join(f"p{page}w{index}" for index in range(40)) + " " for page in range(1, 5)]
+    text = "".join(pages)
+    page_starts = [sum(len(page) for page in pages[:index]) for index in range(len(pages))]
+    chunks, progress = split(pages, size=100, overlap=20)
+
+    assert progress == [1, 2, 3, 4]
+    offset = 0
+    for page, chunk in chunks:
+        offset = text.index(chunk, offset)
+        assert page == max(number for number, start in enumerate(page_starts, start=1) if start <= offset)
+    assert {page for page, _ in chunks} == {1, 2, 3, 4}
+
+
+def test_progress_follows_each_page():
+    results = list(chunk_pages(iter(["a " * 30, "", "b " * 30]), size=40, overlap=0))
+    markers = [index for index, (_, chunk) in enumerate(results) if chunk is None]
+
+    assert [results[index][0] for index in markers] == [1, 2, 3]
+    assert results[-1][1] is not None  # the tail follows the last page's marker
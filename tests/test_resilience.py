@@ -0,0 +1,82 @@
+"""Tests for the circuit breakers in app.core.resilience."""
+
+from app.core.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def fail_calls(breaker: CircuitBreaker, count: int) -> None:
+    for _ in range(count):
+        breaker.on_failure(breaker.acquire())
+
+
+def test_opens_when_failure_rate_reached():
+    breaker = CircuitBreaker("test", failure_rate=0.5, window=10, minimum_calls=4, open_seconds=60)
+    breaker.on_success(breaker.acquire(), 0.01)
+    fail_calls(breaker, 2)
+    assert breaker.state == CLOSED  # below minimum_calls
+
+    fail_calls(breaker, 1)
+    assert breaker.state == OPEN
+    assert breaker.acquire() is None
+
+
+def test_opens_when_slow_call_rate_reached():
+    breaker = CircuitBreaker("test", slow_call_seconds=0.5, slow_call_rate=0.5, minimum_calls=2, open_seconds=60)
+    breaker.on_success(breaker.acquire(), 0.1)
+    breaker.on_success(breaker.acquire(), 1.0)
+    assert breaker.state == OPEN
+
+
+def test_probe_success_closes():
+    breaker = CircuitBreaker("test", minimum_calls=2, open_seconds=0)
+    fail_calls(breaker, 2)
+    assert breaker.state == OPEN
+
+    probe = breaker.acquire()
+    assert breaker.state == HALF_OPEN and probe.probe
+    assert breaker.acquire() is None  # one probe at a time
+    breaker.on_success(probe, 0.01)
+    assert breaker.state == CLOSED
+    assert breaker.describe()["window_calls"] == 0
+
+
+def test_probe_failure_reopens():
+    breaker = CircuitBreaker("test", minimum_calls=2, open_seconds=0)
+    fail_calls(breaker, 2)
+    breaker.on_failure(breaker.acquire())
+    assert breaker.state == OPEN
+
+
+def test_stale_outcomes_are_ignored():
+    breaker = CircuitBreaker("test", minimum_calls=2, open_seconds=0)
+    straggler = breaker.acquire()  # started while closed
+    fail_calls(breaker, 2)
+    probe = breaker.acquire()
+    assert breaker.state == HALF_OPEN
+
+    breaker.on_failure(straggler)
+    assert breaker.state == HALF_OPEN
+    breaker.on_success(probe, 0.01)
+    assert breaker.state == CLOSED
+    assert breaker.inflight == 0
+
+
+def test_cancelled_probe_frees_its_slot():
+    breaker = CircuitBreaker("test", minimum_calls=2, open_seconds=0)
+    fail_calls(breaker, 2)
+    probe = breaker.acquire()
+    breaker.on_cancel(probe)
+    assert breaker.state == HALF_OPEN
+
+    probe = breaker.acquire()
+    assert probe is not None and probe.probe
+
+
+def test_bulkhead_limits_calls_in_flight():
+    breaker = CircuitBreaker("test", max_concurrency=2)
+    first, second = breaker.acquire(), breaker.acquire()
+    assert breaker.acquire() is None
+
+    breaker.on_success(first, 0.01)
+    assert breaker.acquire() is not None
+    breaker.on_cancel(second)
+    assert breaker.inflight == 1
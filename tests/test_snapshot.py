@@ -0,0 +1,128 @@
+"""Tests for saving and restoring warm-state snapshots."""
+
+import os
+
+import pytest
+
+from app.core import snapshot
+from app.core.compression import CompressedResponseCache
+from app.core.snapshot import register_snapshot, restore_snapshot, save_snapshot, snapshot_summary
+from app.core.static import CachedStaticFiles
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshot(monkeypatch):
+    """Start every test without registered caches or an open snapshot."""
+    monkeypatch.setattr(snapshot, "_providers", {})
+    monkeypatch.setattr(snapshot, "_sections", {})
+    monkeypatch.setattr(snapshot, "_mapping", None)
+    monkeypatch.setattr(snapshot, "_summary", {"path": None, "created": None, "restored": {}, "saved": None})
+
+
+class DictCache:
+    def __init__(self, entries=None) -> None:
+        self.entries = dict(entries or {})
+
+    def dump(self):
+        keys = sorted(self.entries)
+        return keys, [self.entries[key] for key in keys]
+
+    def load(self, keys, blobs):
+        self.entries.update(zip(keys, (bytes(blob) for blob in blobs)))
+        return len(keys)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "data" / "warm.snapshot"
+    register_snapshot("words", *_methods(DictCache({"a": b"alpha", "b": b"\x00\xffbinary"})))
+    register_snapshot("empty", *_methods(DictCache()))
+    size = save_snapshot(path)
+    assert path.stat().st_size == size
+    assert os.listdir(path.parent) == ["warm.snapshot"]  # no temporary file left behind
+
+    restored = DictCache()
+    register_snapshot("words", *_methods(restored))
+    assert restore_snapshot(path)
+    assert restored.entries == {"a": b"alpha", "b": b"\x00\xffbinary"}
+    summary = snapshot_summary()
+    assert summary["restored"]["words"]["entries"] == 2
+    assert summary["restored"]["words"]["bytes"] == len(b"alpha") + len(b"\x00\xffbinary")
+    assert summary["restored"]["empty"]["entries"] == 0
+    assert summary["pending"] == []
+
+
+def test_late_registration_is_restored_on_register(tmp_path):
+    path = tmp_path / "warm.snapshot"
+    register_snapshot("late", *_methods(DictCache({"key": b"value"})))
+    save_snapshot(path)
+    snapshot._providers.clear()
+
+    assert restore_snapshot(path)
+    assert snapshot_summary()["pending"] == ["late"]
+    restored = DictCache()
+    register_snapshot("late", *_methods(restored))
+    assert restored.entries == {"key": b"value"}
+    assert snapshot_summary()["pending"] == []
+    assert snapshot._mapping is None
+
+
+def test_missing_and_unreadable_snapshots_are_cold_starts(tmp_path):
+    assert not restore_snapshot(tmp_path / "missing.snapshot")
+    (tmp_path / "empty.snapshot").write_bytes(b"")
+    assert not restore_snapshot(tmp_path / "empty.snapshot")
+    (tmp_path / "garbage.snapshot").write_bytes(b"not a snapshot at all")
+    assert not restore_snapshot(tmp_path / "garbage.snapshot")
+
+
+def test_failing_cache_does_not_spoil_the_others(tmp_path):
+    path = tmp_path / "warm.snapshot"
+
+    def broken_dump():
+        raise RuntimeError("cannot dump")
+
+    def broken_load(meta, blobs):
+        raise RuntimeError("cannot load")
+
+    register_snapshot("broken", broken_dump, broken_load)
+    register_snapshot("words", *_methods(DictCache({"a": b"alpha"})))
+    register_snapshot("picky", *_methods(DictCache({"b": b"beta"})))
+    save_snapshot(path)
+
+    restored = DictCache()
+    register_snapshot("picky", lambda: ([], []), broken_load)
+    register_snapshot("words", *_methods(restored))
+    assert restore_snapshot(path)
+    assert restored.entries == {"a": b"alpha"}
+    assert set(snapshot_summary()["restored"]) == {"words"}
+
+
+def test_application_caches_round_trip(tmp_path):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "kept.css").write_text("body { color: black; }\n" * 50)
+    (static_dir / "changed.css").write_text("p { margin: 0; }\n" * 50)
+    files = CachedStaticFiles(directory=str(static_dir))
+    files.warm()
+    compressed = CompressedResponseCache(1024 * 1024)
+    compressed.put((b"\x01" * 32, "gzip", 9), b"compressed body")
+    register_snapshot("static", files.snapshot_state, files.restore_state)
+    register_snapshot("compression", compressed.dump, compressed.load)
+    save_snapshot(tmp_path / "warm.snapshot")
+
+    changed = static_dir / "changed.css"
+    changed.write_text("p { margin: 1px; }\n" * 50)
+    os.utime(changed, ns=(changed.stat().st_atime_ns, changed.stat().st_mtime_ns + 10**9))
+    fresh_files = CachedStaticFiles(directory=str(static_dir))
+    fresh_compressed = CompressedResponseCache(1024 * 1024)
+    register_snapshot("static", fresh_files.snapshot_state, fresh_files.restore_state)
+    register_snapshot("compression", fresh_compressed.dump, fresh_compressed.load)
+    assert restore_snapshot(tmp_path / "warm.snapshot")
+
+    kept = str(static_dir / "kept.css")
+    assert set(fresh_files._entries) == {kept}  # the changed file is hashed again on demand
+    assert fresh_files._entries[kept].variants[None].etag == files._entries[kept].variants[None].etag
+    assert fresh_compressed.get((b"\x01" * 32, "gzip", 9)) == b"compressed body"
+
+
+def _methods(cache: DictCache):
+    return cache.dump, cache.load
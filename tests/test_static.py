@@ -0,0 +1,119 @@
+"""Tests for range parsing and conditional responses of CachedStaticFiles."""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from app.core.static import CachedStaticFiles, RangeNotSatisfiable, parse_range
+
+CONTENT = b"".join(b"line %04d of a static text file\n" % number for number in range(200))
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=-5000", 1000) == (0, 999)
+    assert parse_range("bytes=990-2000", 1000) == (990, 999)
+
+
+def test_parse_range_ignores_unsupported_headers():
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    assert parse_range("items=0-1", 1000) is None
+    assert parse_range("bytes=abc-", 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-2", "bytes=-0"])
+def test_parse_range_rejects_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 1000)
+
+
+def fetch(app, *requests):
+    """Send (path, headers) requests in order and return the responses."""
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return [await client.get(path, headers={"accept-encoding": "identity", **headers})
+                    for path, headers in requests]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "notes.txt").write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture(params=["memory", "disk"])
+def static_app(request, static_dir):
+    # "disk" keeps every body out of the hot set, so responses stream from the file
+    max_file_bytes = 1024 * 1024 if request.param == "memory" else 0
+    return CachedStaticFiles(directory=str(static_dir), cache_max_file_bytes=max_file_bytes)
+
+
+def test_full_response_has_validators(static_app):
+    response, = fetch(static_app, ("/notes.txt", {}))
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["accept-ranges"] == "bytes"
+    assert int(response.headers["content-length"]) == len(CONTENT)
+
+
+def test_matching_etag_is_not_modified(static_app):
+    first, = fetch(static_app, ("/notes.txt", {}))
+    etag = first.headers["etag"]
+    strong, weak, other = fetch(static_app, ("/notes.txt", {"if-none-match": etag}),
+                                ("/notes.txt", {"if-none-match": f"W/{etag}"}),
+                                ("/notes.txt", {"if-none-match": '"something-else"'}))
+
+    assert strong.status_code == weak.status_code == 304
+    assert strong.content == b""
+    assert strong.headers["etag"] == etag
+    assert other.status_code == 200
+
+
+def test_changed_file_gets_new_etag(static_app, static_dir):
+    first, = fetch(static_app, ("/notes.txt", {}))
+    path = static_dir / "notes.txt"
+    path.write_bytes(CONTENT + b"appended\n")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    second, = fetch(static_app, ("/notes.txt", {"if-none-match": first.headers["etag"]}))
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+
+
+def test_range_is_partial_content(static_app):
+    middle, suffix = fetch(static_app, ("/notes.txt", {"range": "bytes=100-199"}),
+                           ("/notes.txt", {"range": "bytes=-10"}))
+
+    assert middle.status_code == 206
+    assert middle.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert middle.content == CONTENT[100:200]
+    assert suffix.status_code == 206
+    assert suffix.content == CONTENT[-10:]
+
+
+def test_unsatisfiable_range_and_stale_if_range(static_app):
+    outside, stale = fetch(static_app, ("/notes.txt", {"range": f"bytes={len(CONTENT)}-"}),
+                           ("/notes.txt", {"range": "bytes=0-9", "if-range": '"stale"'}))
+
+    assert outside.status_code == 416
+    assert outside.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def test_compressed_variant_has_its_own_etag(static_dir):
+    app = CachedStaticFiles(directory=str(static_dir))
+    identity, = fetch(app, ("/notes.txt", {}))
+    compressed, = fetch(app, ("/notes.txt", {"accept-encoding": "gzip"}))
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] != identity.headers["etag"]
+    assert compressed.content == CONTENT
@@ -0,0 +1,94 @@
+"""Tests for streaming uploads into the content-addressed UploadStore."""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from app.core.exceptions import PayloadTooLargeError, UnsupportedMediaTypeError
+from app.services.uploads import UploadStore, sniff_document_type
+
+PDF = b"%PDF-1.7\n" + b"0123456789abcdef" * 4096
+
+
+async def chunked(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def save(store: UploadStore, filename: str, data: bytes):
+    return asyncio.run(store.save_stream(filename, chunked(data)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(tmp_path / "uploads", max_size=100 * 1024, allowed_extensions=[".pdf", "docx", "TXT"])
+
+
+def stored_files(store: UploadStore):
+    return sorted(path.name for path in store.directory.iterdir() if path.is_file())
+
+
+def test_sniff_document_type():
+    assert sniff_document_type(PDF[:512]) == "pdf"
+    assert sniff_document_type(b"PK\x03\x04rest") == "docx"
+    assert sniff_document_type(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1rest") == "doc"
+    assert sniff_document_type("plain notes – ünïcode".encode()) == "txt"
+    assert sniff_document_type(b"\x89PNG\r\n\x1a\n\x00\x00") is None
+    # A multi-byte character cut off by the sniff window is only fine mid-stream
+    assert sniff_document_type("abc é".encode()[:-1]) == "txt"
+    assert sniff_document_type("abc é".encode()[:-1], complete=True) is None
+
+
+def test_streams_upload_to_content_hash(store):
+    result = save(store, "../../report.pdf", PDF)
+
+    content_hash = hashlib.sha256(PDF).hexdigest()
+    assert result == {
+        "id": content_hash,
+        "filename": "report.pdf",
+        "size": len(PDF),
+        "content_type": "application/pdf",
+        "deduplicated": False,
+    }
+    assert (store.directory / f"{content_hash}.pdf").read_bytes() == PDF
+    assert list(store.incoming.iterdir()) == []
+
+
+def test_identical_uploads_are_deduplicated(store):
+    first = save(store, "a.pdf", PDF)
+    second = store.save_file("b.pdf", io.BytesIO(PDF))
+
+    assert second["deduplicated"] and not first["deduplicated"]
+    assert second["id"] == first["id"]
+    assert stored_files(store) == [f"{first['id']}.pdf"]
+    assert list(store.incoming.iterdir()) == []
+
+
+def test_size_limit(store):
+    with pytest.raises(PayloadTooLargeError):
+        save(store, "big.pdf", PDF + b"x" * store.max_size)
+    assert stored_files(store) == []
+    assert list(store.incoming.iterdir()) == []
+
+
+@pytest.mark.parametrize("filename, data", [
+    ("report.pdf", b"just some text pretending to be a pdf"),
+    ("report.pdf", b"PK\x03\x04" + b"\x00" * 1000),
+    ("notes.txt", b"\x00\x01\x02 binary"),
+    ("slides.docx", PDF),
+    ("program.exe", b"MZ\x90\x00"),
+    ("no-extension", b"hello"),
+])
+def test_content_must_match_extension(store, filename, data):
+    with pytest.raises(UnsupportedMediaTypeError):
+        save(store, filename, data)
+    assert stored_files(store) == []
+
+
+def test_small_text_file_is_sniffed_when_complete(store):
+    result = save(store, "notes.txt", b"short note")
+
+    assert result["content_type"] == "text/plain"
+    assert result["size"] == len(b"short note")
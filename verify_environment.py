@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Environment Verification Script
+
+This script verifies an environment in a single pass of its own interpreter:
+it reads every installed distribution through importlib.metadata, imports the
+critical dependencies concurrently and evaluates the known compatibility
+rules (see compatibility_checker.py) against the same snapshot.
+
+The result is a JSON report, cached by a fingerprint of the interpreter, the
+installed distributions and the rules, so repeated runs against an unchanged
+environment return immediately. setup.py and setup_poetry.py run it with the
+virtual environment's Python.
+
+Usage:
+    python verify_environment.py [--json] [--refresh] [package ...]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Critical dependencies to verify when none are given
+CRITICAL_DEPENDENCIES = [
+    "uvicorn",
+    "fastapi",
+    "nicegui",
+    "pydantic"
+]
+
+# Reports are cached here, one file per environment fingerprint
+REPORT_DIR = Path(os.getenv("VERIFICATION_CACHE_DIR", ".cache/verification"))
+
+# Number of cached reports kept
+MAX_REPORTS = 8
+
+def site_directories():
+    """Directories on sys.path that hold installed distributions."""
+    return sorted({path for path in sys.path
+                   if path and os.path.isdir(path) and os.path.basename(path) in ("site-packages", "dist-packages")})
+
+def environment_fingerprint(packages):
+    """Hash the interpreter, the installed distributions, the rules and the packages to verify.
+
+    Only directory listings are read, so this is much cheaper than verifying.
+    """
+    digest = hashlib.sha256()
+    for part in (sys.version, sys.executable, sys.prefix, ",".join(packages)):
+        digest.update(part.encode() + b"\0")
+    for directory in site_directories():
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if entry.name.endswith((".dist-info", ".egg-info", ".egg-link", ".pth")):
+                digest.update(f"{entry.name}:{entry.stat().st_mtime_ns}\0".encode())
+    rules = Path(__file__).with_name("compatibility_checker.py")
+    if rules.exists():
+        digest.update(rules.read_bytes())
+    return digest.hexdigest()
+
+def check_import(name):
+    """Import a package and report whether that worked and how long it took."""
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+    except Exception as e:
+        return {"importable": False, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "importable": True,
+        "module_version": getattr(module, "__version__", None),
+        "import_seconds": round(time.perf_counter() - started, 3),
+    }
+
+def verify(packages):
+    """Verify the running environment.
+
+    Args:
+        packages: Import names of the critical dependencies
+
+    Returns:
+        The verification report
+    """
+    started = time.perf_counter()
+    # Imports are the expensive part; they run concurrently while the metadata is read
+    with ThreadPoolExecutor(max_workers=max(len(packages), 1)) as executor:
+        imports = {name: executor.submit(check_import, name) for name in packages}
+        try:
+            import compatibility_checker
+        except ImportError as e:
+            compatibility_checker = None
+            rules_error = f"compatibility rules unavailable ({e})"
+        if compatibility_checker is not None:
+            installed = compatibility_checker.get_installed_packages()
+            issues = [{"condition": compatibility_checker.describe_rule(rule), "package": rule["package"],
+                       "version": ver1, "requires": rule["requires"], "installed": ver2,
+                       "recommendation": rule["recommendation"]}
+                      for rule, ver1, ver2 in compatibility_checker.find_issues(installed)]
+        else:
+            from importlib import metadata
+            installed = {}
+            for dist in metadata.distributions():
+                if dist.metadata["Name"]:
+                    installed.setdefault(dist.metadata["Name"].lower().replace("_", "-"), dist.version)
+            issues = []
+        critical = {name: dict(future.result(), version=installed.get(name.lower().replace("_", "-")))
+                    for name, future in imports.items()}
+
+    missing = [name for name, result in critical.items() if not result["importable"]]
+    report = {
+        "python": sys.version.split()[0],
+        "executable": sys.executable,
+        "packages": dict(sorted(installed.items())),
+        "critical": critical,
+        "missing": missing,
+        "issues": issues,
+        "ok": not missing and not issues,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    if compatibility_checker is None:
+        report["warnings"] = [rules_error]
+    return report
+
+def load_or_verify(packages, refresh=False):
+    """Return the cached report for this environment, verifying it first when needed."""
+    fingerprint = environment_fingerprint(packages)
+    path = REPORT_DIR / f"{fingerprint}.json"
+    if not refresh and path.exists():
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+            report["cached"] = True
+            return report
+        except ValueError:
+            pass
+
+    report = dict(verify(packages), fingerprint=fingerprint, cached=False)
+    try:
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        os.replace(temporary, path)
+        reports = sorted(REPORT_DIR.glob("*.json"), key=lambda report_path: report_path.stat().st_mtime)
+        for old in reports[:-MAX_REPORTS]:
+            old.unlink()
+    except OSError as e:
+        print(f"Warning: could not cache the verification report: {e}", file=sys.stderr)
+    return report
+
+def summarize_report(report):
+    """Print a verification report for humans; returns whether the environment is usable."""
+    for name, result in report["critical"].items():
+        if result["importable"]:
+            print(f"✓ {name} is installed (version {result.get('version') or result.get('module_version') or 'unknown'})")
+        else:
+            print(f"✗ {name} is missing ({result['error']})")
+    for warning in report.get("warnings", []):
+        print(f"⚠️ {warning}")
+
+    if report["missing"]:
+        print("\nWarning: Some critical dependencies are missing:")
+        for name in report["missing"]:
+            print(f"  - {name}")
+        print("\nPlease try running the setup again or install them manually.")
+        return False
+
+    if report["issues"]:
+        print("\nWarning: Dependency compatibility issues detected:")
+        for issue in report["issues"]:
+            print(f"  - {issue['condition']}, but {issue['requires']} {issue['installed']} is installed. "
+                  f"{issue['recommendation']}")
+        print("\nThe application may not function correctly due to these compatibility issues.")
+        return False
+
+    source = "cached report" if report.get("cached") else f"{report['seconds']:.2f}s"
+    print(f"All critical dependencies are installed and compatible ({len(report['packages'])} packages, {source}).")
+    return True
+
+def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description="Environment Verification Script")
+    parser.add_argument("packages", nargs="*", default=CRITICAL_DEPENDENCIES, help="Critical packages to import")
+    parser.add_argument("--json", action="store_true", help="Print the machine-readable report")
+    parser.add_argument("--refresh", action="store_true", help="Ignore a cached report")
+    args = parser.parse_args()
+
+    # Rules are read from the script's directory, wherever it is run from
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    report = load_or_verify(args.packages, args.refresh)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return report["ok"]
+    print("=== Environment Verification ===")
+    return summarize_report(report)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)